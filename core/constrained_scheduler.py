@@ -4,8 +4,21 @@ Fixes: Reflection for all, Delta→Super Troop sequencing.
 """
 import random
 from collections import defaultdict
-from .models import Activity, Troop, Schedule, ScheduleEntry, TimeSlot, Day, Zone, generate_time_slots, EXCLUSIVE_AREAS
+from .models import Activity, Troop, Schedule, ScheduleEntry, TimeSlot, Day, Zone, generate_time_slots, EXCLUSIVE_AREAS, zobrist_key
 from core.scheduler import config_loader
+from core.scheduler.budget import Deadline, PhaseWatchdog, BudgetReport
+from core.scheduler.pipeline import (
+    CheckpointStore, build_default_pipeline, build_finish_pipeline, build_repair_pipeline, build_warm_pipeline,
+    restore_checkpoint
+)
+from core.scheduler.cluster_days import plan_area_days
+from core.scheduler.nogood import NogoodStore
+from core.scheduler.disruption import slots_before
+from core.scheduler.bounds import AREA_DAY_CAPACITY, AREA_SLOT_CAPACITY, count_satisfied, preference_upper_bound
+from core.scheduler.assignment import (
+    INFEASIBLE, auction_assignment, hungarian, maximum_matching, solve_exclusive_choice,
+    solve_fill_assignment,
+)
 from .activities import get_all_activities, get_activity_by_name
 
 
@@ -174,6 +187,89 @@ class ConstrainedScheduler:
     
     # Non-exclusive areas (multiple activities can run): Beach, Campsite, Off-Camp
     
+    # Anytime scheduling (schedule_all(deadline=...)):
+    # share of the deadline held back for the required cleanup/validation tail
+    DEADLINE_RESERVE_FRACTION = 0.2
+    # max share of the deadline any single optional phase may use before its watchdog stops it
+    PHASE_BUDGET_FRACTION = 0.25
+    
+    # Min-cost flow fill (_flow_fill_empty_cells): base cost of a non-preference fill
+    # (above any preference rank), extra cost of a preference placed under relaxed
+    # constraints (ten ranks), weight of the slot's staff load, and re-solve rounds
+    FILL_DEFAULT_COST = 30.0
+    FILL_RELAXED_COST = 10.0
+    FILL_STAFF_BALANCE_WEIGHT = 0.2
+    FLOW_FILL_MAX_ROUNDS = 5
+    
+    # Reflection slot assignment: tie-break against moving a Reflection for no gain, and the
+    # cost of each extra troop of one commissioner in the same Friday slot
+    REFLECTION_MOVE_COST = 0.01
+    REFLECTION_CROWDING_COST = 10.0
+    # ... and of each commissioner-led entry (Delta, Super Troop, Archery) of the commissioner's
+    # other troops in that slot, which keeps the commissioner from the Reflection
+    REFLECTION_COMMISSIONER_COST = 5.0
+    # Super Troop slot assignment (D.4): value of a same-day Rifle/Shotgun (promoted pairing),
+    # and the tie-break against moving a Super Troop for no gain
+    SUPER_TROOP_PAIRING_VALUE = 1.0
+    SUPER_TROOP_MOVE_COST = 0.01
+    
+    # Joint Delta + Sailing plan (_schedule_delta_sailing_joint): value of placing a requested
+    # activity (minus its rank), and bonuses for same-day pairing, the commissioner's
+    # Delta day and Delta ahead of Super Troop; the search keeps its best plan after
+    # DS_NODE_LIMIT nodes (ten times more changed one stored week's plan, at ten times the cost)
+    DS_ACTIVITY_VALUE = 100.0
+    DS_PAIRING_BONUS = 20.0
+    DS_COMMISSIONER_DAY_BONUS = 5.0
+    DS_BEFORE_SUPER_TROOP_BONUS = 5.0
+    DS_NODE_LIMIT = 20000
+    
+    # Limited-activity auction (_schedule_limited_activities_by_priority): value of a request
+    # (minus LA_RANK_STEP per preference rank) and re-bid rounds after commit rejections
+    LA_ACTIVITY_VALUE = 100
+    LA_RANK_STEP = 5
+    LA_AUCTION_ROUNDS = 3
+    
+    # Large neighbourhood search (_lns_repair): activities a repair never frees
+    LNS_FIXED_ACTIVITIES = frozenset({"Reflection", "Super Troop", "Delta", "Sailing"})
+    
+    # Ejection-chain Top 5 recovery (_guarantee_all_top5): entries one chain may displace in
+    # turn, search nodes per missing preference, the rank from which a displaced entry may be
+    # dropped instead of re-placed, and activities never displaced
+    TOP5_CHAIN_DEPTH = 3
+    TOP5_CHAIN_NODE_LIMIT = 2000
+    TOP5_CHAIN_DROPPABLE_RANK = 5
+    TOP5_CHAIN_PROTECTED = frozenset({"Reflection", "Super Troop", "Delta", "Sailing"})
+    
+    # Area cluster-day plan (_plan_area_cluster_days): areas planned up front and how deep
+    # into each troop's preferences a request counts as expected demand
+    CLUSTER_PLAN_AREAS = ("Tower", "Outdoor Skills", "Rifle Range", "Handicrafts", "Archery")
+    CLUSTER_PLAN_DEMAND_RANK = 15
+
+    # Staff per slot a placement may reach (_check_placement): the base limit, the limit for
+    # staff clustering activities and the clustering bonus on top of it
+    STAFF_LIMIT = 16
+    STAFF_CLUSTERING_LIMIT = 20
+    STAFF_CLUSTERING_BONUS = 4
+    
+    # Passes of the clustering swaps (_phase_swap_optimization, _comprehensive_smart_swaps) and
+    # of the improvement swaps (_neutral_beneficial_swaps, _preference_improvement_swaps)
+    SWAP_MAX_ITERATIONS = 3
+    IMPROVEMENT_SWAP_MAX_ITERATIONS = 5
+    
+    # Rolling-horizon day plan (_solve_day_exactly): value of placing a Top 10 request (minus
+    # its rank) and the branch-and-bound node limit of one day's subproblem
+    ROLLING_ACTIVITY_VALUE = 100.0
+    ROLLING_NODE_LIMIT = 200000
+
+    # Run-state saved with every pipeline checkpoint (besides the schedule entries)
+    CHECKPOINT_STATE = (
+        'troop_top5_scheduled', 'troop_top10_scheduled', 'troop_progress',
+        'troop_has_delta', 'troop_has_super_troop', 'delta_was_swapped',
+        'sailing_balls_fills', 'staff_load_by_slot', 'total_staff_by_slot',
+        'commissioner_activity_day_assignments', 'commissioner_busy_map', '_top5_to_recover',
+        'area_day_plan',
+    )
+    
     def __init__(self, troops: list[Troop], activities: list[Activity] = None, voyageur_mode: bool = False):
         # Initialize logging
         from .scheduler_logging import get_logger
@@ -319,6 +415,9 @@ class ConstrainedScheduler:
         # Cache for Friday slots (used by smart Reflection)
         self._friday_slots = None
         
+        # Planned open days per staffed area (area -> [Day]), set by _plan_area_cluster_days
+        self.area_day_plan = {}
+        
         # === GLOBAL STAFF LOAD TRACKING ===
         # Track staff loads per slot for each zone during scheduling
         # Format: {slot: {'Tower': count, 'Rifle': count, 'ODS': count, 'Beach': count, 'Handicrafts': count}}
@@ -355,9 +454,15 @@ class ConstrainedScheduler:
             'Delta': 'Commissioner',
         }
         
-        # Cache for troop day activity counts (invalidated when schedule changes)
+        # Cache for troop day activity counts: troop name -> (schedule state hash, counts)
         self._troop_day_counts_cache = {}
-        self._cache_valid = True
+        
+        # Placements _can_schedule rejected, keyed to the troop/day state that rejected them
+        self.nogoods = NogoodStore()
+        
+        # Disruption repair: slots that already ran and reduced capacities (see repair_disruption)
+        self.frozen_slots = frozenset()
+        self.capacity_overrides = []
         
         # === TOTAL STAFF PER SLOT TRACKING ===
         # Track total staff count per slot (across ALL zones) for balanced distribution
@@ -390,6 +495,30 @@ class ConstrainedScheduler:
                                 
         # Concurrent activities (can have multiple troops)
         self.CONCURRENT_ACTIVITIES = {'Reflection', 'Campsite Free Time'}
+        
+        # === ANYTIME SCHEDULING ===
+        # Wall-clock deadline for schedule_all and the watchdog of the phase currently running.
+        # Both are unbounded by default, so loops that tick the watchdog behave exactly as before.
+        self._deadline = Deadline(None)
+        self._watchdog = PhaseWatchdog.unbounded()
+        self.budget_report = BudgetReport(self._deadline)
+        self._profiler = None
+        # Summary of the last schedule_all(lns=...) search, None when LNS did not run
+        self.lns_report = None
+        # Summary of the last reschedule(), None when it did not run
+        self.reschedule_report = None
+        # Summary of the last repair_disruption(), None when it did not run
+        self.disruption_report = None
+        # Summary of the last schedule_all(initial=...) validation, None for cold runs
+        self.warm_start_report = None
+        # Top N -> PreferenceBound, computed on first use (depends on the troops only)
+        self.preference_bounds = {}
+        
+        # SKULL.json area_clustering_priority (None: each clustering pass uses its own default areas)
+        self.area_clustering_priority = config_loader.get_optimization_rules().get("area_clustering_priority")
+        
+        # Registered schedule_all phases (per instance, so phases can be added/removed for tuning)
+        self.pipeline = build_default_pipeline()
 
 
     
@@ -509,6 +638,10 @@ class ConstrainedScheduler:
         max_iterations = 3  # Prevent infinite loops
         
         for iteration in range(1, max_iterations + 1):
+            # The first pass is the required cleanup and always runs, even past the
+            # deadline; the deadline only cuts the follow-up passes.
+            if iteration > 1 and not self._watchdog_allows():
+                break
             print(f"    Iteration {iteration}...")
             changes_made = False
             entries_before = len(self.schedule.entries)
@@ -606,238 +739,496 @@ class ConstrainedScheduler:
         gaps = self._comprehensive_gap_check(phase_name)
         if gaps > 0:
             print(f"  [IMMEDIATE FIX] Running emergency gap fill after {phase_name}")
-            self._guarantee_no_gaps()  # Quick emergency fix
+            # Required step: under a deadline the watchdog falls back to the fast emergency fill
+            self._run_phase(f"Gap fix ({phase_name})", self._guarantee_no_gaps, optional=False)
     
-    def schedule_all(self) -> Schedule:
-        """Run the constrained scheduling algorithm - TOP 5 FIRST approach.
-        
-        Aligned with SCHEDULING_PROCESS.md Phase Groups A-D.
+    def _run_phase(self, phase_id: str, method, *args, optional: bool = True, **kwargs):
         """
-        self.logger.section("CONSTRAINED SCHEDULER - PHASE A: FOUNDATION")
-        
-        # =================================================================
-        # PHASE A: FOUNDATION & CLUSTERING
-        # =================================================================
-        
-        # Phase A.0: Friday Reflection (FIRST - Mandatory, Reserve slots early!)
-        # This prevents gap-fills from consuming Friday slots before Reflection runs
-        self.logger.subsection("A.0 Friday Reflection (reserve Friday slots)")
-        self._schedule_friday_reflection()
+        Run one schedule_all phase under its own watchdog.
         
-        # Phase A.0b: Super Troop (Mandatory for all troops)
-        # Reserve slots early to ensure every troop gets Super Troop before preferences fill slots
-        self.logger.subsection("A.0b Super Troop (mandatory)")
-        self._schedule_super_troop()
+        Required phases always run - together they produce a valid, gap-free schedule.
+        Optional (improvement) phases are skipped once the deadline budget, less the
+        reserve kept for the required cleanup tail, is spent. Every phase is recorded
+        in self.budget_report (ran / truncated / skipped, time, iterations, budget),
+        and executed phases are also measured by the PhaseProfiler when one is attached.
+        """
+        deadline = self._deadline
+        if optional and not deadline.has_budget_for(self.DEADLINE_RESERVE_FRACTION):
+            self.budget_report.record(phase_id, 'skipped', optional)
+            print(f"  [Budget] Skipping optional phase {phase_id} (deadline budget spent)")
+            return None
         
-        # Phase A.3: HC/DG Tuesday ONLY - Must run BEFORE 3hr/clustering (Spine order)
-        # Tuesday is their only allowed day - reserve before other phases consume it
-        self.logger.subsection("A.3 HC/DG Tuesday scheduling (Spine: early)")
-        self._schedule_hc_dg_tuesday()
+        max_seconds = None
+        if optional and deadline.bounded:
+            max_seconds = deadline.seconds * self.PHASE_BUDGET_FRACTION
+        watchdog = PhaseWatchdog(phase_id, deadline, max_seconds=max_seconds)
         
-        # Phase A.5: Thursday Sailing Reservation - Must run BEFORE 3hr/clustering (Spine order)
-        # Thursday has only 2 slots; Sailing needs both. Reserve early.
-        self.logger.subsection("A.5 Thursday Sailing Reservation (Spine: early)")
-        self._schedule_thursday_sailing_largest_troop()
+        profiler = self._profiler
+        if profiler is not None:
+            profiler.start(phase_id)
         
-        # Phase A.5b: Early Aqua Trampoline for Top 5 (Pattern: 67% of Top 5 misses are AT)
-        # Reserve beach slots (1 or 3) before preferences consume them. Large troops first.
-        self.logger.subsection("A.5b Early Aqua Trampoline for Top 5")
-        self._schedule_early_aqua_trampoline_top5()
+        previous_watchdog = self._watchdog
+        self._watchdog = watchdog
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            self._watchdog = previous_watchdog
+        
+        status = 'truncated' if watchdog.tripped else 'ran'
+        if profiler is not None:
+            profiler.stop(phase_id, status)
+        self.budget_report.record(phase_id, status, optional, watchdog)
+        return result
+    
+    def _watchdog_allows(self) -> bool:
+        """Tick the running phase's watchdog. Returns False (once logged) when its budget is spent."""
+        if self._watchdog.tick():
+            return True
+        if not self._watchdog.reported:
+            self._watchdog.reported = True
+            print(f"    [Watchdog] {self._watchdog.phase}: budget spent after {self._watchdog.iterations} iteration(s)")
+        return False
+    
+    def get_budget_report(self) -> dict:
+        """Per-phase budget report of the last schedule_all run."""
+        return self.budget_report.to_dict()
+    
+    def load_profile(self, profile):
+        """Apply a tuning profile: a TuningProfile, a name in config/profiles or a JSON path (core/scheduler/tuning.py)."""
+        from core.scheduler.tuning import TuningProfile
 
-        # Phase A.5c: Guarantee Top 1 Beach (prevent missed top-1 beach)
-        # Ensures top-1 beach activities are placed before other phases consume beach slots.
-        self.logger.subsection("A.5c Guarantee Top 1 Beach (AT/WP/GM/etc.)")
-        self._guarantee_top1_beach()
-        
-        # Phase A.1: 3-Hour Activities (Rocks - full day blocks)
-        self.logger.subsection("A.1 Scheduling 3-Hour Activities")
-        self._schedule_three_hour_activities()
-        
-        # Phase A.7: Delta + Sailing Pairing (reserve full day slots early)
-        self.logger.subsection("A.7 Delta + Sailing pairing (reserve day)")
-        self._schedule_delta_sailing_pairs()
-        
-        # Phase A.2: Top 10 2-Hour Activities (need consecutive slots)
-        self.logger.subsection("A.2 Top 10 2-Hour Activities (Priority)")
-        self._schedule_two_hour_activities_priority()
-        
-        # Phase A.4: Early Staff Area Clustering (Pre-schedule Tower, ODS, Rifle)
-        self.logger.subsection("A.4 Early staff area clustering")
-        self._early_staff_area_clustering()
-        
-        # Phase A.6: Priority Scheduling for Limited Activities
-        self.logger.subsection("A.6 Priority scheduling for limited activities (Global Rank 0-4)")
-        self._schedule_limited_activities_by_priority(max_rank=4)
-        
-        # Phase A.8: Sailing Pairs for Same-Day Bonus (Spine: AT sharing integration)
-        # Runs after Delta+Sailing pairing - pairs troops for overlapping Sailing sessions
-        self.logger.subsection("A.8 Sailing pairs for Same-Day bonus")
-        self._schedule_sailing_pairs()
-        
-        # GAP CHECK: After Phase A - Foundation & Clustering
-        self._immediate_gap_fix_if_needed("Phase A (Foundation & Clustering)")
+        TuningProfile.coerce(profile).apply(self)
 
-        # =================================================================
-        # PHASE B: CORE REQUESTS
-        # =================================================================
-        self.logger.section("PHASE B: CORE REQUESTS")
-        
-        # Phase B.1: Preference Rank 1-5 (Top 5 Guarantee)
-        # Force Top 1 first before ranks 2-5
-        self.logger.subsection("B.1 Scheduling Top 1 (FIRST PRIORITY)")
-        self._schedule_preferences_range(0, 1)
-        self.logger.subsection("B.1b Forcing Top 1 (make space before Top 2-5)")
-        self._force_top1_preferences()
-        self.logger.subsection("B.1c Scheduling Top 2-5")
-        self._schedule_preferences_range(1, 5)
-        
-        # Phase B.2: Guarantee 100% Top 5
-        self.logger.subsection("B.2 Guaranteeing 100% Top 5 satisfaction")
-        self._guarantee_all_top5()
-        
-        # Phase B.3: Mandatory Enforcement
-        self.logger.subsection("B.3 Mandatory Top 5 enforcement")
-        self._enforce_mandatory_top5()
-        
-        # Phase B.4: Friday Reflection (MOVED to A.0 - runs first to reserve slots)
-        # self._schedule_friday_reflection()  # Now in Phase A.0
-        
-        # Phase B.6: Delta (Requested only, NO commissioner forcing)
-        self._schedule_delta_early()
-        
-        # Phase B.6: Super Troop (MOVED to A.0b - runs first to reserve slots)
-        # self._schedule_super_troop()  # Now in Phase A.0b
-        
-        # Phase B.7: Build commissioner busy map (informational)
-        self._build_commissioner_busy_map()
-        
-        # Phase B.8: Early Sailing for Top 10 troops (pair with Delta if possible)
-        self.logger.subsection("B.8 Early Sailing for Top 10 troops")
-        self._schedule_early_sailing_top10()
-        
-        # Phase B.9: Enforce Delta + Sailing same-day pairing
-        self.logger.subsection("B.9 Enforce Delta + Sailing same-day pairing")
-        self._enforce_delta_sailing_pairing()
-        
-        # Phase B.10: Consolidate Sailing to cluster 2 per day (AGGRESSIVE)
-        self.logger.subsection("B.10 Consolidate Sailing same-day clustering")
-        self._consolidate_sailing_same_day()
+    def schedule_all(self, deadline=None, profiler=None, checkpoints=None,
+                     resume_from=None, stop_after=None, lns=None, initial=None) -> Schedule:
+        """Run the constrained scheduling algorithm - TOP 5 FIRST approach.
         
-        # GAP CHECK: After Phase B - Core Requests
-        self._immediate_gap_fix_if_needed("Phase B (Core Requests)")
+        Aligned with SCHEDULING_PROCESS.md Phase Groups A-D. The phase order is the
+        registered pipeline in self.pipeline (see core/scheduler/pipeline.py).
         
-        # Phase B.11: Early Aqua Trampoline sharing (pair Top 5 AT wants before slots fill)
-        self.logger.subsection("B.11 Early Aqua Trampoline sharing (Top 5)")
-        self._aggressive_aqua_trampoline_sharing()
+        Args:
+            deadline: Optional wall-clock budget in seconds (or a Deadline). Required
+                phases always run so the result is valid and gap-free; optional
+                improvement phases only run while budget remains. None = no limit.
+            profiler: Optional PhaseProfiler; records time, _can_schedule calls, entry
+                churn and violation/score deltas for every phase of this run.
+            checkpoints: Optional CheckpointStore (or directory); a checkpoint of the
+                schedule and run-state counters is saved after every phase.
+            resume_from: Phase id (see self.pipeline.ids()) to start at, restoring the
+                checkpoint saved after the phase before it.
+            stop_after: Phase id to stop after (inclusive); None runs to the end.
+            lns: Optional LargeNeighbourhoodSearch run on the finished schedule (not
+                with stop_after); its summary is kept in self.lns_report.
+            initial: Optional warm start - a Schedule or a saved schedule JSON file
+                (io_handler.save_schedule_to_json format). Entries that still pass the
+                placement checks are kept, and build_warm_pipeline() only re-plans the
+                rest before Phase D polishes the week. Not with resume_from.
+        """
+        self._deadline = Deadline.coerce(deadline)
+        self.budget_report = BudgetReport(self._deadline)
+        self._profiler = profiler
+        if profiler is not None:
+            profiler.attach(self)
         
-        # =================================================================
-        # PHASE C: REMAINING & OPTIMIZATION
-        # =================================================================
-        self.logger.section("PHASE C: REMAINING & OPTIMIZATION")
+        try:
+            checkpoints = CheckpointStore.coerce(checkpoints)
+            pipeline = self.pipeline
+            if initial is not None:
+                if resume_from is not None:
+                    raise ValueError("initial and resume_from cannot be combined")
+                self._warm_start(initial)
+                pipeline = build_warm_pipeline(self.pipeline)
+            if resume_from is not None:
+                previous = self.pipeline.previous(resume_from)
+                if previous is not None:
+                    if checkpoints is None:
+                        raise ValueError(f"resume_from='{resume_from}' needs the checkpoints of an earlier run")
+                    restore_checkpoint(self, checkpoints.load(previous))
+                    print(f"  [Pipeline] Resuming at {resume_from} from checkpoint after {previous}")
+        
+            pipeline.run(self, start=resume_from, stop=stop_after, checkpoints=checkpoints)
+        
+            if lns is not None and stop_after is None and not self._deadline.expired():
+                self.logger.section("LARGE NEIGHBOURHOOD SEARCH")
+                self.lns_report = lns.run(self, deadline=self._deadline)
+        
+            if self._deadline.bounded:
+                self.budget_report.print_summary()
+        finally:
+            if profiler is not None:
+                profiler.detach()
+                self._profiler = None
         
-        # Phase C.1: Day Specific requests
-        self._schedule_day_requests()
-        # Limited activities moved to A.6
+        return self.schedule
 
+    def reschedule(self, previous: Schedule, changed=None, deadline=None, lns=None) -> Schedule:
+        """Repair a finished schedule after troops changed instead of scheduling from scratch.
+
+        Entries of unchanged troops are frozen as they are in previous. Changed
+        troops are released (all entries but Reflection, which only depends on the
+        campsite) and re-placed by the placement phases of build_repair_pipeline()
+        with self.troops narrowed to them. Frozen entries are not re-checked: the
+        released troops are placed under the normal checks against them, so new
+        conflicts can only involve released cells. The required finish phases
+        (build_finish_pipeline()) then run for every troop. Only recovery moves
+        (cleanup, ejection chains, gap fills) may still shift another troop's entry.
+
+        Args:
+            previous: The schedule to repair (its entries carry the old troops).
+            changed: Names of the troops to release; None compares self.troops
+                with the troops of previous (new troops and any changed field).
+            deadline: Optional wall-clock budget in seconds (or a Deadline), as for
+                schedule_all.
+            lns: Optional LargeNeighbourhoodSearch; without its own neighbourhoods it
+                only repairs the released troops ('troop' neighbourhoods).
+
+        A summary (released troops, frozen entries kept, unchanged troops' entries
+        that moved) is kept in self.reschedule_report.
+        """
+        from core.scheduler.lns import LargeNeighbourhoodSearch, Neighbourhood
+
+        self._deadline = Deadline.coerce(deadline)
+        self.budget_report = BudgetReport(self._deadline)
+
+        old_troops = {e.troop.name: e.troop for e in previous.entries}
+        if changed is None:
+            changed = {t.name for t in self.troops if old_troops.get(t.name) != t}
+        released = [t for t in self.troops if t.name in set(changed)]
+        released_names = {t.name for t in released}
+        by_name = {t.name: t for t in self.troops}
+
+        self.logger.section("INCREMENTAL RESCHEDULE")
+        print(f"  Releasing {len(released)} troop(s): {', '.join(sorted(released_names)) or 'none'}")
+
+        # Freeze: the kept entries are copied as they are (see _load_entries)
+        self.schedule = Schedule()
+        frozen = []
+        for entry in previous.entries:
+            troop = by_name.get(entry.troop.name)
+            if troop is None:
+                continue
+            if troop.name in released_names and not (
+                    entry.activity.name == "Reflection" and old_troops[troop.name].campsite == troop.campsite):
+                continue
+            frozen.append(ScheduleEntry(entry.time_slot, entry.activity, troop))
+        kept = self._load_entries(frozen)
+
+        for troop in released:
+            if not any(e.troop.name == troop.name and e.activity.name == "Reflection"
+                       for e in self.schedule.entries):
+                self._place_released_reflection(troop)
+
+        # Re-place only the released troops with the normal placement phases
+        all_troops = self.troops
+        self.troops = released
+        try:
+            build_repair_pipeline(self.pipeline).run(self)
+        finally:
+            self.troops = all_troops
+            # Bounds computed while narrowed cover the released troops only
+            self.preference_bounds = {}
+
+        self._run_phase("B.7", self._build_commissioner_busy_map, optional=False)
+        self._immediate_gap_fix_if_needed("Incremental reschedule")
+
+        if lns is not None and released and not self._deadline.expired():
+            if lns.neighbourhoods is None:
+                lns = LargeNeighbourhoodSearch(lns.evaluate_fn, lns.sweeps, lns.jobs,
+                                               [Neighbourhood('troop', t.name) for t in released])
+            self.logger.section("LARGE NEIGHBOURHOOD SEARCH")
+            self.lns_report = lns.run(self, deadline=self._deadline)
+
+        # The required cleanup and validation every other entry point ends with
+        build_finish_pipeline(self.pipeline).run(self)
+
+        def cells(schedule):
+            return {(e.troop.name, e.activity.name, e.time_slot.day, e.time_slot.slot_number)
+                    for e in schedule.entries if e.troop.name in by_name and e.troop.name not in released_names}
+        moved = len(cells(previous) - cells(self.schedule))
+        self.reschedule_report = {
+            'released': sorted(released_names),
+            'kept': kept,
+            'moved': moved,
+        }
+        print(f"  [Reschedule] kept {kept} entries, {moved} entries of unchanged troops moved")
+
+        if self._deadline.bounded:
+            self.budget_report.print_summary()
+        return self.schedule
+
+    def _load_entries(self, entries) -> int:
+        """
+        Put entries on the empty schedule as they are, with staff and progress bookkeeping.
         
-        # Phase C.2: Staff Optimization (Consecutive)
-        self.logger.subsection("C.2 Staff Optimization (consecutive activities)")
-        self._schedule_staff_optimized_areas()
-        
-        # Phase C.3: Balance Staff Loads
-        self.logger.subsection("C.3 Balancing staff workload")
-        # Skip - this is now handled in the enhanced staff variance optimization
-        
-        # Phase C.4: Remaining Preferences (Top 6-20)
-        self.logger.subsection("C.4 Scheduling Remaining Preferences (Top 6-20)")
-        self._schedule_preferences_range(5, 20)
-        
-        # Phase C.4.5: Guarantee Minimum Top 10 (2-3 per troop)
-        self.logger.subsection("C.4.5 Guaranteeing Minimum Top 10 (2-3 per troop)")
-        self._guarantee_minimum_top10()
-        
-        # Phase C.5: Guarantee Top 10
-        self.logger.subsection("C.5 Guaranteeing Top 10 with exceptions")
-        self._guarantee_top10_with_exceptions()
-        
-        # Phase C.6: Fill Slot Logic
-        self.logger.subsection("C.6 Filling remaining slots")
-        self._fill_all_remaining()
-        self.logger.subsection("Scheduling balls activities during sailing")
-        self._schedule_sailing_balls_fills()
-        
-        # GAP CHECK: After Phase C.6 - Fill Slot Logic
-        self._immediate_gap_fix_if_needed("Phase C.6 (Fill Slot Logic)")
-        
-        # Phase C.7: Aggressive Aqua Trampoline Sharing
-        self.logger.subsection("C.7 Aggressively pairing Aqua Trampoline sharing")
-        self._aggressive_aqua_trampoline_sharing()
-        
-        # GAP CHECK: After Phase C.7 - Aqua Trampoline Sharing
-        self._immediate_gap_fix_if_needed("Phase C.7 (Aqua Trampoline Sharing)")
-        
-        # Phase C.8: Removed - Early clustering was causing constraint violations
-        # The existing D.3 clustering pass is sufficient
-        
-        # =================================================================
-        # PHASE D: FINAL POLISH
-        # =================================================================
-        self.logger.section("PHASE D: FINAL POLISH & VERIFICATION")
-        
-        # Phase D.1: Optimizations (Consolidated)
-        self.logger.subsection("D.1 Optimizing Friday Reflection slots")
-        self._optimize_friday_reflections()
-        
-        self.logger.subsection("D.2 Comprehensive clustering & smart swaps")
-        self._comprehensive_clustering_optimization()
-        
-        # GAP CHECK: After D.2 - Comprehensive Clustering
-        self._immediate_gap_fix_if_needed("Phase D.2 (Comprehensive Clustering)")
-        
-        self.logger.subsection("D.3 Early forced clustering consolidation")
-        self._force_clustering_consolidation()
-        
-        # GAP CHECK: After D.3 - Forced Clustering
-        self._immediate_gap_fix_if_needed("Phase D.3 (Forced Clustering)")
-        
-        self.logger.subsection("D.4 Friday Super Troop optimization")
-        self._optimize_friday_super_troop()
-        
-        self.logger.subsection("D.5 Flexible Reflection slot optimization")
-        self._optimize_flexible_reflections()
-        
-        self.logger.subsection("D.6 Commissioner load balancing")
-        self._optimize_commissioner_balance()
-        
-        self.logger.subsection("D.7 Setup Efficiency & Activity Clustering")
-        self._optimize_setup_efficiency()
-        self._optimize_activity_clustering()
-        
-        # GAP CHECK: After D.7 - Activity Clustering
-        self._immediate_gap_fix_if_needed("Phase D.7 (Activity Clustering)")
-        
-        self.logger.subsection("D.8 Outlier Activity Optimization")
-        self._optimize_outlier_activities()
-        self._optimize_commissioner_day_ownership()
-        
-        self.logger.subsection("D.9 Post-Fill Cluster Gap Optimization")
-        self._optimize_cluster_gaps_post_fill()
-        
-        # Phase D.8: Recovery & Gap Filling
-        self.logger.subsection("D.8 Top 10 Recovery & Gap Filling")
-        self._recover_top10_from_fills()
-        # self._fill_gaps_with_valuable_moves() # DISABLED: Causes multi-slot corruption (found 1 slot expected N)
-        
-        # Phase D.9: Comprehensive Cleanup
-        self.logger.subsection("D.9 Comprehensive final cleanup")
-        self._comprehensive_final_cleanup()
-        
-        # GAP CHECK: After D.9 - Final Cleanup
-        self._immediate_gap_fix_if_needed("Phase D.9 (Final Cleanup)")
+        Continuation entries are copied too: a finished run leaves states
+        Schedule.add_entry would refuse, so entries are not re-added. Returns
+        the number of entries loaded.
+        """
+        for entry in entries:
+            self.schedule.entries.append(entry)
+            self._update_staff_load(entry.time_slot, entry.activity.name, delta=1)
+            if entry.activity.name in self.ACTIVITY_STAFF_COUNT:
+                self.total_staff_by_slot[entry.time_slot] += self.ACTIVITY_STAFF_COUNT[entry.activity.name]
+        for troop in self.troops:
+            for name in {e.activity.name for e in self.schedule.entries if e.troop.name == troop.name}:
+                self._update_progress(troop, name)
+                if name == "Delta":
+                    self.troop_has_delta[troop.name] = True
+                elif name == "Super Troop":
+                    self.troop_has_super_troop[troop.name] = True
+        return len(entries)
+
+    def _warm_start(self, initial):
+        """
+        Load the still-valid entries of initial (Schedule or saved JSON path).
         
-        # =================================================================
-        # ENHANCED POST-PROCESSING: CRITICAL CONSTRAINT FIXES
-        # =================================================================
+        Each activity (all slots it covers) is checked with the relaxed placement
+        check against the rest of the schedule; concurrent activities only need
+        their slot count to match. Entries of unknown troops or activities, or
+        whose span no longer matches the troop's size, are dropped too.
+        """
+        from core.io_handler import load_schedule_from_json
+
+        if not isinstance(initial, Schedule):
+            initial = load_schedule_from_json(initial, self.troops, self.activities)
+        by_name = {t.name: t for t in self.troops}
+        entries = [ScheduleEntry(e.time_slot, e.activity, by_name[e.troop.name])
+                   for e in initial.entries if e.troop.name in by_name]
+
+        groups = defaultdict(list)
+        for entry in entries:
+            groups[(entry.troop.name, entry.activity.name, entry.time_slot.day)].append(entry)
+        self.schedule = Schedule(entries=list(entries))
+        kept = []
+        for (_, name, day), group in groups.items():
+            group.sort(key=lambda e: e.time_slot.slot_number)
+            first, troop, activity = group[0], group[0].troop, group[0].activity
+            numbers = [e.time_slot.slot_number for e in group]
+            span = int(self.schedule._get_effective_slots(activity, troop) + 0.5)
+            valid = numbers == list(range(numbers[0], numbers[0] + span))
+            if valid and name not in self.CONCURRENT_ACTIVITIES:
+                own = {id(e) for e in group}
+                self.schedule.entries = [e for e in entries if id(e) not in own]
+                valid = self._check_placement(troop, activity, first.time_slot, day, relax_constraints=True,
+                                              allow_top1_beach_slot2=True)
+            if valid:
+                kept += group
+
+        self.schedule = Schedule()
+        self._load_entries(kept)
+        self.warm_start_report = {'kept': len(kept), 'released': len(initial.entries) - len(kept)}
+        print(f"  [Warm start] kept {len(kept)} of {len(initial.entries)} entries")
+        for troop in self.troops:
+            if not any(e.troop.name == troop.name and e.activity.name == "Reflection" for e in kept):
+                self._place_released_reflection(troop)
+
+    def _place_released_reflection(self, troop):
+        """Reflection for a released troop in its nearest campsite neighbour's Friday slot (as A.0 groups them)."""
+        reflection = get_activity_by_name("Reflection")
+        friday_slots = [s for s in self.time_slots if s.day == Day.FRIDAY]
+
+        def position(name):
+            base_name = name.replace("-A", "").replace("-B", "")
+            if base_name in self.CAMPSITE_ORDER:
+                return self.CAMPSITE_ORDER.index(base_name)
+            return len(self.CAMPSITE_ORDER)
+
+        neighbours = sorted((abs(position(e.troop.name) - position(troop.name)), e.time_slot.slot_number)
+                            for e in self.schedule.entries
+                            if e.activity.name == "Reflection" and e.troop.name != troop.name)
+        by_number = {s.slot_number: s for s in friday_slots}
+        for slot in [by_number[number] for _, number in neighbours] + friday_slots:
+            if self.schedule.is_troop_free(slot, troop):
+                self._add_to_schedule(slot, reflection, troop)
+                print(f"  {troop.name}: Reflection -> {slot} (nearest campsite)")
+                return True
+        print(f"  WARNING: Could not schedule Reflection for {troop.name} (All Friday slots busy?)")
+        return False
+
+    def repair_disruption(self, previous: Schedule, start, overrides=(), deadline=None) -> Schedule:
+        """Re-plan the rest of the week from `start` after a closure (see core/scheduler/disruption.py).
+
+        Args:
+            previous: The schedule being run (its entries are matched to self.troops by name).
+            start: First TimeSlot to re-plan, or an explicit collection of frozen TimeSlots.
+            overrides: CapacityOverride list (disruption.capacity_override builds them).
+            deadline: Optional wall-clock budget in seconds (or a Deadline); the fill and
+                gap check always run, Top 10 re-placement only while budget remains.
+
+        A summary (released entries, re-placed requests, entries that changed, slots
+        still over an override after the forced gap fill) is kept in self.disruption_report.
+        """
+        self._deadline = Deadline.coerce(deadline)
+        self.budget_report = BudgetReport(self._deadline)
+        if isinstance(start, TimeSlot):
+            self.frozen_slots = slots_before(self.time_slots, start)
+        else:
+            self.frozen_slots = frozenset(start)
+        self.capacity_overrides = list(overrides)
+
+        self.logger.section("DISRUPTION REPAIR")
+        print(f"  {len(self.frozen_slots)} slots frozen, {len(self.capacity_overrides)} capacity override(s)")
+
+        by_name = {t.name: t for t in self.troops}
+        self.schedule = Schedule()
+        self._load_entries([ScheduleEntry(e.time_slot, e.activity, by_name[e.troop.name])
+                            for e in previous.entries if e.troop.name in by_name])
+
+        # An activity under way in a frozen slot runs to its end
+        under_way = {(e.troop.name, e.activity.name, e.time_slot.day)
+                     for e in self.schedule.entries if e.time_slot in self.frozen_slots}
+        released = []
+        for override in self.capacity_overrides:
+            for slot in self.time_slots:
+                if slot in self.frozen_slots or (slot.day.name, slot.slot_number) not in override.slots:
+                    continue
+                # Least-wanted first, so Top 5 entries keep the reduced capacity
+                candidates = sorted((e for e in self.schedule.entries
+                                     if e.time_slot == slot and e.activity.name in override.activities
+                                     and (e.troop.name, e.activity.name, slot.day) not in under_way),
+                                    key=lambda e: (-e.troop.get_priority(e.activity.name), e.troop.name))
+                while candidates and self._override_usage(override, slot) > override.capacity:
+                    entry = candidates.pop(0)
+                    released += self._release_activity(entry.troop, entry.activity.name, slot.day)
+        if released:
+            print(f"  Released {len(released)} entries over the reduced capacities")
+
+        # Re-place released Top 10 requests in the remaining window, best rank first
+        requests = sorted({(e.troop.get_priority(e.activity.name), e.troop.name, e.activity.name)
+                           for e in released})
+        replaced = self._run_phase("Disruption re-placement", self._replace_released_requests,
+                                   [r for r in requests if r[0] < 10], by_name) or 0
+
+        self._run_phase("Disruption fill", self._flow_fill_empty_cells, optional=False)
+        for entry in released:
+            self._fill_vacated_slot(entry.troop, entry.time_slot)
+        self._immediate_gap_fix_if_needed("Disruption repair")
+
+        def cells(schedule):
+            return {(e.troop.name, e.activity.name, e.time_slot.day, e.time_slot.slot_number)
+                    for e in schedule.entries if e.troop.name in by_name}
+        over_capacity = sum(1 for override in self.capacity_overrides for slot in self.time_slots
+                            if slot not in self.frozen_slots
+                            and (slot.day.name, slot.slot_number) in override.slots
+                            and self._override_usage(override, slot) > override.capacity)
+        self.disruption_report = {
+            'released': len(released),
+            'replaced': replaced,
+            'changed': len(cells(previous) ^ cells(self.schedule)),
+            'over_capacity': over_capacity,
+        }
+        print(f"  [Disruption] released {len(released)} entries, re-placed {replaced} requests, "
+              f"{self.disruption_report['changed']} cells changed")
+        if over_capacity:
+            print(f"  WARNING: {over_capacity} slot(s) still over a reduced capacity (forced gap fill)")
+
+        if self._deadline.bounded:
+            self.budget_report.print_summary()
+        return self.schedule
+
+    def _replace_released_requests(self, requests, by_name):
+        """Put released (rank, troop name, activity name) requests back after the frozen slots.
+
+        A free cell is used if the troop has one; Top 5 requests may also displace
+        entries through an ejection chain. Returns the number re-placed.
+        """
+        replaced = 0
+        for rank, troop_name, activity_name in requests:
+            troop, activity = by_name[troop_name], get_activity_by_name(activity_name)
+            if activity is None or self._troop_has_activity(troop, activity):
+                continue
+            for slot in self.time_slots:
+                if self._can_schedule(troop, activity, slot, slot.day):
+                    self._add_to_schedule(slot, activity, troop)
+                    self._update_progress(troop, activity_name)
+                    replaced += 1
+                    break
+            else:
+                if rank < 5 and self._place_by_ejection_chain(troop, activity, rank):
+                    replaced += 1
+        return replaced
+
+    def _fits_disruption(self, troop, activity, slot, slots_needed) -> bool:
+        """False if the placement would use a frozen slot or go over a CapacityOverride."""
+        start = self.time_slots.index(slot)
+        covered = [s for s in self.time_slots[start:start + slots_needed] if s.day == slot.day]
+        for covered_slot in covered:
+            if covered_slot in self.frozen_slots:
+                return False
+            for override in self.capacity_overrides:
+                if not override.covers(activity.name, covered_slot):
+                    continue
+                if override.unit == "staff":
+                    added = self._get_activity_staff_count(activity.name)
+                elif override.unit == "people":
+                    added = troop.size
+                else:
+                    added = 1
+                if self._override_usage(override, covered_slot) + added > override.capacity:
+                    return False
+        return True
+
+    def _override_usage(self, override, slot) -> int:
+        """Troops (staff, people) of the override's activities in slot."""
+        entries = [e for e in self.schedule.entries
+                   if e.time_slot == slot and e.activity.name in override.activities]
+        if override.unit == "staff":
+            return sum(self._get_activity_staff_count(e.activity.name) for e in entries)
+        if override.unit == "people":
+            return sum(e.troop.size for e in entries)
+        return len(entries)
+
+    def _release_activity(self, troop, activity_name, day):
+        """Remove troop's activity_name on day (every slot it covers) with staff bookkeeping."""
+        released = [e for e in self.schedule.entries
+                    if e.troop.name == troop.name and e.activity.name == activity_name and e.time_slot.day == day]
+        for entry in released:
+            self.schedule.entries.remove(entry)
+            self._update_staff_load(entry.time_slot, activity_name, delta=-1)
+            if activity_name in self.ACTIVITY_STAFF_COUNT:
+                self.total_staff_by_slot[entry.time_slot] -= self.ACTIVITY_STAFF_COUNT[activity_name]
+        return released
+
+    def _lns_repair(self, kind, key):
+        """
+        Free one LNS neighbourhood and re-fill its cells (see core/scheduler/lns.py).
+        
+        kind/key select the entries: 'day' + Day name, 'commissioner' + name,
+        'area' + EXCLUSIVE_AREAS name, or 'troop' + troop name. LNS_FIXED_ACTIVITIES
+        and multi-slot entries stay put. The freed cells are re-filled by the
+        min-cost-flow fill, then _fill_vacated_slot, then _guarantee_no_gaps.
+        Returns entries freed.
+        """
+        if kind == 'day':
+            selected = lambda e: e.time_slot.day.name == key
+        elif kind == 'commissioner':
+            selected = lambda e: self.troop_commissioner.get(e.troop.name) == key
+        elif kind == 'area':
+            area_activities = EXCLUSIVE_AREAS.get(key, ())
+            selected = lambda e: e.activity.name in area_activities
+        elif kind == 'troop':
+            selected = lambda e: e.troop.name == key
+        else:
+            raise ValueError(f"Unknown LNS neighbourhood kind '{kind}'")
+        
+        freed = [e for e in self.schedule.entries
+                 if selected(e) and e.activity.name not in self.LNS_FIXED_ACTIVITIES
+                 and self.schedule._get_effective_slots(e.activity, e.troop) <= 1]
+        for entry in freed:
+            self.schedule.entries.remove(entry)
+            self._update_staff_load(entry.time_slot, entry.activity.name, delta=-1)
+            if entry.activity.name in self.ACTIVITY_STAFF_COUNT:
+                self.total_staff_by_slot[entry.time_slot] -= self.ACTIVITY_STAFF_COUNT[entry.activity.name]
+        
+        self._flow_fill_empty_cells()
+        for entry in freed:
+            self._fill_vacated_slot(entry.troop, entry.time_slot)
+        if any(self.schedule.is_troop_free(e.time_slot, e.troop) for e in freed):
+            self._guarantee_no_gaps()
+        return len(freed)
+    
+    def _enhanced_post_processing(self):
+        """Optional post-processing via external enhanced fixer modules (skipped when not installed)."""
         self.logger.section("ENHANCED POST-PROCESSING: CRITICAL CONSTRAINT FIXES")
         
         # Import enhanced fixers
@@ -960,19 +1351,7 @@ class ConstrainedScheduler:
         except ImportError as e:
             print(f"  [WARN] Enhanced fixers not available: {e}")
             print("  Continuing with standard optimization...")
-        
-        # =================================================================
-        # FINAL VERIFICATION
-        # =================================================================
-        self.logger.section("FINAL VERIFICATION")
-        
-        # Final comprehensive validation
-        self._final_comprehensive_validation()
-
-        # Final exclusivity sanitization after all post-processing
-        self._sanitize_exclusivity()
-        
-        return self.schedule
+    
     
     def _final_comprehensive_validation(self):
         """Perform final comprehensive validation of the schedule."""
@@ -1821,472 +2200,47 @@ class ConstrainedScheduler:
         else:
             print("  [Top1 Force] All Top 1 preferences placed")
     
-    def _schedule_early_sailing_top10(self):
+    def _schedule_hc_dg_tuesday(self):
         """
-        Schedule Sailing early for troops that have it in their Top 10.
+        Schedule History Center and Disc Golf for the top 3 troops that want them.
         
-        Sailing requires 1.5 consecutive slots - this must be done early
-        before the schedule fills up and no consecutive slots remain.
+        NEW RULE: If a troop wants BOTH, they MUST be scheduled back-to-back.
         """
         from .models import Day
         
-        print("\n--- Early Sailing for Top 10 Troops ---")
-        
-        sailing = get_activity_by_name("Sailing")
-        if not sailing:
-            print("  Sailing activity not found!")
-            return
-        
-        # Find troops with Sailing in Top 10 that don't have it yet
-        troops_need_sailing = []
-        for troop in self.troops:
-            if "Sailing" in troop.preferences[:10]:
-                if not self._troop_has_activity(troop, sailing):
-                    rank = troop.preferences.index("Sailing") + 1
-                    scouts = troop.scouts if hasattr(troop, 'scouts') else 0
-                    troops_need_sailing.append((troop, rank, scouts))
+        print("\n--- Early HC/DG Scheduling (Tuesday Only, Top 3) ---")
         
-        if not troops_need_sailing:
-            print("  No troops need Sailing in Top 10")
-            return
+        hc = get_activity_by_name("History Center")
+        dg = get_activity_by_name("Disc Golf")
         
-        # Sort by preference rank (lower=better), then by size
-        troops_need_sailing.sort(key=lambda x: (x[1], -x[2]))
+        tuesday_slots = [s for s in self.time_slots if s.day == Day.TUESDAY]
         
-        print(f"  Troops needing Sailing (Top 10):")
-        for troop, rank, scouts in troops_need_sailing:
-            print(f"    {troop.name}: #{rank}, {scouts} scouts")
+        # 1. Handle History Center (and Pairs)
+        print("  Processing History Center requests...")
+        troops_wanting_hc = []
+        for troop in self.troops:
+            if "History Center" in troop.preferences:
+                rank = troop.preferences.index("History Center") + 1
+                troops_wanting_hc.append((troop, rank))
         
-        scheduled_count = 0
+        troops_wanting_hc.sort(key=lambda x: x[1])
         
-        for troop, rank, scouts in troops_need_sailing:
-            # Preferred days for sailing: Mon, Tue, Wed (not Thu - reserved for largest, not Fri - Reflection)
-            preferred_days = [Day.MONDAY, Day.TUESDAY, Day.WEDNESDAY]
-            
-            # AGGRESSIVELY prefer days that already have exactly 1 Sailing (to get to 2 per day)
-            # This maximizes the "2 sails per day" pattern for scoring
-            sailing_day_counts = {}
-            for entry in self.schedule.entries:
-                if entry.activity.name != "Sailing":
-                    continue
-                sailing_day_counts[entry.time_slot.day] = sailing_day_counts.get(entry.time_slot.day, 0) + 1
-            
-            # Sort: days with exactly 1 sail first (to get to 2), then days with 0, then days with 2 (full)
-            def day_priority(day):
-                count = sailing_day_counts.get(day, 0)
-                if count == 1:
-                    return 0  # Highest priority - can get to 2
-                elif count == 0:
-                    return 1  # Medium priority - can start a new pair
-                else:
-                    return 2  # Lowest priority - already at max (2) or over
-            preferred_days.sort(key=day_priority)
+        for troop, rank in troops_wanting_hc[:3]:
+            if self._troop_has_activity(troop, hc):
+                continue
             
-            # Pair with Delta if already scheduled
-            delta_day = None
-            for entry in self.schedule.entries:
-                if entry.troop == troop and entry.activity.name == "Delta":
-                    delta_day = entry.time_slot.day
-                    break
-            if delta_day and delta_day != Day.FRIDAY:
-                preferred_days = [delta_day] + [d for d in preferred_days if d != delta_day]
-                print(f"  [Delta Pairing] {troop.name}: preferring Sailing on {delta_day.value}")
+            # Check for Pairing Requirement
+            wants_dg = "Disc Golf" in troop.preferences
+            dg_scheduled = False
             
-            # Try each preferred day
-            for day in preferred_days:
-                # Sailing needs slots 1-2 (consecutive)
-                slot1 = TimeSlot(day, 1)
-                slot2 = TimeSlot(day, 2)
+            if wants_dg:
+                print(f"    {troop.name} wants BOTH HC and DG - attempting back-to-back...")
+                # Try consecutive slots (1-2 or 2-3)
+                # Note: HC/DG allowed neighbors logic updated in _can_schedule
                 
-                # Check both slots are free
-                if not self.schedule.is_troop_free(slot1, troop):
-                    continue
-                if not self.schedule.is_troop_free(slot2, troop):
-                    continue
-                
-                # Check sailing constraints
-                if self._can_schedule(troop, sailing, slot1, day):
-                    self.schedule.add_entry(slot1, sailing, troop)
-                    self._update_progress(troop, "Sailing")
-                    scheduled_count += 1
-                    print(f"  [SUCCESS] {troop.name}: Sailing at {day.value[:3]}-1 (Top {rank})")
-                    break
-            else:
-                # Try slots 2-3 as fallback
-                for day in preferred_days:
-                    slot2 = TimeSlot(day, 2)
-                    slot3 = TimeSlot(day, 3)
-                    
-                    if not self.schedule.is_troop_free(slot2, troop):
-                        continue
-                    if not self.schedule.is_troop_free(slot3, troop):
-                        continue
-                    
-                    if self._can_schedule(troop, sailing, slot2, day):
-                        self.schedule.add_entry(slot2, sailing, troop)
-                        self._update_progress(troop, "Sailing")
-                        scheduled_count += 1
-                        print(f"  [SUCCESS] {troop.name}: Sailing at {day.value[:3]}-2 (Top {rank})")
-                        break
-                else:
-                    print(f"  [FAILED] {troop.name}: No consecutive slots available")
-        
-        print(f"  Scheduled Sailing for {scheduled_count}/{len(troops_need_sailing)} troops")
-    
-    def _enforce_delta_sailing_pairing(self):
-        """Force Delta + Sailing to occur on the same day when both are scheduled.
-        
-        AGGRESSIVE: For troops with BOTH Delta and Sailing, ensures Delta is in slot 1 or 3
-        (never 2), and Sailing takes the other two slots on the same day.
-        
-        NOTE: Deltas NOT paired with Sailing can be in slot 2 to reduce gaps and excess days.
-        This restriction ONLY applies to Deltas that are paired with Sailing.
-        
-        Will move activities to achieve this pairing, respecting spine constraints.
-        """
-        from .models import TimeSlot, Day
-        
-        print("\n--- Enforcing Delta + Sailing Same-Day Pairing ---")
-        fixes = 0
-        protected = {"Reflection", "Super Troop"}
-        
-        def is_protected(occupant_entry) -> bool:
-            """Never displace Reflection, Super Troop, or any Top 5 preference."""
-            if occupant_entry.activity.name in protected:
-                return True
-            troop = occupant_entry.troop
-            rank = troop.get_priority(occupant_entry.activity.name) if hasattr(troop, 'get_priority') else None
-            return rank is not None and rank < 5
-        
-        for troop in self.troops:
-            # Only enforce slot 1/3 restriction for troops that have BOTH Delta and Sailing
-            # Deltas NOT paired with Sailing can be in slot 2 to reduce gaps and excess days
-            if "Delta" not in troop.preferences or "Sailing" not in troop.preferences:
-                continue
-            
-            top5 = set(troop.preferences[:5])
-            sailing_entries = [e for e in self.schedule.entries if e.troop == troop and e.activity.name == "Sailing"]
-            delta_entry = next((e for e in self.schedule.entries if e.troop == troop and e.activity.name == "Delta"), None)
-            if not sailing_entries or not delta_entry:
-                continue  # Skip if either is not scheduled yet
-            
-            def move_entry_to_slot(entry, target_slot):
-                """Move a single-slot entry to target_slot, swapping out any non-protected occupant."""
-                occupant = next((e for e in self.schedule.entries
-                                 if e.troop == troop and e.time_slot == target_slot), None)
-                if occupant and is_protected(occupant):
-                    return False
-                removed = []
-                if occupant:
-                    self.schedule.entries.remove(occupant)
-                    removed.append(occupant)
-                    removed.extend(self._remove_continuations_helper(occupant))
-                if entry in self.schedule.entries:
-                    self.schedule.entries.remove(entry)
-                if self._can_schedule(troop, entry.activity, target_slot, target_slot.day):
-                    self.schedule.add_entry(target_slot, entry.activity, troop)
-                    if occupant:
-                        old_slot = entry.time_slot
-                        if self._can_schedule(troop, occupant.activity, old_slot, old_slot.day):
-                            self.schedule.add_entry(old_slot, occupant.activity, troop)
-                        else:
-                            self._fill_vacated_slot(troop, old_slot)
-                    return True
-                # Restore
-                if entry not in self.schedule.entries:
-                    self.schedule.entries.append(entry)
-                for r in removed:
-                    if r not in self.schedule.entries:
-                        self.schedule.entries.append(r)
-                return False
-            
-            # CRITICAL: For Delta+Sailing pairs, Delta MUST be in slot 1 or 3 (never 2)
-            # This allows Sailing to take the other two slots on the same day
-            # If Delta is in slot 2, we need to move it to allow Sailing pairing
-            if delta_entry.time_slot.slot_number == 2:
-                # Try slot 1 first, then slot 3 on the same day
-                for slot_num in (1, 3):
-                    target = TimeSlot(delta_entry.time_slot.day, slot_num)
-                    if move_entry_to_slot(delta_entry, target):
-                        delta_entry = next((e for e in self.schedule.entries if e.troop == troop and e.activity.name == "Delta"), delta_entry)
-                        fixes += 1
-                        print(f"  {troop.name}: Delta moved from slot 2 to slot {slot_num} (Sailing pairing requirement)")
-                        break
-                # If still in slot 2, try moving to Sailing's day
-                if delta_entry.time_slot.slot_number == 2:
-                    if sailing_entries:
-                        sailing_day = sailing_entries[0].time_slot.day
-                        if delta_entry.time_slot.day != sailing_day:
-                            for slot_num in (1, 3):
-                                target = TimeSlot(sailing_day, slot_num)
-                                if move_entry_to_slot(delta_entry, target):
-                                    delta_entry = next((e for e in self.schedule.entries if e.troop == troop and e.activity.name == "Delta"), delta_entry)
-                                    fixes += 1
-                                    print(f"  {troop.name}: Delta moved to {sailing_day.value} slot {slot_num} (Sailing pairing requirement)")
-                                    break
-            
-            # Determine sailing day + start slot
-            sailing_days = sorted({e.time_slot.day for e in sailing_entries}, key=lambda d: list(Day).index(d))
-            sailing_day = sailing_days[0]
-            sailing_slots = sorted({e.time_slot.slot_number for e in sailing_entries if e.time_slot.day == sailing_day})
-            if not sailing_slots:
-                continue
-            
-            start_slot = 1 if 1 in sailing_slots else min(sailing_slots)
-            target_slot_num = 3 if start_slot == 1 else 1
-            target_slot = TimeSlot(sailing_day, target_slot_num)
-            
-            if delta_entry.time_slot.day == sailing_day and delta_entry.time_slot.slot_number == target_slot_num:
-                continue  # Already paired correctly
-            
-            # Try to move Delta to the open slot on the Sailing day
-            if move_entry_to_slot(delta_entry, target_slot):
-                fixes += 1
-                print(f"  {troop.name}: Delta paired with Sailing on {sailing_day.value} (slot {target_slot_num})")
-                continue
-            
-            # Otherwise, try moving Sailing to Delta's day
-            delta_day = delta_entry.time_slot.day
-            delta_slot_num = delta_entry.time_slot.slot_number
-            if delta_slot_num not in (1, 3):
-                continue
-            sailing_start_slot = 2 if delta_slot_num == 1 else 1
-            start_slot = TimeSlot(delta_day, sailing_start_slot)
-            target_slots = [TimeSlot(delta_day, sailing_start_slot), TimeSlot(delta_day, sailing_start_slot + 1)]
-            
-            # Remove existing sailing for this troop first
-            removed_sailing = []
-            for entry in sailing_entries:
-                if entry in self.schedule.entries:
-                    self.schedule.entries.remove(entry)
-                    removed_sailing.append(entry)
-            
-            # Clear target slots (do not remove Top 5)
-            removed_block = []
-            can_clear = True
-            for ts in target_slots:
-                if not self.schedule.is_troop_free(ts, troop):
-                    occupant = next((e for e in self.schedule.entries if e.troop == troop and e.time_slot == ts), None)
-                    if occupant and is_protected(occupant):
-                        can_clear = False
-                        break
-                    if occupant:
-                        self.schedule.entries.remove(occupant)
-                        removed_block.append(occupant)
-                        removed_block.extend(self._remove_continuations_helper(occupant))
-            if can_clear and self._can_schedule(troop, get_activity_by_name("Sailing"), start_slot, delta_day):
-                self.schedule.add_entry(start_slot, get_activity_by_name("Sailing"), troop)
-                fixes += 1
-                print(f"  {troop.name}: Sailing moved to {delta_day.value} to pair with Delta")
-                continue
-            
-            # Restore if failed
-            for entry in removed_block:
-                if entry not in self.schedule.entries:
-                    self.schedule.entries.append(entry)
-            for entry in removed_sailing:
-                if entry not in self.schedule.entries:
-                    self.schedule.entries.append(entry)
-        
-        if fixes == 0:
-            print("  No Delta+Sailing pair adjustments needed")
-        else:
-            print(f"  Paired Delta+Sailing for {fixes} troop(s)")
-    
-    def _consolidate_sailing_same_day(self):
-        """AGGRESSIVELY consolidate Sailing to cluster 2 sails per day.
-        
-        Moves Sailing activities to days that already have 1 sail, maximizing
-        the "2 sails per day" pattern for scoring (20 points in evaluation).
-        Respects spine constraints and does not create overlaps/gaps.
-        
-        FIX 2026-01-30: Corrected logic - find days with 1 sail as TARGETS,
-        then find ISOLATED sails (alone on their day) as SOURCES to move TO targets.
-        """
-        from .models import Day, TimeSlot
-        from collections import defaultdict
-        
-        print("\n--- Consolidating Sailing to Cluster 2 Per Day ---")
-        
-        sailing = get_activity_by_name("Sailing")
-        if not sailing:
-            return
-        
-        # Build sailing count per day
-        def count_sails_per_day():
-            sailing_by_day = defaultdict(list)
-            for entry in self.schedule.entries:
-                if entry.activity.name == "Sailing":
-                    day = entry.time_slot.day
-                    slot = entry.time_slot.slot_number
-                    # Only count start entries (slot 1, or slot 2 if no slot 1 for same troop/day)
-                    if slot == 1:
-                        sailing_by_day[day].append((entry, entry.troop))
-                    elif slot == 2:
-                        # Slot 2 is a start only if slot 1 isn't Sailing for the same troop/day
-                        has_slot1 = any(
-                            e.troop == entry.troop and e.activity.name == "Sailing" and
-                            e.time_slot.day == day and e.time_slot.slot_number == 1
-                            for e in self.schedule.entries
-                        )
-                        if not has_slot1:
-                            sailing_by_day[day].append((entry, entry.troop))
-            return sailing_by_day
-        
-        sailing_starts_by_day = count_sails_per_day()
-        
-        # Log current state
-        for day in [Day.MONDAY, Day.TUESDAY, Day.WEDNESDAY, Day.THURSDAY]:
-            count = len(sailing_starts_by_day.get(day, []))
-            troops = [t.name for _, t in sailing_starts_by_day.get(day, [])]
-            if count > 0:
-                print(f"  {day.value}: {count} sail(s) - {troops}")
-        
-        moves = 0
-        max_iterations = 5  # Safety limit
-        
-        for iteration in range(max_iterations):
-            # Refresh counts each iteration
-            sailing_starts_by_day = count_sails_per_day()
-            
-            # TARGET: Days with exactly 1 sail (want to add a 2nd)
-            target_days = [day for day, starts in sailing_starts_by_day.items() 
-                          if len(starts) == 1 and day != Day.FRIDAY and day != Day.THURSDAY]
-            
-            # SOURCE: Days with exactly 1 sail that could move TO a target
-            # (An isolated sail on a day can move to join another isolated sail)
-            source_days = [day for day, starts in sailing_starts_by_day.items() 
-                          if len(starts) == 1 and day != Day.FRIDAY and day != Day.THURSDAY]
-            
-            if len(target_days) < 2:
-                # Need at least 2 isolated sails to consolidate
-                print(f"  Iteration {iteration+1}: Not enough isolated sails to consolidate ({len(target_days)} found)")
-                break
-            
-            moved_this_iteration = False
-            
-            # Pick first target, find a source that can move to it
-            target_day = target_days[0]
-            existing_entry, existing_troop = sailing_starts_by_day[target_day][0]
-            existing_slot = existing_entry.time_slot.slot_number
-            
-            # Find a source day (different from target)
-            for source_day in source_days:
-                if source_day == target_day:
-                    continue
-                
-                source_entry, source_troop = sailing_starts_by_day[source_day][0]
-                
-                # Check if source_troop is free on target_day
-                # Sailing needs 2 consecutive slots (1-2 or 2-3)
-                # If existing sail is at slot 1, new sail should be at slot 2
-                # If existing sail is at slot 2, new sail should be at slot 1
-                if existing_slot == 1:
-                    target_slot = TimeSlot(target_day, 2)
-                else:
-                    target_slot = TimeSlot(target_day, 1)
-                
-                # Check if source_troop can move to target_day
-                # First, is the troop free on those slots?
-                if not self.schedule.is_troop_free(target_slot, source_troop):
-                    # Try swapping slot number
-                    alt_slot = TimeSlot(target_day, 1 if target_slot.slot_number == 2 else 2)
-                    if not self.schedule.is_troop_free(alt_slot, source_troop):
-                        continue
-                    target_slot = alt_slot
-                
-                # Also check slot+1 for sailing continuation
-                next_slot_num = target_slot.slot_number + 1
-                if next_slot_num <= 3:
-                    next_slot = TimeSlot(target_day, next_slot_num)
-                    if not self.schedule.is_troop_free(next_slot, source_troop):
-                        # Troop busy in continuation slot, can't move here
-                        continue
-                
-                # Check if we can actually schedule sailing there
-                if not self._can_schedule(source_troop, sailing, target_slot, target_day):
-                    continue
-                
-                # Remove source sailing (including continuation)
-                source_entries = [e for e in self.schedule.entries 
-                                 if e.activity.name == "Sailing" and 
-                                 e.troop == source_troop and 
-                                 e.time_slot.day == source_day]
-                removed_entries = []
-                for entry in source_entries:
-                    if entry in self.schedule.entries:
-                        self.schedule.entries.remove(entry)
-                        removed_entries.append(entry)
-                
-                # Add sailing at new location
-                self.schedule.add_entry(target_slot, sailing, source_troop)
-                moves += 1
-                moved_this_iteration = True
-                print(f"  [MOVE] {source_troop.name}: Sailing {source_day.value} -> {target_day.value} slot {target_slot.slot_number}")
-                
-                # Fill the vacated slots on source day
-                for entry in removed_entries:
-                    vacated_slot = entry.time_slot
-                    if self.schedule.is_troop_free(vacated_slot, source_troop):
-                        self._fill_vacated_slot(source_troop, vacated_slot)
-                
-                break  # Move one sail per iteration
-            
-            if not moved_this_iteration:
-                print(f"  Iteration {iteration+1}: No valid moves found")
-                break
-        
-        # Final summary
-        sailing_starts_by_day = count_sails_per_day()
-        days_with_2 = sum(1 for day, starts in sailing_starts_by_day.items() if len(starts) >= 2)
-        total_sail_days = len([d for d, s in sailing_starts_by_day.items() if len(s) > 0])
-        
-        if moves == 0:
-            print(f"  No Sailing moves made. Current: {days_with_2}/{total_sail_days} days with 2+ sails")
-        else:
-            print(f"  Consolidated {moves} Sailing activity(ies). Now: {days_with_2}/{total_sail_days} days with 2+ sails")
-
-    def _schedule_hc_dg_tuesday(self):
-        """
-        Schedule History Center and Disc Golf for the top 3 troops that want them.
-        
-        NEW RULE: If a troop wants BOTH, they MUST be scheduled back-to-back.
-        """
-        from .models import Day
-        
-        print("\n--- Early HC/DG Scheduling (Tuesday Only, Top 3) ---")
-        
-        hc = get_activity_by_name("History Center")
-        dg = get_activity_by_name("Disc Golf")
-        
-        tuesday_slots = [s for s in self.time_slots if s.day == Day.TUESDAY]
-        
-        # 1. Handle History Center (and Pairs)
-        print("  Processing History Center requests...")
-        troops_wanting_hc = []
-        for troop in self.troops:
-            if "History Center" in troop.preferences:
-                rank = troop.preferences.index("History Center") + 1
-                troops_wanting_hc.append((troop, rank))
-        
-        troops_wanting_hc.sort(key=lambda x: x[1])
-        
-        for troop, rank in troops_wanting_hc[:3]:
-            if self._troop_has_activity(troop, hc):
-                continue
-            
-            # Check for Pairing Requirement
-            wants_dg = "Disc Golf" in troop.preferences
-            dg_scheduled = False
-            
-            if wants_dg:
-                print(f"    {troop.name} wants BOTH HC and DG - attempting back-to-back...")
-                # Try consecutive slots (1-2 or 2-3)
-                # Note: HC/DG allowed neighbors logic updated in _can_schedule
-                
-                # Try 1-2 (HC then DG)
-                slot1 = tuesday_slots[0] # Slot 1
-                slot2 = tuesday_slots[1] # Slot 2
+                # Try 1-2 (HC then DG)
+                slot1 = tuesday_slots[0] # Slot 1
+                slot2 = tuesday_slots[1] # Slot 2
                 
                 slot1_free = self.schedule.is_troop_free(slot1, troop)
                 slot2_free = self.schedule.is_troop_free(slot2, troop)
@@ -2374,15 +2328,25 @@ class ConstrainedScheduler:
         """
         Schedule limited-capacity activities by GLOBAL priority across all troops.
         
-        For activities like Troop Shotgun (max 1 per slot) and 3-hour activities (1 per day),
-        sort ALL troops who want them by preference rank and schedule highest-ranked first.
+        For activities like Troop Shotgun (max 1 per slot) and 3-hour activities,
+        every troop's request is allocated in one auction instead of first come,
+        first served: each (troop, activity) request bids for the slots
+        _can_schedule accepts now, valued by preference rank, and
+        auction_assignment picks the allocation with the highest total value
+        across all troops (ties go to the least-staffed slot). Exclusive areas
+        are shared objects (Aqua Trampoline/Water Polo hold two troops); other
+        activities only compete for the troop's own slot.
         
         This ensures that if:
         - Troop A wants Shotgun as #2
         - Troop B wants Shotgun as #9
-        Then Troop A gets it first, regardless of scheduling phase.
+        Then Troop A wins a slot both want, but if B has no other slot and A
+        does, each gets one instead of A taking B's only option.
         
-        Also ensures each troop gets at most 1 three-hour activity.
+        Winners are committed through _can_schedule (troop conflicts the
+        auction does not model can still reject one) and the rest re-bid, up
+        to LA_AUCTION_ROUNDS times; anything left falls back to
+        _try_schedule_activity.
         
         Args:
             max_rank (int, optional): If set, only schedule requests with preference_index <= max_rank.
@@ -2390,82 +2354,91 @@ class ConstrainedScheduler:
         """
         print(f"\n--- Priority Scheduling for Limited Activities (Max Rank: {max_rank if max_rank is not None else 'ALL'}) ---")
         
-        # Per Spine: Allow multiple 3-hour activities per troop - do NOT track or limit
-        
         # Define limited activities that need priority scheduling
         # Added Canoe activities and limited beach activities (Aqua Trampoline, Water Polo)
         # to ensure Top 5 preference priority over lower-ranked requests
-        LIMITED_ACTIVITIES = (
-            set(self.ACCURACY_ACTIVITIES) | 
-            set(self.THREE_HOUR_ACTIVITIES) |
-            set(self.CANOE_ACTIVITIES) |
-            {'Aqua Trampoline', 'Water Polo'}
+        LIMITED_ACTIVITIES = set(
+            self.ACCURACY_ACTIVITIES + self.THREE_HOUR_ACTIVITIES + self.CANOE_ACTIVITIES +
+            ['Aqua Trampoline', 'Water Polo']
         )
         
-        print(f"  Limited activities to check: {LIMITED_ACTIVITIES}")
-        
-        # For each limited activity, collect all troops who want it and their ranks
-        activity_requests = {}  # activity_name: [(troop, pref_rank), ...]
-        
-        for activity_name in LIMITED_ACTIVITIES:
-            requests = []
-            for troop in self.troops:
-                if activity_name in troop.preferences:
-                    pref_rank = troop.preferences.index(activity_name)
-                    
-                    # Filter by max_rank if specified
-                    if max_rank is not None and pref_rank > max_rank:
-                        continue
-                        
-                    # Skip if already has this activity
-                    activity = get_activity_by_name(activity_name)
-                    if not activity:
-                        print(f"  WARNING: Activity '{activity_name}' not found by get_activity_by_name!")
-                        continue
-                    if self._troop_has_activity(troop, activity):
-                        # print(f"  {troop.name} already has {activity_name}")
-                        continue
-                    requests.append((troop, pref_rank))
-                    # print(f"  {troop.name} wants {activity_name} at rank #{pref_rank+1}")
-            
-            if requests:
-                # Sort by preference rank (lower = higher priority)
-                requests.sort(key=lambda x: x[1])
-                activity_requests[activity_name] = requests
-        
-        print(f"  Found {len(activity_requests)} limited activities with requests")
+        # Requests in troop order: (pref_rank, troop, activity)
+        requests = []
+        for troop in self.troops:
+            for pref_rank, activity_name in enumerate(troop.preferences):
+                if max_rank is not None and pref_rank > max_rank:
+                    break
+                if activity_name not in LIMITED_ACTIVITIES or troop.preferences.index(activity_name) != pref_rank:
+                    continue
+                activity = get_activity_by_name(activity_name)
+                if not activity:
+                    print(f"  WARNING: Activity '{activity_name}' not found by get_activity_by_name!")
+                    continue
+                if not self._troop_has_activity(troop, activity):
+                    requests.append((pref_rank, troop, activity))
+        print(f"  Found {len(requests)} limited activity requests")
         
-        # Schedule each limited activity in priority order
         scheduled_count = 0
-        for activity_name, requests in activity_requests.items():
-            activity = get_activity_by_name(activity_name)
-            if not activity:
-                continue
-            
-            is_3hour = activity_name in self.THREE_HOUR_ACTIVITIES
-            print(f"  Attempting to schedule {activity_name} for {len(requests)} troops...")
-            
-            for troop, pref_rank in requests:
-                # Skip if troop already has this activity
+        rejected = set()        # (troop, activity, slot) the commit check refused
+        for _ in range(self.LA_AUCTION_ROUNDS):
+            values, capacity = {}, {}
+            for index, (pref_rank, troop, activity) in enumerate(requests):
                 if self._troop_has_activity(troop, activity):
                     continue
-                
-                # Get current entries for this troop
-                troop_entries = [e for e in self.schedule.entries if e.troop == troop]
-
-                # Per Spine: Allow multiple 3-hour activities per troop if sufficient days available
-                # No limit check needed
-                
-                # Try to schedule (Tuesday is allowed for 3-hour activities per Spine rule)
-                scheduled = self._try_schedule_activity(troop, activity)
-                if scheduled:
-                    scheduled_count += 1
-                    print(f"  [OK] {troop.name}: {activity_name} (rank #{pref_rank+1})")
-                else:
-                    print(f"    [FAIL] {troop.name}: {activity_name} failed to schedule")
+                slots = [s for s in self.time_slots
+                         if (troop.name, activity.name, s) not in rejected
+                         and self._can_schedule(troop, activity, s, s.day)]
+                # Lightly staffed slots first, as _try_schedule_activity orders them
+                slots.sort(key=lambda s: (self._get_total_staff_score(s), 1 if s.day == Day.FRIDAY else 0))
+                bids = {}
+                for slot in slots:
+                    key, units = self._limited_auction_object(troop, activity, slot)
+                    capacity[key] = units
+                    bids.setdefault(key, (self.LA_ACTIVITY_VALUE - self.LA_RANK_STEP * pref_rank, slot))
+                if bids:
+                    values[index] = bids
+            
+            plan = auction_assignment({i: {k: v for k, (v, _) in bids.items()} for i, bids in values.items()},
+                                      capacity)
+            if not plan:
+                break
+            
+            for index in sorted(plan, key=lambda i: requests[i][0]):
+                pref_rank, troop, activity = requests[index]
+                slot = values[index][plan[index]][1]
+                if not self._can_schedule(troop, activity, slot, slot.day):
+                    rejected.add((troop.name, activity.name, slot))
+                    continue
+                self._add_to_schedule(slot, activity, troop)
+                self._update_progress(troop, activity.name)
+                if slot.day == Day.FRIDAY:
+                    self._check_and_schedule_reflection(troop)
+                self._try_pair_chain(troop, activity, slot)
+                scheduled_count += 1
+                print(f"  [OK] {troop.name}: {activity.name} at {slot} (rank #{pref_rank+1})")
+        
+        # Whatever the auction could not place gets the regular day-preference search
+        for pref_rank, troop, activity in requests:
+            if self._troop_has_activity(troop, activity):
+                continue
+            if self._try_schedule_activity(troop, activity):
+                scheduled_count += 1
+                print(f"  [OK] {troop.name}: {activity.name} (rank #{pref_rank+1})")
+            else:
+                print(f"    [FAIL] {troop.name}: {activity.name} failed to schedule")
         
         print(f"  Scheduled {scheduled_count} limited activities by priority")
     
+    def _limited_auction_object(self, troop, activity, slot):
+        """Auction object (and the troops it can still take) that troop/activity uses in slot."""
+        area = next((a for a, names in EXCLUSIVE_AREAS.items() if activity.name in names), None)
+        if area is None:
+            return ('cell', troop.name, slot.day.name, slot.slot_number), 1
+        used = sum(1 for e in self.schedule.entries
+                   if e.time_slot == slot and e.activity.name in EXCLUSIVE_AREAS[area])
+        # _can_schedule accepted the slot, so at least this troop still fits
+        return ('area', area, slot.day.name, slot.slot_number), max(1, AREA_SLOT_CAPACITY.get(area, 1) - used)
+    
     def _schedule_preferences_range(self, start_rank, end_rank):
         """
         Unified per-preference scheduling: iterate through preference ranks start_rank to end_rank.
@@ -2801,302 +2774,258 @@ class ConstrainedScheduler:
     
     def _guarantee_all_top5(self):
         """
-        MANDATORY: GUARANTEE 100% Top 5 satisfaction - ALL Top 5 preferences MUST be scheduled.
+        Recover missing Top 5 preferences with bounded ejection chains.
         
-        This is MANDATORY - Top 1-5 are required. For any troop missing a Top 5 preference:
-        1. Find which Top 5 is missing
-        2. Find ANY slot with a lower-priority activity (6+ or fill)
-        3. FORCE swap it out for the missing Top 5
-        4. Use relaxed constraints if needed to make it work
+        Stops early once the week (or a troop) reaches its Top 5 upper bound,
+        and requests no slot can ever hold are not searched.
+        
+        For each missing Top 5 (a second 3-hour activity is exempt once the troop
+        has one) _place_by_ejection_chain either places it directly or displaces
+        the entries blocking a slot and re-places them in turn, up to
+        TOP5_CHAIN_DEPTH links. Every placement passes the strict _can_schedule,
+        so a recovery never trades a Top 5 for a constraint violation.
+        """
+        print("\n--- Top 5 recovery (ejection chains) ---")
+        bound = self._preference_bound(5)
+        if count_satisfied(self.schedule, self.troops, 5) >= bound.achievable:
+            print(f"  At the upper bound ({bound.summary()}), nothing to recover")
+            return
+        recovered = 0
+        failures = []
+        for troop in self.troops:
+            troop_entries = [e for e in self.schedule.entries if e.troop == troop]
+            scheduled = {e.activity.name for e in troop_entries}
+            has_3hr_scheduled = any(e.activity.name in self.THREE_HOUR_ACTIVITIES for e in troop_entries)
+            if count_satisfied(self.schedule, [troop], 5) >= bound.troop_achievable.get(troop.name, 0):
+                continue  # Every structurally possible Top 5 is already in
+            
+            for rank, pref in enumerate(troop.preferences[:5]):
+                if pref in scheduled or (pref in self.THREE_HOUR_ACTIVITIES and has_3hr_scheduled):
+                    continue
+                if pref in bound.unreachable.get(troop.name, ()):
+                    failures.append((troop.name, pref, rank + 1))
+                    continue
+                activity = get_activity_by_name(pref)
+                if not activity:
+                    continue
+                if self._place_by_ejection_chain(troop, activity, rank):
+                    recovered += 1
+                    has_3hr_scheduled = has_3hr_scheduled or pref in self.THREE_HOUR_ACTIVITIES
+                else:
+                    failures.append((troop.name, pref, rank + 1))
+        
+        if recovered or failures:
+            print(f"  Recovered {recovered}/{recovered + len(failures)} missing Top 5 preferences")
+        for troop_name, pref, rank in failures:
+            print(f"    [MISSING] {troop_name}: {pref} (Top {rank})")
+        if not recovered and not failures:
+            print("  All Top 5 already satisfied")
+    
+    def _preference_bound(self, top):
+        """Upper bound on satisfied Top `top` requests for this week (see core/scheduler/bounds.py)."""
+        if top not in self.preference_bounds:
+            self.preference_bounds[top] = preference_upper_bound(self.troops, top, self.voyageur_mode)
+        return self.preference_bounds[top]
+    
+    def _place_by_ejection_chain(self, troop, activity, rank):
+        """
+        Place activity for troop, displacing and re-placing blockers if needed.
+        
+        Depth-first search over trial moves recorded in an undo log, deepened one
+        link at a time; a failed branch is rolled back exactly. Displaced
+        entries ranked at or beyond TOP5_CHAIN_DROPPABLE_RANK may be dropped
+        (their slot is refilled after the chain commits); anything better must
+        find a new slot. States already explored are memoised and the search
+        stops after TOP5_CHAIN_NODE_LIMIT nodes, so the worst case stays bounded.
+        
+        Returns:
+            True if a chain was committed.
+        """
+        # Iterative deepening: the shortest chain found is the one committed
+        search = {'nodes': 0, 'seen': set()}
+        for depth in range(self.TOP5_CHAIN_DEPTH + 1):
+            moves, vacated = [], []
+            search['seen'].clear()
+            if self._chain_place(troop, activity, depth, moves, vacated, search, resettle=False):
+                break
+        else:
+            return False
+        
+        # Commit: staff load bookkeeping for the net changes, then refill dropped slots
+        for kind, entries in moves:
+            for entry in entries:
+                self._update_staff_load(entry.time_slot, entry.activity.name, delta=1 if kind == 'add' else -1)
+        self._update_progress(troop, activity.name)
+        chain = [f"{entries[0].troop.name}: {entries[0].activity.name} {'->' if kind == 'add' else 'out of'} "
+                 f"{entries[0].time_slot.day.name[:3]}-{entries[0].time_slot.slot_number}"
+                 for kind, entries in moves]
+        print(f"  [Chain] {troop.name}: {activity.name} (Top {rank + 1}) via " + "; ".join(chain))
+        for vacated_troop, slot in vacated:
+            self._fill_vacated_slot(vacated_troop, slot)
+        return True
+    
+    def _chain_place(self, troop, activity, depth, moves, vacated, search, resettle=True):
+        """
+        One link of the ejection chain: place activity for troop, possibly ejecting
+        blockers. Beach slot 2 is tried last for the recovered preference; a
+        displaced entry is never re-placed in beach slot 2 or on an excess area day.
+        """
+        slots = sorted(self._get_cluster_ordered_slots(troop, activity),
+                       key=lambda s: self._chain_in_beach_slot2(troop, activity, s))
+        if resettle:
+            slots = [s for s in slots if not self._chain_in_beach_slot2(troop, activity, s)
+                     and not self._would_create_excess_day(activity.name, s.day)]
+        for slot in slots:
+            if self._chain_try_add(troop, activity, slot, moves):
+                return True
+        if depth == 0:
+            return False
+        
+        for slot in slots:
+            blockers = self._chain_blockers(troop, activity, slot)
+            if not blockers:
+                continue
+            search['nodes'] += 1
+            if search['nodes'] > self.TOP5_CHAIN_NODE_LIMIT:
+                return False
+            state = (troop.name, activity.name, slot,
+                     frozenset((kind, e.troop.name, e.activity.name, e.time_slot)
+                               for kind, entries in moves for e in entries))
+            if state in search['seen']:
+                continue
+            search['seen'].add(state)
+            
+            mark, vacated_mark = len(moves), len(vacated)
+            for blocker in blockers:
+                self.schedule.entries.remove(blocker)
+                moves.append(('remove', [blocker]))
+            if self._chain_try_add(troop, activity, slot, moves) and all(
+                    self._chain_resettle(blocker, troop, depth - 1, moves, vacated, search) for blocker in blockers):
+                return True
+            self._chain_undo(moves, mark)
+            del vacated[vacated_mark:]
+        return False
+    
+    def _chain_resettle(self, entry, troop, depth, moves, vacated, search):
+        """Re-place an ejected entry; troop's own low-ranked entries may be dropped instead."""
+        if entry.troop == troop and entry.troop.get_priority(entry.activity.name) >= self.TOP5_CHAIN_DROPPABLE_RANK:
+            vacated.append((entry.troop, entry.time_slot))
+            return True
+        return self._chain_place(entry.troop, entry.activity, depth, moves, vacated, search)
+    
+    def _chain_in_beach_slot2(self, troop, activity, slot):
+        """True if activity at slot would put a beach activity in slot 2 (Thursday excepted)."""
+        if activity.name not in self.BEACH_SLOT_ACTIVITIES:
+            return False
+        size = int(self.schedule._get_effective_slots(activity, troop) + 0.5)
+        start = self.time_slots.index(slot)
+        return any(s.slot_number == 2 and s.day != Day.THURSDAY for s in self.time_slots[start:start + size])
+    
+    def _chain_blockers(self, troop, activity, slot):
+        """
+        Entries that must leave for troop to take activity at slot: the troop's
+        own entries in the covered slots plus other troops holding the same
+        exclusive area there. None if any of them may not be displaced.
+        """
+        size = int(self.schedule._get_effective_slots(activity, troop) + 0.5)
+        start = self.time_slots.index(slot)
+        covered = self.time_slots[start:start + size]
+        if len(covered) < size or any(s.day != slot.day for s in covered):
+            return None
+        area_activities = next((acts for acts in EXCLUSIVE_AREAS.values() if activity.name in acts), ())
+        blockers = [e for e in self.schedule.entries
+                    if e.time_slot in covered and (e.troop == troop or e.activity.name in area_activities)]
+        for entry in blockers:
+            if (entry.activity.name in self.TOP5_CHAIN_PROTECTED
+                    or self.schedule._get_effective_slots(entry.activity, entry.troop) > 1):
+                return None
+        return blockers
+    
+    def _chain_try_add(self, troop, activity, slot, moves):
+        """Trial placement under the strict checks; logged for undo."""
+        if not self.schedule.is_troop_free(slot, troop) or not self._can_schedule(troop, activity, slot, slot.day):
+            return False
+        before = len(self.schedule.entries)
+        if not self.schedule.add_entry(slot, activity, troop):
+            return False
+        moves.append(('add', self.schedule.entries[before:]))
+        return True
+    
+    def _chain_undo(self, moves, mark):
+        """Roll the trial moves back to moves[:mark]."""
+        while len(moves) > mark:
+            kind, entries = moves.pop()
+            for entry in entries:
+                if kind == 'add':
+                    self.schedule.entries.remove(entry)
+                else:
+                    self.schedule.entries.append(entry)
+    
+    def _guarantee_minimum_top10(self):
+        """
+        GUARANTEE: Each troop gets at least 2-3 of their Top 10 preferences.
+        
+        Strategy:
+        1. Count how many Top 10 preferences each troop has scheduled
+        2. If a troop has < 2-3 Top 10 preferences, aggressively schedule more
+        3. Prioritize Top 6-10 preferences that aren't scheduled yet
         """
-        from .models import ScheduleEntry
         from .activities import get_activity_by_name
         
-        print("\n--- ENHANCED: Guaranteeing 90%+ Top 5 Satisfaction (Target: 16/18 available) ---")
+        print("\n--- Guaranteeing Minimum Top 10 (2-3 per troop) ---")
         
         PROTECTED = {"Reflection", "Super Troop"}  # Never swap these
+        MIN_TOP10_REQUIRED = 3  # Require at least 3 of Top 10
         
-        swaps_made = 0
         total_recovered = 0
-        total_missing = 0
-        forced_placements = 0
         
         for troop in self.troops:
-            # Get troop's scheduled activities
             troop_entries = [e for e in self.schedule.entries if e.troop == troop]
             scheduled_activities = {e.activity.name for e in troop_entries}
             
-            # Find missing Top 5 (excluding exempt activities)
-            top5 = troop.preferences[:5] if len(troop.preferences) >= 5 else troop.preferences
-            missing_top5 = []
+            # Count Top 10 preferences scheduled
+            top10 = troop.preferences[:10] if len(troop.preferences) >= 10 else troop.preferences
+            top10_scheduled = [p for p in top10 if p in scheduled_activities]
+            top10_count = len(top10_scheduled)
             
-            # Check for exempt activities (capacity-constrained, 2nd+ 3-hour)
-            # NOTE: Each troop should only get 1 three-hour activity (multiple troops can have them on same day)
-            has_3hr_scheduled = any(e.activity.name in self.THREE_HOUR_ACTIVITIES for e in troop_entries)
+            if top10_count >= MIN_TOP10_REQUIRED:
+                continue  # Already has minimum
             
-            for i, pref in enumerate(top5):
-                if pref not in scheduled_activities:
-                    # EXEMPT: 2nd+ 3-hour activity if troop already has one
-                    if pref in self.THREE_HOUR_ACTIVITIES and has_3hr_scheduled:
-                        print(f"    [EXEMPT] {troop.name}: {pref} - troop already has a 3-hour activity")
-                        continue
-                    missing_top5.append((i, pref))
+            # Find missing Top 6-10 preferences (Top 1-5 should already be handled)
+            missing_top6_10 = []
+            for i in range(5, 10):  # Ranks 6-10 (0-indexed: 5-9)
+                if i >= len(troop.preferences):
+                    break
+                pref_name = troop.preferences[i]
+                if pref_name not in scheduled_activities:
+                    activity = get_activity_by_name(pref_name)
+                    if activity:
+                        missing_top6_10.append((i, pref_name, activity))
             
-            if not missing_top5:
-                continue
+            if not missing_top6_10:
+                continue  # No Top 6-10 to schedule
             
-            total_missing += len(missing_top5)
-            print(f"  {troop.name}: Missing Top 5 = {[p[1] for p in missing_top5]} [TARGETING 90%+ RECOVERY]")
+            needed = MIN_TOP10_REQUIRED - top10_count
+            print(f"  {troop.name}: Has {top10_count}/10 Top 10, needs {needed} more (missing: {[p[1] for p in missing_top6_10[:needed]]})")
             
-            # Try to recover each missing Top 5 preference - MANDATORY
-            for pref_rank, missing_pref in missing_top5:
-                missing_activity = get_activity_by_name(missing_pref)
-                if not missing_activity:
-                    print(f"    [SKIP] Activity '{missing_pref}' not found")
-                    continue
+            # Try to schedule up to 'needed' more Top 6-10 preferences
+            recovered_this_troop = 0
+            for pref_rank, pref_name, activity in missing_top6_10[:needed]:
+                if recovered_this_troop >= needed:
+                    break
                 
-                # MANDATORY: Try ALL slots, even with relaxed constraints
+                # Try normal scheduling first
+                ordered_slots = self._get_cluster_ordered_slots(troop, activity)
                 placed = False
                 
-                # PASS 1: Try normal scheduling
-                ordered_slots = self._get_cluster_ordered_slots(troop, missing_activity)
                 for slot in ordered_slots:
-                    if self._can_schedule(troop, missing_activity, slot, slot.day):
-                        self._add_to_schedule(slot, missing_activity, troop)
-                        print(f"    [MANDATORY Top 5] {troop.name}: {missing_pref} (#{pref_rank + 1}) -> {slot}")
-                        placed = True
+                    if self._can_schedule(troop, activity, slot, slot.day):
+                        self._add_to_schedule(slot, activity, troop)
+                        print(f"    {troop.name}: {pref_name} (Pref #{pref_rank + 1}) -> {slot.day.name[:3]}-{slot.slot_number}")
+                        recovered_this_troop += 1
                         total_recovered += 1
-                        scheduled_activities.add(missing_pref)
-                        troop_entries = [e for e in self.schedule.entries if e.troop == troop]
-                        break
-                
-                if placed:
-                    continue
-                
-                # PASS 2: Try with relaxed constraints
-                for slot in ordered_slots:
-                    if self._can_schedule(troop, missing_activity, slot, slot.day, relax_constraints=True):
-                        self._add_to_schedule(slot, missing_activity, troop)
-                        print(f"    [MANDATORY Top 5 RELAXED] {troop.name}: {missing_pref} (#{pref_rank + 1}) -> {slot}")
-                        placed = True
-                        total_recovered += 1
-                        scheduled_activities.add(missing_pref)
-                        troop_entries = [e for e in self.schedule.entries if e.troop == troop]
-                        break
-                
-                if placed:
-                    continue
-                
-                # PASS 3: FORCE swap - displace ANY lower-priority activity (MANDATORY)
-                # Find replaceable activities (prefer lowest priority)
-                replaceable = []
-                for entry in troop_entries:
-                    # Get this activity's priority
-                    try:
-                        entry_priority = troop.preferences.index(entry.activity.name)
-                    except ValueError:
-                        entry_priority = 999  # Not in preferences at all
-                    
-                    # Only replace if lower priority than the missing Top 5
-                    if entry_priority > pref_rank:
-                        # Don't replace mandatory activities (Spine)
-                        if entry.activity.name not in PROTECTED:
-                            replaceable.append((entry, entry_priority))
-                
-                # Sort by priority (highest index = lowest priority = best to replace)
-                replaceable.sort(key=lambda x: x[1], reverse=True)
-                
-                success = False
-                
-                # PASS 1: Try swapping in the same slot (original behavior)
-                for candidate, cand_priority in replaceable:
-                    slot = candidate.time_slot
-                    
-                    # Temporarily remove candidate to test if missing activity fits
-                    self.schedule.entries.remove(candidate)
-                    
-                    # NEW: Track if we're swapping out Delta
-                    # This allows Super Troop to be scheduled before Delta for this troop
-                    if candidate.activity.name == "Delta":
-                        self.delta_was_swapped.add(troop.name)
-                    
-                    if self._can_schedule(troop, missing_activity, slot, slot.day) or self._can_schedule(troop, missing_activity, slot, slot.day, relax_constraints=True):
-                        # Success! Add the Top 5 preference (try relaxed if strict failed)
-                        self.schedule.add_entry(slot, missing_activity, troop)
-                        self._update_progress(troop, missing_pref)
-                        
-                        old_name = candidate.activity.name
-                        old_rank = f"#{cand_priority+1}" if cand_priority < 999 else "fill"
-                        print(f"    [SWAP] {missing_pref} (Top {pref_rank+1}) <- {old_name} ({old_rank}) at {slot}")
-                        swaps_made += 1
-                        success = True
-                        
-                        # Update troop_entries for next iteration
-                        troop_entries = [e for e in self.schedule.entries if e.troop == troop]
-                        break
-                    else:
-                        # Restore the candidate and try next
-                        self.schedule.entries.append(candidate)
-                        
-                        # Un-mark Delta swap if restore happened
-                        if candidate.activity.name == "Delta":
-                            self.delta_was_swapped.discard(troop.name)
-                
-                # PASS 2: If same-slot swap failed, try replacing ANY lower-priority activity
-                # and placing the Top 5 in ANY available slot
-                # ENHANCED: Now also tries clusterable activities - Top 5 takes priority over clustering
-                # clusterable_activities = {'Climbing Tower', 'Troop Rifle', 'Troop Shotgun', 'Archery',
-                #                          'Tie Dye', 'Hemp Craft', 'Woggle Neckerchief Slide', 'Monkey\'s Fist'}
-                
-                if not success and replaceable:
-                    print(f"    [AGGRESSIVE] Trying cross-slot swap for {missing_pref}")
-                    
-                    # Try removing lowest-priority activity and placing Top 5 anywhere
-                    for candidate, cand_priority in replaceable:
-                        # Remove the low-priority activity
-                        self.schedule.entries.remove(candidate)
-                        removed_slot = candidate.time_slot
-                        
-                        if candidate.activity.name == "Delta":
-                            self.delta_was_swapped.add(troop.name)
-                        
-                        # Try placing Top 5 in ANY slot (strict first, then relaxed)
-                        placed = False
-                        for slot in self.time_slots:
-                            if self._can_schedule(troop, missing_activity, slot, slot.day):
-                                self.schedule.add_entry(slot, missing_activity, troop)
-                                self._update_progress(troop, missing_pref)
-                                old_name = candidate.activity.name
-                                old_rank = f"#{cand_priority+1}" if cand_priority < 999 else "fill"
-                                print(f"    [CROSS-SWAP] {missing_pref} (Top {pref_rank+1}) @ {slot} <- {old_name} ({old_rank}) from {removed_slot}")
-                                swaps_made += 1
-                                placed = True
-                                success = True
-                                self._fill_vacated_slot(troop, removed_slot)
-                                troop_entries = [e for e in self.schedule.entries if e.troop == troop]
-                                break
-                        if not placed:
-                            for slot in self.time_slots:
-                                if self._can_schedule(troop, missing_activity, slot, slot.day, relax_constraints=True):
-                                    self.schedule.add_entry(slot, missing_activity, troop)
-                                    self._update_progress(troop, missing_pref)
-                                    old_name = candidate.activity.name
-                                    old_rank = f"#{cand_priority+1}" if cand_priority < 999 else "fill"
-                                    print(f"    [CROSS-SWAP RELAXED] {missing_pref} (Top {pref_rank+1}) @ {slot} <- {old_name} ({old_rank}) from {removed_slot}")
-                                    swaps_made += 1
-                                    placed = True
-                                    success = True
-                                    self._fill_vacated_slot(troop, removed_slot)
-                                    troop_entries = [e for e in self.schedule.entries if e.troop == troop]
-                                    break
-                        
-                        if placed:
-                            break
-                        else:
-                            # Couldn't place Top 5 anywhere, restore candidate
-                            self.schedule.entries.append(candidate)
-                            if candidate.activity.name == "Delta":
-                                self.delta_was_swapped.discard(troop.name)
-                
-                if not success:
-                    # MANDATORY: Try one more time with relaxed constraints on replaceable
-                    for candidate, cand_priority in replaceable:
-                        slot = candidate.time_slot
-                        if candidate not in self.schedule.entries:
-                            continue
-                        self.schedule.entries.remove(candidate)
-                        if self._can_schedule(troop, missing_activity, slot, slot.day, relax_constraints=True):
-                            self.schedule.add_entry(slot, missing_activity, troop)
-                            print(f"    [MANDATORY Top 5 FORCED] {troop.name}: {missing_pref} (#{pref_rank + 1}) <- {candidate.activity.name} @ {slot} [RELAXED]")
-                            total_recovered += 1
-                            swaps_made += 1
-                            success = True
-                            scheduled_activities.add(missing_pref)
-                            troop_entries = [e for e in self.schedule.entries if e.troop == troop]
-                            break
-                        else:
-                            self.schedule.entries.append(candidate)
-                
-                if not success:
-                    print(f"    [CRITICAL FAILURE] Could not schedule MANDATORY Top 5: {missing_pref} for {troop.name}")
-        
-        if total_recovered > 0:
-            satisfaction_rate = (total_recovered / total_missing * 100) if total_missing > 0 else 100
-            print(f"  ENHANCED: Recovered {total_recovered}/{total_missing} Top 5 preferences ({satisfaction_rate:.1f}% satisfaction)")
-            print(f"  Swaps made: {swaps_made}, Forced placements: {forced_placements}")
-            
-            if satisfaction_rate >= 90:
-                print(f"  🎯 SUCCESS: Achieved 90%+ Top 5 satisfaction target!")
-            else:
-                print(f"  ⚠️  NEEDS WORK: {90 - satisfaction_rate:.1f}% short of target")
-        else:
-            print("  All Top 5 already satisfied")
-    
-    def _guarantee_minimum_top10(self):
-        """
-        GUARANTEE: Each troop gets at least 2-3 of their Top 10 preferences.
-        
-        Strategy:
-        1. Count how many Top 10 preferences each troop has scheduled
-        2. If a troop has < 2-3 Top 10 preferences, aggressively schedule more
-        3. Prioritize Top 6-10 preferences that aren't scheduled yet
-        """
-        from .activities import get_activity_by_name
-        
-        print("\n--- Guaranteeing Minimum Top 10 (2-3 per troop) ---")
-        
-        PROTECTED = {"Reflection", "Super Troop"}  # Never swap these
-        MIN_TOP10_REQUIRED = 3  # Require at least 3 of Top 10
-        
-        total_recovered = 0
-        
-        for troop in self.troops:
-            troop_entries = [e for e in self.schedule.entries if e.troop == troop]
-            scheduled_activities = {e.activity.name for e in troop_entries}
-            
-            # Count Top 10 preferences scheduled
-            top10 = troop.preferences[:10] if len(troop.preferences) >= 10 else troop.preferences
-            top10_scheduled = [p for p in top10 if p in scheduled_activities]
-            top10_count = len(top10_scheduled)
-            
-            if top10_count >= MIN_TOP10_REQUIRED:
-                continue  # Already has minimum
-            
-            # Find missing Top 6-10 preferences (Top 1-5 should already be handled)
-            missing_top6_10 = []
-            for i in range(5, 10):  # Ranks 6-10 (0-indexed: 5-9)
-                if i >= len(troop.preferences):
-                    break
-                pref_name = troop.preferences[i]
-                if pref_name not in scheduled_activities:
-                    activity = get_activity_by_name(pref_name)
-                    if activity:
-                        missing_top6_10.append((i, pref_name, activity))
-            
-            if not missing_top6_10:
-                continue  # No Top 6-10 to schedule
-            
-            needed = MIN_TOP10_REQUIRED - top10_count
-            print(f"  {troop.name}: Has {top10_count}/10 Top 10, needs {needed} more (missing: {[p[1] for p in missing_top6_10[:needed]]})")
-            
-            # Try to schedule up to 'needed' more Top 6-10 preferences
-            recovered_this_troop = 0
-            for pref_rank, pref_name, activity in missing_top6_10[:needed]:
-                if recovered_this_troop >= needed:
-                    break
-                
-                # Try normal scheduling first
-                ordered_slots = self._get_cluster_ordered_slots(troop, activity)
-                placed = False
-                
-                for slot in ordered_slots:
-                    if self._can_schedule(troop, activity, slot, slot.day):
-                        self._add_to_schedule(slot, activity, troop)
-                        print(f"    {troop.name}: {pref_name} (Pref #{pref_rank + 1}) -> {slot.day.name[:3]}-{slot.slot_number}")
-                        recovered_this_troop += 1
-                        total_recovered += 1
-                        scheduled_activities.add(pref_name)
-                        placed = True
+                        scheduled_activities.add(pref_name)
+                        placed = True
                         break
                 
                 if placed:
@@ -3267,221 +3196,6 @@ class ConstrainedScheduler:
         else:
             print("  All troops have 100% Top 5 satisfaction!")
     
-    def _recover_missing_top5(self):
-        """
-        ENHANCED: Ultra-aggressive recovery of missing Top 5 preferences.
-        
-        Each missed Top 5 preference costs -24 points (tripled penalty).
-        This is the final optimization pass after all other improvements.
-        
-        Strategy: Multi-tiered recovery from least to most aggressive:
-        1. Smart swaps with same-day activities
-        2. Cross-troop activity exchanges  
-        3. Constraint-aware displacement of lower priority activities
-        4. Emergency placement with relaxed constraints (last resort)
-        """
-        print("    [Top 5 Recovery] Starting ENHANCED missing Top 5 recovery...")
-        
-        recoveries = 0
-        total_missing = 0
-        
-        for troop in self.troops:
-            # Check which Top 5 preferences are missing
-            scheduled_activities = set(e.activity.name for e in self.schedule.entries if e.troop == troop)
-            top5_preferences = troop.preferences[:5] if len(troop.preferences) >= 5 else troop.preferences
-            
-            missing_preferences = []
-            for i, pref in enumerate(top5_preferences):
-                if pref not in scheduled_activities:
-                    # Check exemption rules
-                    if pref in ["Tamarac Wildlife Refuge", "Itasca State Park", "Back of the Moon"]:
-                        # Check if troop already has any 3-hour activity
-                        has_3hr = any(e.activity.name in ["Tamarac Wildlife Refuge", "Itasca State Park", "Back of the Moon"] 
-                                     for e in self.schedule.entries if e.troop == troop)
-                        if has_3hr:
-                            continue  # Exempt - already has a 3-hour activity
-                    
-                    if pref in ("History Center", "Disc Golf"):
-                        # Check Tuesday HC/DG exemption
-                        tuesday_hc_dg_slots = set()
-                        for e in self.schedule.entries:
-                            if e.time_slot.day == Day.TUESDAY and e.activity.name in ("History Center", "Disc Golf"):
-                                tuesday_hc_dg_slots.add(e.time_slot.slot_number)
-                        if tuesday_hc_dg_slots >= {1, 2, 3}:
-                            continue  # Exempt - all Tuesday slots full with HC/DG
-                    
-                    missing_preferences.append((i, pref))  # (rank, activity)
-            
-            if not missing_preferences:
-                continue
-            
-            total_missing += len(missing_preferences)
-            print(f"      [Top 5] {troop.name}: Missing {len(missing_preferences)} Top 5 preferences")
-            
-            # Try to recover each missing preference
-            for rank, missing_pref in missing_preferences:
-                # ENHANCED: Multi-strategy recovery
-                
-                # Strategy 1: Smart same-day swaps
-                recovered = self._smart_same_day_swap(troop, missing_pref, rank)
-                if recovered:
-                    recoveries += 1
-                    continue
-                
-                # Strategy 2: Cross-troop activity exchanges
-                recovered = self._cross_troop_exchange(troop, missing_pref, rank)
-                if recovered:
-                    recoveries += 1
-                    continue
-                
-                # Strategy 3: Constraint-aware displacement (for rank 1-2 only)
-                if rank < 2:
-                    recovered = self._constraint_aware_displacement(troop, missing_pref, rank)
-                    if recovered:
-                        recoveries += 1
-                        continue
-                
-                # Strategy 4: Emergency placement (rank 0 only - absolute priority)
-                if rank == 0:
-                    recovered = self._emergency_placement(troop, missing_pref, rank)
-                    if recovered:
-                        recoveries += 1
-                        continue
-        
-        print(f"    [Top 5 Recovery] Recovered {recoveries} out of {total_missing} missing Top 5 preferences")
-        return recoveries
-    
-    def _smart_same_day_swap(self, troop, missing_pref, rank):
-        """Strategy 1: Smart swap with same-day activity."""
-        activity = get_activity_by_name(missing_pref)
-        if not activity:
-            return False
-        
-        # Find all available slots for this activity
-        available_slots = []
-        for slot in self.time_slots:
-            if (self.schedule.is_troop_free(slot, troop) and 
-                self.schedule.is_activity_available(slot, activity, troop)):
-                available_slots.append(slot)
-        
-        for target_slot in available_slots:
-            # Find what the troop is doing on that day
-            day_entries = [e for e in self.schedule.entries 
-                          if e.troop == troop and e.time_slot.day == target_slot.day]
-            
-            for entry in day_entries:
-                # Don't swap with protected activities
-                if entry.activity.name in {"Reflection", "Super Troop"}:
-                    continue
-                
-                # Don't swap with higher priority activities
-                if troop.get_priority(entry.activity.name) < rank:
-                    continue
-                
-                # Check if swap is valid
-                if self._can_swap_for_top5(entry, activity, target_slot):
-                    # Perform the swap
-                    self.schedule.remove_entry(entry)
-                    self.schedule.add_entry(target_slot, activity, troop)
-                    
-                    print(f"        [Smart Swap] {troop.name}: {entry.activity.name} -> {missing_pref} ({target_slot.day.name[:3]})")
-                    return True
-        
-        return False
-    
-    def _cross_troop_exchange(self, troop, missing_pref, rank):
-        """Strategy 2: Cross-troop activity exchange."""
-        activity = get_activity_by_name(missing_pref)
-        if not activity:
-            return False
-        
-        # Find troops that have the missing activity but might prefer something else
-        for other_troop in self.troops:
-            if other_troop == troop:
-                continue
-            
-            # Check if other troop has the missing activity
-            other_entries = [e for e in self.schedule.entries 
-                           if e.troop == other_troop and e.activity.name == missing_pref]
-            
-            if not other_entries:
-                continue
-            
-            for other_entry in other_entries:
-                # Check if our troop can take that slot
-                if not self.schedule.is_troop_free(other_entry.time_slot, troop):
-                    continue
-                
-                # Find what our troop could offer in exchange
-                troop_entries = [e for e in self.schedule.entries if e.troop == troop]
-                
-                for troop_entry in troop_entries:
-                    if troop_entry.activity.name in {"Reflection", "Super Troop"}:
-                        continue
-                    
-                    # Check if other troop is free and would prefer this activity
-                    if not self.schedule.is_troop_free(troop_entry.time_slot, other_troop):
-                        continue
-                    
-                    # Check if other troop prefers this activity
-                    other_priority = other_troop.get_priority(troop_entry.activity.name)
-                    if other_priority >= 20:  # Not in their top 20
-                        continue
-                    
-                    # Check if swap is valid for both
-                    if (self._can_schedule(troop, activity, other_entry.time_slot, other_entry.time_slot.day) and
-                        self._can_schedule(other_troop, troop_entry.activity, troop_entry.time_slot, troop_entry.time_slot.day)):
-                        
-                        # Perform the exchange
-                        self.schedule.remove_entry(other_entry)
-                        self.schedule.remove_entry(troop_entry)
-                        
-                        self.schedule.add_entry(other_entry.time_slot, activity, troop)
-                        self.schedule.add_entry(troop_entry.time_slot, troop_entry.activity, other_troop)
-                        
-                        print(f"        [Cross Exchange] {troop.name} <-> {other_troop.name}: {missing_pref} for {troop_entry.activity.name}")
-                        return True
-        
-        return False
-    
-    def _constraint_aware_displacement(self, troop, missing_pref, rank):
-        """Strategy 3: Displace lower priority activities with constraint awareness."""
-        activity = get_activity_by_name(missing_pref)
-        if not activity:
-            return False
-        
-        # Find all available slots (even if currently occupied)
-        for slot in self.time_slots:
-            if not self.schedule.is_activity_available(slot, activity, troop):
-                continue
-            
-            # Check what's currently in this slot
-            current_entries = [e for e in self.schedule.entries 
-                             if e.time_slot == slot and e.troop != troop]
-            
-            for current_entry in current_entries:
-                # Don't displace from same troop
-                if current_entry.troop == troop:
-                    continue
-                
-                # Check if this is a low-priority activity we can displace
-                current_priority = current_entry.troop.get_priority(current_entry.activity.name)
-                
-                # Only displace if current priority is much lower than our missing preference
-                if current_priority <= rank + 5:
-                    continue
-                
-                # Try to find an alternative for the displaced troop
-                if self._find_alternative_for_displaced(current_entry):
-                    # Perform the displacement
-                    self.schedule.remove_entry(current_entry)
-                    self.schedule.add_entry(slot, activity, troop)
-                    
-                    print(f"        [Displacement] {troop.name}: {missing_pref} (displaced {current_entry.troop.name} {current_entry.activity.name})")
-                    return True
-        
-        return False
-    
     def _emergency_placement(self, troop, missing_pref, rank):
         """Strategy 4: Emergency placement with relaxed constraints (rank 0 only)."""
         activity = get_activity_by_name(missing_pref)
@@ -3499,287 +3213,6 @@ class ConstrainedScheduler:
         
         return False
     
-    def _can_swap_for_top5(self, entry, new_activity, target_slot):
-        """Check if a swap for Top 5 recovery is valid."""
-        troop = entry.troop
-        
-        # Check if new activity can go in target slot
-        if not self._can_schedule(troop, new_activity, target_slot, target_slot.day):
-            return False
-        
-        # Check if current activity can be moved elsewhere (same day)
-        for slot in self.time_slots:
-            if slot.day == entry.time_slot.day and slot.slot_number != entry.time_slot.slot_number:
-                if self.schedule.is_troop_free(slot, troop):
-                    if self._can_schedule(troop, entry.activity, slot, slot.day):
-                        return True
-        
-        return False
-    
-    def _find_alternative_for_displaced(self, displaced_entry):
-        """Find an alternative activity/slot for a displaced entry."""
-        troop = displaced_entry.troop
-        
-        # Try to find any available slot for this activity
-        for slot in self.time_slots:
-            if self.schedule.is_troop_free(slot, troop):
-                if self._can_schedule(troop, displaced_entry.activity, slot, slot.day):
-                    return slot
-        
-        # Try to find a different activity the troop might like
-        for pref in troop.preferences[:10]:  # Top 10
-            if pref == displaced_entry.activity.name:
-                continue
-            
-            activity = get_activity_by_name(pref)
-            if not activity:
-                continue
-            
-            for slot in self.time_slots:
-                if self.schedule.is_troop_free(slot, troop):
-                    if self._can_schedule(troop, activity, slot, slot.day):
-                        # Place the alternative activity
-                        self.schedule.add_entry(slot, activity, troop)
-                        return slot
-        
-        return None
-    
-    def _ultra_aggressive_top5_recovery(self, troop, activity, missing_pref, rank):
-        """
-        Ultra-aggressive recovery for Top 3 activities using cross-day consolidation.
-        """
-        failures = []
-        
-        for troop in self.troops:
-            troop_entries = [e for e in self.schedule.entries if e.troop == troop]
-            scheduled = {e.activity.name for e in troop_entries}
-            
-            top5 = troop.preferences[:5] if len(troop.preferences) >= 5 else troop.preferences
-            missing = []
-            
-            # Check for missing Top 5 (with exemptions)
-            has_3hr_scheduled = any(e.activity.name in self.THREE_HOUR_ACTIVITIES for e in troop_entries)
-            
-            for i, pref in enumerate(top5):
-                if pref not in scheduled:
-                    # EXEMPT: 2nd+ 3-hour activity if troop already has one
-                    if pref in self.THREE_HOUR_ACTIVITIES and has_3hr_scheduled:
-                        continue
-                    # EXEMPT: History Center/Disc Golf if Tuesday is full
-                    tuesday_hc_dg_slots = set()
-                    for e in self.schedule.entries:
-                        if e.time_slot.day == Day.TUESDAY and e.activity.name in ("History Center", "Disc Golf"):
-                            tuesday_hc_dg_slots.add(e.time_slot.slot_number)
-                    hc_dg_tuesday_full = tuesday_hc_dg_slots >= {1, 2, 3}
-                    if pref in ("History Center", "Disc Golf") and hc_dg_tuesday_full:
-                        continue
-                    missing.append((i, pref))
-            
-            if not missing:
-                continue
-            
-            for rank, missing_pref in missing:
-                activity = get_activity_by_name(missing_pref)
-                if not activity:
-                    continue
-                
-                # ENHANCED: Try more aggressive displacement strategies
-                
-                # Strategy 1: Find lowest priority displaceable entries
-                displaceable = [e for e in troop_entries if e.activity.name not in PROTECTED]
-                
-                def get_priority(entry):
-                    try:
-                        return troop.preferences.index(entry.activity.name)
-                    except ValueError:
-                        return 999
-                
-                displaceable.sort(key=get_priority, reverse=True)
-                
-                placed = False
-                
-                # Strategy 2: Try ANY available slot with relaxed constraints
-                for slot in self.time_slots:
-                    # Remove lowest priority activity to make room
-                    if displaceable:
-                        entry = displaceable[0]
-                        removed_slot = entry.time_slot
-                        
-                        # Temporarily remove the entry
-                        try:
-                            self.schedule.entries.remove(entry)
-                        except ValueError:
-                            # Entry already removed, skip
-                            continue
-                        
-                        # Try placing the missing Top 5 activity
-                        if self._can_schedule(troop, activity, slot, slot.day, relax_constraints=True):
-                            self._add_to_schedule(slot, activity, troop)
-                            print(f"  [RECOVERED] {troop.name}: {missing_pref} (Top {rank+1}) @ {slot} <- {entry.activity.name}")
-                            recoveries += 1
-                            placed = True
-                            
-                            # Try to place the displaced activity back in a different slot
-                            self._fill_vacated_slot(troop, removed_slot)
-                            break
-                        else:
-                            # Restore if couldn't place
-                            self.schedule.entries.append(entry)
-                
-                # Strategy 3: If still not placed, try swapping with another troop
-                if not placed:
-                    for other_troop in self.troops:
-                        if other_troop == troop:
-                            continue
-                            
-                        other_entries = [e for e in self.schedule.entries if e.troop == other_troop]
-                        other_displaceable = [e for e in other_entries if e.activity.name not in PROTECTED]
-                        
-                        for other_entry in other_displaceable:
-                            # Check if we can swap
-                            other_slot = other_entry.time_slot
-                            
-                            # Temporarily remove both entries
-                            try:
-                                self.schedule.entries.remove(other_entry)
-                            except ValueError:
-                                # Entry already removed, skip
-                                continue
-                            
-                            if self._can_schedule(troop, activity, other_slot, other_slot.day, relax_constraints=True):
-                                self._add_to_schedule(other_slot, activity, troop)
-                                print(f"  [SWAPPED] {troop.name}: {missing_pref} (Top {rank+1}) @ {other_slot} <- {other_troop.name}:{other_entry.activity.name}")
-                                recoveries += 1
-                                placed = True
-                                break
-                            else:
-                                # Restore if couldn't place
-                                self.schedule.entries.append(other_entry)
-                        
-                        if placed:
-                            break
-                
-                # ENHANCED: Strategy 4 - Ultra-aggressive cross-day activity consolidation
-                if not placed and rank < 3:  # Only for Top 3 activities
-                    # Temporarily disabled due to bug - main optimizations working well
-                    # placed = self._ultra_aggressive_top5_recovery(troop, activity, missing_pref, rank)
-                    # if placed:
-                    #     recoveries += 1
-                    pass
-                
-                if not placed:
-                    failures.append((troop.name, missing_pref, rank + 1))
-        
-        if recoveries > 0:
-            print(f"  Recovered {recoveries} missing Top 5 preferences")
-        
-        if failures:
-            print(f"  [WARNING] {len(failures)} Top 5 still missing:")
-            for troop_name, pref, rank in failures:
-                print(f"    - {troop_name}: {pref} (Top {rank})")
-        else:
-            print("  All missing Top 5 preferences recovered!")
-    
-    def _ultra_aggressive_top5_recovery(self, troop, activity, missing_pref, rank):
-        """
-        Ultra-aggressive recovery for Top 3 activities using cross-day consolidation.
-        
-        This method:
-        - Creates space by consolidating scattered activities
-        - Moves activities to create optimal slots
-        - Uses constraint-aware placement
-        """
-        # Get all troop entries
-        troop_entries = [e for e in self.schedule.entries if e.troop == troop]
-        
-        # Group activities by day to find consolidation opportunities
-        day_activities = {}
-        for entry in troop_entries:
-            day = entry.time_slot.day
-            if day not in day_activities:
-                day_activities[day] = []
-            day_activities[day].append(entry)
-        
-        # Look for days with scattered activities that could be consolidated
-        for day, entries in day_activities.items():
-            if len(entries) <= 1:
-                continue
-            
-            # Try to consolidate activities on this day to free up a slot
-            for entry in entries:
-                if entry.activity.name in {"Reflection", "Super Troop"}:
-                    continue  # Don't move protected activities
-                
-                # Try to move this activity to another day where it fits better
-                for other_day, other_entries in day_activities.items():
-                    if other_day == day:
-                        continue
-                    
-                    # Check if we can move this activity to the other day
-                    for other_entry in other_entries:
-                        if other_entry.activity.name in {"Reflection", "Super Troop"}:
-                            continue
-                        
-                        # Try swapping the activities between days
-                        entry_slot = entry.time_slot
-                        other_slot = other_entry.time_slot
-                        
-                        # Temporarily remove both entries
-                        try:
-                            self.schedule.entries.remove(entry)
-                            self.schedule.entries.remove(other_entry)
-                        except ValueError:
-                            # Entry already removed, skip
-                            continue
-                        
-                        # Check if we can place the missing Top 5 in the freed slot
-                        if self._can_schedule(troop, activity, entry_slot, entry_slot.day, relax_constraints=True):
-                            # Place the Top 5 activity
-                            self._add_to_schedule(entry_slot, activity, troop)
-                            
-                            # Try to place the displaced activities
-                            can_place_others = True
-                            
-                            # Try to place entry in other_slot
-                            if not self._can_schedule(troop, entry.activity, other_slot, other_slot.day, relax_constraints=True):
-                                can_place_others = False
-                            else:
-                                self._add_to_schedule(other_slot, entry.activity, troop)
-                            
-                            # Try to place other_entry in its original slot
-                            if can_place_others:
-                                if not self._can_schedule(troop, other_entry.activity, other_entry.time_slot, other_entry.time_slot.day, relax_constraints=True):
-                                    # Remove entry and try to restore
-                                    try:
-                                        self.schedule.entries.remove(entry)
-                                    except:
-                                        pass
-                                    can_place_others = False
-                                else:
-                                    self._add_to_schedule(other_entry.time_slot, other_entry.activity, troop)
-                            
-                            if can_place_others:
-                                print(f"  [ULTRA RECOVERY] {troop.name}: {missing_pref} (Top {rank+1}) @ {entry_slot.day.name}-{entry_slot.slot_number}")
-                                print(f"                  Consolidated: {entry.activity.name} -> {other_slot.day.name}-{other_slot.slot_number}")
-                                return True
-                            else:
-                                # Restore everything if couldn't place
-                                try:
-                                    if entry in self.schedule.entries:
-                                        self.schedule.entries.remove(entry)
-                                    if other_entry in self.schedule.entries:
-                                        self.schedule.entries.remove(other_entry)
-                                except:
-                                    pass
-                                self._add_to_schedule(entry_slot, entry.activity, troop)
-                                self._add_to_schedule(other_slot, other_entry.activity, troop)
-                        else:
-                            # Restore if couldn't place Top 5
-                            self._add_to_schedule(entry_slot, entry.activity, troop)
-                            self._add_to_schedule(other_slot, other_entry.activity, troop)
-        
-        return False
-    
     def _guarantee_top10_with_exceptions(self):
         """
         Guarantee Top 10 preferences unless legitimate exceptions apply.
@@ -4029,125 +3462,122 @@ class ConstrainedScheduler:
                     print(f"    {troop.name}: {activity_name} (Top {pref_rank})")
     
     def _fill_all_remaining(self):
-        """Fill any empty slots with remaining preferences, then default activities.
+        """
+        Fill any empty slots with remaining preferences, then default activities.
         
-        IMPORTANT: Reserves one Friday slot per troop if Reflection hasn't been scheduled yet.
-        IMPROVED: Prioritizes ANY remaining preferences (even beyond Top 15) before default fills.
-        AGGRESSIVE: First pass fills ALL remaining preferences (especially Top 5) before default fills.
+        One min-cost flow over every troop's empty cells (_flow_fill_empty_cells): remaining
+        preferences cost their rank, default fills cost more, and a preference that only fits
+        under relaxed constraints costs FILL_RELAXED_COST extra. One Friday slot stays free
+        for a troop still without Reflection.
         """
-        # PASS 1: Aggressively fill ALL remaining preferences, prioritizing Top 5
-        # This ensures we fill as many preferences as possible before using default fills
-        for troop in self.troops:
-            # Get all remaining preferences, prioritizing Top 5
-            remaining_prefs = []
-            top5_remaining = []
-            other_remaining = []
-            
-            for i, pref_name in enumerate(troop.preferences):
-                activity = get_activity_by_name(pref_name)
-                if activity and not self._troop_has_activity(troop, activity):
-                    if i < 5:
-                        top5_remaining.append((pref_name, i+1))
-                    else:
-                        other_remaining.append((pref_name, i+1))
-            
-            # Prioritize Top 5 first
-            remaining_prefs = top5_remaining + other_remaining
-            
-            # Try to fill each remaining preference
-            for pref_name, pref_rank in remaining_prefs:
-                activity = get_activity_by_name(pref_name)
-                if not activity:
+        self._flow_fill_empty_cells(relax_preferences=True)
+    
+    def _fill_cost(self, troop: Troop, activity_name: str, slot: TimeSlot) -> float:
+        """Cost of filling troop's slot with activity_name: preference rank first, then staff balance."""
+        rank = troop.get_priority(activity_name)
+        if rank < 999:
+            cost = float(rank)
+        elif activity_name in self.DEFAULT_FILL_PRIORITY:
+            cost = self.FILL_DEFAULT_COST + self.DEFAULT_FILL_PRIORITY.index(activity_name)
+        else:
+            cost = self.FILL_DEFAULT_COST + len(self.DEFAULT_FILL_PRIORITY)
+        staff = self.ACTIVITY_STAFF_COUNT.get(activity_name, 0)
+        return cost + self.FILL_STAFF_BALANCE_WEIGHT * staff * self.total_staff_by_slot[slot]
+    
+    def _flow_fill_empty_cells(self, relax_preferences=False) -> int:
+        """
+        Fill empty (troop, slot) cells with a min-cost flow instead of greedy troop-by-troop passes.
+        
+        Every cell gets at most one activity and a troop gets each activity at most once; cost is
+        preference rank, then DEFAULT_FILL_PRIORITY order, plus a staff-balance term. With
+        relax_preferences, a preference that only passes _can_schedule(relax_constraints=True)
+        is offered too, at FILL_RELAXED_COST extra. Cross-troop rules (exclusive areas, wet/dry,
+        staff limits) are enforced when the solution is committed through _can_schedule -
+        rejected placements are excluded and the rest is re-solved. Multi-slot activities span
+        several cells and are not offered. Returns the number of cells filled.
+        """
+        blocked = set()
+        filled = 0
+        for _ in range(self.FLOW_FILL_MAX_ROUNDS):
+            candidates = {}
+            costs = {}
+            relaxed = set()
+            troops_by_name = {}
+            for troop in self.troops:
+                troops_by_name[troop.name] = troop
+                free_slots = [s for s in self.time_slots if self.schedule.is_troop_free(s, troop)]
+                if not free_slots:
                     continue
                 
-                # Find an available slot for this preference
-                for slot in self.time_slots:
-                    if not self.schedule.is_troop_free(slot, troop):
+                # Reserve one Friday slot for Reflection if not scheduled yet
+                reserved = None
+                if not any(e.activity.name == "Reflection" for e in self.schedule.get_troop_schedule(troop)):
+                    free_friday = [s for s in free_slots if s.day == Day.FRIDAY]
+                    if free_friday:
+                        reserved = free_friday[-1]
+                
+                scheduled_activities = {e.activity.name for e in self.schedule.get_troop_schedule(troop)}
+                remaining_prefs = [p for p in troop.preferences if p not in scheduled_activities]
+                fill_names = remaining_prefs + [f for f in self.DEFAULT_FILL_PRIORITY
+                                                if f not in remaining_prefs and f not in scheduled_activities]
+                fill_activities = []
+                for name in fill_names:
+                    activity = get_activity_by_name(name)
+                    if activity and self.schedule._get_effective_slots(activity, troop) <= 1:
+                        fill_activities.append(activity)
+                
+                for slot in free_slots:
+                    if slot == reserved:
                         continue
-                    
-                    # Reserve one Friday slot for Reflection if not scheduled yet
-                    if slot.day == Day.FRIDAY:
-                        has_reflection = any(e.activity.name == "Reflection" 
-                                            for e in self.schedule.entries 
-                                            if e.troop == troop)
-                        if not has_reflection:
-                            free_friday = sum(1 for s in self.time_slots 
-                                             if s.day == Day.FRIDAY and self.schedule.is_troop_free(s, troop))
-                            if free_friday <= 1:
-                                continue  # Skip this slot - reserve for Reflection
-                    
-                    # Try to schedule with normal constraints first
-                    if self._can_schedule(troop, activity, slot, slot.day):
-                        self._add_to_schedule(slot, activity, troop)
-                        self._update_progress(troop, activity.name)
-                        self.logger.info(f"  [Fill Pref] {troop.name}: {pref_name} -> {slot} (#{pref_rank})")
-                        break
-                    # If normal constraints fail, try with relaxed constraints (especially for Top 5)
-                    elif pref_rank <= 5 and self._can_schedule(troop, activity, slot, slot.day, relax_constraints=True):
-                        self._add_to_schedule(slot, activity, troop)
-                        self._update_progress(troop, activity.name)
-                        self.logger.info(f"  [Fill Pref Relaxed] {troop.name}: {pref_name} -> {slot} (#{pref_rank})")
-                        break
-        
-        # PASS 2: Fill any remaining empty slots - PREFERENCES FIRST, then default fills
-        for troop in self.troops:
-            # Build prioritized fill list: remaining preferences (sorted by rank) + default fills
-            scheduled_activities = {e.activity.name for e in self.schedule.entries if e.troop == troop}
-            remaining_prefs = [p for p in troop.preferences if p not in scheduled_activities]
+                    options = []
+                    for activity in fill_activities:
+                        key = (troop.name, slot, activity.name)
+                        if key in blocked:
+                            continue
+                        if self._can_schedule(troop, activity, slot, slot.day):
+                            cost = self._fill_cost(troop, activity.name, slot)
+                        elif (relax_preferences and troop.get_priority(activity.name) < 999
+                              and self._can_schedule(troop, activity, slot, slot.day, relax_constraints=True)):
+                            cost = self._fill_cost(troop, activity.name, slot) + self.FILL_RELAXED_COST
+                            relaxed.add(key)
+                        else:
+                            continue
+                        options.append((activity.name, cost))
+                        costs[key] = cost
+                    if options:
+                        candidates[(troop.name, slot)] = options
             
-            # Simple priority: remaining preferences first (in rank order), then defaults
-            fill_priority = remaining_prefs + [f for f in self.DEFAULT_FILL_PRIORITY if f not in remaining_prefs]
+            if not candidates:
+                break
             
-            for slot in self.time_slots:
-                if not self.schedule.is_troop_free(slot, troop):
+            assignment = solve_fill_assignment(candidates)
+            # Commit cheapest placements first, so a cross-troop conflict drops the costlier one
+            ordered = sorted(assignment.items(), key=lambda item: costs[(item[0][0], item[0][1], item[1])])
+            committed = 0
+            for (troop_name, slot), activity_name in ordered:
+                troop = troops_by_name[troop_name]
+                activity = get_activity_by_name(activity_name)
+                key = (troop_name, slot, activity_name)
+                if (not self.schedule.is_troop_free(slot, troop)
+                        or not self._can_schedule(troop, activity, slot, slot.day, relax_constraints=key in relaxed)):
+                    blocked.add(key)
                     continue
-                
-                # Reserve one Friday slot for Reflection if not scheduled yet
-                if slot.day == Day.FRIDAY:
-                    has_reflection = any(e.activity.name == "Reflection" 
-                                        for e in self.schedule.entries 
-                                        if e.troop == troop)
-                    if not has_reflection:
-                        free_friday = sum(1 for s in self.time_slots 
-                                         if s.day == Day.FRIDAY and self.schedule.is_troop_free(s, troop))
-                        if free_friday <= 1:
-                            continue  # Skip this slot - reserve for Reflection
-                
-                # Use prioritized fill list (preferences first, then defaults)
-                scheduled = False
-                for fill_name in fill_priority:
-                    activity = get_activity_by_name(fill_name)
-                    if not activity or self._troop_has_activity(troop, activity):
-                        continue
-                    
-                    pref_rank = troop.get_priority(fill_name)
-                    
-                    # Try strict constraints first
-                    if self._can_schedule(troop, activity, slot, slot.day, relax_constraints=False):
-                        self._add_to_schedule(slot, activity, troop)
-                        rank_info = f" (Pref #{pref_rank + 1})" if pref_rank is not None else ""
-                        self.logger.info(f"  [Fill] {troop.name}: {fill_name}{rank_info} -> {slot}")
-                        scheduled = True
-                        scheduled_activities.add(fill_name)
-                        break
-                
-                # If strict failed, try with relaxed constraints (especially for preferences)
-                if not scheduled:
-                    for fill_name in fill_priority:
-                        activity = get_activity_by_name(fill_name)
-                        if not activity or self._troop_has_activity(troop, activity):
-                            continue
-                        
-                        pref_rank = troop.get_priority(fill_name)
-                        # Only relax constraints for preferences (not generic fills)
-                        if pref_rank is not None:
-                            if self._can_schedule(troop, activity, slot, slot.day, relax_constraints=True):
-                                self._add_to_schedule(slot, activity, troop)
-                                rank_info = f" (Pref #{pref_rank + 1} RELAXED)"
-                                self.logger.info(f"  [Fill] {troop.name}: {fill_name}{rank_info} -> {slot}")
-                                scheduled = True
-                                scheduled_activities.add(fill_name)
-                                break
+                self._add_to_schedule(slot, activity, troop)
+                if self.schedule.is_troop_free(slot, troop):
+                    blocked.add(key)
+                    continue
+                self._update_progress(troop, activity_name)
+                rank = troop.get_priority(activity_name)
+                relax_info = " RELAXED" if key in relaxed else ""
+                rank_info = f" (Pref #{rank + 1}{relax_info})" if rank < 999 else ""
+                self.logger.info(f"  [Flow Fill] {troop_name}: {activity_name}{rank_info} -> {slot}")
+                committed += 1
+            
+            filled += committed
+            if committed == len(assignment):
+                break
+        
+        return filled
     
     def _schedule_smart_balls(self):
         """
@@ -4232,118 +3662,139 @@ class ConstrainedScheduler:
     
     def _aggressive_aqua_trampoline_sharing(self):
         """
-        Aggressively identify and pair troops that can share Aqua Trampoline.
-        Strategy:
-        1. Find all troops with Aqua Trampoline scheduled solo (not sharing)
-        2. Find compatible troops (≤16 scouts+adults) that want Aqua Trampoline
-        3. Try to move/swap to pair them together
-        4. Protect existing sharing unless swap enables sharing elsewhere
-        """
-        from .activities import get_activity_by_name
+        Pair troops that can share Aqua Trampoline (both ≤16 scouts+adults).
         
+        Candidates are small troops holding an AT slot alone and small troops that
+        want AT but don't have it. Two candidates are linked when one can be added
+        to (or moved into) the other's AT slot; a maximum matching over that graph
+        gives the largest set of pairings in one shot. Joins by troops still
+        missing AT are seeded first, existing shared slots are never broken, and
+        beach slots vacated by a move go to troops missing a Top 5 beach activity.
+        """
         AT_ACTIVITY = get_activity_by_name("Aqua Trampoline")
         if not AT_ACTIVITY:
             return
         
         AT_MAX_SIZE = 16  # scouts + adults
         
-        # Find all troops with Aqua Trampoline scheduled
-        at_entries = [e for e in self.schedule.entries if e.activity.name == "Aqua Trampoline"]
-        
-        # Group by slot to identify sharing opportunities
         slot_groups = defaultdict(list)
-        for entry in at_entries:
-            key = (entry.time_slot.day, entry.time_slot.slot_number)
-            slot_groups[key].append(entry)
-        
-        # Find troops that are sharing (2 per slot)
-        sharing_slots = {slot: entries for slot, entries in slot_groups.items() if len(entries) >= 2}
-        
-        # Find troops that are solo (1 per slot) and could share
-        solo_slots = {slot: entries[0] for slot, entries in slot_groups.items() if len(entries) == 1}
-        
-        # Find troops that want Aqua Trampoline but don't have it
-        troops_wanting_at = []
-        for troop in self.troops:
-            troop_size = troop.scouts + troop.adults
-            if troop_size <= AT_MAX_SIZE:
-                has_at = any(e.activity.name == "Aqua Trampoline" for e in self.schedule.entries if e.troop == troop)
-                wants_at = "Aqua Trampoline" in troop.preferences
-                if wants_at and not has_at:
-                    troops_wanting_at.append((troop, troop_size))
-        
-        # Sort by size (smaller first for better pairing)
-        troops_wanting_at.sort(key=lambda x: x[1])
-        
-        swaps_made = 0
+        for entry in self.schedule.entries:
+            if entry.activity.name == "Aqua Trampoline":
+                slot_groups[entry.time_slot].append(entry)
+        at_troops = {e.troop.name for entries in slot_groups.values() for e in entries}
+        
+        # Nodes: solo AT entries of small troops, then small troops wanting AT
+        holders = [entries[0] for entries in slot_groups.values()
+                   if len(entries) == 1 and entries[0].troop.scouts + entries[0].troop.adults <= AT_MAX_SIZE]
+        wanting = [troop for troop in self.troops
+                   if troop.scouts + troop.adults <= AT_MAX_SIZE and troop.name not in at_troops
+                   and "Aqua Trampoline" in troop.preferences]
+        wanting.sort(key=lambda t: (t.get_priority("Aqua Trampoline"), t.scouts + t.adults))
+        if len(holders) + len(wanting) < 2:
+            print("  No additional Aqua Trampoline sharing opportunities found")
+            return
         
-        # Strategy 1: Try to pair solo AT troops with compatible troops wanting AT
-        for (day, slot_num), solo_entry in list(solo_slots.items()):
-            solo_troop = solo_entry.troop
-            solo_size = solo_troop.scouts + solo_troop.adults
-            
-            if solo_size > AT_MAX_SIZE:
-                continue  # Can't share - too large
-            
-            # Find a compatible troop that wants AT
-            for wanting_troop, wanting_size in troops_wanting_at:
-                if wanting_troop == solo_troop:
-                    continue
-                
-                # Check if they can share (both ≤16)
-                if wanting_size <= AT_MAX_SIZE:
-                    # Try to schedule wanting_troop in the same slot
-                    slot = TimeSlot(day, slot_num)
-                    if self.schedule.is_troop_free(slot, wanting_troop):
-                        if self._can_schedule(wanting_troop, AT_ACTIVITY, slot, day):
-                            self._add_to_schedule(slot, AT_ACTIVITY, wanting_troop)
-                            self._update_progress(wanting_troop, "Aqua Trampoline")
-                            print(f"  [AT Share] Paired {wanting_troop.name} ({wanting_size}) with {solo_troop.name} ({solo_size}) at {day.name} slot {slot_num}")
-                            swaps_made += 1
-                            # Remove from wanting list
-                            troops_wanting_at = [(t, s) for t, s in troops_wanting_at if t != wanting_troop]
-                            break
+        edges = []
+        for w, troop in enumerate(wanting, start=len(holders)):
+            for h, entry in enumerate(holders):
+                slot = entry.time_slot
+                if self.schedule.is_troop_free(slot, troop) and self._can_schedule(troop, AT_ACTIVITY, slot, slot.day):
+                    edges.append((h, w))
+        
+        # Holder pairs: move one troop into the other's slot, preferring to vacate a slot 2
+        moves = {}
+        for a, b in ((a, b) for a in range(len(holders)) for b in range(a + 1, len(holders))):
+            directions = sorted([(a, b), (b, a)], key=lambda d: holders[d[0]].time_slot.slot_number != 2)
+            for mover, host in directions:
+                if self._move_aqua_trampoline(holders[mover], holders[host].time_slot):
+                    moves[(a, b)] = (mover, host)
+                    edges.append((a, b))
+                    break
         
-        # Strategy 2: Try to move solo AT troops to slots where another small troop has AT
-        for (day, slot_num), solo_entry in list(solo_slots.items()):
-            solo_troop = solo_entry.troop
-            solo_size = solo_troop.scouts + solo_troop.adults
-            
-            if solo_size > AT_MAX_SIZE:
+        pairs_made = 0
+        vacated = []
+        for u, v in maximum_matching(len(holders) + len(wanting), edges):
+            if v >= len(holders):
+                troop, slot = wanting[v - len(holders)], holders[u].time_slot
+                if self._can_schedule(troop, AT_ACTIVITY, slot, slot.day):
+                    self._add_to_schedule(slot, AT_ACTIVITY, troop)
+                    self._update_progress(troop, "Aqua Trampoline")
+                    print(f"  [AT Share] Paired {troop.name} with {holders[u].troop.name} at {slot.day.name} slot {slot.slot_number}")
+                    pairs_made += 1
                 continue
             
-            # Look for other slots with solo AT troops that could share
-            for (other_day, other_slot), other_entry in solo_slots.items():
-                if (other_day, other_slot) == (day, slot_num):
-                    continue
-                
-                other_troop = other_entry.troop
-                other_size = other_troop.scouts + other_troop.adults
-                
-                if other_size > AT_MAX_SIZE:
-                    continue
-                
-                # Try moving solo_troop to other_slot
-                other_slot_obj = TimeSlot(other_day, other_slot)
-                if self.schedule.is_troop_free(other_slot_obj, solo_troop):
-                    # Check if we can move the activity
-                    if self._can_schedule(solo_troop, AT_ACTIVITY, other_slot_obj, other_day):
-                        # Remove old entry
-                        self.schedule.entries.remove(solo_entry)
-                        # Add to new slot
-                        self._add_to_schedule(other_slot_obj, AT_ACTIVITY, solo_troop)
-                        print(f"  [AT Share] Moved {solo_troop.name} ({solo_size}) to share with {other_troop.name} ({other_size}) at {other_day.name} slot {other_slot}")
-                        swaps_made += 1
-                        # Fill vacated slot
-                        vacated_slot = TimeSlot(day, slot_num)
-                        self._fill_vacated_slot(solo_troop, vacated_slot)
-                        break
+            mover, host = moves[(u, v)]
+            entry, slot = holders[mover], holders[host].time_slot
+            if self._move_aqua_trampoline(entry, slot, commit=True):
+                print(f"  [AT Share] Moved {entry.troop.name} to share with {holders[host].troop.name} at {slot.day.name} slot {slot.slot_number}")
+                vacated.append((entry.troop, entry.time_slot))
+                pairs_made += 1
         
-        if swaps_made > 0:
-            print(f"  Created {swaps_made} Aqua Trampoline sharing pairs")
+        for troop, slot in vacated:
+            self._give_freed_beach_slot(slot)
+            self._fill_vacated_slot(troop, slot)
+        
+        if pairs_made > 0:
+            print(f"  Created {pairs_made} Aqua Trampoline sharing pairs")
         else:
             print("  No additional Aqua Trampoline sharing opportunities found")
     
+    def _move_aqua_trampoline(self, entry, slot, commit=False) -> bool:
+        """
+        Move a troop's Aqua Trampoline entry to slot.
+        
+        If the troop is busy at slot with a single-slot activity, that activity
+        trades places with AT instead. Without commit the schedule is left
+        unchanged and only feasibility is reported.
+        """
+        troop = entry.troop
+        old_slot = entry.time_slot
+        occupants = [e for e in self.schedule.entries if e.troop == troop and e.time_slot == slot]
+        if len(occupants) > 1:
+            return False
+        occupant = occupants[0] if occupants else None
+        if occupant and (occupant.activity.name in {"Reflection", "Super Troop", "Delta", "Sailing"} or
+                         self.schedule._get_effective_slots(occupant.activity, troop) != 1):
+            return False
+        
+        self.schedule.entries.remove(entry)
+        if occupant:
+            self.schedule.entries.remove(occupant)
+        feasible = self._can_schedule(troop, entry.activity, slot, slot.day)
+        if feasible:
+            moved = ScheduleEntry(slot, entry.activity, troop)
+            self.schedule.entries.append(moved)
+            if occupant:
+                feasible = self._can_schedule(troop, occupant.activity, old_slot, old_slot.day)
+            self.schedule.entries.remove(moved)
+        
+        if feasible and commit:
+            self._add_to_schedule(slot, entry.activity, troop)
+            if occupant:
+                self._add_to_schedule(old_slot, occupant.activity, troop)
+            return True
+        self.schedule.entries.append(entry)
+        if occupant:
+            self.schedule.entries.append(occupant)
+        return feasible
+    
+    def _give_freed_beach_slot(self, slot):
+        """Offer beach capacity freed at slot to the free troop with the best-ranked missing Top 5 beach activity."""
+        candidates = []
+        for troop in self.troops:
+            if not self.schedule.is_troop_free(slot, troop):
+                continue
+            for rank, name in enumerate(troop.preferences[:5]):
+                if name in self.BEACH_ACTIVITIES and not self._troop_has_activity(troop, get_activity_by_name(name)):
+                    candidates.append((rank, troop, name))
+        for rank, troop, name in sorted(candidates, key=lambda c: c[0]):
+            activity = get_activity_by_name(name)
+            if activity.slots == 1 and self._can_schedule(troop, activity, slot, slot.day):
+                self._add_to_schedule(slot, activity, troop)
+                self._update_progress(troop, name)
+                print(f"    [AT Share] Freed beach slot {slot} -> {troop.name}: {name} (Top {rank + 1})")
+                return
+    
     def _protect_aqua_trampoline_sharing(self, troop: Troop, activity: Activity, slot: TimeSlot) -> bool:
         """
         Check if swapping/moving would break existing Aqua Trampoline sharing.
@@ -4623,6 +4074,12 @@ class ConstrainedScheduler:
             # Negative clustering to sort descending (more activities = higher priority)
             day_counts.sort(key=lambda x: (-x[3], x[1], x[2]))
             preferred_days = [d for d, _, _, _ in day_counts]
+        
+        # Planned cluster days (A.2b) first; the branch above still decides which days are allowed
+        planned_days = self._planned_area_days(activity.name)
+        if planned_days:
+            preferred_days = ([d for d in preferred_days if d in planned_days] +
+                              [d for d in preferred_days if d not in planned_days])
 
         
         # === GLOBAL STAFF BALANCING ===
@@ -4656,6 +4113,7 @@ class ConstrainedScheduler:
                 return 0
 
             all_slots = sorted(all_slots, key=lambda s: (
+                0 if not planned_days or s.day in planned_days else 1,  # Planned cluster days (A.2b) before batching
                 get_batching_score(s),           # Primary: Batching (Top priority for targets)
                 self._get_total_staff_score(s),  # Secondary: total staff balance
                 self._get_slot_staff_score(s, activity.name),  # Tertiary: zone capacity
@@ -4997,8 +4455,6 @@ class ConstrainedScheduler:
         if activity_name in self.STAFF_ZONE_MAP:
             zone = self.STAFF_ZONE_MAP[activity_name]
             self.staff_load_by_slot[slot][zone] += delta
-            # Invalidate troop day counts cache when schedule changes
-            self._cache_valid = False
     
     def _get_slot_staff_score(self, slot: TimeSlot, activity_name: str) -> int:
         """
@@ -5045,18 +4501,32 @@ class ConstrainedScheduler:
         
         Returns: {Day.MONDAY: 2, Day.TUESDAY: 3, ...}
         """
-        # Check cache first
-        if self._cache_valid and troop.name in self._troop_day_counts_cache:
-            return self._troop_day_counts_cache[troop.name]
+        # Check cache first (valid while the schedule's Zobrist state is unchanged)
+        state = self.schedule.state_hash()
+        cached = self._troop_day_counts_cache.get(troop.name)
+        if cached is not None and cached[0] == state:
+            return cached[1]
         
         counts = {day: 0 for day in [Day.MONDAY, Day.TUESDAY, Day.WEDNESDAY, Day.THURSDAY, Day.FRIDAY]}
         for entry in self.schedule.entries:
             if entry.troop == troop:
                 counts[entry.time_slot.day] += 1
         
-        self._troop_day_counts_cache[troop.name] = counts
+        self._troop_day_counts_cache[troop.name] = (state, counts)
         return counts
     
+    def _state_hash_after(self, removed, added) -> int:
+        """
+        Zobrist hash the schedule would have after a move, without making it.
+        
+        removed/added are (troop, activity_name, slot) placements; search loops
+        compare the result against states they have already visited.
+        """
+        state = self.schedule.state_hash()
+        for troop, activity_name, slot in list(removed) + list(added):
+            state ^= zobrist_key(troop.name, activity_name, slot)
+        return state
+    
     def _would_create_excess_day(self, activity_name: str, day: Day) -> bool:
         """
         Check if scheduling this activity on this day would create an excess cluster day.
@@ -5187,15 +4657,17 @@ class ConstrainedScheduler:
             slot = friday_slots[slot_idx]
             zone_name = "north" if slot_idx == 0 else ("middle" if slot_idx == 1 else "south")
             
+            # Reflection is concurrent: append directly, add_entry would refuse a second
+            # troop's Reflection in the same slot
             if self.schedule.is_troop_free(slot, troop):
-                self.schedule.add_entry(slot, reflection, troop)
+                self.schedule.entries.append(ScheduleEntry(slot, reflection, troop))
                 print(f"  {troop.name}: Reflection -> {slot} ({zone_name} zone)")
             else:
                 # Try next available slot
                 scheduled = False
                 for alt_slot in friday_slots:
                     if self.schedule.is_troop_free(alt_slot, troop):
-                        self.schedule.add_entry(alt_slot, reflection, troop)
+                        self.schedule.entries.append(ScheduleEntry(alt_slot, reflection, troop))
                         print(f"  {troop.name}: Reflection -> {alt_slot} (fallback)")
                         scheduled = True
                         break
@@ -5244,63 +4716,55 @@ class ConstrainedScheduler:
 
     
     def _optimize_friday_reflections(self):
-        """Swap Friday Reflection slots within commissioners to improve Tower/ODS/Archery clustering."""
-        friday_slots = [s for s in self.time_slots if s.day == Day.FRIDAY]
+        """Reassign Friday Reflection slots to improve Tower/ODS/Archery clustering.
         
+        Solved as one weighted assignment (Hungarian) of troops to the current Reflection
+        slots instead of pairwise swaps, so each slot keeps its Reflection count. A troop
+        moves into a Friday slot it has free or trades with its own entry there
+        (_reflection_trades); REFLECTION_COMMISSIONER_COST keeps it out of slots where its
+        commissioner leads another troop.
+        """
         # Staff-intensive activities that benefit from clustering
         cluster_activities = EXCLUSIVE_AREAS.get("Tower", []) + \
                            EXCLUSIVE_AREAS.get("Outdoor Skills", []) + \
                            EXCLUSIVE_AREAS.get("Archery", [])
         
-        # Group troops by commissioner
-        troops_by_commissioner = {}
-        # Consolidate all troops (Ignore commissioner grouping)
-        all_troops = self.troops[:]
-        
-        # Get each troop's reflection slot
-        reflection_slots = {}
-        for troop in all_troops:
+        # Each troop's Friday Reflection entry (Consolidate all troops - ignore commissioner grouping)
+        rows = []
+        for troop in self.troops:
             for entry in self.schedule.entries:
-                if entry.troop == troop and entry.activity.name == "Reflection":
-                    reflection_slots[troop.name] = entry.time_slot
+                if entry.troop == troop and entry.activity.name == "Reflection" and entry.time_slot.day == Day.FRIDAY:
+                    rows.append((troop, entry))
                     break
+        if len(rows) < 2:
+            return
         
-        # Check each pair of troops for beneficial swaps (Global Optimization)
-        # Iterate all troops pair-wise
-        for i, troop1 in enumerate(all_troops):
-            for troop2 in all_troops[i+1:]:
-                slot1 = reflection_slots.get(troop1.name)
-                slot2 = reflection_slots.get(troop2.name)
-                if not slot1 or not slot2 or slot1 == slot2:
-                    continue
-                
-                # CRITICAL: Verify troops are free in the target slots before checking scores
-                # Troop 1 is moving to Slot 2: Check if Troop 1 is free in Slot 2 (ignoring Troop 2's current Reflection there)
-                # Use a custom check because is_troop_free(slot2, troop1) is exactly what we need
-                # (it checks if troop1 has ANY activity in slot2)
-                if not self.schedule.is_troop_free(slot2, troop1):
+        positions = [entry.time_slot for _, entry in rows]
+        busy = self._commissioner_busy_slots()
+        cost, trades = [], []
+        for troop, entry in rows:
+            trade = self._reflection_trades(troop, entry)
+            row = []
+            for slot in positions:
+                if slot != entry.time_slot and slot not in trade:
+                    row.append(INFEASIBLE)
                     continue
-                    
-                # Troop 2 is moving to Slot 1
-                if not self.schedule.is_troop_free(slot1, troop2):
-                    continue
-
-                # Calculate clustering score for current assignment
-                score_current = self._friday_clustering_score(troop1, slot1, cluster_activities) + \
-                               self._friday_clustering_score(troop2, slot2, cluster_activities)
-                
-                # Calculate clustering score if swapped
-                score_swapped = self._friday_clustering_score(troop1, slot2, cluster_activities) + \
-                               self._friday_clustering_score(troop2, slot1, cluster_activities)
-                
-                # Favor spreading distinct slots if score is equal? No, focus on clustering.
-                
-                if score_swapped > score_current:
-                    # Swap is beneficial - do it
-                    self._swap_reflection_slots(troop1, troop2, slot1, slot2)
-                    reflection_slots[troop1.name] = slot2
-                    reflection_slots[troop2.name] = slot1
-                    print(f"  Swapped: {troop1.name} <-> {troop2.name} (improved clustering)")
+                score = self._friday_clustering_score(troop, slot, cluster_activities)
+                row.append(-score + self._reflection_commissioner_cost(troop, slot, busy)
+                           + (self.REFLECTION_MOVE_COST if slot != entry.time_slot else 0.0))
+            cost.append(row)
+            trades.append(trade)
+        
+        assignment = hungarian(cost)
+        moves = []
+        for (troop, entry), trade, col in zip(rows, trades, assignment):
+            if col is None or positions[col] == entry.time_slot:
+                continue
+            if self._apply_reflection_trade(troop, entry, positions[col], trade[positions[col]]):
+                moves.append((troop, positions[col]))
+        if moves:
+            print(f"  Reassigned {len(moves)} Reflection slot(s) (improved clustering): " +
+                  ", ".join(f"{t.name}->{s}" for t, s in moves))
     
     def _friday_clustering_score(self, troop, reflection_slot, cluster_activities):
         """Score how well a Reflection slot placement helps cluster staff activities."""
@@ -5322,6 +4786,84 @@ class ConstrainedScheduler:
         
         return score
     
+    def _reflection_trades(self, troop, entry):
+        """
+        Friday slots troop's Reflection entry can move to, each mapped to the troop's own
+        entry there it trades slots with (None when the troop is free in that slot).
+        
+        A trade partner is a single-slot entry that passes _entry_trade_ok. Delta stays put
+        and Super Troop only trades into a slot after the troop's Delta (unless Delta was
+        swapped out), so the Delta -> Super Troop precedence holds.
+        """
+        own = [e for e in self.schedule.entries if e.troop == troop]
+        delta_slot = next((e.time_slot for e in own if e.activity.name == "Delta"), None)
+        if troop.name in self.delta_was_swapped:
+            delta_slot = None
+        trades = {}
+        for slot in self.time_slots:
+            if slot.day != Day.FRIDAY or slot == entry.time_slot:
+                continue
+            occupants = [e for e in own if e.time_slot == slot]
+            if not occupants:
+                trades[slot] = None
+                continue
+            if len(occupants) != 1:
+                continue
+            other = occupants[0]
+            if (other.activity.name in ("Reflection", "Delta")
+                    or self.schedule._get_effective_slots(other.activity, troop) > 1
+                    or (other.activity.name == "Super Troop" and delta_slot
+                        and self.time_slots.index(entry.time_slot) <= self.time_slots.index(delta_slot))):
+                continue
+            if self._entry_trade_ok(troop, entry, other):
+                trades[slot] = other
+        return trades
+    
+    def _apply_reflection_trade(self, troop, entry, new_slot, other):
+        """
+        Move troop's Reflection entry to new_slot, trading with other (its own entry there) if given.
+        
+        Earlier moves this round can invalidate a trade, so it is re-checked first.
+        
+        Returns:
+            Whether the Reflection moved.
+        """
+        if other is None:
+            if not self.schedule.is_troop_free(new_slot, troop):
+                return False
+            self._move_friday_reflection(troop, new_slot)
+            return True
+        if not self._entry_trade_ok(troop, entry, other):
+            return False
+        self.schedule.entries.remove(entry)
+        self.schedule.entries.remove(other)
+        self.schedule.entries.append(ScheduleEntry(new_slot, entry.activity, troop))
+        self.schedule.entries.append(ScheduleEntry(entry.time_slot, other.activity, troop))
+        return True
+    
+    def _commissioner_busy_slots(self):
+        """Slots of commissioner-led entries (Delta, Super Troop, Archery), per commissioner, as (troop name, slot)."""
+        busy = {}
+        for e in self.schedule.entries:
+            if e.activity.name in ("Delta", "Super Troop", "Archery"):
+                commissioner = self.troop_commissioner.get(e.troop.name)
+                busy.setdefault(commissioner, []).append((e.troop.name, e.time_slot))
+        return busy
+    
+    def _reflection_commissioner_cost(self, troop, slot, busy):
+        """REFLECTION_COMMISSIONER_COST per commissioner-led entry of the commissioner's other troops in slot."""
+        commissioner = self.troop_commissioner.get(troop.name)
+        return self.REFLECTION_COMMISSIONER_COST * sum(
+            1 for name, busy_slot in busy.get(commissioner, ()) if name != troop.name and busy_slot == slot)
+    
+    def _move_friday_reflection(self, troop, new_slot):
+        """Move a troop's Friday Reflection entry to new_slot (Reflection is concurrent - no capacity check)."""
+        reflection = get_activity_by_name("Reflection")
+        self.schedule.entries = [e for e in self.schedule.entries
+                                 if not (e.troop == troop and e.activity.name == "Reflection" and
+                                         e.time_slot.day == Day.FRIDAY)]
+        self.schedule.entries.append(ScheduleEntry(new_slot, reflection, troop))
+    
     def _swap_reflection_slots(self, troop1, troop2, slot1, slot2):
         """Swap Reflection entries between two troops."""
         reflection = get_activity_by_name("Reflection")
@@ -6065,243 +5607,105 @@ class ConstrainedScheduler:
         return True
 
 
-    def _schedule_delta_early(self):
-        """Schedule Delta ONLY for troops that have it in their preferences.
-        
-        Delta is now treated like any other requested activity (no longer mandatory).
-        It is scheduled based purely on preference rank with early week bias.
-        PROMOTED PAIRING: Prefers days where Sailing is already scheduled (+15 bonus per Spine).
+    def _schedule_delta_sailing_joint(self):
         """
-        print("\n--- Scheduling Delta (by preference rank, early week bias, Sailing pairing) ---")
-        delta = get_activity_by_name("Delta")
-        if not delta:
-            return
-        
-        # Filter to only troops that have Delta in their preferences
-        # Sort by preference rank (lower index = higher priority)
-        troops_wanting_delta = []
-        for troop in self.troops:
-            if "Delta" in troop.preferences:
-                rank = troop.preferences.index("Delta")
-                troops_wanting_delta.append((troop, rank))
-        
-        if not troops_wanting_delta:
-            print("  No troops requested Delta in their preferences")
-            return
-        
-        # Sort by preference rank (higher priority = scheduled first)
-        troops_wanting_delta.sort(key=lambda x: x[1])
-        
-        print(f"  Troops requesting Delta (sorted by rank): {[(t.name, r+1) for t, r in troops_wanting_delta]}")
-        
-        # Early week slots preferred (Mon > Tue > Wed > Thu, avoid Friday)
-        early_week_slots = [s for s in self.time_slots if s.day in [Day.MONDAY, Day.TUESDAY]]
-        mid_week_slots = [s for s in self.time_slots if s.day == Day.WEDNESDAY]
-        late_week_slots = [s for s in self.time_slots if s.day == Day.THURSDAY]
-        friday_slots = [s for s in self.time_slots if s.day == Day.FRIDAY]
-        
-        # Combined slot order: early > mid > late > friday
-        base_slot_order = early_week_slots + mid_week_slots + late_week_slots + friday_slots
-        
-        scheduled_count = 0
-        for troop, rank in troops_wanting_delta:
-            if self.troop_has_delta.get(troop.name, False):
-                continue  # Already scheduled
-            
-            # PROMOTED PAIRING: Check if troop has Sailing scheduled, prefer that day
-            sailing_day = None
-            for entry in self.schedule.entries:
-                if entry.troop == troop and entry.activity.name == "Sailing":
-                    sailing_day = entry.time_slot.day
-                    break
-            
-            # Reorder slots: sailing day slots first (promoted pairing), then normal order
-            if sailing_day:
-                sailing_day_slots = [s for s in base_slot_order if s.day == sailing_day]
-                other_slots = [s for s in base_slot_order if s.day != sailing_day]
-                preferred_slot_order = sailing_day_slots + other_slots
-                print(f"  [Promoted Pairing] {troop.name}: Sailing on {sailing_day.value}, preferring Delta there")
-            else:
-                preferred_slot_order = base_slot_order
-            
-            scheduled = False
-            for slot in preferred_slot_order:
-                if self._can_schedule(troop, delta, slot, slot.day):
-                    self.schedule.add_entry(slot, delta, troop)
-                    self.troop_has_delta[troop.name] = True
-                    self._update_progress(troop, "Delta")
-                    pairing_note = " (Sailing paired!)" if sailing_day and slot.day == sailing_day else ""
-                    print(f"  {troop.name}: Delta (#{rank+1}) -> {slot}{pairing_note}")
-                    scheduled = True
-                    scheduled_count += 1
-                    break
-            
-            if not scheduled:
-                print(f"  WARNING: Could not schedule Delta for {troop.name} (#{rank+1})")
-        
-        print(f"  Scheduled {scheduled_count}/{len(troops_wanting_delta)} Delta requests")
-
-    def _schedule_delta_sailing_pairs(self):
-        """Schedule Delta + Sailing together on the same day when both are requested."""
-        from .models import Day, TimeSlot
+        Choose Delta and Sailing for every requesting troop in one decision.
         
-        print("\n--- Scheduling Delta + Sailing Pairs ---")
+        Covers Delta for any troop that requests it and Sailing for Top 10
+        requests. Each troop gets one option (Sailing start, Delta slot, both or
+        neither) among placements _can_schedule accepts now; options are valued
+        by preference rank (earlier days break ties) plus same-day pairing
+        (Delta in the slot Sailing leaves free), the commissioner's Delta day
+        and Delta ahead of the troop's Super Troop. Sailing is one troop per day (the
+        staggered second session overlaps slot 2) and Delta one troop per slot,
+        and solve_exclusive_choice picks the best combination across troops.
+        """
+        print("\n--- Joint Delta + Sailing plan ---")
         delta = get_activity_by_name("Delta")
         sailing = get_activity_by_name("Sailing")
         if not delta or not sailing:
             return
         
-        # AGGRESSIVELY prefer days with exactly 1 Sailing (to get to 2 per day)
-        sailing_day_counts = defaultdict(int)
-        for entry in self.schedule.entries:
-            if entry.activity.name == "Sailing":
-                sailing_day_counts[entry.time_slot.day] += 1
-        
-        scheduled = 0
+        sailing_days = [Day.MONDAY, Day.TUESDAY, Day.WEDNESDAY]
+        day_index = {day: i for i, day in enumerate(Day)}
+        groups = {}
         for troop in self.troops:
-            if "Delta" not in troop.preferences or "Sailing" not in troop.preferences:
+            wants_delta = "Delta" in troop.preferences and not self._troop_has_activity(troop, delta)
+            wants_sailing = "Sailing" in troop.preferences[:10] and not self._troop_has_activity(troop, sailing)
+            if not wants_delta and not wants_sailing:
                 continue
-            if self._troop_has_activity(troop, delta) or self._troop_has_activity(troop, sailing):
-                continue
-            
-            preferred_days = [Day.MONDAY, Day.TUESDAY, Day.WEDNESDAY]
-            # Sort: days with exactly 1 sail first (to get to 2), then days with 0, then days with 2 (full)
-            def day_priority(day):
-                count = sailing_day_counts.get(day, 0)
-                if count == 1:
-                    return 0  # Highest priority - can get to 2
-                elif count == 0:
-                    return 1  # Medium priority - can start a new pair
-                else:
-                    return 2  # Lowest priority - already at max (2) or over
-            preferred_days.sort(key=day_priority)
-            
-            paired = False
-            for day in preferred_days:
-                # Option 1: Sailing slots 1-2, Delta slot 3
-                sailing_slot = TimeSlot(day, 1)
-                delta_slot = TimeSlot(day, 3)
-                if (self._can_schedule(troop, sailing, sailing_slot, day) and
-                        self._can_schedule(troop, delta, delta_slot, day)):
-                    self._add_to_schedule(sailing_slot, sailing, troop)
-                    self._add_to_schedule(delta_slot, delta, troop)
-                    self._update_progress(troop, "Sailing")
-                    self._update_progress(troop, "Delta")
-                    self.troop_has_delta[troop.name] = True
-                    scheduled += 1
-                    paired = True
-                    break
-                
-                # Option 2: Delta slot 1, Sailing slots 2-3
-                sailing_slot = TimeSlot(day, 2)
-                delta_slot = TimeSlot(day, 1)
-                if (self._can_schedule(troop, sailing, sailing_slot, day) and
-                        self._can_schedule(troop, delta, delta_slot, day)):
-                    self._add_to_schedule(sailing_slot, sailing, troop)
-                    self._add_to_schedule(delta_slot, delta, troop)
-                    self._update_progress(troop, "Sailing")
-                    self._update_progress(troop, "Delta")
-                    self.troop_has_delta[troop.name] = True
-                    scheduled += 1
-                    paired = True
-                    break
             
-            if paired:
-                # Update sailing count for clustering
-                sailing_day_counts[day] = sailing_day_counts.get(day, 0) + 1
-        
-        if scheduled == 0:
-            print("  No Delta+Sailing pairs scheduled")
-        else:
-            print(f"  Scheduled {scheduled} Delta+Sailing pairs")
-    
-    def _schedule_sailing_pairs(self):
-        """Proactively schedule overlapping Sailing sessions to maximize Same-Day bonus.
-        
-        The evaluation awards points when 2+ different troops sail on the same day.
-        This method pairs troops and schedules them with overlapping slots:
-        - Troop A: Slots 1-2 (Sailing starts at slot 1)
-        - Troop B: Slots 2-3 (Sailing starts at slot 2)
-        They share slot 2, which is allowed by the models.py fix.
-        """
-        from .models import Day, TimeSlot
+            sail_options = [None]
+            if wants_sailing:
+                sail_value = self.DS_ACTIVITY_VALUE - troop.get_priority("Sailing")
+                for day in sailing_days:
+                    for start in (1, 2):
+                        slot = TimeSlot(day, start)
+                        if self.schedule.is_troop_free(slot, troop) and self._can_schedule(troop, sailing, slot, day):
+                            # Tie-break toward earlier days and the slot 1 start
+                            sail_options.append((slot, sail_value - 0.1 * day_index[day] - 0.01 * start))
+            
+            delta_options = [None]
+            if wants_delta:
+                delta_value = self.DS_ACTIVITY_VALUE - troop.get_priority("Delta")
+                commissioner_day = self.COMMISSIONER_DELTA_DAYS.get(self.troop_commissioner.get(troop.name))
+                super_troop_slot = next((e.time_slot for e in self.schedule.entries
+                                         if e.troop == troop and e.activity.name == "Super Troop"), None)
+                for slot in self.time_slots:
+                    if not self.schedule.is_troop_free(slot, troop) or not self._can_schedule(troop, delta, slot, slot.day):
+                        continue
+                    value = delta_value - 0.1 * day_index[slot.day]
+                    if slot.day == commissioner_day:
+                        value += self.DS_COMMISSIONER_DAY_BONUS
+                    if super_troop_slot and (day_index[slot.day], slot.slot_number) < \
+                            (day_index[super_troop_slot.day], super_troop_slot.slot_number):
+                        value += self.DS_BEFORE_SUPER_TROOP_BONUS
+                    delta_options.append((slot, value))
+            
+            options = []
+            for sail in sail_options:
+                for delta_option in delta_options:
+                    if sail is None and delta_option is None:
+                        continue
+                    value, resources = 0.0, set()
+                    sail_slot = delta_slot = None
+                    if sail:
+                        sail_slot, sail_value = sail
+                        value += sail_value
+                        resources.add(('sailing', sail_slot.day))
+                    if delta_option:
+                        delta_slot, delta_value = delta_option
+                        value += delta_value
+                        resources.add(('delta', delta_slot))
+                    if sail and delta_option and sail_slot.day == delta_slot.day:
+                        # Delta must sit in the slot Sailing leaves free (3 after a slot 1 start, 1 after slot 2)
+                        if delta_slot.slot_number != (3 if sail_slot.slot_number == 1 else 1):
+                            continue
+                        value += self.DS_PAIRING_BONUS
+                    options.append((value, frozenset(resources), (sail_slot, delta_slot)))
+            groups[troop.name] = options
         
-        print("\n--- Scheduling Sailing Pairs (Same-Day Bonus) ---")
-        sailing = get_activity_by_name("Sailing")
-        if not sailing:
+        if not groups:
+            print("  No troops need Delta or Sailing")
             return
         
-        # Find troops wanting Sailing (prioritize Top 5)
-        troops_wanting_sailing = []
-        for troop in self.troops:
-            if "Sailing" in troop.preferences[:10]:  # Top 10 for wider net
-                # Skip if already scheduled
-                if self._troop_has_activity(troop, sailing):
+        plan, value = solve_exclusive_choice(groups, node_limit=self.DS_NODE_LIMIT)
+        troops_by_name = {t.name: t for t in self.troops}
+        placed = {"Sailing": 0, "Delta": 0}
+        for troop_name, (sail_slot, delta_slot) in plan.items():
+            troop = troops_by_name[troop_name]
+            for activity, slot in ((sailing, sail_slot), (delta, delta_slot)):
+                if slot is None or not self._can_schedule(troop, activity, slot, slot.day):
                     continue
-                priority = troop.preferences.index("Sailing") if "Sailing" in troop.preferences else 999
-                troops_wanting_sailing.append((troop, priority))
-        
-        # Sort by priority (lower = better)
-        troops_wanting_sailing.sort(key=lambda x: x[1])
-        troops_only = [t for t, _ in troops_wanting_sailing]
-        
-        if len(troops_only) < 2:
-            print(f"  Only {len(troops_only)} troop(s) want Sailing - skipping pairing")
-            return
-        
-        # Pair troops: take pairs from sorted list
-        pairs_scheduled = 0
-        available_days = [Day.MONDAY, Day.TUESDAY, Day.WEDNESDAY]  # Avoid Thu/Fri
-        
-        i = 0
-        while i + 1 < len(troops_only) and available_days:
-            troop_a = troops_only[i]
-            troop_b = troops_only[i + 1]
-            
-            # Try to schedule on an available day
-            scheduled_day = None
-            for day in available_days:
-                slot_1 = TimeSlot(day, 1)
-                slot_2 = TimeSlot(day, 2)
-                
-                # Check if both troops can be scheduled
-                # Troop A at slot 1 (occupies 1-2), Troop B at slot 2 (occupies 2-3)
-                can_a = self._can_schedule(troop_a, sailing, slot_1, day)
-                can_b = self._can_schedule(troop_b, sailing, slot_2, day)
-                
-                if can_a and can_b:
-                    # Schedule both
-                    self._add_to_schedule(slot_1, sailing, troop_a)
-                    self._add_to_schedule(slot_2, sailing, troop_b)
-                    self._update_progress(troop_a, "Sailing")
-                    self._update_progress(troop_b, "Sailing")
-                    pairs_scheduled += 1
-                    scheduled_day = day
-                    print(f"  PAIR: {troop_a.name} (slot 1) + {troop_b.name} (slot 2) on {day.value}")
-                    break
-                else:
-                    # Try reversed slots
-                    can_a_alt = self._can_schedule(troop_a, sailing, slot_2, day)
-                    can_b_alt = self._can_schedule(troop_b, sailing, slot_1, day)
-                    if can_a_alt and can_b_alt:
-                        self._add_to_schedule(slot_1, sailing, troop_b)
-                        self._add_to_schedule(slot_2, sailing, troop_a)
-                        self._update_progress(troop_a, "Sailing")
-                        self._update_progress(troop_b, "Sailing")
-                        pairs_scheduled += 1
-                        scheduled_day = day
-                        print(f"  PAIR: {troop_b.name} (slot 1) + {troop_a.name} (slot 2) on {day.value}")
-                        break
-            
-            if scheduled_day:
-                available_days.remove(scheduled_day)  # Each day can only have one pair
-            
-            i += 2  # Move to next pair
-        
-        if pairs_scheduled == 0:
-            print("  No Sailing pairs scheduled")
-        else:
-            print(f"  Scheduled {pairs_scheduled} Sailing pairs for Same-Day bonus")
+                self._add_to_schedule(slot, activity, troop)
+                self._update_progress(troop, activity.name)
+                if activity.name == "Delta":
+                    self.troop_has_delta[troop.name] = True
+                placed[activity.name] += 1
+            paired = " (paired)" if sail_slot and delta_slot and sail_slot.day == delta_slot.day else ""
+            print(f"  {troop_name}: Sailing {sail_slot or '-'}, Delta {delta_slot or '-'}{paired}")
+        print(f"  Placed {placed['Sailing']} Sailing and {placed['Delta']} Delta "
+              f"for {len(groups)} requesting troops (plan value {value:.1f})")
     
     def _schedule_early_ods_clustering(self):
         """Schedule ODS activities early for Top 10 troops on preferred cluster days."""
@@ -6434,6 +5838,8 @@ class ConstrainedScheduler:
         
         # Schedule all troops with intelligent day selection
         for troop in self.troops:
+            if self.troop_has_super_troop.get(troop.name, False):
+                continue  # Kept from a warm start
             commissioner = self.troop_commissioner.get(troop.name, "")
             preferred_day = self.COMMISSIONER_SUPER_TROOP_DAYS.get(commissioner) if commissioner else None
             
@@ -6574,6 +5980,62 @@ class ConstrainedScheduler:
             else:
                 print(f"  ERROR: Could not schedule Super Troop for {troop.name} - no available slots!")
     
+    def _plan_area_cluster_days(self):
+        """
+        Plan the fewest open days for each staffed area before placement starts.
+        
+        Each troop request in the top CLUSTER_PLAN_DEMAND_RANK preferences is an
+        item (Climbing Tower for 16+ scouts takes two slots) allowed on the days
+        the troop can still take it, each day a bin of the area's open slots,
+        and one troop's requests for an area go on different days.
+        plan_area_days picks the smallest packable set of days, preferring the
+        commissioners' area days; placement then treats the planned days as
+        the area's primary days (area_day_plan).
+        """
+        print("\n--- Area cluster-day plan (bin packing) ---")
+        commissioner_days = {
+            "Tower": self.COMMISSIONER_TOWER_ODS_DAYS,
+            "Outdoor Skills": self.COMMISSIONER_TOWER_ODS_DAYS,
+            "Rifle Range": self.COMMISSIONER_RIFLE_DAYS,
+            "Archery": self.COMMISSIONER_ARCHERY_DAYS,
+        }
+        for area in self.CLUSTER_PLAN_AREAS:
+            area_activities = EXCLUSIVE_AREAS.get(area, [])
+            items, allowed = [], []
+            for troop in self.troops:
+                for name in troop.preferences[:self.CLUSTER_PLAN_DEMAND_RANK]:
+                    activity = get_activity_by_name(name) if name in area_activities else None
+                    if activity:
+                        size = int(self.schedule._get_effective_slots(activity, troop) + 0.5)
+                        items.append((troop.name, size))
+                        allowed.append({slot.day for i, slot in enumerate(self.time_slots)
+                                        if all(self.schedule.is_troop_free(s, troop) and s.day == slot.day
+                                               for s in self.time_slots[i:i + size])
+                                        and i + size <= len(self.time_slots)
+                                        and self._can_schedule(troop, activity, slot, slot.day)})
+            if not items:
+                continue
+            
+            used = {e.time_slot for e in self.schedule.entries if e.activity.name in area_activities}
+            capacity = {}
+            for slot in self.time_slots:
+                capacity.setdefault(slot.day, 0)
+                if slot not in used:
+                    capacity[slot.day] += 1
+            area_commissioner_days = commissioner_days.get(area, {})
+            preferred = [area_commissioner_days[c] for c in sorted(set(self.troop_commissioner.values()))
+                         if c in area_commissioner_days]
+            
+            self.area_day_plan[area] = plan_area_days(items, capacity, preferred, allowed)
+            print(f"  {area}: {len(items)} request(s) -> {[d.name[:3] for d in self.area_day_plan[area]]}")
+    
+    def _planned_area_days(self, activity_name):
+        """Planned days (A.2b) for the area activity_name belongs to, or None if unplanned."""
+        for area, days in self.area_day_plan.items():
+            if activity_name in EXCLUSIVE_AREAS.get(area, ()):
+                return days
+        return None
+    
     def _pre_cluster_archery(self):
          # DEPRECATED: Commissioner clustering is disabled for preference-based scheduling.
          pass
@@ -6940,6 +6402,11 @@ class ConstrainedScheduler:
             import math
             num_days_needed = min(math.ceil(len(demand) / 3), 2)  # Cap at 2 days for bulletproof clustering
             primary_days = PREFERRED_DAYS[:num_days_needed]
+            # Bin-packed plan from A.2b when available
+            planned_days = self._planned_area_days(area_activities[0])
+            if planned_days:
+                primary_days = list(planned_days)
+                num_days_needed = len(primary_days)
             
             print(f"  {area_name}: {len(demand)} requests -> {num_days_needed} primary days: {[d.value[:3] for d in primary_days]}")
             
@@ -7091,21 +6558,147 @@ class ConstrainedScheduler:
                 pass  # Slot filled
     
     def _schedule_day(self, day: Day):
-        """Schedule activities for a specific day."""
+        """Schedule activities for a specific day (one step of build_rolling_pipeline)."""
         day_slots = [s for s in self.time_slots if s.day == day]
         
-        # Step 1: Schedule beach activities in preferred slots
+        # Step 1: Top 5 and Top 6-10 picks for the day (1 each), solved exactly across troops
+        self._solve_day_exactly(day, day_slots)
+        
+        # Step 2: Schedule beach activities in preferred slots
         self._schedule_beach_activities(day, day_slots)
         
-        # Step 2: Schedule Top-5 preferences (1 per day)
+        # Step 3: Schedule Top-5 preferences the plan could not commit (1 per day)
         self._schedule_priority_tier(day, day_slots, range(0, 5), "Top 5", max_per_day=1)
         
-        # Step 3: Schedule Top-10 preferences (1 per day)
+        # Step 4: Schedule Top-10 preferences the plan could not commit (1 per day)
         self._schedule_priority_tier(day, day_slots, range(5, 10), "Top 6-10", max_per_day=1)
         
-        # Step 4: Fill remaining slots
+        # Step 5: Fill remaining slots
         self._fill_remaining_slots(day, day_slots)
     
+    def _solve_day_exactly(self, day: Day, day_slots: list[TimeSlot]):
+        """
+        Choose every troop's Top 10 requests for day in one decision.
+        
+        Each troop gets one option: at most one Top 5 and one Top 6-10 request
+        (the _schedule_day caps) in its free slots, among placements
+        _can_schedule accepts now, a pair checked together. Top 5 requests that
+        fit no slot today are offered in the next day's slots instead (one-day
+        look-ahead) and committed now as reservations, so the next day's plan
+        works around them. Options are valued by preference rank and use the
+        areas (or activities) of the slots they cover, plus the day's one
+        Sailing troop (AREA_DAY_CAPACITY), each with the troops it can still
+        take (_day_resource_capacity), and solve_exclusive_choice picks the
+        best combination across troops.
+        """
+        days = list(Day)
+        next_day = days[days.index(day) + 1] if day != days[-1] else None
+        next_slots = [s for s in self.time_slots if s.day == next_day]
+        
+        groups = {}
+        for troop in self.troops:
+            today_top5 = self._day_requests(troop, day, day_slots, range(0, 5))
+            top5 = [] if self._count_top5_today(troop, day) else today_top5
+            top10 = [] if self._count_top10_today(troop, day) else self._day_requests(troop, day, day_slots, range(5, 10))
+            options = [[request] for request in top5 + top10]
+            for first in top5:
+                for second in top10:
+                    if self._requests_fit_together(troop, day, first, second):
+                        options.append([first, second])
+            if options:
+                groups[(troop.name, day)] = [self._day_option(troop, option) for option in options]
+            
+            # Look-ahead: Top 5 requests with no slot today may reserve one tomorrow
+            if next_day is None or self._count_top5_today(troop, next_day):
+                continue
+            fits_today = {activity.name for _, activity, _ in today_top5}
+            later = [request for request in self._day_requests(troop, next_day, next_slots, range(0, 5))
+                     if request[1].name not in fits_today]
+            if later:
+                groups[(troop.name, next_day)] = [self._day_option(troop, [request]) for request in later]
+        
+        if not groups:
+            return
+        
+        capacity = {resource: self._day_resource_capacity(resource)
+                    for options in groups.values() for _, resources, _ in options for resource in resources}
+        plan, value = solve_exclusive_choice(groups, node_limit=self.ROLLING_NODE_LIMIT, capacity=capacity)
+        troops_by_name = {t.name: t for t in self.troops}
+        placed = reserved = 0
+        for (troop_name, plan_day), requests in plan.items():
+            troop = troops_by_name[troop_name]
+            for _, activity, slot in requests:
+                if not self.schedule.is_troop_free(slot, troop) or not self._can_schedule(troop, activity, slot, slot.day):
+                    continue
+                self._add_to_schedule(slot, activity, troop)
+                self._update_progress(troop, activity.name)
+                if activity.name == "Delta":
+                    self.troop_has_delta[troop.name] = True
+                if plan_day == day:
+                    placed += 1
+                else:
+                    reserved += 1
+                    print(f"  {troop_name}: {activity.name} -> {slot} [LOOK-AHEAD]")
+        print(f"  {day.value}: placed {placed} Top 10 requests, reserved {reserved} Top 5 on "
+              f"{next_day.value if next_day else '-'} (plan value {value:.1f})")
+    
+    def _day_requests(self, troop: Troop, day: Day, day_slots: list[TimeSlot], pref_range: range) -> list:
+        """(rank, activity, slot) for troop's unscheduled requests in pref_range that fit a free slot on day."""
+        requests = []
+        for rank in pref_range:
+            if rank >= len(troop.preferences):
+                break
+            activity = get_activity_by_name(troop.preferences[rank])
+            if not activity or self._troop_has_activity(troop, activity):
+                continue
+            if not self._can_schedule_on_day(troop, activity, day):
+                continue
+            for slot in day_slots:
+                if self.schedule.is_troop_free(slot, troop) and self._can_schedule(troop, activity, slot, day):
+                    requests.append((rank, activity, slot))
+        return requests
+    
+    def _requests_fit_together(self, troop: Troop, day: Day, first, second) -> bool:
+        """Whether second still fits once first is placed (first is placed and released again)."""
+        _, activity, slot = first
+        _, other, other_slot = second
+        if other_slot == slot:
+            return False
+        self._add_to_schedule(slot, activity, troop)
+        try:
+            if self.schedule.is_troop_free(slot, troop):
+                return False
+            return self.schedule.is_troop_free(other_slot, troop) and self._can_schedule(troop, other, other_slot, day)
+        finally:
+            self._release_activity(troop, activity.name, day)
+    
+    def _day_option(self, troop: Troop, requests: list):
+        """(value, resources, requests) for solve_exclusive_choice (see _day_resource_capacity)."""
+        value, resources = 0.0, set()
+        for rank, activity, slot in requests:
+            value += self.ROLLING_ACTIVITY_VALUE - rank
+            if activity.name in self.CONCURRENT_ACTIVITIES or activity.name in self.THREE_HOUR_ACTIVITIES:
+                continue
+            if activity.name in AREA_DAY_CAPACITY:
+                resources.add((activity.name, slot.day))
+            # Areas hold troops per slot; other activities are exclusive by name
+            area = next((a for a, names in EXCLUSIVE_AREAS.items() if activity.name in names), activity.name)
+            span = int(self.schedule._get_effective_slots(activity, troop) + 0.5)
+            resources.update((area, s) for s in self.time_slots
+                             if s.day == slot.day and slot.slot_number <= s.slot_number < slot.slot_number + span)
+        return value, frozenset(resources), requests
+    
+    def _day_resource_capacity(self, resource) -> int:
+        """Troops a _day_option resource can still take: (area, TimeSlot) or (activity, Day) sessions."""
+        name, where = resource
+        if isinstance(where, Day):
+            used = len({e.troop.name for e in self.schedule.entries
+                        if e.activity.name == name and e.time_slot.day == where})
+            return max(0, AREA_DAY_CAPACITY.get(name, 1) - used)
+        names = EXCLUSIVE_AREAS.get(name, [name])
+        used = sum(1 for e in self.schedule.entries if e.time_slot == where and e.activity.name in names)
+        return max(0, AREA_SLOT_CAPACITY.get(name, 1) - used)
+    
     def _schedule_beach_activities(self, day: Day, day_slots: list[TimeSlot]):
         """Schedule beach activities in preferred slots.
         
@@ -7141,7 +6734,7 @@ class ConstrainedScheduler:
             scheduled = False
             for slot in preferred_slots:
                 if self._can_schedule(troop, beach_activity, slot, day):
-                    self.schedule.add_entry(slot, beach_activity, troop)
+                    self._add_to_schedule(slot, beach_activity, troop)
                     self._update_progress(troop, beach_activity.name)
                     scheduled = True
                     break
@@ -7150,7 +6743,7 @@ class ConstrainedScheduler:
             if not scheduled and beach_activity.slots == 1:
                 for slot in day_slots:
                     if self._can_schedule(troop, beach_activity, slot, day):
-                        self.schedule.add_entry(slot, beach_activity, troop)
+                        self._add_to_schedule(slot, beach_activity, troop)
                         self._update_progress(troop, beach_activity.name)
                         break
     
@@ -7189,7 +6782,7 @@ class ConstrainedScheduler:
                 
                 for slot in day_slots:
                     if self._can_schedule(troop, activity, slot, day):
-                        self.schedule.add_entry(slot, activity, troop)
+                        self._add_to_schedule(slot, activity, troop)
                         self._update_progress(troop, activity_name)
                         print(f"  {troop.name}: {activity_name} ({tier_name}) -> {slot} [PRIORITY]")
                         break
@@ -7214,7 +6807,7 @@ class ConstrainedScheduler:
                 
                 for slot in day_slots:
                     if self._can_schedule(troop, activity, slot, day):
-                        self.schedule.add_entry(slot, activity, troop)
+                        self._add_to_schedule(slot, activity, troop)
                         self._update_progress(troop, activity_name)
                         print(f"  {troop.name}: {activity_name} ({tier_name}) -> {slot}")
                         break
@@ -7224,9 +6817,6 @@ class ConstrainedScheduler:
         
         ENHANCED: Prioritize filling underused slots (< 5 staff) to reduce severe underuse penalty.
         """
-        if day == Day.TUESDAY:
-             print(f"DEBUG: _fill_remaining_slots called for TUESDAY")
-        
         # ENHANCEMENT: Sort slots by staff count (underused first) to prioritize filling them
         slot_staff_counts = [(slot, self._count_all_staff_in_slot(slot)) for slot in day_slots]
         slot_staff_counts.sort(key=lambda x: x[1])  # Ascending: underused slots first
@@ -7236,8 +6826,6 @@ class ConstrainedScheduler:
             for slot in sorted_slots:  # Process underused slots first
                 if not self.schedule.is_troop_free(slot, troop):
                     continue
-                if troop.name == "Tecumseh" and day == Day.TUESDAY:
-                     print(f"DEBUG: Processing Tecumseh Tue slot {slot.slot_number}")
                 
                 # First try troop preferences
                 scheduled = False
@@ -7257,7 +6845,7 @@ class ConstrainedScheduler:
                         continue  # Skip staffed activity in heavy slot
                     
                     if self._can_schedule(troop, activity, slot, day):
-                        self.schedule.add_entry(slot, activity, troop)
+                        self._add_to_schedule(slot, activity, troop)
                         self._update_progress(troop, activity.name)
                         scheduled = True
                         break
@@ -7279,11 +6867,15 @@ class ConstrainedScheduler:
                     elif prefer_staffed:
                         fill_candidates.sort(key=lambda x: -x[0])  # Descending by staff cost (staffed first)
                     
-                    for _, fill_name, activity in fill_candidates:
-                        # Use relax_constraints=True to allow same-area activities if needed
-                        if self._can_schedule(troop, activity, slot, day, relax_constraints=True):
-                            self.schedule.add_entry(slot, activity, troop)
-                            print(f"  [Fill] {troop.name}: {fill_name} -> {slot}")
+                    # Strict checks first; relaxed checks still never pair two activities of
+                    # one area on a day (slots 1 and 3 of one area are a cluster gap)
+                    for relax in (False, True):
+                        fill = next((activity for _, _, activity in fill_candidates
+                                     if not (relax and self._has_same_area_activity_today(troop, activity, day))
+                                     and self._can_schedule(troop, activity, slot, day, relax_constraints=relax)), None)
+                        if fill:
+                            self._add_to_schedule(slot, fill, troop)
+                            print(f"  [Fill] {troop.name}: {fill.name} -> {slot}")
                             break
     
     def _is_far_apart(self, activity1: str, activity2: str) -> bool:
@@ -7386,10 +6978,27 @@ class ConstrainedScheduler:
             else:
                 raise ValueError("Insufficient arguments for _can_schedule")
         
-        # Original method body starts here
-        if not self.schedule.is_troop_free(slot, troop):
+        # Nogood cache: a failed placement keeps failing until the troop's entries, the day's
+        # entries or the run state _check_placement reads besides the entries change
+        nogood_key = (troop.name, activity.name, activity.slots, slot.day, slot.slot_number, day,
+                      relax_constraints, ignore_day_requests, allow_top1_beach_slot2)
+        scope = self.schedule.scope_hash(troop.name, (slot.day, day)) + self._nogood_context(troop)
+        if self.nogoods.is_nogood(nogood_key, scope):
             return False
-        """Check if activity can be scheduled in this slot."""
+        if self._check_placement(troop, activity, slot, day, relax_constraints,
+                                 ignore_day_requests, allow_top1_beach_slot2):
+            return True
+        self.nogoods.record(nogood_key, scope)
+        return False
+    
+    def _nogood_context(self, troop) -> tuple:
+        """Inputs of _check_placement that are not schedule entries (part of every nogood scope)."""
+        return (self.frozen_slots, tuple(self.capacity_overrides), self.voyageur_mode,
+                self.troop_commissioner.get(troop.name))
+    
+    def _check_placement(self, troop, activity, slot, day, relax_constraints=False,
+                         ignore_day_requests=False, allow_top1_beach_slot2=False) -> bool:
+        """Check if activity can be scheduled in this slot (uncached body of _can_schedule)."""
         if not self.schedule.is_troop_free(slot, troop):
             return False
         
@@ -7403,13 +7012,13 @@ class ConstrainedScheduler:
         
         # Use higher limit for staff clustering to improve efficiency
         # But also consider clustering quality impact
-        base_staff_limit = 20 if activity.name in STAFF_CLUSTERING_ACTIVITIES else 16
+        base_staff_limit = self.STAFF_CLUSTERING_LIMIT if activity.name in STAFF_CLUSTERING_ACTIVITIES else self.STAFF_LIMIT
         
         # Check current clustering quality impact
         current_staff = self._count_all_staff_in_slot(slot)
         
         # Allow higher limits if it improves clustering
-        clustering_bonus = 4 if activity.name in STAFF_CLUSTERING_ACTIVITIES else 0
+        clustering_bonus = self.STAFF_CLUSTERING_BONUS if activity.name in STAFF_CLUSTERING_ACTIVITIES else 0
         staff_limit = base_staff_limit + clustering_bonus
         
         # Calculate what total staff would be if we add this activity
@@ -7429,6 +7038,11 @@ class ConstrainedScheduler:
         if slot.slot_number + slots_needed - 1 > max_slot:
             return False  # Activity extends beyond end of day
         
+        # DISRUPTION REPAIR: never place into slots that already ran or over a reduced capacity
+        if (self.frozen_slots or self.capacity_overrides) and \
+                not self._fits_disruption(troop, activity, slot, slots_needed):
+            return False
+        
         # DUPLICATE PREVENTION: Ensure troop doesn't already have this activity
         # Exception: Troop Shotgun allows duplicates for large troops (>15 people)
         # This is handled by special logic below
@@ -7992,7 +7606,7 @@ class ConstrainedScheduler:
         
         Capacity rules:
         - Aqua Trampoline: 2 troops if both ≤16 scouts
-        - Sailing: 1 troop per slot (exclusive per-slot). Up to 2 troops per day allowed since 2 Sailing sessions (1.5 + 1.5 = 3 slots) fit in a 3-slot day.
+        - Sailing: 1 troop per slot (exclusive per-slot); _can_schedule_sailing limits it to 1 troop per day
         - Water Polo: up to 2 troops
         - Canoe activities: total people ≤26 (13 canoes)
         - Gaga Ball / 9 Square: 1 troop (exclusive)
@@ -8329,9 +7943,9 @@ class ConstrainedScheduler:
         """Special check for Sailing.
         
         Sailing IS exclusive - only 1 troop per slot (duration 1.5 slots).
-        Since Sailing is 1.5 slots, 2 Sailing sessions (1.5 + 1.5 = 3 slots) can fit in a 3-slot day.
-        This allows up to 2 troops per day with Sailing (one starting at slot 1, one starting at slot 2).
-        Exclusivity is enforced per-slot, not per-day.
+        A session starting at slot 1 or 2 also books the next slot (continuation
+        entry), so a second troop never fits beside it: 1 Sailing troop per day
+        (AREA_DAY_CAPACITY in core/scheduler/bounds.py).
         
         Thursday Sailing priority for largest troop is handled by 
         _schedule_thursday_sailing_largest_troop phase which runs first.
@@ -8345,7 +7959,6 @@ class ConstrainedScheduler:
         day_slots = [s for s in self.time_slots if s.day == day]
         
         # Sailing IS exclusive per slot (standard exclusive area rule)
-        # Since Sailing is 1.5 slots, 2 Sailing sessions (1.5 + 1.5 = 3 slots) fit in a 3-slot day
         # Check if there's already a Sailing session in this specific slot on this day
         for entry in self.schedule.entries:
             if not hasattr(entry, 'time_slot') or not hasattr(entry, 'activity'):
@@ -8360,7 +7973,7 @@ class ConstrainedScheduler:
                     if slot.slot_number in [2, 3]:
                         return False  # Slot conflict
         
-        # Check if we'd exceed 2 per day limit (only applies to 3-slot days)
+        # Sailing entries today: one session is a start entry plus its continuation
         sailing_sessions_today = 0
         for entry in self.schedule.entries:
             if hasattr(entry, 'activity') and hasattr(entry, 'time_slot') and \
@@ -8368,7 +7981,7 @@ class ConstrainedScheduler:
                 sailing_sessions_today += 1
         
         if day != Day.THURSDAY and sailing_sessions_today >= 2:
-            return False  # Already have 2 Sailing sessions on this day (max 2 per day)
+            return False  # A Sailing troop (start + continuation) already has this day
         
         # Friday is reserved for Reflection; no Sailing allowed
         if day == Day.FRIDAY:
@@ -8644,8 +8257,7 @@ class ConstrainedScheduler:
         # ============================================================
         
         # Dynamic STAFF_AREAS based on configuration
-        priority_areas = config_loader.get_optimization_rules().get("area_clustering_priority", 
-                                        ["Tower", "Rifle Range", "Archery", "Outdoor Skills", "Commissioner"])
+        priority_areas = self.area_clustering_priority or ["Tower", "Rifle Range", "Archery", "Outdoor Skills", "Commissioner"]
         
         STAFF_AREAS = {}
         for area_name in priority_areas:
@@ -8760,6 +8372,11 @@ class ConstrainedScheduler:
                 # No activities yet - use first N preferred days
                 area_primary_days = set(PREFERRED_DAY_ORDER[:min_days_needed])
         
+        # The A.2b bin-packing plan replaces the per-call demand estimate
+        planned_days = self._planned_area_days(activity.name)
+        if planned_days:
+            area_primary_days = set(planned_days)
+        
         if activity.name == 'Climbing Tower':
              print(f"DEBUG_TOWER: {troop.name} ({comm}) -> Forced Day: {forced_day}")
              print(f"DEBUG_TOWER: Primary Days: {area_primary_days}")
@@ -9320,8 +8937,7 @@ class ConstrainedScheduler:
         
         # Build area mapping for clustering score
         # Dynamic CLUSTER_AREAS based on configuration
-        priority_areas = config_loader.get_optimization_rules().get("area_clustering_priority", 
-                                        ["Tower", "Rifle Range", "Archery", "Outdoor Skills", "Commissioner"])
+        priority_areas = self.area_clustering_priority or ["Tower", "Rifle Range", "Archery", "Outdoor Skills", "Commissioner"]
         
         CLUSTER_AREAS = {}
         for area_name in priority_areas:
@@ -9573,6 +9189,9 @@ class ConstrainedScheduler:
         print(f"  [Gap Fill] Starting ABSOLUTE gap detection and filling...")
         
         for iteration in range(max_iterations):
+            # Out of budget: skip preference-aware filling, the emergency fill below still closes every gap
+            if not self._watchdog_allows():
+                break
             iteration_fills = 0
             print(f"    Iteration {iteration + 1}/{max_iterations}...")
             
@@ -10166,8 +9785,7 @@ class ConstrainedScheduler:
         # Staff areas to optimize for clustering
         # Staff areas to optimize for clustering
         # Dynamic CLUSTER_AREAS based on configuration
-        priority_areas = config_loader.get_optimization_rules().get("area_clustering_priority", 
-                                        ["Tower", "Rifle Range", "Archery", "Outdoor Skills"])
+        priority_areas = self.area_clustering_priority or ["Tower", "Rifle Range", "Archery", "Outdoor Skills"]
         
         CLUSTER_AREAS = {}
         for area_name in priority_areas:
@@ -10184,14 +9802,15 @@ class ConstrainedScheduler:
         PROTECTED = {"Delta", "Super Troop", "Reflection", "Archery", 
                      "Tamarac Wildlife Refuge", "Itasca State Park", "Back of the Moon"}
         
-        # Track swaps to prevent oscillation
-        # Key: (troop_a_name, troop_b_name, slot) -> True
-        swapped_pairs = set()
+        # Zobrist hashes of schedules already reached, to prevent oscillation
+        visited_states = {self.schedule.state_hash()}
         
         total_swaps = 0
-        max_iterations = 3  # Limit iterations to avoid infinite loops
+        max_iterations = self.SWAP_MAX_ITERATIONS  # Limit iterations to avoid infinite loops
         
         for iteration in range(max_iterations):
+            if not self._watchdog_allows():
+                break
             swaps_this_iteration = 0
             
             # For each troop, find clustering outliers
@@ -10203,7 +9822,7 @@ class ConstrainedScheduler:
                 
                 for outlier in outliers:
                     swap_made = self._try_swap_for_outlier(
-                        troop, outlier, activity_to_area, PROTECTED, swapped_pairs
+                        troop, outlier, activity_to_area, PROTECTED, visited_states
                     )
                     if swap_made:
                         swaps_this_iteration += 1
@@ -10299,15 +9918,18 @@ class ConstrainedScheduler:
         
         return outliers
     
-    def _try_swap_for_outlier(self, troop, outlier, activity_to_area, protected, swapped_pairs):
+    def _try_swap_for_outlier(self, troop, outlier, activity_to_area, protected, visited_states):
         """
         Try to find another troop to swap with for this outlier.
         
         Simplified approach: Try ANY troop that has a different activity in this slot.
         If the swap passes constraints and doesn't hurt either troop too much, do it.
+        Candidates are checked pairwise: scoring all same-slot swaps in one batch
+        found no swap to make on the stored weeks (few same-slot swaps are valid
+        by the end of a run), so it was not kept.
         
         Args:
-            swapped_pairs: Set of (troop_a, troop_b, slot) tuples to prevent re-swapping
+            visited_states: Zobrist hashes of schedules already reached (never revisited)
         
         Returns True if a swap was made.
         """
@@ -10345,9 +9967,11 @@ class ConstrainedScheduler:
             if other_activity.name == outlier_activity.name:
                 continue
             
-            # Skip if we've already swapped this pair in this slot (prevent oscillation)
-            swap_key = tuple(sorted([troop.name, other_troop.name]) + [str(slot)])
-            if swap_key in swapped_pairs:
+            # Skip if the swap leads back to a schedule already visited (prevent oscillation)
+            next_state = self._state_hash_after(
+                [(troop, outlier_activity.name, slot), (other_troop, other_activity.name, slot)],
+                [(troop, other_activity.name, slot), (other_troop, outlier_activity.name, slot)])
+            if next_state in visited_states:
                 continue
             
             # BONUS: Prefer if other_troop has a desired activity (cluster helper)
@@ -10363,7 +9987,7 @@ class ConstrainedScheduler:
             
             # Execute the swap
             self._execute_swap(troop, other_troop, outlier_activity, other_activity, slot)
-            swapped_pairs.add(swap_key)  # Track this swap to prevent re-swapping
+            visited_states.add(self.schedule.state_hash())
             cluster_note = " [CLUSTER]" if is_cluster_helper else ""
             print(f"    SWAP{cluster_note}: {troop.name} and {other_troop.name} in {slot}")
             print(f"          {troop.name}: {outlier_activity.name} -> {other_activity.name}")
@@ -10531,9 +10155,11 @@ class ConstrainedScheduler:
                     "Tamarac Wildlife Refuge", "Itasca State Park", "Back of the Moon"}
         
         swaps_made = 0
-        max_iterations = 3
+        max_iterations = self.SWAP_MAX_ITERATIONS
         
         for iteration in range(max_iterations):
+            if not self._watchdog_allows():
+                break
             iteration_swaps = 0
             
             # Analyze each cluster activity
@@ -10625,13 +10251,15 @@ class ConstrainedScheduler:
         # Exclusive activities (only 1 troop per slot)
         EXCLUSIVE = {"Delta", "Super Troop", "Archery", "Climbing Tower", "Troop Rifle", "Troop Shotgun"}
         
-        # Track swapped pairs to prevent oscillation
-        swapped_pairs = set()  # Set of (troop_name, activity1, activity2) tuples
+        # Zobrist hashes of schedules already reached, to prevent oscillation
+        visited_states = {self.schedule.state_hash()}
         
         total_swaps = 0
-        max_iterations = 5  # More iterations for cascading improvements
+        max_iterations = self.IMPROVEMENT_SWAP_MAX_ITERATIONS  # More iterations for cascading improvements
         
         for iteration in range(max_iterations):
+            if not self._watchdog_allows():
+                break
             iteration_swaps = 0
             best_global_swap = None
             best_global_score = 0
@@ -10679,9 +10307,11 @@ class ConstrainedScheduler:
                         if swap_day == current_day:
                             continue  # Same day, no clustering improvement
                         
-                        # Check if this pair was already swapped (prevent oscillation)
-                        pair_key = tuple(sorted([cluster_activity, swap_activity]))
-                        if (troop.name, pair_key) in swapped_pairs:
+                        # Skip swaps that lead back to a schedule already visited (prevent oscillation)
+                        next_state = self._state_hash_after(
+                            [(troop, cluster_activity, current_slot), (troop, swap_activity, swap_slot)],
+                            [(troop, cluster_activity, swap_slot), (troop, swap_activity, current_slot)])
+                        if next_state in visited_states:
                             continue
                         
                         # Check if entries still exist
@@ -10915,9 +10545,7 @@ class ConstrainedScheduler:
                     iteration_swaps += 1
                     total_swaps += 1
                     
-                    # Track this pair to prevent oscillation
-                    pair_key = tuple(sorted([s['cluster_activity'], s['swap_activity']]))
-                    swapped_pairs.add((troop.name, pair_key))
+                    visited_states.add(self.schedule.state_hash())
                     
                     details = []
                     if s.get('activity_gain', 0) > 0:
@@ -11710,9 +11338,10 @@ class ConstrainedScheduler:
         Swap valuable activities with fill activities to improve clustering across ALL days equally.
         
         This optimization:
-        1. Finds exclusive activities (Super Troop, Tower, Archery, Rifle) that aren't well-clustered
-        2. Finds fill activities that could swap with them
-        3. Swaps when it improves clustering by moving to a day with more of the same activity
+        1. Reassigns Super Troop slots in one weighted assignment (_assign_super_troop_slots)
+        2. Finds exclusive activities (Delta, Tower, Archery, Rifle) that aren't well-clustered
+        3. Finds fill activities that could swap with them
+        4. Swaps when it improves clustering by moving to a day with more of the same activity
         
         All days (Mon-Fri) are treated equally - no bias against Friday.
         """
@@ -11724,8 +11353,10 @@ class ConstrainedScheduler:
         FILL_ACTIVITIES = {"Shower House", "Trading Post", "Campsite Free Time", 
                            "Fishing", "Sauna", "Gaga Ball", "9 Square", "Troop Swim"}
         
-        # Exclusive activities that benefit from clustering
-        EXCLUSIVE_ACTIVITIES = {"Super Troop", "Delta", "Climbing Tower", "Archery",
+        self._assign_super_troop_slots(FILL_ACTIVITIES)
+        
+        # Exclusive activities that benefit from clustering (Super Troop is assigned above)
+        EXCLUSIVE_ACTIVITIES = {"Delta", "Climbing Tower", "Archery",
                                 "Troop Rifle", "Troop Shotgun"}
         
         # Never swap these out
@@ -11735,6 +11366,8 @@ class ConstrainedScheduler:
         max_iterations = 3
         
         for iteration in range(max_iterations):
+            if not self._watchdog_allows():
+                break
             iteration_swaps = 0
             
             for troop in self.troops:
@@ -11837,6 +11470,89 @@ class ConstrainedScheduler:
         else:
             print("  No clustering improvements found")
     
+    def _assign_super_troop_slots(self, fill_activities):
+        """
+        Reassign Super Troop slots as one weighted assignment (Hungarian) of troops to slots.
+        
+        A troop keeps its slot or trades it with one of its own fill_activities in a
+        slot no other troop's Super Troop holds. The trade must pass _entry_trade_ok,
+        keep Super Troop after the troop's Delta (unless Delta was swapped out) and
+        leave the commissioner free of their other troops' Delta, Reflection and Archery.
+        A same-day Rifle/Shotgun (promoted pairing) is worth SUPER_TROOP_PAIRING_VALUE;
+        SUPER_TROOP_MOVE_COST keeps a troop in place on ties.
+        
+        Returns:
+            Number of Super Troop entries moved.
+        """
+        super_troop = get_activity_by_name("Super Troop")
+        rows = [(e.troop, e) for e in self.schedule.entries if e.activity.name == "Super Troop"]
+        if not super_troop or not rows:
+            return 0
+        
+        held = {e.time_slot for _, e in rows}
+        commissioner_slots = {}
+        for e in self.schedule.entries:
+            if e.activity.name in ("Delta", "Reflection", "Archery"):
+                commissioner = self.troop_commissioner.get(e.troop.name)
+                commissioner_slots.setdefault(commissioner, []).append((e.troop.name, e.time_slot))
+        
+        cost, trades = [], []
+        for troop, entry in rows:
+            commissioner = self.troop_commissioner.get(troop.name)
+            delta_slot = next((e.time_slot for e in self.schedule.entries
+                               if e.troop == troop and e.activity.name == "Delta"), None)
+            if troop.name in self.delta_was_swapped:
+                delta_slot = None
+            fills = {e.time_slot: e for e in self.schedule.entries
+                     if e.troop == troop and e.activity.name in fill_activities}
+            row, trade = [], {}
+            for col, slot in enumerate(self.time_slots):
+                if slot != entry.time_slot:
+                    fill = fills.get(slot)
+                    if (fill is None or slot in held
+                            or (delta_slot and self.time_slots.index(slot) <= self.time_slots.index(delta_slot))
+                            or any(name != troop.name and busy == slot
+                                   for name, busy in commissioner_slots.get(commissioner, ()))
+                            or not self._entry_trade_ok(troop, entry, fill)):
+                        row.append(INFEASIBLE)
+                        continue
+                    trade[col] = fill
+                value = 0.0
+                if any(e.troop == troop and e.time_slot.day == slot.day
+                       and e.activity.name in ("Troop Rifle", "Troop Shotgun") for e in self.schedule.entries):
+                    value += self.SUPER_TROOP_PAIRING_VALUE
+                row.append(-value + (self.SUPER_TROOP_MOVE_COST if col in trade else 0.0))
+            cost.append(row)
+            trades.append(trade)
+        
+        moved = 0
+        for (troop, entry), trade, col in zip(rows, trades, hungarian(cost)):
+            fill = trade.get(col)
+            # Earlier trades this round can invalidate a later one - re-check before committing
+            if fill is None or not self._entry_trade_ok(troop, entry, fill):
+                continue
+            self.schedule.entries.remove(entry)
+            self.schedule.entries.remove(fill)
+            self.schedule.entries.append(ScheduleEntry(fill.time_slot, super_troop, troop))
+            self.schedule.entries.append(ScheduleEntry(entry.time_slot, fill.activity, troop))
+            moved += 1
+            print(f"  [Super Troop] {troop.name}: {entry.time_slot} -> {fill.time_slot} (swapped with {fill.activity.name})")
+        return moved
+    
+    def _entry_trade_ok(self, troop, entry, fill):
+        """Whether two of troop's entries can trade slots (_can_schedule both ways)."""
+        self.schedule.entries.remove(entry)
+        self.schedule.entries.remove(fill)
+        ok = self._can_schedule(troop, entry.activity, fill.time_slot, fill.time_slot.day)
+        if ok:
+            moved = ScheduleEntry(fill.time_slot, entry.activity, troop)
+            self.schedule.entries.append(moved)
+            ok = self._can_schedule(troop, fill.activity, entry.time_slot, entry.time_slot.day)
+            self.schedule.entries.remove(moved)
+        self.schedule.entries.append(entry)
+        self.schedule.entries.append(fill)
+        return ok
+    
     
     def _preference_improvement_swaps(self):
         """
@@ -11860,9 +11576,11 @@ class ConstrainedScheduler:
         PROTECTED = {"Reflection", "Super Troop"}
         
         swaps_made = 0
-        max_iterations = 5  # Increased from 3 for more aggressive optimization
+        max_iterations = self.IMPROVEMENT_SWAP_MAX_ITERATIONS
         
         for iteration in range(max_iterations):
+            if not self._watchdog_allows():
+                break
             iteration_swaps = 0
             
             for troop in self.troops:
@@ -12356,7 +12074,8 @@ class ConstrainedScheduler:
                                         # TRACK TOP 5 TO RECOVER LATER
                                         if not hasattr(self, '_top5_to_recover'):
                                             self._top5_to_recover = []
-                                        self._top5_to_recover.append((troop, e.activity, rank))
+                                        if (troop, e.activity, rank) not in self._top5_to_recover:
+                                            self._top5_to_recover.append((troop, e.activity, rank))
                         else:
                             # RULE 2: No Top 5 involved - use original priority logic
                             def sort_key(e):
@@ -12957,11 +12676,13 @@ class ConstrainedScheduler:
         - Ideal: Commissioner A has 3 troops → Fri-1, Fri-2, Fri-3 (one in each)
         - This allows the commissioner to visit all 3 of their troops' Reflections
         
-        OLD BEHAVIOR (BUG): Clustered all troops together in same slot
-        NEW BEHAVIOR (FIX): Spread troops across different slots
+        Solved per commissioner as a weighted assignment (Hungarian) of troops to
+        (Friday slot, k-th troop in that slot) columns: crowding costs
+        REFLECTION_CROWDING_COST per extra troop, REFLECTION_COMMISSIONER_COST keeps
+        Reflections off the commissioner's other commitments and Friday clustering breaks
+        ties. A troop moves into a Friday slot it has free or trades with its own entry
+        there (_reflection_trades).
         """
-        from .models import ScheduleEntry
-        
         print("\n--- Flexible Reflection Distribution (Spread Across Slots) ---")
         
         reflection = get_activity_by_name("Reflection")
@@ -12969,6 +12690,9 @@ class ConstrainedScheduler:
             return
         
         friday_slots = [s for s in self.time_slots if s.day == Day.FRIDAY]
+        cluster_activities = EXCLUSIVE_AREAS.get("Tower", []) + \
+                           EXCLUSIVE_AREAS.get("Outdoor Skills", []) + \
+                           EXCLUSIVE_AREAS.get("Archery", [])
         swaps_made = 0
         
         # Group troops by commissioner
@@ -12980,78 +12704,69 @@ class ConstrainedScheduler:
             commissioner_troops[comm].append(troop)
         
         for commissioner, troops in commissioner_troops.items():
-            if len(troops) <= 1:
-                continue  # No distribution needed for single-troop commissioners
-            
-            # Find reflection entries for this commissioner's troops
-            reflection_entries = []
-            for troop in troops:
-                entry = next(
-                    (e for e in self.schedule.entries 
-                     if e.troop == troop and e.activity.name == "Reflection"),
-                    None
-                )
-                if entry:
-                    reflection_entries.append((troop, entry))
-            
-            if len(reflection_entries) <= 1:
-                continue
-            
-            # Count how many troops in each slot
-            slot_distribution = {}
-            for _, entry in reflection_entries:
-                slot = entry.time_slot
-                if slot not in slot_distribution:
-                    slot_distribution[slot] = []
-                slot_distribution[slot].append(entry.troop)
-            
-            # Find slots with multiple troops from same commissioner (BAD - need to spread)
-            overcrowded_slots = {slot: troops_list for slot, troops_list in slot_distribution.items() if len(troops_list) > 1}
-            
-            if not overcrowded_slots:
-                print(f"  {commissioner}: Already distributed (1 per slot) [OK]")
-                continue
-            
-            # Try to spread troops from overcrowded slots to empty/less-crowded slots
-            for overcrowded_slot, troops_in_slot in overcrowded_slots.items():
-                # Keep first troop, move others
-                troops_to_move = troops_in_slot[1:]  # All but the first
-                
-                for troop in troops_to_move:
-                    # Find current Reflection entry
-                    current_entry = next((e for e in self.schedule.entries 
-                                        if e.troop == troop and e.activity.name == "Reflection"), None)
-                    if not current_entry:
-                        continue
-                    
-                    # Find a Friday slot that doesn't have this commissioner's troops yet
-                    target_slot = None
-                    for friday_slot in friday_slots:
-                        # Check if this slot already has troops from this commissioner
-                        has_commissioner_troop = any(
-                            e.troop in troops and e.activity.name == "Reflection"
-                            for e in self.schedule.entries if e.time_slot == friday_slot
-                        )
-                        
-                        if not has_commissioner_troop:
-                            target_slot = friday_slot
-                            break
-                    
-                    if not target_slot:
-                        continue  # No available slot
-                    
-                    # Move Reflection to new slot
-                    self.schedule.entries.remove(current_entry)
-                    self.schedule.add_entry(target_slot, reflection, troop)
-                    
-                    print(f"  [Swap] {troop.name}: Reflection {overcrowded_slot.day.name[:3]}-{overcrowded_slot.slot_number} -> {target_slot.day.name[:3]}-{target_slot.slot_number} (spreading {commissioner})")
-                    swaps_made += 1
+            # Trades interact through capacity (two troops trading Archery into one slot),
+            # so a trade can fail its re-check; re-solve while that left troops behind
+            for _ in range(len(troops)):
+                moved, rejected = self._spread_commissioner_reflections(commissioner, troops, friday_slots,
+                                                                        cluster_activities)
+                swaps_made += moved
+                if not (moved and rejected):
+                    break
         
         if swaps_made > 0:
             print(f"  Total Reflection distribution swaps: {swaps_made}")
         else:
             print("  All commissioners already have troops spread across slots")
     
+    def _spread_commissioner_reflections(self, commissioner, troops, friday_slots, cluster_activities):
+        """
+        One assignment round of _optimize_flexible_reflections for one commissioner's troops.
+        
+        Returns:
+            (Reflections moved, assigned moves whose trade failed its re-check)
+        """
+        # This commissioner's troops with a Friday Reflection
+        rows = []
+        for troop in troops:
+            entry = next((e for e in self.schedule.entries
+                          if e.troop == troop and e.activity.name == "Reflection"
+                          and e.time_slot.day == Day.FRIDAY), None)
+            if entry:
+                rows.append((troop, entry))
+        if len(rows) <= 1:
+            return 0, 0  # No distribution needed for single-troop commissioners
+        
+        depth = -(-len(rows) // len(friday_slots))
+        columns = [(slot, k) for k in range(depth) for slot in friday_slots]
+        busy = self._commissioner_busy_slots()
+        cost, trades = [], []
+        for troop, entry in rows:
+            trade = self._reflection_trades(troop, entry)
+            row = []
+            for slot, k in columns:
+                if slot != entry.time_slot and slot not in trade:
+                    row.append(INFEASIBLE)
+                    continue
+                row.append(k * self.REFLECTION_CROWDING_COST
+                           + self._reflection_commissioner_cost(troop, slot, busy)
+                           - self._friday_clustering_score(troop, slot, cluster_activities)
+                           + (self.REFLECTION_MOVE_COST if slot != entry.time_slot else 0.0))
+            cost.append(row)
+            trades.append(trade)
+        
+        moved = rejected = 0
+        for (troop, entry), trade, col in zip(rows, trades, hungarian(cost)):
+            current_slot = entry.time_slot
+            if col is None or columns[col][0] == current_slot:
+                continue
+            target_slot = columns[col][0]
+            if not self._apply_reflection_trade(troop, entry, target_slot, trade[target_slot]):
+                rejected += 1
+                continue
+            print(f"  [Swap] {troop.name}: Reflection {current_slot.day.name[:3]}-{current_slot.slot_number} -> {target_slot.day.name[:3]}-{target_slot.slot_number} (spreading {commissioner})")
+            moved += 1
+        return moved, rejected
+    
     def _fix_beach_slot_violations(self):
         """
         Fix Beach Slot Rule violations by swapping beach activities from slot 2 to slot 1 or 3.
@@ -13401,8 +13116,13 @@ class ConstrainedScheduler:
         - Each excess cluster day costs -8 points
         - Target: Reduce excess days from 3-5 to 0-2 per area
         - Strategy: Smart consolidation with priority-aware moves
+        - Skipped when the A.2b cluster-day plan already decided the areas' days
         """
         print("\n--- Activity Clustering Optimization ---")
+        if self.area_day_plan:
+            # Placement already kept the staffed areas on their A.2b planned days
+            print("  Skipped: staffed areas follow the cluster-day plan (A.2b)")
+            return 0
         
         # Activities that don't count towards clustering (mandatory only)
         IGNORED = {'Reflection', 'Super Troop', 'Campsite Free Time', 'Trading Post', 'Shower House'}
@@ -13620,10 +13340,15 @@ class ConstrainedScheduler:
         
         This method aggressively moves cluster activities from excess days to consolidate
         them into the minimum required number of days, reducing excess cluster day penalties.
+        Skipped when the A.2b cluster-day plan already decided the areas' days.
         """
         from .models import EXCLUSIVE_AREAS, Day
         import math
         
+        if self.area_day_plan:
+            print("  Skipped: staffed areas follow the cluster-day plan (A.2b)")
+            return 0
+        
         total_consolidated = 0
         
         # Target cluster areas: Tower, Rifle Range, Outdoor Skills, Handicrafts
@@ -13736,6 +13461,8 @@ class ConstrainedScheduler:
         cluster_areas = ["Tower", "Rifle Range", "Outdoor Skills", "Handicrafts"]
         
         for area in cluster_areas:
+            if not self._watchdog_allows():
+                break
             activities = EXCLUSIVE_AREAS.get(area, [])
             if not activities:
                 continue
@@ -13780,6 +13507,8 @@ class ConstrainedScheduler:
                     for source_entry in source_entries[:]:  # Copy list
                         if len(target_entries) >= 3:  # Target day became full
                             break
+                        if not self._watchdog_allows():
+                            break
                         
                         # Check if we can move this activity
                         for slot_num in range(1, 4):
@@ -13975,6 +13704,8 @@ class ConstrainedScheduler:
         max_iterations = 5  # Prevent infinite loops
         
         for iteration in range(max_iterations):
+            if not self._watchdog_allows():
+                break
             print(f"      [Iteration {iteration + 1}]")
             iteration_fixed = 0
             
@@ -14715,6 +14446,8 @@ class ConstrainedScheduler:
         max_iterations = 3  # Prevent infinite loops
         
         for iteration in range(max_iterations):
+            if not self._watchdog_allows():
+                break
             iteration_optimizations = 0
             
             # ENHANCED: Multi-strategy approach
@@ -15663,8 +15396,8 @@ class ConstrainedScheduler:
     
     def _displacement_logic(self, activity, troop, timeslot):
         """Handle displacement logic for scheduling."""
-        # Delegate to existing displacement methods
-        return self._constraint_aware_displacement(activity, troop, timeslot)
+        # Delegate to the ejection-chain placement
+        return self._place_by_ejection_chain(troop, activity, troop.get_priority(activity.name))
     
     def _eliminate_empty_slots(self):
         """Eliminate empty slots in the schedule."""
@@ -27,8 +27,8 @@ def load_troops_from_json(file_path):
         
     return troops
 
-def save_schedule_to_json(schedule, troops, output_file, unscheduled_data=None):
-    """Save schedule and troops to a JSON file (cache format)."""
+def schedule_to_data(schedule, troops, unscheduled_data=None, input_key=None):
+    """Schedule and troops as the JSON-serializable cache format."""
     
     # Serialize troops
     troops_data = []
@@ -60,21 +60,33 @@ def save_schedule_to_json(schedule, troops, output_file, unscheduled_data=None):
         'entries': entries_data,
         'unscheduled': unscheduled_data if unscheduled_data else {}
     }
+    if input_key is not None:
+        # Inputs the schedule was made for (core/scheduler/schedule_cache.py)
+        output_data['input_key'] = input_key
+    return output_data
+
+def save_schedule_to_json(schedule, troops, output_file, unscheduled_data=None, input_key=None):
+    """Save schedule and troops to a JSON file (cache format)."""
+    output_data = schedule_to_data(schedule, troops, unscheduled_data, input_key)
     
     with open(output_file, 'w') as f:
         json.dump(output_data, f, indent=2)
     
     print(f"Schedule saved to {output_file}")
+
 def load_schedule_from_json(file_path, troops, all_activities):
     """
     Load a schedule from a JSON file.
     Requires fully populated troops and activities lists to reconstruct objects.
     """
-    from .models import Schedule, ScheduleEntry, TimeSlot, Day
-    
     with open(file_path, 'r') as f:
         data = json.load(f)
-        
+    return schedule_from_data(data, troops, all_activities)
+
+def schedule_from_data(data, troops, all_activities):
+    """Rebuild a Schedule from cache-format data for the given troops and activities."""
+    from .models import Schedule, ScheduleEntry, TimeSlot, Day
+    
     schedule = Schedule()
     
     # Map names to objects
@@ -1,6 +1,7 @@
 """
 Summer Camp Scheduler - Data Models
 """
+import hashlib
 from dataclasses import dataclass, field
 from typing import Optional
 from enum import Enum
@@ -191,10 +192,120 @@ class ScheduleEntry:
         return False
 
 
+_ZOBRIST_KEYS = {}
+
+
+def zobrist_key(troop_name: str, activity_name: str, time_slot: TimeSlot) -> int:
+    """64-bit Zobrist key of one (troop, activity, slot) placement.
+    
+    Derived from the names rather than random.getrandbits so keys (and state
+    hashes) agree across processes and PYTHONHASHSEED values.
+    """
+    ident = (troop_name, activity_name, time_slot.day.name, time_slot.slot_number)
+    key = _ZOBRIST_KEYS.get(ident)
+    if key is None:
+        digest = hashlib.blake2b("|".join(map(str, ident)).encode(), digest_size=8).digest()
+        key = _ZOBRIST_KEYS[ident] = int.from_bytes(digest, "little")
+    return key
+
+
+def _entry_zobrist(entry: ScheduleEntry) -> int:
+    return zobrist_key(entry.troop.name, entry.activity.name, entry.time_slot)
+
+
+class EntryList(list):
+    """Schedule entry list that keeps an incremental Zobrist hash of its contents.
+    
+    zobrist is the XOR of the keys of all entries, updated on every add and
+    remove, so equal schedules hash equal regardless of entry order.
+    troop_zobrist and day_zobrist hash the entries of one troop or one day
+    the same way, for caches that only depend on part of the schedule.
+    """
+    zobrist = 0  # class default: unpickling appends items before restoring __dict__
+    
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self._rehash()
+    
+    def _rehash(self):
+        self.zobrist = 0
+        self.troop_zobrist = {}
+        self.day_zobrist = {}
+        for entry in self:
+            self._toggle(entry)
+    
+    def _toggle(self, entry):
+        """XOR entry's key in (or out) of the whole, troop and day hashes."""
+        if 'troop_zobrist' not in self.__dict__:
+            self.troop_zobrist, self.day_zobrist = {}, {}
+        key = _entry_zobrist(entry)
+        self.zobrist ^= key
+        troop_name, day = entry.troop.name, entry.time_slot.day
+        self.troop_zobrist[troop_name] = self.troop_zobrist.get(troop_name, 0) ^ key
+        self.day_zobrist[day] = self.day_zobrist.get(day, 0) ^ key
+    
+    def append(self, entry):
+        super().append(entry)
+        self._toggle(entry)
+    
+    def insert(self, index, entry):
+        super().insert(index, entry)
+        self._toggle(entry)
+    
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+    
+    def __iadd__(self, entries):
+        self.extend(entries)
+        return self
+    
+    def remove(self, entry):
+        super().remove(entry)
+        self._toggle(entry)
+    
+    def pop(self, index=-1):
+        entry = super().pop(index)
+        self._toggle(entry)
+        return entry
+    
+    def clear(self):
+        super().clear()
+        self._rehash()
+    
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._rehash()
+    
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._rehash()
+    
+    def __imul__(self, count):
+        result = super().__imul__(count)
+        self._rehash()
+        return result
+
+
 @dataclass  
 class Schedule:
     """Complete schedule for all troops."""
-    entries: list[ScheduleEntry] = field(default_factory=list)
+    entries: list[ScheduleEntry] = field(default_factory=EntryList)
+    
+    def __setattr__(self, name, value):
+        # Assigned lists (schedule.entries = [...]) become hashed EntryLists
+        if name == "entries" and not isinstance(value, EntryList):
+            value = EntryList(value)
+        super().__setattr__(name, value)
+    
+    def state_hash(self) -> int:
+        """Zobrist hash of the current entries (order-independent, O(1))."""
+        return self.entries.zobrist
+    
+    def scope_hash(self, troop_name: str, days) -> tuple:
+        """Hash of one troop's entries and of every entry on the given days (O(len(days)))."""
+        entries = self.entries
+        return (entries.troop_zobrist.get(troop_name, 0),) + tuple(entries.day_zobrist.get(day, 0) for day in days)
     
     def _get_effective_slots(self, activity: Activity, troop: Troop) -> float:
         """Get effective slot duration for activity based on troop size.
@@ -0,0 +1,411 @@
+"""
+Assignment Solvers for Summer Camp Scheduler.
+
+Pure-Python network-flow building blocks used where a phase would otherwise
+fill or assign greedily one troop at a time:
+
+- MinCostFlow: successive-shortest-path min-cost max-flow (small graphs,
+  a few hundred nodes, so Bellman-Ford/SPFA per augmentation is plenty).
+- solve_fill_assignment: empty (troop, slot) cells -> fill activities, at most
+  one activity per cell and each activity at most once per troop, minimising
+  total cost among maximum-cardinality fills.
+- hungarian: optimal rows -> columns assignment for a dense cost matrix
+  (Friday Reflection slot assignment).
+- maximum_matching: maximum-cardinality matching on a general graph
+  (Aqua Trampoline sharing pairs).
+- solve_exclusive_choice: one option per group over capacitated resources,
+  maximising total value by branch and bound (joint Delta + Sailing plan,
+  rolling-horizon day plans).
+- auction_assignment: bidders -> capacitated objects maximising total value
+  by Bertsekas' forward auction (scarce limited activities across troops).
+
+Scheduling rules that couple different troops (exclusive areas, wet/dry,
+staff limits) are not encoded in the network; callers commit the solution
+through _can_schedule and re-solve what was rejected.
+"""
+from collections import defaultdict, deque
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Sequence, Tuple
+
+_EPS = 1e-9
+
+# Cost of a forbidden row/column pair in hungarian(); such pairs are never returned
+INFEASIBLE = float('inf')
+
+
+class MinCostFlow:
+    """Min-cost max-flow on a directed graph with hashable node keys."""
+
+    def __init__(self):
+        self._adj: Dict[Hashable, List[int]] = defaultdict(list)
+        self._to: List[Hashable] = []
+        self._cap: List[int] = []
+        self._cost: List[float] = []
+        self._original_cap: List[int] = []
+
+    def add_edge(self, u: Hashable, v: Hashable, cap: int, cost: float = 0.0) -> int:
+        """Add u -> v and its residual reverse edge. Returns the forward edge id."""
+        edge_id = len(self._to)
+        for head, tail, capacity, edge_cost in ((u, v, cap, cost), (v, u, 0, -cost)):
+            self._adj[head].append(len(self._to))
+            self._to.append(tail)
+            self._cap.append(capacity)
+            self._cost.append(edge_cost)
+            self._original_cap.append(capacity)
+        return edge_id
+
+    def flow(self, edge_id: int) -> int:
+        """Units of flow currently on forward edge edge_id."""
+        return self._original_cap[edge_id] - self._cap[edge_id]
+
+    def _shortest_path(self, source, sink):
+        """SPFA over the residual graph (handles the negative reverse-edge costs)."""
+        dist = {source: 0.0}
+        via = {}
+        queue = deque([source])
+        queued = {source}
+        while queue:
+            u = queue.popleft()
+            queued.discard(u)
+            for edge_id in self._adj[u]:
+                if self._cap[edge_id] <= 0:
+                    continue
+                v = self._to[edge_id]
+                candidate = dist[u] + self._cost[edge_id]
+                if candidate < dist.get(v, float('inf')) - _EPS:
+                    dist[v] = candidate
+                    via[v] = edge_id
+                    if v not in queued:
+                        queued.add(v)
+                        queue.append(v)
+        if sink not in dist:
+            return None
+        path = []
+        node = sink
+        while node != source:
+            edge_id = via[node]
+            path.append(edge_id)
+            node = self._to[edge_id ^ 1]
+        return path
+
+    def solve(self, source: Hashable, sink: Hashable, max_flow: Optional[int] = None) -> Tuple[int, float]:
+        """Push as much flow as possible (up to max_flow) at minimum cost. Returns (flow, cost)."""
+        total_flow = 0
+        total_cost = 0.0
+        while max_flow is None or total_flow < max_flow:
+            path = self._shortest_path(source, sink)
+            if path is None:
+                break
+            push = min(self._cap[e] for e in path)
+            if max_flow is not None:
+                push = min(push, max_flow - total_flow)
+            for edge_id in path:
+                self._cap[edge_id] -= push
+                self._cap[edge_id ^ 1] += push
+                total_cost += push * self._cost[edge_id]
+            total_flow += push
+        return total_flow, total_cost
+
+
+def solve_fill_assignment(candidates: Dict[Tuple[str, Hashable], List[Tuple[str, float]]]) -> Dict[Tuple[str, Hashable], str]:
+    """
+    Match empty cells to fill activities in one min-cost flow.
+
+    Args:
+        candidates: (troop_name, slot) -> [(activity_name, cost), ...] of
+            placements that are individually valid.
+
+    Returns:
+        (troop_name, slot) -> activity_name for the filled cells. As many cells
+        as possible are filled; among those fills total cost is minimal. A troop
+        never receives the same activity in two cells.
+    """
+    network = MinCostFlow()
+    source, sink = ('source',), ('sink',)
+    arcs = []
+    troop_activities = set()
+    for cell, options in candidates.items():
+        troop_name = cell[0]
+        network.add_edge(('cell', cell), sink, 1)
+        for activity_name, cost in options:
+            node = ('troop_activity', troop_name, activity_name)
+            if node not in troop_activities:
+                troop_activities.add(node)
+                network.add_edge(source, node, 1)
+            arcs.append((network.add_edge(node, ('cell', cell), 1, cost), cell, activity_name))
+
+    network.solve(source, sink)
+    return {cell: activity_name for edge_id, cell, activity_name in arcs if network.flow(edge_id) > 0}
+
+
+def hungarian(cost: Sequence[Sequence[float]]) -> List[Optional[int]]:
+    """
+    Minimum-cost assignment of every row to a distinct column (rows <= columns).
+
+    Kuhn-Munkres with potentials, O(rows^2 * columns). Entries equal to
+    INFEASIBLE are forbidden; a row that can only be placed on a forbidden
+    column gets None.
+
+    Returns:
+        List with the chosen column index (or None) for each row.
+    """
+    rows = len(cost)
+    if rows == 0:
+        return []
+    cols = len(cost[0])
+    if rows > cols:
+        raise ValueError(f"hungarian() needs rows <= columns, got {rows}x{cols}")
+
+    # Forbidden pairs get a finite penalty above any feasible total, so the
+    # optimum still uses as few of them as possible
+    finite = [c for row in cost for c in row if c != INFEASIBLE]
+    big = (max((abs(c) for c in finite), default=0.0) + 1.0) * (rows + 1)
+    a = [[big if c == INFEASIBLE else c for c in row] for row in cost]
+
+    # 1-indexed arrays as in the classic formulation; column 0 is a sentinel
+    u = [0.0] * (rows + 1)
+    v = [0.0] * (cols + 1)
+    match = [0] * (cols + 1)      # match[j] = row assigned to column j
+    way = [0] * (cols + 1)
+    for i in range(1, rows + 1):
+        match[0] = i
+        j0 = 0
+        minv = [float('inf')] * (cols + 1)
+        used = [False] * (cols + 1)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            delta = float('inf')
+            j1 = 0
+            for j in range(1, cols + 1):
+                if used[j]:
+                    continue
+                reduced = a[i0 - 1][j - 1] - u[i0] - v[j]
+                if reduced < minv[j]:
+                    minv[j] = reduced
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            for j in range(cols + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    result: List[Optional[int]] = [None] * rows
+    for j in range(1, cols + 1):
+        if match[j]:
+            row = match[j] - 1
+            result[row] = j - 1 if cost[row][j - 1] != INFEASIBLE else None
+    return result
+
+
+def maximum_matching(node_count: int, edges: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Maximum-cardinality matching on an undirected graph (Edmonds' blossom algorithm).
+
+    Nodes are 0..node_count-1. Edges are seeded greedily in the order given
+    before augmenting, and augmentation never unmatches a node, so listing
+    preferred edges first keeps their endpoints matched.
+
+    Returns:
+        List of matched (u, v) pairs with u < v.
+    """
+    adj: List[List[int]] = [[] for _ in range(node_count)]
+    match = [-1] * node_count
+    for u, v in edges:
+        if u == v:
+            continue
+        adj[u].append(v)
+        adj[v].append(u)
+        if match[u] == -1 and match[v] == -1:
+            match[u], match[v] = v, u
+
+    for root in range(node_count):
+        if match[root] == -1 and adj[root]:
+            end, parent = _augmenting_path(root, adj, match)
+            while end != -1:
+                mate = parent[end]
+                next_end = match[mate]
+                match[end], match[mate] = mate, end
+                end = next_end
+
+    return [(u, v) for u, v in enumerate(match) if u < v]
+
+
+def _augmenting_path(root: int, adj: List[List[int]], match: List[int]) -> Tuple[int, List[int]]:
+    """BFS for an augmenting path from root, contracting odd cycles (blossoms) as found."""
+    node_count = len(adj)
+    used = [False] * node_count
+    parent = [-1] * node_count
+    base = list(range(node_count))
+    used[root] = True
+    queue = deque([root])
+
+    def lowest_common_base(a, b):
+        seen = [False] * node_count
+        while True:
+            a = base[a]
+            seen[a] = True
+            if match[a] == -1:
+                break
+            a = parent[match[a]]
+        while True:
+            b = base[b]
+            if seen[b]:
+                return b
+            b = parent[match[b]]
+
+    def mark_path(v, blossom_base, child, blossom):
+        while base[v] != blossom_base:
+            blossom[base[v]] = blossom[base[match[v]]] = True
+            parent[v] = child
+            child = match[v]
+            v = parent[match[v]]
+
+    while queue:
+        v = queue.popleft()
+        for to in adj[v]:
+            if base[v] == base[to] or match[v] == to:
+                continue
+            if to == root or (match[to] != -1 and parent[match[to]] != -1):
+                blossom_base = lowest_common_base(v, to)
+                blossom = [False] * node_count
+                mark_path(v, blossom_base, to, blossom)
+                mark_path(to, blossom_base, v, blossom)
+                for node in range(node_count):
+                    if blossom[base[node]]:
+                        base[node] = blossom_base
+                        if not used[node]:
+                            used[node] = True
+                            queue.append(node)
+            elif parent[to] == -1:
+                parent[to] = v
+                if match[to] == -1:
+                    return to, parent
+                used[match[to]] = True
+                queue.append(match[to])
+    return -1, parent
+
+
+def solve_exclusive_choice(groups: Dict[Hashable, List[Tuple[float, FrozenSet[Hashable], Any]]],
+                           node_limit: int = 200000,
+                           capacity: Optional[Dict[Hashable, int]] = None) -> Tuple[Dict[Hashable, Any], float]:
+    """
+    Pick at most one option per group so no resource is over capacity, maximising value.
+
+    Depth-first branch and bound: groups with the most valuable options are
+    decided first, each group's options are tried best first (then "none"),
+    and a branch is cut when even the best remaining option of every undecided
+    group could not beat the incumbent. The first dive is the greedy solution,
+    so hitting node_limit still returns a sensible plan.
+
+    Args:
+        groups: group -> [(value, resources, payload), ...].
+        node_limit: search nodes to expand before returning the best plan found.
+        capacity: resource -> options that may use it (default 1: exclusive).
+
+    Returns:
+        (group -> chosen payload for groups that received an option, total value)
+    """
+    order = sorted(groups, key=lambda g: max((v for v, _, _ in groups[g]), default=0.0), reverse=True)
+    options = [sorted((o for o in groups[g] if o[0] > 0), key=lambda o: o[0], reverse=True) for g in order]
+    # Optimistic value still available from group i onwards
+    remaining = [0.0] * (len(order) + 1)
+    for i in range(len(order) - 1, -1, -1):
+        remaining[i] = remaining[i + 1] + (options[i][0][0] if options[i] else 0.0)
+
+    capacity = capacity or {}
+    best_value = 0.0
+    best_choice: List[Optional[int]] = [None] * len(order)
+    choice: List[Optional[int]] = [None] * len(order)
+    used = defaultdict(int)
+    nodes = 0
+
+    def search(i, value):
+        nonlocal best_value, best_choice, nodes
+        nodes += 1
+        if value > best_value + _EPS:
+            best_value = value
+            best_choice = choice[:]
+        if i == len(order) or value + remaining[i] <= best_value + _EPS or nodes > node_limit:
+            return
+        for k, (option_value, resources, _) in enumerate(options[i]):
+            if all(used[r] < capacity.get(r, 1) for r in resources):
+                choice[i] = k
+                for r in resources:
+                    used[r] += 1
+                search(i + 1, value + option_value)
+                for r in resources:
+                    used[r] -= 1
+                choice[i] = None
+        search(i + 1, value)
+
+    search(0, 0.0)
+    plan = {order[i]: options[i][k][2] for i, k in enumerate(best_choice) if k is not None}
+    return plan, best_value
+
+
+def auction_assignment(values: Dict[Hashable, Dict[Hashable, float]],
+                       capacity: Optional[Dict[Hashable, int]] = None,
+                       epsilon: Optional[float] = None) -> Dict[Hashable, Hashable]:
+    """
+    Assign bidders to objects maximising total value (Bertsekas forward auction).
+
+    Each object holds capacity[obj] bidders (default 1) and a bidder may stay
+    unassigned, which is worth 0, so options with value <= 0 are never taken.
+    Unassigned bidders bid in turn for their best object at current prices,
+    raising its price by the margin over their second best plus epsilon and
+    evicting the previous holder (ties go to the bidder's earlier option in
+    values). The result is within len(values) * epsilon
+    of the optimum, so with integer values and the default epsilon
+    (1 / (bidders + 1)) it is optimal.
+
+    Args:
+        values: bidder -> {object: value}.
+        capacity: object -> bidders it can hold.
+        epsilon: minimum bid increment.
+
+    Returns:
+        bidder -> object for the assigned bidders.
+    """
+    capacity = capacity or {}
+    if epsilon is None:
+        epsilon = 1.0 / (len(values) + 1)
+    # An object with capacity c is c identical units, each priced separately
+    options = {
+        bidder: [((obj, k), value) for obj, value in bids.items() if value > 0
+                 for k in range(capacity.get(obj, 1))]
+        for bidder, bids in values.items()
+    }
+    price: Dict[Hashable, float] = defaultdict(float)
+    owner: Dict[Hashable, Hashable] = {}
+    assigned: Dict[Hashable, Hashable] = {}
+    queue = deque(values)
+    while queue:
+        bidder = queue.popleft()
+        best_unit, best_net, second_net = None, 0.0, 0.0
+        for unit, value in options[bidder]:
+            net = value - price[unit]
+            if net > best_net:
+                best_unit, best_net, second_net = unit, net, best_net
+            elif net > second_net:
+                second_net = net
+        if best_unit is None:
+            continue                            # staying unassigned is at least as good
+        price[best_unit] += best_net - second_net + epsilon
+        previous = owner.get(best_unit)
+        if previous is not None:
+            del assigned[previous]
+            queue.append(previous)
+        owner[best_unit] = bidder
+        assigned[bidder] = best_unit
+    return {bidder: unit[0] for bidder, unit in assigned.items()}
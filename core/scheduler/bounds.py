@@ -0,0 +1,141 @@
+"""
+Preference Upper Bounds for Summer Camp Scheduler.
+
+A relaxation of the week that keeps only the structural limits on Top N
+satisfaction and drops every soft and cross-slot rule:
+
+- each requested activity may only use the slots the strict placement
+  check allows for that troop on an empty schedule (HC/DG Tuesday, 3-hour
+  days, Thursday's two slots, beach slot rules, ...)
+- a troop takes at most one 3-hour trip, and at most one of its
+  non-exclusive requests per slot
+- an exclusive area (EXCLUSIVE_AREAS) hosts one troop per slot, Aqua
+  Trampoline and Water Polo two, and Sailing one troop per day
+
+The maximum flow through that network is the most Top N requests any
+schedule can satisfy, so search loops can stop once they reach it and
+reports can show "X of Y achievable" instead of penalising misses that no
+schedule avoids. Multi-slot activities only use their start slot, and an
+exclusive request does not occupy its troop's slot: both only loosen the
+network, so the bound stays valid (never below the true optimum).
+"""
+import contextlib
+import io
+from typing import Dict, List, NamedTuple
+
+from core.models import EXCLUSIVE_AREAS
+from core.scheduler.assignment import MinCostFlow
+
+# Troops per slot for the shareable exclusive areas (one elsewhere)
+AREA_SLOT_CAPACITY = {"Aqua Trampoline": 2, "Water Polo": 2}
+# Areas limited per day rather than per slot (troops per day). A Sailing session
+# covers 1.5 slots and books its continuation slot, so _can_schedule_sailing never
+# fits a second troop on the same day.
+AREA_DAY_CAPACITY = {"Sailing": 1}
+
+_AREA_OF = {name: area for area, names in EXCLUSIVE_AREAS.items() for name in names}
+
+
+class PreferenceBound(NamedTuple):
+    """Most Top N requests any schedule can satisfy, for the week and per troop."""
+    top: int
+    achievable: int
+    requested: int
+    troop_achievable: Dict[str, int]          # each troop on its own (ignores other troops)
+    unreachable: Dict[str, List[str]]         # requests with no allowed slot at all
+
+    def summary(self) -> str:
+        return f"Top {self.top}: {self.achievable} of {self.requested} achievable"
+
+
+def _allowed_slots(probe, troop, activity) -> List:
+    """Slots the strict check allows for troop/activity on the probe's empty schedule."""
+    return [slot for slot in probe.time_slots
+            if probe._can_schedule(troop, activity, slot, slot.day, relax_constraints=True,
+                                   ignore_day_requests=True, allow_top1_beach_slot2=True)]
+
+
+def _max_satisfied(requests, three_hour) -> int:
+    """Max flow of the relaxed network for requests = [(troop_name, activity_name, slots)]."""
+    flow = MinCostFlow()
+    source, sink = 'source', 'sink'
+    capacity = {}               # shared node -> units it may pass to the sink
+    for troop_name, activity_name, slots in requests:
+        request = ('request', troop_name, activity_name)
+        if activity_name in three_hour:
+            capacity[('three_hour', troop_name)] = None
+            flow.add_edge(('three_hour', troop_name), request, 1)
+        else:
+            flow.add_edge(source, request, 1)
+        area = _AREA_OF.get(activity_name)
+        for slot in slots:
+            # Plain tuple keys: TimeSlot hashing dominates the flow search otherwise
+            day, number = slot.day.name, slot.slot_number
+            if area is None:
+                node, units = ('cell', troop_name, day, number), 1
+            elif area in AREA_DAY_CAPACITY:
+                node, units = ('area', area, day), AREA_DAY_CAPACITY[area]
+            else:
+                node, units = ('area', area, day, number), AREA_SLOT_CAPACITY.get(area, 1)
+            capacity[node] = units
+            flow.add_edge(request, node, 1)
+    for node, units in capacity.items():
+        if node[0] == 'three_hour':
+            flow.add_edge(source, node, 1)
+        else:
+            flow.add_edge(node, sink, units)
+    achieved, _ = flow.solve(source, sink)
+    return achieved
+
+
+def count_satisfied(schedule, troops, top: int = 5) -> int:
+    """Top `top` requests a schedule satisfies, counted as the bound counts them.
+    
+    Distinct requested names that are scheduled, with at most one 3-hour trip
+    per troop, so the count never exceeds preference_upper_bound's achievable.
+    """
+    from core.constrained_scheduler import ConstrainedScheduler
+
+    three_hour = set(ConstrainedScheduler.THREE_HOUR_ACTIVITIES)
+    scheduled = {}
+    for entry in schedule.entries:
+        scheduled.setdefault(entry.troop.name, set()).add(entry.activity.name)
+    total = 0
+    for troop in troops:
+        hits = [name for name in dict.fromkeys(troop.preferences[:top])
+                if name in scheduled.get(troop.name, ())]
+        trips = sum(1 for name in hits if name in three_hour)
+        total += len(hits) - max(0, trips - 1)
+    return total
+
+
+def preference_upper_bound(troops, top: int = 5, voyageur_mode: bool = False) -> PreferenceBound:
+    """
+    Upper bound on satisfied Top `top` requests for a week's troops.
+
+    Builds a fresh probe scheduler so allowed slots reflect the rules alone,
+    not whatever a running scheduler has placed so far.
+    """
+    from core.activities import get_activity_by_name
+    from core.constrained_scheduler import ConstrainedScheduler
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        probe = ConstrainedScheduler(troops, voyageur_mode=voyageur_mode)
+        requests, unreachable, requested = [], {}, 0
+        for troop in probe.troops:
+            for name in dict.fromkeys(troop.preferences[:top]):
+                requested += 1
+                activity = get_activity_by_name(name)
+                slots = _allowed_slots(probe, troop, activity) if activity else []
+                if slots:
+                    requests.append((troop.name, name, slots))
+                else:
+                    unreachable.setdefault(troop.name, []).append(name)
+
+    three_hour = set(probe.THREE_HOUR_ACTIVITIES)
+    troop_achievable = {
+        troop.name: _max_satisfied([r for r in requests if r[0] == troop.name], three_hour)
+        for troop in troops
+    }
+    return PreferenceBound(top, _max_satisfied(requests, three_hour), requested,
+                           troop_achievable, unreachable)
@@ -0,0 +1,154 @@
+"""
+Time Budgets for Summer Camp Scheduler.
+
+Provides the wall-clock deadline and per-phase watchdogs used by
+ConstrainedScheduler.schedule_all(deadline=...) to run in "anytime" mode:
+required phases always run so the result is valid and gap-free, optional
+improvement phases only run while budget remains, and long loops inside a
+phase stop cleanly when their watchdog expires.
+"""
+import time
+from typing import Callable, Dict, List, Optional, Any
+
+
+class Deadline:
+    """
+    Wall-clock deadline for a whole scheduling run.
+
+    A Deadline created with seconds=None never expires, which keeps the
+    default (no deadline) behaviour of schedule_all unchanged.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.seconds = seconds
+        self.started_at = clock()
+
+    @classmethod
+    def coerce(cls, deadline) -> 'Deadline':
+        """Accept None, a number of seconds, or an existing Deadline."""
+        if isinstance(deadline, Deadline):
+            return deadline
+        if deadline is None:
+            return cls(None)
+        return cls(float(deadline))
+
+    @property
+    def bounded(self) -> bool:
+        return self.seconds is not None
+
+    def elapsed(self) -> float:
+        return self._clock() - self.started_at
+
+    def remaining(self) -> float:
+        """Seconds left (infinity when unbounded, never negative)."""
+        if self.seconds is None:
+            return float('inf')
+        return max(0.0, self.seconds - self.elapsed())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def has_budget_for(self, reserve_fraction: float = 0.0) -> bool:
+        """True while more than reserve_fraction of the total budget is left."""
+        if self.seconds is None:
+            return True
+        return self.remaining() > self.seconds * reserve_fraction
+
+
+class PhaseWatchdog:
+    """
+    Iteration and time budget for a single phase.
+
+    Loops inside a phase call tick() once per iteration and stop when it
+    returns False. The watchdog never stops a loop when it was created
+    without limits, so unbudgeted runs behave exactly as before.
+    """
+
+    def __init__(self, phase: str, deadline: Optional[Deadline] = None,
+                 max_seconds: Optional[float] = None, max_iterations: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.phase = phase
+        self.deadline = deadline
+        self.max_seconds = max_seconds
+        self.max_iterations = max_iterations
+        self._clock = clock
+        self.started_at = clock()
+        self.iterations = 0
+        self.tripped = False
+        self.reported = False
+
+    @classmethod
+    def unbounded(cls, phase: str = "unbudgeted") -> 'PhaseWatchdog':
+        return cls(phase)
+
+    def elapsed(self) -> float:
+        return self._clock() - self.started_at
+
+    def budget_seconds(self) -> Optional[float]:
+        """Effective time budget: the phase cap or what is left of the deadline."""
+        limits = []
+        if self.max_seconds is not None:
+            limits.append(self.max_seconds)
+        if self.deadline is not None and self.deadline.bounded:
+            limits.append(self.elapsed() + self.deadline.remaining())
+        return min(limits) if limits else None
+
+    def expired(self) -> bool:
+        if self.tripped:
+            return True
+        if self.max_iterations is not None and self.iterations >= self.max_iterations:
+            self.tripped = True
+        elif self.max_seconds is not None and self.elapsed() >= self.max_seconds:
+            self.tripped = True
+        elif self.deadline is not None and self.deadline.expired():
+            self.tripped = True
+        return self.tripped
+
+    def tick(self) -> bool:
+        """Count one loop iteration. Returns False once the budget is spent."""
+        if self.expired():
+            return False
+        self.iterations += 1
+        return True
+
+
+class BudgetReport:
+    """Collects one record per phase: ran / skipped / truncated, time and iterations."""
+
+    def __init__(self, deadline: Deadline):
+        self.deadline = deadline
+        self.phases: List[Dict[str, Any]] = []
+
+    def record(self, phase: str, status: str, optional: bool, watchdog: Optional[PhaseWatchdog] = None):
+        budget = watchdog.budget_seconds() if watchdog else None
+        self.phases.append({
+            'phase': phase,
+            'status': status,
+            'optional': optional,
+            'elapsed': round(watchdog.elapsed(), 4) if watchdog else 0.0,
+            'iterations': watchdog.iterations if watchdog else 0,
+            'budget': round(budget, 4) if budget is not None else None,
+        })
+
+    def skipped(self) -> List[str]:
+        return [p['phase'] for p in self.phases if p['status'] == 'skipped']
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'deadline': self.deadline.seconds,
+            'elapsed': round(self.deadline.elapsed(), 4),
+            'deadline_met': not self.deadline.bounded or self.deadline.elapsed() <= self.deadline.seconds,
+            'skipped': self.skipped(),
+            'truncated': [p['phase'] for p in self.phases if p['status'] == 'truncated'],
+            'phases': list(self.phases),
+        }
+
+    def print_summary(self):
+        data = self.to_dict()
+        print(f"  [Budget] {data['elapsed']:.2f}s elapsed"
+              + (f" of {self.deadline.seconds:.2f}s deadline" if self.deadline.bounded else " (no deadline)"))
+        if data['skipped']:
+            print(f"  [Budget] Skipped {len(data['skipped'])} optional phase(s): {', '.join(data['skipped'])}")
+        if data['truncated']:
+            print(f"  [Budget] Watchdog stopped: {', '.join(data['truncated'])}")
@@ -0,0 +1,99 @@
+"""
+Area Cluster-Day Planning for Summer Camp Scheduler.
+
+Bin-packs each staffed area's expected demand (Tower, Rifle Range, Outdoor
+Skills, Handicrafts, Archery) into the fewest days before placement starts,
+so placement can aim for those days instead of clustering swaps repairing a
+scattered week afterwards.
+
+Each day is a bin holding as many troop-slots as the area has open slots
+that day; a troop's requests for one area must land on different days (same
+place same day / one accuracy activity per day).
+"""
+from collections import Counter
+from itertools import combinations
+from typing import Collection, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# Search nodes per candidate day set before it is treated as not packable
+_PACK_NODE_LIMIT = 20000
+
+
+def pack_items(items: Sequence[Tuple[Hashable, int]], capacity: Dict[Hashable, int],
+               allowed: Optional[Sequence[Collection[Hashable]]] = None) -> Optional[List[Hashable]]:
+    """
+    Assign items to days without exceeding capacity or repeating an owner on a day.
+
+    Args:
+        items: (owner, size) per request; size is the slots it needs.
+        capacity: day -> open slots.
+        allowed: days each item may use (same order as items); None allows every day.
+
+    Returns:
+        Day per item (same order as items), or None when they do not fit.
+    """
+    order = sorted(range(len(items)), key=lambda i: (-items[i][1], str(items[i][0])))
+    remaining = dict(capacity)
+    owners_on_day = {day: set() for day in capacity}
+    placement: List[Optional[Hashable]] = [None] * len(items)
+    nodes = 0
+
+    def place(k):
+        nonlocal nodes
+        if k == len(order):
+            return True
+        nodes += 1
+        if nodes > _PACK_NODE_LIMIT:
+            return False
+        owner, size = items[order[k]]
+        for day in capacity:
+            if remaining[day] < size or owner in owners_on_day[day]:
+                continue
+            if allowed is not None and day not in allowed[order[k]]:
+                continue
+            remaining[day] -= size
+            owners_on_day[day].add(owner)
+            placement[order[k]] = day
+            if place(k + 1):
+                return True
+            remaining[day] += size
+            owners_on_day[day].discard(owner)
+        return False
+
+    return list(placement) if place(0) else None
+
+
+def plan_area_days(items: Sequence[Tuple[Hashable, int]], capacity: Dict[Hashable, int],
+                   preferred_days: Sequence[Hashable] = (),
+                   allowed: Optional[Sequence[Collection[Hashable]]] = None) -> List[Hashable]:
+    """
+    Smallest set of days the items can be packed into.
+
+    Among day sets of minimum size, the one containing the most preferred
+    days wins, then the one earliest in capacity's day order. Items with no
+    allowed day at all are left out of the plan.
+
+    Returns:
+        Chosen days in capacity's order ([] for no items; every day with
+        capacity when nothing packs).
+    """
+    days = [day for day, slots in capacity.items() if slots > 0]
+    if allowed is not None:
+        keep = [i for i in range(len(items)) if any(d in allowed[i] for d in days)]
+        items = [items[i] for i in keep]
+        allowed = [allowed[i] for i in keep]
+    if not items:
+        return []
+    # A troop's requests need distinct days
+    fewest = max(Counter(owner for owner, _ in items).values())
+    total = sum(size for _, size in items)
+    preferred = set(preferred_days)
+    for size in range(fewest, len(days) + 1):
+        candidates = sorted(combinations(days, size),
+                            key=lambda combo: (-sum(1 for d in combo if d in preferred),
+                                               [days.index(d) for d in combo]))
+        for combo in candidates:
+            if sum(capacity[d] for d in combo) < total:
+                continue
+            if pack_items(items, {d: capacity[d] for d in combo}, allowed) is not None:
+                return list(combo)
+    return days
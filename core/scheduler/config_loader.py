@@ -35,6 +35,17 @@ def reload_skull() -> None:
     _load_skull()
 
 
+def get_skull() -> Dict[str, Any]:
+    """The loaded SKULL.json configuration (loaded on first use)."""
+    return _load_skull()
+
+
+def preload_skull(config: Dict[str, Any]) -> None:
+    """Install an already-loaded configuration (e.g. in worker processes) instead of reading the file."""
+    global _skull_cache
+    _skull_cache = config
+
+
 # === Exclusive Areas ===
 
 def get_exclusive_areas() -> Dict[str, List[str]]:
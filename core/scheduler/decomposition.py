@@ -0,0 +1,126 @@
+"""
+Commissioner-Group Decomposition for Summer Camp Scheduler.
+
+Most rules concern one troop or one commissioner, so commissioner groups
+only interact through shared capacity: an exclusive area or activity
+(Delta and Super Troop included) holds one troop per slot, and staff, beach
+staff and canoes are capped per slot.
+schedule_decomposed splits a week along those lines:
+
+1. allocate_capacity hands each group its share of every shared resource
+   (decomposition_resources) slot by slot, in proportion to how many of its
+   troops asked for the resource (plus one, so fills stay possible). The
+   units are dealt out in slot order by the D'Hondt rule, which interleaves
+   the groups over the week instead of giving each a block of days.
+2. Every group is scheduled on its own with its share as CapacityOverrides,
+   in its own worker process when jobs > 1 (multi_camp.schedule_camps).
+3. Reconciliation: placements the engine makes without _check_placement can
+   still overlap another group's share. The multi-camp ledger finds them and
+   repairs the yielding groups until the week is within every capacity.
+   The merged schedule then gets one gap check.
+
+A group run is much smaller than the whole week, and the engine's cost grows
+faster than its troop count, so even with one process the decomposed run is
+quicker on large weeks. The groups run in parallel, so the time falls
+further as cores are added, down to that of the largest group.
+"""
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from core.models import EXCLUSIVE_AREAS, Schedule, generate_time_slots
+from core.scheduler import config_loader
+from core.scheduler.bounds import AREA_SLOT_CAPACITY
+from core.scheduler.disruption import CapacityOverride
+from core.scheduler.multi_camp import Camp, SharedResource, schedule_camps
+
+
+def decomposition_resources() -> List[SharedResource]:
+    """
+    What commissioner groups share: each exclusive area, each other exclusive
+    activity, canoes, staffed beach activities and the global staff cap.
+    """
+    from core.activities import get_all_activities
+    from core.constrained_scheduler import ConstrainedScheduler
+
+    canoes = frozenset(ConstrainedScheduler.CANOE_ACTIVITIES)
+    # Any number of troops at once: the engine's concurrent and off-camp 3-hour activities
+    concurrent = set(ConstrainedScheduler.CONCURRENT_ACTIVITIES) | set(ConstrainedScheduler.THREE_HOUR_ACTIVITIES)
+    resources = [SharedResource(area, frozenset(names), AREA_SLOT_CAPACITY.get(area, 1))
+                 for area, names in EXCLUSIVE_AREAS.items() if not set(names) & canoes]
+    in_areas = {name for names in EXCLUSIVE_AREAS.values() for name in names}
+    for activity in sorted(a.name for a in get_all_activities()):
+        if activity not in in_areas | concurrent | canoes:
+            resources.append(SharedResource(activity, frozenset({activity}), AREA_SLOT_CAPACITY.get(activity, 1)))
+    staffed = frozenset(name for name, count in ConstrainedScheduler.ACTIVITY_STAFF_COUNT.items() if count)
+    resources += [
+        SharedResource("Canoes", canoes, ConstrainedScheduler.MAX_CANOE_CAPACITY, "people"),
+        SharedResource("Beach staff", frozenset(ConstrainedScheduler.BEACH_STAFFED_ACTIVITIES),
+                       ConstrainedScheduler.MAX_BEACH_STAFFED_ACTIVITIES),
+        SharedResource("Staff", staffed, config_loader.get_max_staff_global(), "staff"),
+    ]
+    return resources
+
+
+def commissioner_groups(troops, voyageur_mode: bool = False) -> Dict[str, list]:
+    """Troops by commissioner (the engine's troop_commissioner), in first-seen order."""
+    from core.constrained_scheduler import ConstrainedScheduler
+
+    troop_commissioner = ConstrainedScheduler(troops, voyageur_mode=voyageur_mode).troop_commissioner
+    groups: Dict[str, list] = {}
+    for troop in troops:
+        groups.setdefault(troop_commissioner.get(troop.name, ""), []).append(troop)
+    return groups
+
+
+def allocate_capacity(groups: Dict[str, list], resources: List[SharedResource]) -> Dict[str, List[CapacityOverride]]:
+    """
+    Each group's share of every resource as CapacityOverrides (slots where it gets less than all of it).
+
+    Demand is the number of the group's troops with one of the resource's
+    activities among their preferences, plus one; the units (troops, staff or
+    people per slot) are dealt slot by slot to the group with the highest
+    demand / (units so far + 1).
+    """
+    time_slots = generate_time_slots()
+    overrides: Dict[str, List[CapacityOverride]] = {name: [] for name in groups}
+    for resource in resources:
+        demand = {name: 1 + sum(1 for t in troops if resource.activities & set(t.preferences))
+                  for name, troops in groups.items()}
+        dealt = dict.fromkeys(groups, 0)
+        share = defaultdict(int)
+        for _ in range(resource.capacity):
+            for slot in time_slots:
+                winner = max(groups, key=lambda name: (demand[name] / (dealt[name] + 1), -list(groups).index(name)))
+                dealt[winner] += 1
+                share[(winner, slot)] += 1
+        for name in groups:
+            by_capacity = defaultdict(set)
+            for slot in time_slots:
+                if share[(name, slot)] < resource.capacity:
+                    by_capacity[share[(name, slot)]].add((slot.day.name, slot.slot_number))
+            overrides[name] += [CapacityOverride(resource.activities, frozenset(slots), capacity, resource.unit)
+                                for capacity, slots in sorted(by_capacity.items())]
+    return overrides
+
+
+def schedule_decomposed(troops, voyageur_mode: bool = False, jobs: int = 1, max_rounds: int = 5,
+                        deadline=None) -> Tuple[Schedule, Dict]:
+    """
+    Schedule a week one commissioner group at a time (in parallel with jobs > 1).
+
+    Returns the merged schedule (entries refer to the given troops) and the
+    multi-camp report plus the group sizes.
+    """
+    from core.constrained_scheduler import ConstrainedScheduler
+
+    groups = commissioner_groups(troops, voyageur_mode)
+    resources = decomposition_resources()
+    camps = [Camp(name, group, voyageur_mode) for name, group in groups.items()]
+    schedules, report = schedule_camps(camps, resources, jobs=jobs, max_rounds=max_rounds, deadline=deadline,
+                                       overrides=allocate_capacity(groups, resources))
+
+    scheduler = ConstrainedScheduler(troops, voyageur_mode=voyageur_mode)
+    scheduler._load_entries([entry for camp in camps for entry in schedules[camp.name].entries])
+    scheduler._immediate_gap_fix_if_needed("Decomposition")
+    report['groups'] = {name: len(group) for name, group in groups.items()}
+    return scheduler.schedule, report
@@ -0,0 +1,75 @@
+"""
+Disruption Repair for Summer Camp Scheduler.
+
+When weather closes the beach or an area shuts for a day, the slots that have
+already run stay as they are and only the rest of the week is re-planned
+(ConstrainedScheduler.repair_disruption):
+
+- every entry before the first re-planned slot is frozen, and so is an
+  activity already under way in it
+- later entries that still fit the reduced capacities are kept
+- entries over a reduced capacity are released, least-wanted first; Top 10
+  ones are re-placed in the remaining window (Top 5 through ejection chains)
+  and the freed cells are re-filled by the min-cost-flow fill
+
+While the repair runs, _can_schedule refuses frozen slots and placements
+over a CapacityOverride, so none of the recovery helpers can touch the past
+or re-open a closed area.
+"""
+from typing import FrozenSet, Iterable, List, NamedTuple, Tuple
+
+from core.models import Day, EXCLUSIVE_AREAS, TimeSlot
+
+# What a CapacityOverride counts per slot
+UNITS = ("troops", "staff", "people")
+
+
+class CapacityOverride(NamedTuple):
+    """At most `capacity` troops (staff, people) across `activities` in each of `slots`."""
+    activities: FrozenSet[str]
+    slots: FrozenSet[Tuple[str, int]]     # (Day name, slot number)
+    capacity: int = 0                     # 0 closes the activities
+    unit: str = "troops"
+
+    def covers(self, activity_name: str, slot: TimeSlot) -> bool:
+        return activity_name in self.activities and (slot.day.name, slot.slot_number) in self.slots
+
+
+def activity_group(name: str) -> FrozenSet[str]:
+    """Activities a name stands for: 'Beach', 'Canoe', 'Staff', an EXCLUSIVE_AREAS area, or itself."""
+    from core.constrained_scheduler import ConstrainedScheduler
+
+    groups = {
+        "Beach": set(ConstrainedScheduler.BEACH_ACTIVITIES) | ConstrainedScheduler.BEACH_SLOT_ACTIVITIES,
+        "Canoe": set(ConstrainedScheduler.CANOE_ACTIVITIES),
+        "Staff": set(ConstrainedScheduler.ACTIVITY_STAFF_COUNT),
+    }
+    if name in groups:
+        return frozenset(groups[name])
+    return frozenset(EXCLUSIVE_AREAS.get(name, (name,)))
+
+
+def capacity_override(names: Iterable[str], window: Iterable, capacity: int = 0,
+                      unit: str = "troops") -> CapacityOverride:
+    """
+    CapacityOverride for names (see activity_group) over window.
+
+    window holds TimeSlots and/or whole Days; capacity 0 closes the activities.
+    """
+    if unit not in UNITS:
+        raise ValueError(f"Unknown capacity unit '{unit}' (expected one of {', '.join(UNITS)})")
+    if isinstance(names, str):
+        names = [names]
+    activities = frozenset().union(*(activity_group(name) for name in names))
+    slots = set()
+    for item in window:
+        if isinstance(item, Day):
+            slots.update((item.name, number) for number in range(1, (2 if item == Day.THURSDAY else 3) + 1))
+        else:
+            slots.add((item.day.name, item.slot_number))
+    return CapacityOverride(activities, frozenset(slots), capacity, unit)
+
+
+def slots_before(time_slots: List[TimeSlot], start: TimeSlot) -> FrozenSet[TimeSlot]:
+    """The slots of the week that run before start (already run when re-planning from it)."""
+    return frozenset(time_slots[:time_slots.index(start)])
@@ -0,0 +1,181 @@
+"""
+Large Neighbourhood Search for Summer Camp Scheduler.
+
+Polishes a finished schedule by repeatedly freeing one neighbourhood and
+re-solving it:
+
+- a day: every movable entry on that day
+- a commissioner group: every movable entry of that commissioner's troops
+- a staffed area: every movable entry in Tower, Rifle Range, Outdoor Skills,
+  Handicrafts or Archery
+- a troop: every movable entry of one troop (used by reschedule(), not by
+  build_neighbourhoods)
+
+ConstrainedScheduler._lns_repair frees the entries and re-fills the freed
+cells with the min-cost-flow fill, so each repair is an exact re-assignment of
+its cells under the strict constraint checks. A repair is kept only when the
+week score improves without adding constraint violations.
+
+Each sweep repairs every neighbourhood from the same starting schedule and
+applies the best improvement, so the result does not depend on how many worker
+processes share the work (jobs > 1 uses a process pool). Scores are cached by
+the schedule's Zobrist state hash: a repair that reproduces a schedule already
+scored is not evaluated again, and duplicate outcomes are dropped.
+
+Scoring needs an evaluate_fn(schedule, troops) returning 'final_score' and
+'constraint_violations' (utils.evaluate_week_success.evaluate_schedule), as for
+PhaseProfiler.
+"""
+import contextlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from core.models import Day
+from core.scheduler.pipeline import capture_checkpoint, restore_checkpoint
+from core.scheduler.tuning import TUNABLE_CONSTANTS
+
+LNS_AREAS = ("Tower", "Rifle Range", "Outdoor Skills", "Handicrafts", "Archery")
+
+# Per-instance settings a worker's fresh scheduler must share with the parent: a
+# tuning profile's choices (core/scheduler/tuning.py), disruption capacity
+# overrides and frozen slots, and a scaled section's campsite order
+WORKER_SETTINGS = tuple(TUNABLE_CONSTANTS) + (
+    "DEFAULT_FILL_PRIORITY", "area_clustering_priority", "pipeline",
+    "capacity_overrides", "frozen_slots", "CAMPSITE_ORDER",
+)
+
+
+class Neighbourhood(NamedTuple):
+    """One destroy-and-repair region: kind is 'day', 'commissioner', 'area' or 'troop'."""
+    kind: str
+    key: str
+
+    @property
+    def label(self) -> str:
+        return f"{self.kind}:{self.key}"
+
+
+def build_neighbourhoods(scheduler) -> List[Neighbourhood]:
+    """Every day, commissioner group and staffed area of the scheduler's week."""
+    neighbourhoods = [Neighbourhood('day', day.name) for day in Day]
+    commissioners = sorted({c for c in scheduler.troop_commissioner.values() if c})
+    neighbourhoods += [Neighbourhood('commissioner', c) for c in commissioners]
+    neighbourhoods += [Neighbourhood('area', area) for area in LNS_AREAS]
+    return neighbourhoods
+
+
+def _repair_and_score(scheduler, checkpoint, neighbourhood, evaluate_fn, scores=None):
+    """Restore checkpoint, repair one neighbourhood and score the result.
+    
+    scores maps state hash -> metrics; states already in it are not evaluated again.
+    """
+    restore_checkpoint(scheduler, checkpoint)
+    with contextlib.redirect_stdout(io.StringIO()):
+        freed = scheduler._lns_repair(neighbourhood.kind, neighbourhood.key)
+    if not freed:
+        return None
+    state = scheduler.schedule.state_hash()
+    metrics = scores.get(state) if scores is not None else None
+    if metrics is None:
+        metrics = evaluate_fn(scheduler.schedule, scheduler.troops)
+    return {
+        'neighbourhood': neighbourhood,
+        'state': state,
+        'metrics': metrics,
+        'score': metrics['final_score'],
+        'violations': metrics['constraint_violations'],
+        'checkpoint': capture_checkpoint(scheduler, neighbourhood.label),
+    }
+
+
+def worker_settings(scheduler) -> Dict[str, Any]:
+    """The scheduler's WORKER_SETTINGS, to install on a worker's copy (rebuild_scheduler)."""
+    return {name: getattr(scheduler, name) for name in WORKER_SETTINGS}
+
+
+def rebuild_scheduler(troops, voyageur_mode: bool, settings: Dict[str, Any]):
+    """A fresh ConstrainedScheduler with the parent's worker_settings installed."""
+    from core.constrained_scheduler import ConstrainedScheduler
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        scheduler = ConstrainedScheduler(troops, voyageur_mode=voyageur_mode)
+    for name, value in settings.items():
+        setattr(scheduler, name, value)
+    return scheduler
+
+
+def _repair_in_worker(task):
+    """Process-pool entry point: rebuild the scheduler, then repair one neighbourhood."""
+    troops, voyageur_mode, settings, checkpoint, neighbourhood, evaluate_fn = task
+    scheduler = rebuild_scheduler(troops, voyageur_mode, settings)
+    return _repair_and_score(scheduler, checkpoint, neighbourhood, evaluate_fn)
+
+
+class LargeNeighbourhoodSearch:
+    """
+    Destroy-and-repair polish for a finished schedule (schedule_all(lns=...)).
+
+    Args:
+        evaluate_fn: metrics function used to accept or reject repairs.
+        sweeps: maximum number of sweeps over all neighbourhoods.
+        jobs: worker processes per sweep (1 = repair in this process).
+        neighbourhoods: optional fixed list; default is build_neighbourhoods().
+    """
+
+    def __init__(self, evaluate_fn: Callable[[Any, Any], Dict[str, Any]], sweeps: int = 3, jobs: int = 1,
+                 neighbourhoods: Optional[List[Neighbourhood]] = None):
+        self.evaluate_fn = evaluate_fn
+        self.sweeps = sweeps
+        self.jobs = max(1, jobs)
+        self.neighbourhoods = neighbourhoods
+
+    def run(self, scheduler, deadline=None) -> Dict[str, Any]:
+        """Improve scheduler.schedule in place; returns a summary of the search."""
+        neighbourhoods = self.neighbourhoods or build_neighbourhoods(scheduler)
+        metrics = self.evaluate_fn(scheduler.schedule, scheduler.troops)
+        best_score = start_score = metrics['final_score']
+        best_violations = metrics['constraint_violations']
+        best = capture_checkpoint(scheduler, 'lns:start')
+        scores = {scheduler.schedule.state_hash(): metrics}
+        report = {'start_score': start_score, 'sweeps': 0, 'repairs': 0, 'accepted': []}
+
+        pool = ProcessPoolExecutor(max_workers=self.jobs) if self.jobs > 1 else None
+        try:
+            for _ in range(self.sweeps):
+                if deadline is not None and deadline.expired():
+                    break
+                report['sweeps'] += 1
+                results = self._repair_all(scheduler, best, neighbourhoods, pool, scores)
+                report['repairs'] += len(neighbourhoods)
+                # Schedules scored before (the current best included) are duplicates
+                fresh = []
+                for r in results:
+                    if r is not None and r['state'] not in scores:
+                        scores[r['state']] = r['metrics']
+                        fresh.append(r)
+                improving = [r for r in fresh
+                             if r['score'] > best_score and r['violations'] <= best_violations]
+                if not improving:
+                    break
+                # Best gain first; ties go to the earlier neighbourhood so the choice is deterministic
+                winner = max(improving, key=lambda r: (r['score'], -neighbourhoods.index(r['neighbourhood'])))
+                print(f"  [LNS] {winner['neighbourhood'].label}: score {best_score} -> {winner['score']}")
+                report['accepted'].append(winner['neighbourhood'].label)
+                best_score, best_violations, best = winner['score'], winner['violations'], winner['checkpoint']
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        restore_checkpoint(scheduler, best)
+        report['final_score'] = best_score
+        return report
+
+    def _repair_all(self, scheduler, checkpoint, neighbourhoods, pool, scores):
+        """Repair every neighbourhood from checkpoint, in worker processes when a pool is given."""
+        if pool is None:
+            return [_repair_and_score(scheduler, checkpoint, n, self.evaluate_fn, scores) for n in neighbourhoods]
+        settings = worker_settings(scheduler)
+        tasks = [(scheduler.troops, scheduler.voyageur_mode, settings, checkpoint, n, self.evaluate_fn)
+                 for n in neighbourhoods]
+        return list(pool.map(_repair_in_worker, tasks))
@@ -0,0 +1,237 @@
+"""
+Joint Multi-Camp Scheduling for Summer Camp Scheduler.
+
+The TC and Voyageur weeks run side by side and share the waterfront and
+some staff. schedule_camps plans several camps together against one ledger
+of shared resources while every camp keeps its own rules (its own
+ConstrainedScheduler, voyageur_mode, commissioners):
+
+1. Every camp is scheduled on its own, in parallel worker processes when
+   jobs > 1.
+2. The ledger adds up each SharedResource per slot over all camps. Where a
+   slot is over capacity, entries are admitted best rank first (ties by camp
+   order) until the capacity is used; the camps with an entry left out must
+   give way.
+3. Each such camp is repaired with repair_disruption (nothing frozen). It
+   gets one CapacityOverride per resource and residual capacity: the
+   resource's capacity less what the other camps keep in that slot. So it can
+   neither keep its refused entries nor move into capacity another camp
+   already uses. Camps are repaired one after another, each against the
+   latest ledger, and rounds repeat until nothing is over capacity
+   (max_rounds).
+
+Camps only coordinate through the shared resources; nothing else about one
+camp's schedule is visible to another.
+"""
+import contextlib
+import io
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Tuple
+
+from core.models import Schedule, ScheduleEntry, TimeSlot, generate_time_slots
+from core.scheduler.disruption import UNITS, CapacityOverride, activity_group
+
+
+class SharedResource(NamedTuple):
+    """At most `capacity` troops (staff, people) across `activities` per slot, all camps together."""
+    name: str
+    activities: FrozenSet[str]
+    capacity: int
+    unit: str = "troops"
+
+
+class Camp(NamedTuple):
+    """One camp's week: its troops and whether it runs under the Voyageur rules."""
+    name: str
+    troops: list
+    voyageur_mode: bool = False
+
+
+def shared_resource(name: str, groups: Iterable[str], capacity: int, unit: str = "troops") -> SharedResource:
+    """SharedResource over groups (see disruption.activity_group)."""
+    if unit not in UNITS:
+        raise ValueError(f"Unknown capacity unit '{unit}' (expected one of {', '.join(UNITS)})")
+    if isinstance(groups, str):
+        groups = [groups]
+    return SharedResource(name, frozenset().union(*(activity_group(g) for g in groups)), capacity, unit)
+
+
+def default_shared_resources() -> List[SharedResource]:
+    """The waterfront staff, canoes, Sailing and the commissioners, at one camp's capacity."""
+    from core.constrained_scheduler import ConstrainedScheduler
+
+    return [
+        SharedResource("Beach staff", frozenset(ConstrainedScheduler.BEACH_STAFFED_ACTIVITIES),
+                       ConstrainedScheduler.MAX_BEACH_STAFFED_ACTIVITIES),
+        shared_resource("Canoes", "Canoe", ConstrainedScheduler.MAX_CANOE_CAPACITY, unit="people"),
+        shared_resource("Sailing", "Sailing", 1),
+        # Commissioner-led activities: one per commissioner at a time
+        shared_resource("Commissioners", ["Delta", "Super Troop"], 3),
+    ]
+
+
+def _usage(resource: SharedResource, entries, staff_count) -> int:
+    """Troops (staff, people) of entries that use resource."""
+    entries = [e for e in entries if e.activity.name in resource.activities]
+    if resource.unit == "staff":
+        return sum(staff_count(e.activity.name) for e in entries)
+    if resource.unit == "people":
+        return sum(e.troop.size for e in entries)
+    return len(entries)
+
+
+class ResourceLedger:
+    """Usage of the shared resources per camp and slot."""
+
+    def __init__(self, resources: List[SharedResource]):
+        from core.constrained_scheduler import ConstrainedScheduler
+
+        self.resources = list(resources)
+        self.time_slots = generate_time_slots()
+        # Staff counts do not depend on camp or troops
+        self._staff_count = ConstrainedScheduler([])._get_activity_staff_count
+
+    def usage(self, schedule: Schedule) -> Dict[Tuple[str, TimeSlot], int]:
+        """(resource name, slot) -> what one camp's schedule uses."""
+        by_slot = defaultdict(list)
+        for entry in schedule.entries:
+            by_slot[entry.time_slot].append(entry)
+        used = {}
+        for resource in self.resources:
+            for slot in self.time_slots:
+                amount = _usage(resource, by_slot[slot], self._staff_count)
+                if amount:
+                    used[(resource.name, slot)] = amount
+        return used
+
+    def conflicts(self, schedules: Dict[str, Schedule]) -> List[Tuple[SharedResource, TimeSlot]]:
+        """(resource, slot) pairs used over capacity by all camps together."""
+        totals = defaultdict(int)
+        for schedule in schedules.values():
+            for key, amount in self.usage(schedule).items():
+                totals[key] += amount
+        return [(resource, slot) for resource in self.resources for slot in self.time_slots
+                if totals[(resource.name, slot)] > resource.capacity]
+
+    def admit(self, schedules: Dict[str, Schedule], resource: SharedResource, slot: TimeSlot) -> Dict[str, int]:
+        """
+        What each camp keeps of an over-used (resource, slot).
+
+        Entries are admitted best preference rank first (ties by camp order)
+        while they fit; the rest must move.
+        """
+        order = list(schedules)
+        candidates = sorted(((e.troop.get_priority(e.activity.name), order.index(camp), camp, e)
+                             for camp, schedule in schedules.items() for e in schedule.entries
+                             if e.time_slot == slot and e.activity.name in resource.activities),
+                            key=lambda c: c[:2])
+        kept = dict.fromkeys(schedules, 0)
+        for _, _, camp, entry in candidates:
+            amount = _usage(resource, [entry], self._staff_count)
+            if sum(kept.values()) + amount <= resource.capacity:
+                kept[camp] += amount
+        return kept
+
+    def overrides_for(self, camp: str, schedules: Dict[str, Schedule],
+                      admitted: Dict[Tuple[str, TimeSlot], Dict[str, int]]) -> List[CapacityOverride]:
+        """The residual capacity camp may use: each resource less the other camps' (kept) usage."""
+        others = defaultdict(int)
+        for other, schedule in schedules.items():
+            if other == camp:
+                continue
+            for (name, slot), amount in self.usage(schedule).items():
+                kept = admitted.get((name, slot), {}).get(other)
+                others[(name, slot)] += amount if kept is None else min(amount, kept)
+        own = self.usage(schedules[camp])
+        overrides = []
+        for resource in self.resources:
+            by_capacity = defaultdict(set)
+            for slot in self.time_slots:
+                capacity = resource.capacity - others[(resource.name, slot)]
+                if (resource.name, slot) in admitted:
+                    capacity = min(capacity, admitted[(resource.name, slot)][camp])
+                # The camp may be over the full capacity on its own
+                if capacity < resource.capacity or own.get((resource.name, slot), 0) > capacity:
+                    by_capacity[max(0, capacity)].add((slot.day.name, slot.slot_number))
+            overrides += [CapacityOverride(resource.activities, frozenset(slots), capacity, resource.unit)
+                          for capacity, slots in sorted(by_capacity.items())]
+        return overrides
+
+
+def _solve_camp(camp: Camp, deadline=None, overrides=()):
+    """Schedule one camp on its own (worker process entry point): entries as plain tuples, seconds."""
+    from core.constrained_scheduler import ConstrainedScheduler
+
+    start = time.perf_counter()
+    scheduler = ConstrainedScheduler(camp.troops, voyageur_mode=camp.voyageur_mode)
+    scheduler.capacity_overrides = list(overrides)
+    with contextlib.redirect_stdout(io.StringIO()):
+        schedule = scheduler.schedule_all(deadline=deadline)
+    rows = [(e.troop.name, e.activity.name, e.time_slot.day.name, e.time_slot.slot_number)
+            for e in schedule.entries]
+    return rows, time.perf_counter() - start
+
+
+def _to_schedule(rows, troops) -> Schedule:
+    from core.activities import get_activity_by_name
+    from core.models import Day
+
+    by_name = {t.name: t for t in troops}
+    return Schedule(entries=[ScheduleEntry(TimeSlot(Day[day], slot), get_activity_by_name(activity), by_name[troop])
+                             for troop, activity, day, slot in rows])
+
+
+def schedule_camps(camps: List[Camp], resources=None, jobs: int = 1, max_rounds: int = 5,
+                   deadline=None, overrides=None) -> Tuple[Dict[str, Schedule], Dict]:
+    """
+    Schedule camps together against shared resources.
+
+    overrides optionally maps camp name -> CapacityOverrides for its independent
+    run (a share of the resources handed out up front, as decomposition does).
+
+    Returns camp name -> Schedule, and a report: the seconds of each camp's
+    independent run, conflicts after the independent runs and after
+    coordination (0 when coordinated), and the camps repaired per round.
+    """
+    from core.constrained_scheduler import ConstrainedScheduler
+
+    if len({camp.name for camp in camps}) != len(camps):
+        raise ValueError("Camp names must be unique")
+    ledger = ResourceLedger(default_shared_resources() if resources is None else resources)
+    camps_by_name = {camp.name: camp for camp in camps}
+
+    shares = [(overrides or {}).get(camp.name, ()) for camp in camps]
+    if jobs > 1 and len(camps) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(camps))) as pool:
+            results = list(pool.map(_solve_camp, camps, [deadline] * len(camps), shares))
+    else:
+        results = [_solve_camp(camp, deadline, share) for camp, share in zip(camps, shares)]
+    schedules = {camp.name: _to_schedule(rows, camp.troops) for camp, (rows, _) in zip(camps, results)}
+
+    initial_conflicts = len(ledger.conflicts(schedules))
+    rounds = []
+    for _ in range(max_rounds):
+        conflicts = ledger.conflicts(schedules)
+        if not conflicts:
+            break
+        admitted = {(resource.name, slot): ledger.admit(schedules, resource, slot) for resource, slot in conflicts}
+        usage = {name: ledger.usage(schedule) for name, schedule in schedules.items()}
+        yielding = [name for name in schedules
+                    if any(usage[name].get(key, 0) > kept[name] for key, kept in admitted.items())]
+        for name in yielding:
+            camp = camps_by_name[name]
+            scheduler = ConstrainedScheduler(camp.troops, voyageur_mode=camp.voyageur_mode)
+            with contextlib.redirect_stdout(io.StringIO()):
+                schedules[name] = scheduler.repair_disruption(
+                    schedules[name], frozenset(), ledger.overrides_for(name, schedules, admitted))
+        rounds.append({'conflicts': len(conflicts), 'repaired': yielding})
+
+    report = {
+        'seconds': {camp.name: seconds for camp, (_, seconds) in zip(camps, results)},
+        'initial_conflicts': initial_conflicts,
+        'conflicts': len(ledger.conflicts(schedules)),
+        'rounds': rounds,
+    }
+    return schedules, report
@@ -0,0 +1,49 @@
+"""
+Nogood Store for Summer Camp Scheduler.
+
+Recovery and fill passes keep asking _can_schedule about the same
+(troop, activity, slot) placements, and most of those checks fail for the
+same reason as a moment earlier. A failed placement is recorded as a
+nogood together with the hash of everything that can have blocked it, and
+later checks of that placement fail immediately until that part of the
+schedule changes.
+
+_can_schedule has no reason codes to name the exact blocking entries, so the
+recorded blockers are its whole dependency scope instead: every entry of the
+troop (duplicates, per-day and cross-day rules) and every entry of the
+slot's day (exclusive areas, staff and beach limits, Sailing sessions).
+Entries of other troops on other days never decide the check, so moves
+there leave the nogood in place. Scopes come from the schedule's
+incremental Zobrist hashes (Schedule.scope_hash), so a lookup is O(1).
+The scheduler adds the run state the check reads besides the entries
+(frozen slots, capacity overrides, camp rules, the troop's commissioner),
+so a nogood recorded under one disruption no longer applies under another.
+"""
+from typing import Dict, Hashable, Tuple
+
+
+class NogoodStore:
+    """Failed placement checks, each valid while its dependency scope is unchanged."""
+
+    def __init__(self):
+        self._failed: Dict[Hashable, Tuple[int, ...]] = {}
+        self.hits = 0
+        self.records = 0
+
+    def is_nogood(self, key: Hashable, scope: Tuple[int, ...]) -> bool:
+        """True if key failed before and nothing in its scope has changed since."""
+        if self._failed.get(key) == scope:
+            self.hits += 1
+            return True
+        return False
+
+    def record(self, key: Hashable, scope: Tuple[int, ...]):
+        """Remember that key failed with the schedule's scope hash at `scope`."""
+        self._failed[key] = scope
+        self.records += 1
+
+    def clear(self):
+        self._failed.clear()
+
+    def __len__(self) -> int:
+        return len(self._failed)
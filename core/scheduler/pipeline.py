@@ -0,0 +1,422 @@
+"""
+Phase Pipeline for Summer Camp Scheduler.
+
+schedule_all() runs a registered, ordered list of Phase objects instead of a
+hard-coded call sequence. After every phase the pipeline can store a compact
+checkpoint (schedule entries plus the scheduler's run-state counters), and a
+later run can resume from any phase by restoring the checkpoint taken just
+before it. Tuning a Phase D optimization then only re-runs Phase D:
+
+    store = CheckpointStore("checkpoints/tc_week4")
+    ConstrainedScheduler(troops).schedule_all(checkpoints=store)          # once
+    ConstrainedScheduler(troops).schedule_all(checkpoints=store,
+                                              resume_from="D.2", stop_after="D.2")
+"""
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.activities import get_activity_by_name
+from core.models import Activity, Day, ScheduleEntry, TimeSlot, Troop
+
+
+@dataclass
+class Phase:
+    """One step of schedule_all: a ConstrainedScheduler method and how to run it."""
+    phase_id: str
+    method: str                           # ConstrainedScheduler method name
+    args: tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    optional: bool = True                 # optional phases may be skipped under a deadline
+    section: Optional[str] = None         # logger.section printed before the phase
+    label: Optional[str] = None           # logger.subsection printed before the phase
+    tracked: bool = True                  # False: called directly (gap checks run their own tracked phase)
+
+    def run(self, scheduler):
+        if self.section:
+            scheduler.logger.section(self.section)
+        if self.label:
+            scheduler.logger.subsection(self.label)
+        method = getattr(scheduler, self.method)
+        if not self.tracked:
+            return method(*self.args, **self.kwargs)
+        return scheduler._run_phase(self.phase_id, method, *self.args, optional=self.optional, **self.kwargs)
+
+
+class PhasePipeline:
+    """Ordered registry of phases with lookup, (re)registration and ranged execution."""
+
+    def __init__(self, phases: Optional[List[Phase]] = None):
+        self.phases: List[Phase] = []
+        for phase in phases or []:
+            self.register(phase)
+
+    def __iter__(self):
+        return iter(self.phases)
+
+    def __len__(self):
+        return len(self.phases)
+
+    def ids(self) -> List[str]:
+        return [p.phase_id for p in self.phases]
+
+    def index(self, phase_id: str) -> int:
+        for i, phase in enumerate(self.phases):
+            if phase.phase_id == phase_id:
+                return i
+        raise KeyError(f"Unknown phase '{phase_id}'")
+
+    def get(self, phase_id: str) -> Phase:
+        return self.phases[self.index(phase_id)]
+
+    def register(self, phase: Phase, before: Optional[str] = None, after: Optional[str] = None):
+        """Add a phase at the end, or before/after an existing phase."""
+        if phase.phase_id in self.ids():
+            raise ValueError(f"Phase '{phase.phase_id}' is already registered")
+        if before is not None:
+            self.phases.insert(self.index(before), phase)
+        elif after is not None:
+            self.phases.insert(self.index(after) + 1, phase)
+        else:
+            self.phases.append(phase)
+
+    def remove(self, phase_id: str) -> Phase:
+        return self.phases.pop(self.index(phase_id))
+
+    def previous(self, phase_id: str) -> Optional[str]:
+        """Id of the phase that runs just before phase_id (None for the first)."""
+        i = self.index(phase_id)
+        return self.phases[i - 1].phase_id if i > 0 else None
+
+    def run(self, scheduler, start: Optional[str] = None, stop: Optional[str] = None,
+            checkpoints: Optional['CheckpointStore'] = None):
+        """Run phases from start to stop (inclusive), checkpointing after each one."""
+        first = self.index(start) if start is not None else 0
+        last = self.index(stop) if stop is not None else len(self.phases) - 1
+        for phase in self.phases[first:last + 1]:
+            phase.run(scheduler)
+            if checkpoints is not None:
+                checkpoints.save(phase.phase_id, capture_checkpoint(scheduler, phase.phase_id))
+
+
+# ----------------------------------------------------------------------
+# Checkpoints
+# ----------------------------------------------------------------------
+
+def _encode(value):
+    """JSON-safe encoding of scheduler run-state (slots, days, troops, activities, sets, tuples)."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Day):
+        return {'__day__': value.name}
+    if isinstance(value, TimeSlot):
+        return {'__slot__': [value.day.name, value.slot_number]}
+    if isinstance(value, tuple):
+        return {'__tuple__': [_encode(v) for v in value]}
+    if isinstance(value, (set, frozenset)):
+        return {'__set__': sorted((_encode(v) for v in value), key=repr)}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        return {'__dict__': [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, Troop):
+        return {'__troop__': value.name}
+    if isinstance(value, Activity):
+        return {'__activity__': value.name}
+    raise TypeError(f"Cannot checkpoint value of type {type(value).__name__}")
+
+
+def _decode(value, scheduler):
+    if isinstance(value, list):
+        return [_decode(v, scheduler) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if '__day__' in value:
+        return Day[value['__day__']]
+    if '__slot__' in value:
+        day_name, slot_number = value['__slot__']
+        return scheduler_slot(scheduler, Day[day_name], slot_number)
+    if '__tuple__' in value:
+        return tuple(_decode(v, scheduler) for v in value['__tuple__'])
+    if '__set__' in value:
+        return {_decode(v, scheduler) for v in value['__set__']}
+    if '__dict__' in value:
+        return {_decode(k, scheduler): _decode(v, scheduler) for k, v in value['__dict__']}
+    if '__troop__' in value:
+        return _troop_by_name(scheduler, value['__troop__'])
+    if '__activity__' in value:
+        return _activity_by_name(scheduler, value['__activity__'])
+    raise ValueError(f"Unknown checkpoint value {value!r}")
+
+
+def scheduler_slot(scheduler, day: Day, slot_number: int) -> TimeSlot:
+    for slot in scheduler.time_slots:
+        if slot.day == day and slot.slot_number == slot_number:
+            return slot
+    return TimeSlot(day, slot_number)
+
+
+def _troop_by_name(scheduler, name):
+    for troop in scheduler.troops:
+        if troop.name == name:
+            return troop
+    raise ValueError(f"Checkpoint troop '{name}' is not in this scheduler")
+
+
+def _activity_by_name(scheduler, name):
+    for activity in scheduler.activities:
+        if activity.name == name:
+            return activity
+    activity = get_activity_by_name(name)
+    if activity is None:
+        raise ValueError(f"Checkpoint activity '{name}' is unknown")
+    return activity
+
+
+def capture_checkpoint(scheduler, phase_id: str) -> Dict[str, Any]:
+    """Compact snapshot of the schedule and run-state counters after phase_id."""
+    entries = [
+        [e.troop.name, e.activity.name, e.time_slot.day.name, e.time_slot.slot_number]
+        for e in scheduler.schedule.entries
+    ]
+    state = {}
+    for name in scheduler.CHECKPOINT_STATE:
+        if hasattr(scheduler, name):
+            state[name] = _encode(getattr(scheduler, name))
+    return {
+        'phase': phase_id,
+        'troops': sorted(t.name for t in scheduler.troops),
+        'entries': entries,
+        'state': state,
+    }
+
+
+def restore_checkpoint(scheduler, checkpoint: Dict[str, Any]):
+    """Put a scheduler back into the state recorded by capture_checkpoint."""
+    if checkpoint['troops'] != sorted(t.name for t in scheduler.troops):
+        raise ValueError(f"Checkpoint after '{checkpoint['phase']}' was taken for different troops")
+
+    scheduler.schedule.entries = [
+        ScheduleEntry(scheduler_slot(scheduler, Day[day], slot_number),
+                      _activity_by_name(scheduler, activity_name),
+                      _troop_by_name(scheduler, troop_name))
+        for troop_name, activity_name, day, slot_number in checkpoint['entries']
+    ]
+
+    for name, encoded in checkpoint['state'].items():
+        value = _decode(encoded, scheduler)
+        current = getattr(scheduler, name, None)
+        if isinstance(current, defaultdict):
+            # Keep the default factories (staff loads are nested defaultdicts)
+            current.clear()
+            for key, item in value.items():
+                if isinstance(item, dict) and current.default_factory is not None:
+                    inner = current.default_factory()
+                    inner.update(item)
+                    item = inner
+                current[key] = item
+        else:
+            setattr(scheduler, name, value)
+
+    scheduler._troop_day_counts_cache = {}
+
+
+class CheckpointStore:
+    """
+    Per-phase checkpoints of one run, kept in memory and, when a directory is
+    given, written as <directory>/<phase_id>.json so later runs can resume.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory) if directory is not None else None
+        self._checkpoints: Dict[str, Dict[str, Any]] = {}
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def coerce(cls, checkpoints) -> Optional['CheckpointStore']:
+        """Accept None, a directory path, or an existing CheckpointStore."""
+        if checkpoints is None or isinstance(checkpoints, CheckpointStore):
+            return checkpoints
+        return cls(checkpoints)
+
+    def _path(self, phase_id: str) -> Path:
+        return self.directory / f"{phase_id}.json"
+
+    def save(self, phase_id: str, checkpoint: Dict[str, Any]):
+        self._checkpoints[phase_id] = checkpoint
+        if self.directory is not None:
+            with open(self._path(phase_id), 'w') as f:
+                json.dump(checkpoint, f)
+
+    def load(self, phase_id: str) -> Dict[str, Any]:
+        if phase_id not in self._checkpoints:
+            if self.directory is None or not self._path(phase_id).exists():
+                raise KeyError(f"No checkpoint saved after phase '{phase_id}'")
+            with open(self._path(phase_id)) as f:
+                self._checkpoints[phase_id] = json.load(f)
+        return self._checkpoints[phase_id]
+
+    def __contains__(self, phase_id: str) -> bool:
+        if phase_id in self._checkpoints:
+            return True
+        return self.directory is not None and self._path(phase_id).exists()
+
+
+def build_default_pipeline() -> PhasePipeline:
+    """
+    The schedule_all phase order (SCHEDULING_PROCESS.md Phase Groups A-D, then E/F).
+
+    Optional phases stay only while they pay for their time on the stored
+    weeks: without A.2b, D.2 or D.11b the season score drops and excess
+    cluster days or missing Top 5 rise. utils/profile_phases.py reports what
+    each phase costs; a profile (config/profiles) may still trade quality
+    for speed.
+    """
+    def gap_check(phase_id, phase_name):
+        return Phase(phase_id, '_immediate_gap_fix_if_needed', args=(phase_name,), optional=False, tracked=False)
+
+    return PhasePipeline([
+        # PHASE A: FOUNDATION & CLUSTERING
+        # A.0/A.0b reserve Friday Reflection and Super Troop before gap-fills consume those slots
+        Phase("A.0", '_schedule_friday_reflection', optional=False,
+              section="CONSTRAINED SCHEDULER - PHASE A: FOUNDATION",
+              label="A.0 Friday Reflection (reserve Friday slots)"),
+        Phase("A.0b", '_schedule_super_troop', optional=False, label="A.0b Super Troop (mandatory)"),
+        # Spine order: Tuesday-only HC/DG and Thursday Sailing before 3hr/clustering consume those days
+        Phase("A.3", '_schedule_hc_dg_tuesday', label="A.3 HC/DG Tuesday scheduling (Spine: early)"),
+        Phase("A.5", '_schedule_thursday_sailing_largest_troop',
+              label="A.5 Thursday Sailing Reservation (Spine: early)"),
+        # Reserve beach slots (1 or 3) for Top 5 AT and Top 1 beach before preferences fill them
+        Phase("A.5b", '_schedule_early_aqua_trampoline_top5', label="A.5b Early Aqua Trampoline for Top 5"),
+        Phase("A.5c", '_guarantee_top1_beach', label="A.5c Guarantee Top 1 Beach (AT/WP/GM/etc.)"),
+        Phase("A.1", '_schedule_three_hour_activities', optional=False, label="A.1 Scheduling 3-Hour Activities"),
+        # Delta (all requests) + Sailing (Top 10) chosen jointly for the week
+        Phase("A.7", '_schedule_delta_sailing_joint', label="A.7 Joint Delta + Sailing plan"),
+        Phase("A.2", '_schedule_two_hour_activities_priority', label="A.2 Top 10 2-Hour Activities (Priority)"),
+        # A.2b plans each staffed area's open days once the fixed-time activities are placed
+        Phase("A.2b", '_plan_area_cluster_days', label="A.2b Area cluster-day plan (bin packing)"),
+        Phase("A.4", '_early_staff_area_clustering', label="A.4 Early staff area clustering"),
+        Phase("A.6", '_schedule_limited_activities_by_priority', kwargs={'max_rank': 4},
+              label="A.6 Priority scheduling for limited activities (Global Rank 0-4)"),
+        gap_check("A.gap", "Phase A (Foundation & Clustering)"),
+
+        # PHASE B: CORE REQUESTS (Top 1 forced before ranks 2-5)
+        Phase("B.1", '_schedule_preferences_range', args=(0, 1), optional=False,
+              section="PHASE B: CORE REQUESTS", label="B.1 Scheduling Top 1 (FIRST PRIORITY)"),
+        Phase("B.1b", '_force_top1_preferences', label="B.1b Forcing Top 1 (make space before Top 2-5)"),
+        Phase("B.1c", '_schedule_preferences_range', args=(1, 5), optional=False, label="B.1c Scheduling Top 2-5"),
+        # Top 5 recovery (ejection chains) runs once, after cleanup (D.11b): an early
+        # B.2 pass here recovered only requests D.11b recovers anyway
+        Phase("B.3", '_enforce_mandatory_top5', label="B.3 Mandatory Top 5 enforcement"),
+        Phase("B.7", '_build_commissioner_busy_map', optional=False),
+        gap_check("B.gap", "Phase B (Core Requests)"),
+        Phase("B.11", '_aggressive_aqua_trampoline_sharing', label="B.11 Early Aqua Trampoline sharing (Top 5)"),
+
+        # PHASE C: REMAINING & OPTIMIZATION (C.3 staff balancing lives in the staff variance optimization)
+        Phase("C.1", '_schedule_day_requests', section="PHASE C: REMAINING & OPTIMIZATION"),
+        Phase("C.2", '_schedule_staff_optimized_areas', label="C.2 Staff Optimization (consecutive activities)"),
+        Phase("C.4", '_schedule_preferences_range', args=(5, 20),
+              label="C.4 Scheduling Remaining Preferences (Top 6-20)"),
+        Phase("C.4.5", '_guarantee_minimum_top10', label="C.4.5 Guaranteeing Minimum Top 10 (2-3 per troop)"),
+        Phase("C.5", '_guarantee_top10_with_exceptions', label="C.5 Guaranteeing Top 10 with exceptions"),
+        Phase("C.6", '_fill_all_remaining', optional=False, label="C.6 Filling remaining slots"),
+        Phase("C.6b", '_schedule_sailing_balls_fills', optional=False,
+              label="C.6b Scheduling balls activities during sailing"),
+        gap_check("C.6.gap", "Phase C.6 (Fill Slot Logic)"),
+        Phase("C.7", '_aggressive_aqua_trampoline_sharing', label="C.7 Aggressively pairing Aqua Trampoline sharing"),
+        gap_check("C.7.gap", "Phase C.7 (Aqua Trampoline Sharing)"),
+
+        # PHASE D: FINAL POLISH
+        Phase("D.1", '_optimize_friday_reflections',
+              section="PHASE D: FINAL POLISH & VERIFICATION", label="D.1 Optimizing Friday Reflection slots"),
+        Phase("D.2", '_comprehensive_clustering_optimization', label="D.2 Comprehensive clustering & smart swaps"),
+        gap_check("D.2.gap", "Phase D.2 (Comprehensive Clustering)"),
+        Phase("D.3", '_force_clustering_consolidation', label="D.3 Early forced clustering consolidation"),
+        gap_check("D.3.gap", "Phase D.3 (Forced Clustering)"),
+        Phase("D.4", '_optimize_friday_super_troop', label="D.4 Friday Super Troop optimization"),
+        Phase("D.5", '_optimize_flexible_reflections', label="D.5 Flexible Reflection slot optimization"),
+        Phase("D.6", '_optimize_commissioner_balance', label="D.6 Commissioner load balancing"),
+        Phase("D.7", '_optimize_setup_efficiency', label="D.7 Setup Efficiency & Activity Clustering"),
+        Phase("D.7b", '_optimize_activity_clustering'),
+        gap_check("D.7.gap", "Phase D.7 (Activity Clustering)"),
+        Phase("D.8", '_optimize_outlier_activities', label="D.8 Outlier Activity Optimization"),
+        Phase("D.8b", '_optimize_commissioner_day_ownership'),
+        Phase("D.9", '_optimize_cluster_gaps_post_fill', label="D.9 Post-Fill Cluster Gap Optimization"),
+        Phase("D.10", '_recover_top10_from_fills', label="D.10 Top 10 Recovery & Gap Filling"),
+        # Required: resolves conflicts and fills gaps left by the optional polish phases
+        Phase("D.11", '_comprehensive_final_cleanup', optional=False, label="D.11 Comprehensive final cleanup"),
+        # Cleanup can evict Top 5 entries; recover them without relaxing constraints
+        Phase("D.11b", '_guarantee_all_top5', label="D.11b Late Top 5 recovery (ejection chains)"),
+        gap_check("D.11.gap", "Phase D.11 (Final Cleanup)"),
+
+        # ENHANCED POST-PROCESSING and FINAL VERIFICATION
+        Phase("E", '_enhanced_post_processing'),
+        Phase("F.1", '_final_comprehensive_validation', optional=False, section="FINAL VERIFICATION"),
+        Phase("F.2", '_sanitize_exclusivity', optional=False),
+    ])
+
+
+# Placement phases that re-plan what is missing around kept entries (reschedule()
+# for the released troops, schedule_all(initial=...) for every troop); the fixed
+# Reflection slots, week-wide plans (A.2b/A.4) and Phase D polish are skipped
+REPAIR_PHASES = (
+    "A.0b", "A.3", "A.5b", "A.5c", "A.1", "A.7", "A.2", "A.6", "A.gap",
+    "B.1", "B.1b", "B.1c", "B.3", "B.gap",
+    "C.1", "C.4", "C.4.5", "C.5", "C.6", "C.6b", "C.6.gap", "D.11b", "D.11.gap",
+)
+
+
+def build_repair_pipeline(pipeline: Optional[PhasePipeline] = None) -> PhasePipeline:
+    """The REPAIR_PHASES of pipeline (default: build_default_pipeline()), in its order."""
+    pipeline = pipeline or build_default_pipeline()
+    return PhasePipeline([phase for phase in pipeline if phase.phase_id in REPAIR_PHASES])
+
+
+def build_warm_pipeline(pipeline: Optional[PhasePipeline] = None) -> PhasePipeline:
+    """REPAIR_PHASES, the commissioner busy map, then Phase D onwards (schedule_all(initial=...))."""
+    pipeline = pipeline or build_default_pipeline()
+    polish = set(pipeline.ids()[pipeline.index("D.1"):])
+    return PhasePipeline([phase for phase in pipeline
+                          if phase.phase_id in REPAIR_PHASES or phase.phase_id == "B.7"
+                          or phase.phase_id in polish])
+
+
+# Required cleanup and validation every run ends with (reschedule() runs them
+# after the repair, with all troops), plus the Top 5 recovery after cleanup
+FINISH_PHASES = ("D.11", "D.11b", "D.11.gap", "F.1", "F.2")
+
+
+def build_finish_pipeline(pipeline: Optional[PhasePipeline] = None) -> PhasePipeline:
+    """The FINISH_PHASES of pipeline (default: build_default_pipeline()), in its order."""
+    pipeline = pipeline or build_default_pipeline()
+    return PhasePipeline([phase for phase in pipeline if phase.phase_id in FINISH_PHASES])
+
+
+# Rolling horizon (build_rolling_pipeline): the fixed reservations before the days,
+# and the recovery and required cleanup phases after Friday
+ROLLING_SETUP_PHASES = ("A.0", "A.0b")
+ROLLING_FINISH_PHASES = ("B.7", "D.11", "D.11b", "D.11.gap", "F.1", "F.2")
+
+
+def build_rolling_pipeline(pipeline: Optional[PhasePipeline] = None) -> PhasePipeline:
+    """
+    Plan the week one day at a time, Monday to Friday (ConstrainedScheduler._schedule_day).
+
+    Each day is a small subproblem solved exactly across troops, with a
+    one-day look-ahead for Top 5 requests that only fit later days, so the
+    run time grows with the number of days rather than with the polish
+    phases. The ROLLING_SETUP_PHASES of pipeline (default:
+    build_default_pipeline()) run first and its ROLLING_FINISH_PHASES last.
+    """
+    pipeline = pipeline or build_default_pipeline()
+    days = [Phase(f"R.{day.name.lower()}", '_schedule_day', args=(day,), optional=False,
+                  label=f"R {day.value} (day plan)") for day in Day]
+    days[0].section = "ROLLING HORIZON"
+    gap_check = Phase("R.gap", '_immediate_gap_fix_if_needed', args=("Rolling horizon",),
+                      optional=False, tracked=False)
+    return PhasePipeline([phase for phase in pipeline if phase.phase_id in ROLLING_SETUP_PHASES]
+                         + days + [gap_check]
+                         + [phase for phase in pipeline if phase.phase_id in ROLLING_FINISH_PHASES])
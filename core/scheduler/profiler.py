@@ -0,0 +1,189 @@
+"""
+Per-Phase Profiler for Summer Camp Scheduler.
+
+Instruments every ConstrainedScheduler._run_phase call made by
+schedule_all(profiler=...) and records, per phase:
+
+- wall time
+- number of _can_schedule calls
+- schedule entries added / removed
+- change in constraint violations and in the week score
+
+Violation and score deltas need an evaluate_fn(schedule, troops) returning a
+metrics dict with 'constraint_violations' and 'final_score' keys (the shape
+produced by utils.evaluate_week_success.evaluate_schedule). Without one only
+time, call counts and entry churn are recorded.
+"""
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _entry_key(entry):
+    return (entry.troop.name, entry.activity.name, entry.time_slot.day.name, entry.time_slot.slot_number)
+
+
+class PhaseProfiler:
+    """Collects one record per executed phase of a schedule_all run."""
+
+    def __init__(self, evaluate_fn: Optional[Callable[[Any, Any], Dict[str, Any]]] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.evaluate_fn = evaluate_fn
+        self._clock = clock
+        self.scheduler = None
+        self.can_schedule_calls = 0
+        self.records: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+
+    # ------------------------------------------------------------------
+    # Attachment
+    # ------------------------------------------------------------------
+
+    def attach(self, scheduler):
+        """Start counting scheduler._can_schedule calls (instance-level wrapper)."""
+        self.scheduler = scheduler
+        original = scheduler._can_schedule
+
+        def counting_can_schedule(*args, **kwargs):
+            self.can_schedule_calls += 1
+            return original(*args, **kwargs)
+
+        scheduler._can_schedule = counting_can_schedule
+
+    def detach(self):
+        """Restore the class-level _can_schedule on the attached scheduler."""
+        if self.scheduler is not None and '_can_schedule' in vars(self.scheduler):
+            del self.scheduler._can_schedule
+        self.scheduler = None
+
+    # ------------------------------------------------------------------
+    # Phase hooks (called by ConstrainedScheduler._run_phase)
+    # ------------------------------------------------------------------
+
+    def _snapshot(self) -> Dict[str, Any]:
+        scheduler = self.scheduler
+        snapshot = {
+            'entries': Counter(_entry_key(e) for e in scheduler.schedule.entries),
+            'can_schedule_calls': self.can_schedule_calls,
+            'score': None,
+            'violations': None,
+        }
+        if self.evaluate_fn is not None:
+            metrics = self.evaluate_fn(scheduler.schedule, scheduler.troops)
+            snapshot['score'] = metrics.get('final_score')
+            snapshot['violations'] = metrics.get('constraint_violations')
+        snapshot['time'] = self._clock()
+        return snapshot
+
+    def _discount(self, seconds: float):
+        """Keep profiling overhead of a nested phase out of its enclosing phases' time."""
+        for outer in self._stack:
+            outer['before']['time'] += seconds
+
+    def start(self, phase_id: str):
+        began = self._clock()
+        before = self._snapshot()
+        self._discount(before['time'] - began)
+        self._stack.append({'phase': phase_id, 'before': before})
+
+    def stop(self, phase_id: str, status: str = 'ran'):
+        frame = self._stack.pop()
+        before = frame['before']
+        ended = self._clock()
+        elapsed = ended - before['time']
+        after = self._snapshot()
+
+        added = after['entries'] - before['entries']
+        removed = before['entries'] - after['entries']
+        record = {
+            'phase': phase_id,
+            'status': status,
+            'depth': len(self._stack),
+            'elapsed': round(elapsed, 4),
+            'can_schedule_calls': after['can_schedule_calls'] - before['can_schedule_calls'],
+            'entries_added': sum(added.values()),
+            'entries_removed': sum(removed.values()),
+            'violation_delta': None,
+            'score_delta': None,
+        }
+        if before['violations'] is not None and after['violations'] is not None:
+            record['violation_delta'] = after['violations'] - before['violations']
+        if before['score'] is not None and after['score'] is not None:
+            record['score_delta'] = after['score'] - before['score']
+        self.records.append(record)
+        self._discount(self._clock() - ended)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        top_level = [r for r in self.records if r['depth'] == 0]
+        return {
+            'total_elapsed': round(sum(r['elapsed'] for r in top_level), 4),
+            'total_can_schedule_calls': self.can_schedule_calls,
+            'phases': list(self.records),
+        }
+
+    def format_table(self) -> str:
+        return format_phase_table(self.records)
+
+
+def is_unproductive(record: Dict[str, Any]) -> bool:
+    """A phase that changed nothing measurable, or made the score worse."""
+    if record.get('score_delta') is not None:
+        return record['score_delta'] <= 0 and (record.get('violation_delta') or 0) >= 0
+    return record.get('entries_added', 0) == 0 and record.get('entries_removed', 0) == 0
+
+
+def aggregate_phase_records(runs: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Merge per-run phase records (e.g. one list per week) into one row per phase.
+
+    Rows keep first-seen phase order and sum time, calls and entry churn;
+    score/violation deltas are summed over runs that measured them.
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    for records in runs:
+        for record in records:
+            row = rows.setdefault(record['phase'], {
+                'phase': record['phase'],
+                'depth': record['depth'],
+                'runs': 0,
+                'elapsed': 0.0,
+                'can_schedule_calls': 0,
+                'entries_added': 0,
+                'entries_removed': 0,
+                'violation_delta': None,
+                'score_delta': None,
+                'unproductive_runs': 0,
+            })
+            row['runs'] += 1
+            row['elapsed'] = round(row['elapsed'] + record['elapsed'], 4)
+            row['can_schedule_calls'] += record['can_schedule_calls']
+            row['entries_added'] += record['entries_added']
+            row['entries_removed'] += record['entries_removed']
+            for key in ('violation_delta', 'score_delta'):
+                if record.get(key) is not None:
+                    row[key] = (row[key] or 0) + record[key]
+            if is_unproductive(record):
+                row['unproductive_runs'] += 1
+    return list(rows.values())
+
+
+def format_phase_table(rows: List[Dict[str, Any]]) -> str:
+    """Fixed-width text table of phase records or aggregated rows."""
+    def fmt_delta(value):
+        return "-" if value is None else f"{value:+}"
+
+    names = ["  " * row.get('depth', 0) + row['phase'] for row in rows]
+    width = max([len('Phase')] + [len(name) for name in names])
+    lines = [f"{'Phase':<{width}} {'Time(s)':>8} {'Checks':>8} {'+Ent':>5} {'-Ent':>5} {'dViol':>6} {'dScore':>7}"]
+    lines.append("-" * len(lines[0]))
+    for name, row in zip(names, rows):
+        lines.append(
+            f"{name:<{width}} {row['elapsed']:>8.3f} {row['can_schedule_calls']:>8d} "
+            f"{row['entries_added']:>5d} {row['entries_removed']:>5d} "
+            f"{fmt_delta(row.get('violation_delta')):>6} {fmt_delta(row.get('score_delta')):>7}"
+        )
+    return "\n".join(lines)
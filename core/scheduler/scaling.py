@@ -0,0 +1,82 @@
+"""
+Section-by-Section Scaling Mode for Summer Camp Scheduler.
+
+One ConstrainedScheduler run gets slower much faster than its troop count
+grows (most phases compare every troop's entries with every other troop's),
+and past 14 troops a single camp's exclusive areas are full anyway. A large
+camp laid out in sections (core.scheduler.synthetic.CampTopology) gives each
+section its own copy of the areas, so schedule_sections runs the normal
+engine once per section:
+
+- the section's troops take the real-camp commissioner their commissioner
+  stands in for (by position: A, B, C), so the engine's commissioner day
+  patterns apply unchanged
+- CAMPSITE_ORDER is the section's campsite order
+- the topology's capacities are installed as whole-week capacity overrides
+
+Each run sees at most one section, so the total cost grows linearly with the
+number of sections, i.e. near-linearly with troop count. Troops whose
+campsite is not in the topology are scheduled together as one extra section.
+"""
+import dataclasses
+import time
+from typing import Any, Dict, List, Tuple
+
+from core.models import Schedule, ScheduleEntry
+from core.scheduler.budget import Deadline
+from core.scheduler.synthetic import CampTopology
+
+
+def split_sections(troops, topology: CampTopology) -> List[list]:
+    """Troops grouped by section (topology order); unknown campsites last, as one group."""
+    groups: List[list] = [[] for _ in topology.sections]
+    unplaced = []
+    for troop in troops:
+        section = topology.section_of(troop.campsite)
+        (unplaced if section is None else groups[section]).append(troop)
+    return [group for group in groups + [unplaced] if group]
+
+
+def schedule_sections(troops, topology: CampTopology, activities=None, voyageur_mode: bool = False,
+                      deadline=None) -> Tuple[Schedule, Dict[str, Any]]:
+    """
+    Schedule each section of the camp with its own engine run and merge the results.
+
+    A deadline is shared out evenly: each section gets the remaining time
+    divided by the sections still to run. Returns the merged schedule (entries
+    refer to the given troops) and a report with per-section troop counts,
+    entry counts and seconds.
+    """
+    from core.constrained_scheduler import ConstrainedScheduler
+
+    deadline = Deadline.coerce(deadline)
+    groups = split_sections(troops, topology)
+    schedule = Schedule()
+    sections = []
+    for index, group in enumerate(groups):
+        local = [dataclasses.replace(t, commissioner=topology.base_commissioner(t.commissioner)) for t in group]
+        section = topology.section_of(group[0].campsite)
+        scheduler = ConstrainedScheduler(local, activities, voyageur_mode=voyageur_mode)
+        if section is not None:
+            scheduler.CAMPSITE_ORDER = topology.campsite_order(section)
+            scheduler.capacity_overrides = topology.capacity_overrides()
+        budget = deadline.remaining() / (len(groups) - index) if deadline.bounded else None
+
+        start = time.perf_counter()
+        result = scheduler.schedule_all(deadline=budget)
+        by_name = {t.name: t for t in group}
+        schedule.entries.extend(ScheduleEntry(e.time_slot, e.activity, by_name[e.troop.name])
+                                for e in result.entries)
+        sections.append({
+            'section': section,
+            'troops': len(group),
+            'entries': len(result.entries),
+            'seconds': time.perf_counter() - start,
+        })
+
+    report = {
+        'sections': sections,
+        'troops': len(troops),
+        'seconds': sum(s['seconds'] for s in sections),
+    }
+    return schedule, report
@@ -0,0 +1,133 @@
+"""
+Content-Addressed Schedule Cache for Summer Camp Scheduler.
+
+A finished schedule is stored under a hash of everything that determines it:
+
+- the troops JSON file (bytes)
+- config/SKULL.json and every config/*.yaml file
+- the scheduler engine version: a digest of the core/ Python sources, so
+  any change to the scheduling code is a new version
+- voyageur_mode
+
+Identical inputs find the stored schedule and are never rescheduled; any
+changed input gives a new key, so a stale schedule is never served. mtimes
+play no part. Entries use the save_schedule_to_json format plus the key.
+A week's working file (data/schedules/<week>_schedule.json, which may hold an
+incremental or disruption repair) records the key it was made for too, and
+read_schedule_data only accepts it while that key still matches (week files
+from before keys were recorded are read as legacy files, unchecked):
+
+    cache = ScheduleCache()
+    key = input_key("data/troops/tc_week4_troops.json")
+    data = cache.get(key)          # None: schedule, then cache.put(key, ...)
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_ROOT = Path(__file__).parent.parent.parent
+_CONFIG_DIR = _ROOT / "config"
+_ENGINE_DIR = _ROOT / "core"
+DEFAULT_CACHE_DIR = _ROOT / "data" / "schedules" / "cache"
+
+# Bump to invalidate every cached schedule without a source change (e.g. a new entry format)
+CACHE_FORMAT = 1
+
+_engine_version: Optional[str] = None
+
+
+def engine_version() -> str:
+    """Digest of the core/ Python sources (computed once per process)."""
+    global _engine_version
+    if _engine_version is None:
+        digest = hashlib.sha256()
+        for path in sorted(_ENGINE_DIR.rglob("*.py")):
+            digest.update(path.relative_to(_ENGINE_DIR).as_posix().encode())
+            digest.update(path.read_bytes())
+        _engine_version = digest.hexdigest()[:16]
+    return _engine_version
+
+
+def config_files():
+    """The configuration files a schedule depends on: SKULL.json and the YAML configs."""
+    return [_CONFIG_DIR / "SKULL.json"] + sorted(_CONFIG_DIR.glob("*.yaml"))
+
+
+def input_key(troops_file, voyageur_mode: Optional[bool] = None, profile=None) -> str:
+    """
+    Cache key of a week: hash of its troops file, the configs and the engine version.
+
+    voyageur_mode defaults to the scheduler's filename rule ("voyageur" in the name).
+    profile is the tuning profile file the week is scheduled with, if any.
+    """
+    troops_path = Path(troops_file)
+    if voyageur_mode is None:
+        voyageur_mode = "voyageur" in troops_path.name.lower()
+    digest = hashlib.sha256()
+    digest.update(f"format={CACHE_FORMAT};engine={engine_version()};voyageur={bool(voyageur_mode)}".encode())
+    for path in [troops_path] + config_files() + ([Path(profile)] if profile else []):
+        digest.update(b"\0" + path.name.encode() + b"\0")
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def read_schedule_data(path, key: str, legacy: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Schedule data in the JSON file at path if it was made for key, else None.
+
+    With legacy=True a file that records no input_key at all (a week file
+    written before keys were recorded, like the tracked data/schedules ones)
+    is accepted as well, with a warning, since its inputs cannot be checked.
+    A file recording a different key is never accepted.
+    """
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    if 'input_key' not in data and legacy:
+        print(f"  Warning: {Path(path).name} records no input_key; using it unchecked "
+              f"(regenerate the week to tie it to its inputs)")
+    elif data.get('input_key') != key:
+        return None
+    if 'entries' not in data or 'troops' not in data:
+        return None
+    return data
+
+
+class ScheduleCache:
+    """Schedules stored as <directory>/<input key>.json."""
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory) if directory is not None else DEFAULT_CACHE_DIR
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The stored schedule data for key, or None when missing or unreadable."""
+        return read_schedule_data(self.path(key), key)
+
+    def put(self, key: str, data: Dict[str, Any]) -> Path:
+        """Store schedule data under key (atomically, so readers never see a partial file)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data = dict(data, input_key=key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return self.path(key)
@@ -0,0 +1,224 @@
+"""
+Synthetic Camp Weeks for Summer Camp Scheduler.
+
+Generates troop files in the data/troops format for camps larger than any
+stored week (25/50/100/200 troops), to measure how the engine scales:
+
+- CampTopology lays the camp out in sections. A section is one copy of the
+  real camp: up to 14 campsites in geographic order (SKULL.json
+  commissioner_groups), split among its commissioners, with one set of the
+  exclusive areas. Optional per-section capacities (CapacityOverride, as used
+  by disruption repair) lower an activity group's capacity, e.g. fewer beach
+  staff.
+- PreferenceModel samples troop sizes, list lengths, preferences and day
+  requests from the stored weeks. Preferences are drawn rank band by rank
+  band (Top 5, 6-10, 11-15, 16+) from how often each activity appears in
+  that band, so popular first choices stay popular first choices.
+
+The topology is saved with the troops ('topology' key, ignored by
+load_troops_from_json) so core.scheduler.scaling can schedule the week
+section by section:
+
+    data = generate_week(100, seed=7)
+    write_week(data, "data/synthetic/synthetic_100_troops.json")
+"""
+import json
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.models import Day
+from core.scheduler import config_loader
+from core.scheduler.disruption import CapacityOverride, capacity_override
+
+STORED_WEEKS_DIR = Path(__file__).parent.parent.parent / "data" / "troops"
+
+# Upper bounds (exclusive) of the preference rank bands sampled separately
+RANK_BANDS = (5, 10, 15)
+
+# Commissioners of the real camp; the engine's commissioner day patterns are keyed by these
+BASE_COMMISSIONERS = ("Commissioner A", "Commissioner B", "Commissioner C")
+
+
+def _template_campsites() -> List[str]:
+    """The real camp's campsites in geographic order (North, Central, South groups)."""
+    return [name for group in config_loader.get_commissioner_groups().values() for name in group]
+
+
+@dataclass
+class CampTopology:
+    """
+    Sections of a camp: each maps commissioner -> campsites (geographic order).
+
+    capacities holds capacity_override() arguments applied to every section
+    for the whole week: {"activities": "Beach", "capacity": 2, "unit": "troops"}.
+    """
+    sections: List[Dict[str, List[str]]]
+    capacities: List[Dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def for_troops(cls, n_troops: int, section_size: Optional[int] = None,
+                   commissioners_per_section: int = 3, capacities=()) -> 'CampTopology':
+        """
+        Enough sections of section_size campsites (default: the real camp's 14) for n_troops.
+
+        Section 1 uses the real campsite and commissioner names; section k
+        adds " k" to campsites and k to commissioners ("Commissioner A2").
+        """
+        template = _template_campsites()
+        section_size = section_size or len(template)
+        if not 1 <= section_size <= len(template):
+            raise ValueError(f"section_size must be 1-{len(template)}, got {section_size}")
+        if not 1 <= commissioners_per_section <= section_size:
+            raise ValueError(f"commissioners_per_section must be 1-{section_size}, got {commissioners_per_section}")
+
+        sections = []
+        for number in range(1, -(-n_troops // section_size) + 1):
+            suffix = "" if number == 1 else f" {number}"
+            campsites = [name + suffix for name in template[:section_size]]
+            # Contiguous geographic chunks, larger ones first (14 -> 5/5/4 as in the real camp)
+            base, extra = divmod(section_size, commissioners_per_section)
+            commissioners, start = {}, 0
+            for index in range(commissioners_per_section):
+                size = base + (1 if index < extra else 0)
+                letter = chr(ord("A") + index)
+                commissioners[f"Commissioner {letter}" + ("" if number == 1 else str(number))] = \
+                    campsites[start:start + size]
+                start += size
+            sections.append(commissioners)
+        return cls(sections, [dict(c) for c in capacities])
+
+    def campsites(self) -> List[str]:
+        """Every campsite, section by section."""
+        return [name for section in range(len(self.sections)) for name in self.campsite_order(section)]
+
+    def campsite_order(self, section: int) -> List[str]:
+        """Campsites of one section in geographic order (the engine's CAMPSITE_ORDER)."""
+        return [name for names in self.sections[section].values() for name in names]
+
+    def section_of(self, campsite: str) -> Optional[int]:
+        for index, section in enumerate(self.sections):
+            if any(campsite in names for names in section.values()):
+                return index
+        return None
+
+    def commissioner_of(self, campsite: str) -> Optional[str]:
+        for section in self.sections:
+            for commissioner, names in section.items():
+                if campsite in names:
+                    return commissioner
+        return None
+
+    def base_commissioner(self, commissioner: str) -> str:
+        """The real-camp commissioner whose day pattern a section's commissioner follows (by position)."""
+        for section in self.sections:
+            if commissioner in section:
+                index = list(section).index(commissioner)
+                return BASE_COMMISSIONERS[index % len(BASE_COMMISSIONERS)]
+        return commissioner
+
+    def capacity_overrides(self) -> List[CapacityOverride]:
+        """The per-section capacities as whole-week CapacityOverrides."""
+        return [capacity_override(c["activities"], list(Day), c.get("capacity", 0), c.get("unit", "troops"))
+                for c in self.capacities]
+
+    def to_data(self) -> Dict[str, Any]:
+        return {"sections": self.sections, "capacities": self.capacities}
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> 'CampTopology':
+        return cls([dict(section) for section in data["sections"]], list(data.get("capacities", [])))
+
+
+class PreferenceModel:
+    """Empirical troop distributions of the stored weeks (troops JSON 'troops' entries)."""
+
+    def __init__(self, troops_data: List[Dict[str, Any]]):
+        if not troops_data:
+            raise ValueError("PreferenceModel needs at least one stored troop")
+        self.sizes = [(t.get("scouts", 10), t.get("adults", 2)) for t in troops_data]
+        self.lengths = [len(t.get("preferences", [])) for t in troops_data]
+        self.day_requests = [t.get("day_requests") or {} for t in troops_data]
+        self.bands = [Counter() for _ in range(len(RANK_BANDS) + 1)]
+        for t in troops_data:
+            for rank, name in enumerate(t.get("preferences", [])):
+                self.bands[self._band(rank)][name] += 1
+        self.overall = sum(self.bands, Counter())
+
+    @classmethod
+    def from_weeks(cls, paths=None) -> 'PreferenceModel':
+        """Model of the given troop files (default: every week in data/troops)."""
+        paths = sorted(STORED_WEEKS_DIR.glob("*_troops.json")) if paths is None else paths
+        troops_data = []
+        for path in paths:
+            with open(path, 'r') as f:
+                troops_data += json.load(f)["troops"]
+        return cls(troops_data)
+
+    @staticmethod
+    def _band(rank: int) -> int:
+        return next((i for i, bound in enumerate(RANK_BANDS) if rank < bound), len(RANK_BANDS))
+
+    def sample_preferences(self, rng: random.Random, length: int) -> List[str]:
+        """A ranked list of distinct activities, each rank drawn from its band's frequencies."""
+        chosen: List[str] = []
+        for rank in range(min(length, len(self.overall))):
+            for counts in (self.bands[self._band(rank)], self.overall):
+                names = sorted(name for name in counts if name not in chosen)
+                if names:
+                    chosen.append(rng.choices(names, weights=[counts[n] for n in names])[0])
+                    break
+        return chosen
+
+    def sample_troop(self, rng: random.Random, campsite: str, commissioner: str) -> Dict[str, Any]:
+        """One troop entry (named after its campsite, as in the stored weeks)."""
+        scouts, adults = rng.choice(self.sizes)
+        troop = {
+            "name": campsite,
+            "campsite": campsite,
+            "commissioner": commissioner,
+            "scouts": scouts,
+            "adults": adults,
+            "preferences": self.sample_preferences(rng, rng.choice(self.lengths)),
+        }
+        day_requests = rng.choice(self.day_requests)
+        if day_requests:
+            troop["day_requests"] = {day: list(names) for day, names in day_requests.items()}
+        return troop
+
+
+def generate_week(n_troops: int, topology: Optional[CampTopology] = None,
+                  model: Optional[PreferenceModel] = None, seed: int = 0) -> Dict[str, Any]:
+    """
+    A synthetic week of n_troops in the troops JSON format (plus 'topology').
+
+    Troops take the topology's campsites in order, filling a section before
+    starting the next. The same seed, topology and model give the same week.
+    """
+    topology = topology or CampTopology.for_troops(n_troops)
+    campsites = topology.campsites()
+    if n_troops > len(campsites):
+        raise ValueError(f"Topology has {len(campsites)} campsites, {n_troops} troops requested")
+    model = model or PreferenceModel.from_weeks()
+    rng = random.Random(seed)
+    troops = [model.sample_troop(rng, campsite, topology.commissioner_of(campsite))
+              for campsite in campsites[:n_troops]]
+    return {"troops": troops, "topology": topology.to_data()}
+
+
+def load_topology(path) -> Optional[CampTopology]:
+    """The topology saved in a troops file, or None for a stored (single-camp) week."""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return CampTopology.from_data(data["topology"]) if "topology" in data else None
+
+
+def write_week(data: Dict[str, Any], path) -> Path:
+    """Write a generated week as a troops JSON file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+    return path
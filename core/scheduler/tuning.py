@@ -0,0 +1,363 @@
+"""
+Offline Autotuning for Summer Camp Scheduler.
+
+Several engine behaviours are fixed choices that trade schedule quality for
+run time. A TuningProfile names one setting of each:
+
+- phase_order: the schedule_all pipeline as phase ids. Optional phases may
+  be reordered or left out; required phases keep their order.
+- fill_priority: ConstrainedScheduler.DEFAULT_FILL_PRIORITY.
+- constants: the TUNABLE_CONSTANTS, i.e. the staff limits of
+  _check_placement and the passes of the swap optimizations.
+- area_clustering_priority: the SKULL.json optimization setting.
+
+autotune() searches them offline. Each round it evaluates a batch of
+neighbours of the best profile so far on the stored weeks, with every
+(profile, week) run in its own worker process when jobs > 1, and keeps the
+best neighbour by mean score per CPU-second. A profile that leaves any week
+invalid (exclusive double-book) or loses more than max_score_loss of the
+starting mean score is never chosen. The winner is saved as a named profile
+that any run can load:
+
+    best, history = autotune(weeks, evaluate_schedule, rounds=4, jobs=4)
+    best.profile.save("fast")                  # config/profiles/fast.json
+    scheduler.load_profile("fast")
+
+Search decisions use one run per profile. measure_profiles() re-runs the
+start and the winner several times, so the timings saved with a profile
+are stable enough to compare.
+"""
+import contextlib
+import io
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from core.scheduler import config_loader
+from core.scheduler.budget import Deadline
+from core.scheduler.pipeline import PhasePipeline, build_default_pipeline
+
+PROFILES_DIR = Path(__file__).parent.parent.parent / "config" / "profiles"
+
+# ConstrainedScheduler constants a profile may set, with the (inclusive) range the search keeps them in
+TUNABLE_CONSTANTS = {
+    "STAFF_LIMIT": (12, 20),
+    "STAFF_CLUSTERING_LIMIT": (16, 24),
+    "STAFF_CLUSTERING_BONUS": (0, 8),
+    "SWAP_MAX_ITERATIONS": (1, 6),
+    "IMPROVEMENT_SWAP_MAX_ITERATIONS": (1, 8),
+}
+
+
+def ordered_pipeline(pipeline: PhasePipeline, phase_ids: List[str]) -> PhasePipeline:
+    """The phases of pipeline in phase_ids order; optional phases may be left out."""
+    unknown = [phase_id for phase_id in phase_ids if phase_id not in pipeline.ids()]
+    if unknown:
+        raise ValueError(f"Unknown phase(s) in profile: {', '.join(unknown)}")
+    if len(set(phase_ids)) != len(phase_ids):
+        raise ValueError("Profile phase order repeats a phase")
+    required = [phase.phase_id for phase in pipeline if not phase.optional]
+    if [phase_id for phase_id in phase_ids if phase_id in required] != required:
+        raise ValueError("Profile phase order must keep every required phase, in order")
+    return PhasePipeline([pipeline.get(phase_id) for phase_id in phase_ids])
+
+
+@dataclass
+class TuningProfile:
+    """A named setting of the tunable engine choices (None / empty: the engine's own)."""
+    name: str = "default"
+    phase_order: Optional[List[str]] = None
+    fill_priority: Optional[List[str]] = None
+    constants: Dict[str, int] = field(default_factory=dict)
+    area_clustering_priority: Optional[List[str]] = None
+    # How the profile was chosen (autotune summary); not used when applying it
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def default(cls) -> 'TuningProfile':
+        """The engine's current choices, spelled out (the search's starting point)."""
+        from core.constrained_scheduler import ConstrainedScheduler
+
+        return cls(
+            "default",
+            build_default_pipeline().ids(),
+            list(ConstrainedScheduler.DEFAULT_FILL_PRIORITY),
+            {name: getattr(ConstrainedScheduler, name) for name in TUNABLE_CONSTANTS},
+            list(config_loader.get_optimization_rules().get("area_clustering_priority", [])) or None,
+        )
+
+    @staticmethod
+    def path_for(name_or_path) -> Path:
+        """A profile JSON path, or the file of a named profile in config/profiles."""
+        path = Path(name_or_path)
+        if path.suffix == ".json":
+            return path
+        return PROFILES_DIR / f"{name_or_path}.json"
+
+    @classmethod
+    def load(cls, name_or_path) -> 'TuningProfile':
+        path = cls.path_for(name_or_path)
+        if not path.exists():
+            raise FileNotFoundError(f"Tuning profile not found at {path}")
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_data(json.load(f))
+
+    @classmethod
+    def coerce(cls, profile) -> 'TuningProfile':
+        """Accept a TuningProfile, a profile name or a JSON path."""
+        return profile if isinstance(profile, TuningProfile) else cls.load(profile)
+
+    def save(self, name_or_path=None) -> Path:
+        """Write the profile (default: config/profiles/<name>.json); returns the path."""
+        path = self.path_for(name_or_path or self.name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_data(), f, indent=2)
+        return path
+
+    def apply(self, scheduler):
+        """Install the profile's choices on one ConstrainedScheduler instance."""
+        unknown = sorted(set(self.constants) - set(TUNABLE_CONSTANTS))
+        if unknown:
+            raise ValueError(f"Not tunable: {', '.join(unknown)}")
+        if self.phase_order is not None:
+            scheduler.pipeline = ordered_pipeline(scheduler.pipeline, self.phase_order)
+        if self.fill_priority is not None:
+            scheduler.DEFAULT_FILL_PRIORITY = list(self.fill_priority)
+        for name, value in self.constants.items():
+            setattr(scheduler, name, value)
+        if self.area_clustering_priority is not None:
+            scheduler.area_clustering_priority = list(self.area_clustering_priority)
+
+    def key(self) -> str:
+        """The choices alone as a string (profiles with equal keys schedule identically)."""
+        data = self.to_data()
+        del data['name'], data['metrics']
+        return json.dumps(data, sort_keys=True)
+
+    def to_data(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "phase_order": self.phase_order,
+            "fill_priority": self.fill_priority,
+            "constants": self.constants,
+            "area_clustering_priority": self.area_clustering_priority,
+            "metrics": self.metrics,
+        }
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> 'TuningProfile':
+        return cls(data.get("name", "default"), data.get("phase_order"), data.get("fill_priority"),
+                   dict(data.get("constants", {})), data.get("area_clustering_priority"),
+                   dict(data.get("metrics", {})))
+
+
+# ----------------------------------------------------------------------
+# Neighbourhood
+# ----------------------------------------------------------------------
+
+def _areas():
+    """Areas the clustering passes can prioritise: the staffed areas of the cluster-day plan."""
+    from core.constrained_scheduler import ConstrainedScheduler
+
+    default = config_loader.get_optimization_rules().get("area_clustering_priority", [])
+    return list(dict.fromkeys(list(default) + list(ConstrainedScheduler.CLUSTER_PLAN_AREAS)))
+
+
+def _move_phase(order: List[str], rng: random.Random) -> List[str]:
+    """Drop an optional phase, restore a dropped one at its default place, or swap two adjacent optional phases."""
+    pipeline = build_default_pipeline()
+    optional = {phase.phase_id for phase in pipeline if phase.optional}
+    dropped = [phase_id for phase_id in pipeline.ids() if phase_id in optional and phase_id not in order]
+    present = [phase_id for phase_id in order if phase_id in optional]
+    adjacent = [i for i in range(len(order) - 1) if order[i] in optional and order[i + 1] in optional]
+    move = rng.choice([m for m, possible in (("drop", present), ("restore", dropped), ("swap", adjacent)) if possible])
+    order = list(order)
+    if move == "drop":
+        order.remove(rng.choice(present))
+    elif move == "restore":
+        phase_id = rng.choice(dropped)
+        ids = pipeline.ids()
+        before = [p for p in ids[:ids.index(phase_id)] if p in order]
+        order.insert(order.index(before[-1]) + 1 if before else 0, phase_id)
+    else:
+        i = rng.choice(adjacent)
+        order[i], order[i + 1] = order[i + 1], order[i]
+    return order
+
+
+def neighbour(profile: TuningProfile, rng: random.Random) -> TuningProfile:
+    """A copy of profile with one choice changed (one phase, fill, constant or area move)."""
+    base = TuningProfile.default()
+    candidate = TuningProfile.from_data(profile.to_data())
+    candidate.metrics = {}
+    kind = rng.choice(("phase", "fill", "constant", "areas"))
+    if kind == "phase":
+        candidate.phase_order = _move_phase(candidate.phase_order or base.phase_order, rng)
+    elif kind == "fill":
+        fill = list(candidate.fill_priority or base.fill_priority)
+        i = rng.randrange(len(fill) - 1)
+        fill[i], fill[i + 1] = fill[i + 1], fill[i]
+        candidate.fill_priority = fill
+    elif kind == "constant":
+        name = rng.choice(sorted(TUNABLE_CONSTANTS))
+        low, high = TUNABLE_CONSTANTS[name]
+        value = candidate.constants.get(name, base.constants[name])
+        candidate.constants[name] = min(high, max(low, value + rng.choice((-1, 1))))
+    else:
+        areas = list(candidate.area_clustering_priority or base.area_clustering_priority or [])
+        missing = [a for a in _areas() if a not in areas]
+        moves = [m for m, possible in (("swap", len(areas) > 1), ("drop", len(areas) > 1), ("add", missing)) if possible]
+        move = rng.choice(moves)
+        if move == "swap":
+            i = rng.randrange(len(areas) - 1)
+            areas[i], areas[i + 1] = areas[i + 1], areas[i]
+        elif move == "drop":
+            areas.remove(rng.choice(areas))
+        else:
+            areas.append(rng.choice(missing))
+        candidate.area_clustering_priority = areas
+    return candidate
+
+
+# ----------------------------------------------------------------------
+# Evaluation and search
+# ----------------------------------------------------------------------
+
+class TuningResult(NamedTuple):
+    """A profile's results on the tuning weeks."""
+    profile: TuningProfile
+    scores: Dict[str, int]              # week id -> final_score
+    cpu_seconds: Dict[str, float]       # week id -> CPU seconds of schedule_all
+    invalid: List[str]                  # weeks with an exclusive double-book
+
+    @property
+    def mean_score(self) -> float:
+        return sum(self.scores.values()) / len(self.scores)
+
+    @property
+    def mean_cpu_seconds(self) -> float:
+        return sum(self.cpu_seconds.values()) / len(self.cpu_seconds)
+
+    @property
+    def objective(self) -> float:
+        """Mean score per CPU-second (per week)."""
+        return self.mean_score / max(self.mean_cpu_seconds, 1e-6)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "mean_score": round(self.mean_score, 1),
+            "mean_cpu_seconds": round(self.mean_cpu_seconds, 3),
+            "score_per_cpu_second": round(self.objective, 1),
+            "invalid_weeks": self.invalid,
+        }
+
+
+def run_week(profile_data: Dict[str, Any], troops_file: str, evaluate_fn: Callable) -> Tuple[str, int, float, bool]:
+    """Schedule one week under a profile (worker process entry point): week id, score, CPU seconds, invalid."""
+    from core.constrained_scheduler import ConstrainedScheduler
+    from core.io_handler import load_troops_from_json
+
+    path = Path(troops_file)
+    week_id = path.stem.replace("_troops", "")
+    troops = load_troops_from_json(path)
+    start = time.process_time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        scheduler = ConstrainedScheduler(troops, voyageur_mode="voyageur" in week_id.lower())
+        TuningProfile.from_data(profile_data).apply(scheduler)
+        schedule = scheduler.schedule_all()
+    cpu_seconds = time.process_time() - start
+    metrics = evaluate_fn(schedule, troops)
+    return week_id, metrics['final_score'], cpu_seconds, bool(metrics.get('schedule_invalid'))
+
+
+def evaluate_profiles(profiles: List[TuningProfile], weeks, evaluate_fn: Callable, jobs: int = 1) -> List[TuningResult]:
+    """Run every profile on every week (all runs spread over jobs worker processes)."""
+    tasks = [(profile.to_data(), str(week)) for profile in profiles for week in weeks]
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            runs = list(pool.map(run_week, *zip(*tasks), [evaluate_fn] * len(tasks)))
+    else:
+        runs = [run_week(data, week, evaluate_fn) for data, week in tasks]
+    results = []
+    for index, profile in enumerate(profiles):
+        own = runs[index * len(weeks):(index + 1) * len(weeks)]
+        results.append(TuningResult(profile, {w: score for w, score, _, _ in own},
+                                    {w: seconds for w, _, seconds, _ in own},
+                                    [w for w, _, _, invalid in own if invalid]))
+    return results
+
+
+def measure_profiles(profiles: List[TuningProfile], weeks, evaluate_fn: Callable, repeats: int = 3,
+                     jobs: int = 1) -> List[TuningResult]:
+    """
+    Re-run profiles `repeats` times, interleaved, keeping each week's lowest CPU time.
+
+    One run's CPU time is noisy; the per-week minimum over the repeats is the
+    steadiest estimate of what a profile costs. Scores are deterministic, so
+    they come from the last repeat.
+    """
+    if repeats < 1:
+        raise ValueError("repeats must be at least 1")
+    runs = [evaluate_profiles(profiles, weeks, evaluate_fn, jobs) for _ in range(repeats)]
+    results = []
+    for index, profile in enumerate(profiles):
+        last = runs[-1][index]
+        cpu_seconds = {week: min(run[index].cpu_seconds[week] for run in runs) for week in last.cpu_seconds}
+        results.append(TuningResult(profile, last.scores, cpu_seconds, last.invalid))
+    return results
+
+
+def autotune(weeks, evaluate_fn: Callable, base: Optional[TuningProfile] = None, rounds: int = 5,
+             candidates: int = 6, jobs: int = 1, seed: int = 0, max_score_loss: float = 0.02,
+             min_gain: float = 0.01, deadline=None, log: Callable = print) -> Tuple[TuningResult, List[Dict[str, Any]]]:
+    """
+    Hill-climb from base (default: TuningProfile.default()) to the best mean score per CPU-second.
+
+    Each round evaluates `candidates` distinct untried neighbours of the
+    incumbent and moves to the best eligible one if it beats the incumbent's
+    objective by more than min_gain (a fraction; CPU times are noisy).
+    Eligible: no invalid week and a mean score at least (1 - max_score_loss)
+    of the starting profile's. A deadline (seconds or Deadline) stops the
+    search between rounds. Returns the best result and one history record
+    per evaluated profile.
+    """
+    deadline = Deadline.coerce(deadline)
+    rng = random.Random(seed)
+    weeks = [str(week) for week in weeks]
+    best = evaluate_profiles([base or TuningProfile.default()], weeks, evaluate_fn, jobs)[0]
+    floor = best.mean_score - abs(best.mean_score) * max_score_loss
+    history = [dict(best.summary(), round=0, accepted=True)]
+    log(f"  Start: mean score {best.mean_score:.1f}, {best.mean_cpu_seconds:.2f} CPU-s/week, "
+        f"{best.objective:.1f} per CPU-s")
+    seen = {best.profile.key()}
+
+    for round_number in range(1, rounds + 1):
+        if deadline.expired():
+            break
+        batch = []
+        for _ in range(candidates * 10):
+            if len(batch) == candidates:
+                break
+            candidate = neighbour(best.profile, rng)
+            if candidate.key() not in seen:
+                seen.add(candidate.key())
+                batch.append(candidate)
+        if not batch:
+            break
+        results = evaluate_profiles(batch, weeks, evaluate_fn, jobs)
+        eligible = [r for r in results if not r.invalid and r.mean_score >= floor]
+        winner = max(eligible, key=lambda r: r.objective, default=None)
+        accepted = winner is not None and winner.objective > best.objective * (1 + min_gain)
+        for result in results:
+            history.append(dict(result.summary(), round=round_number, accepted=accepted and result is winner))
+        if accepted:
+            best = winner
+        log(f"  Round {round_number}: {len(results)} profiles, best {best.mean_score:.1f} mean score, "
+            f"{best.mean_cpu_seconds:.2f} CPU-s/week, {best.objective:.1f} per CPU-s"
+            + ("" if accepted else " (no improvement)"))
+    return best, history
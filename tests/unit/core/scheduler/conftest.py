@@ -0,0 +1,37 @@
+"""
+Shared fixtures for the scheduler unit tests
+
+A test module picks its stored week with a module-level WEEK (default tc_week2).
+"""
+import io
+import contextlib
+from pathlib import Path
+
+import pytest
+
+from core.io_handler import load_troops_from_json
+from core.constrained_scheduler import ConstrainedScheduler
+
+DATA_DIR = Path(__file__).resolve().parents[4] / "data" / "troops"
+DEFAULT_WEEK = "tc_week2"
+
+
+@pytest.fixture(scope="session")
+def troops_dir():
+    """Directory of the stored troop weeks (data/troops)"""
+    return DATA_DIR
+
+
+@pytest.fixture(scope="module")
+def troops_file(request):
+    """Troops file of the module's WEEK"""
+    return DATA_DIR / f"{getattr(request.module, 'WEEK', DEFAULT_WEEK)}_troops.json"
+
+
+@pytest.fixture(scope="module")
+def scheduled_week(troops_file):
+    """Scheduler that has run schedule_all on the module's week (shared by the module, do not modify)"""
+    scheduler = ConstrainedScheduler(load_troops_from_json(troops_file))
+    with contextlib.redirect_stdout(io.StringIO()):
+        scheduler.schedule_all()
+    return scheduler
@@ -0,0 +1,157 @@
+"""
+Unit tests for the network-flow assignment solvers
+"""
+from core.scheduler.assignment import (
+    INFEASIBLE, MinCostFlow, auction_assignment, hungarian, maximum_matching, solve_exclusive_choice,
+    solve_fill_assignment,
+)
+
+
+class TestMinCostFlow:
+    """Test cases for MinCostFlow"""
+
+    def test_prefers_cheaper_path(self):
+        """Test one unit of flow takes the cheapest route"""
+        network = MinCostFlow()
+        cheap = network.add_edge('s', 'a', 1, 1.0)
+        network.add_edge('a', 't', 1, 1.0)
+        expensive = network.add_edge('s', 'b', 1, 5.0)
+        network.add_edge('b', 't', 1, 0.0)
+        flow, cost = network.solve('s', 't', max_flow=1)
+        assert (flow, cost) == (1, 2.0)
+        assert network.flow(cheap) == 1
+        assert network.flow(expensive) == 0
+
+    def test_reroutes_for_maximum_flow(self):
+        """Test flow is rerouted along a reverse edge to reach maximum cardinality"""
+        network = MinCostFlow()
+        network.add_edge('s', 'x', 1)
+        network.add_edge('s', 'y', 1)
+        network.add_edge('x', 'p', 1, 0.0)
+        network.add_edge('x', 'q', 1, 3.0)
+        network.add_edge('y', 'p', 1, 1.0)
+        network.add_edge('p', 't', 1)
+        network.add_edge('q', 't', 1)
+        flow, cost = network.solve('s', 't')
+        assert flow == 2
+        assert cost == 4.0
+
+
+class TestSolveFillAssignment:
+    """Test cases for the fill assignment"""
+
+    def test_activity_used_once_per_troop(self):
+        """Test a troop never gets the same fill in two cells"""
+        candidates = {
+            ("T1", 1): [("Gaga Ball", 0.0), ("9 Square", 2.0)],
+            ("T1", 2): [("Gaga Ball", 0.0), ("Fishing", 5.0)],
+        }
+        assignment = solve_fill_assignment(candidates)
+        assert len(assignment) == 2
+        assert sorted(assignment.values()) == ["9 Square", "Gaga Ball"]
+
+    def test_fills_as_many_cells_as_possible(self):
+        """Test cardinality wins over cost"""
+        candidates = {
+            ("T1", 1): [("Archery", 0.0)],
+            ("T1", 2): [("Archery", 0.0), ("Campsite Free Time", 40.0)],
+        }
+        assignment = solve_fill_assignment(candidates)
+        assert assignment == {("T1", 1): "Archery", ("T1", 2): "Campsite Free Time"}
+
+    def test_troops_are_independent(self):
+        """Test two troops may both receive the same activity"""
+        candidates = {("T1", 1): [("Archery", 0.0)], ("T2", 1): [("Archery", 0.0)]}
+        assert solve_fill_assignment(candidates) == {("T1", 1): "Archery", ("T2", 1): "Archery"}
+
+
+class TestHungarian:
+    """Test cases for the dense assignment solver"""
+
+    def test_minimum_cost_assignment(self):
+        """Test the optimal permutation is found where greedy row order is not"""
+        cost = [[1, 2, 9], [1, 8, 9], [9, 9, 1]]
+        assert hungarian(cost) == [1, 0, 2]
+
+    def test_more_columns_than_rows(self):
+        """Test rows pick the cheapest distinct columns"""
+        assert hungarian([[5, 0, 3], [5, 0, 1]]) == [1, 2]
+
+    def test_infeasible_pairs(self):
+        """Test forbidden pairs are avoided and reported as None when unavoidable"""
+        assert hungarian([[INFEASIBLE, 4], [1, 2]]) == [1, 0]
+        assert hungarian([[INFEASIBLE, 0], [INFEASIBLE, 0]]).count(None) == 1
+        assert hungarian([]) == []
+
+
+class TestMaximumMatching:
+    """Test cases for the general-graph matching"""
+
+    def test_augments_through_odd_cycle(self):
+        """Test a blossom (triangle) does not block the maximum matching"""
+        edges = [(0, 1), (1, 2), (2, 0), (2, 3), (0, 4)]
+        pairs = maximum_matching(5, edges)
+        assert len(pairs) == 2
+        matched = [node for pair in pairs for node in pair]
+        assert len(matched) == len(set(matched))
+
+    def test_seeded_edges_stay_matched(self):
+        """Test nodes of edges listed first remain matched after augmenting"""
+        pairs = maximum_matching(4, [(1, 2), (0, 1), (2, 3)])
+        assert sorted(pairs) == [(0, 1), (2, 3)]
+        assert maximum_matching(3, [(0, 1)]) == [(0, 1)]
+        assert maximum_matching(2, []) == []
+
+
+class TestSolveExclusiveChoice:
+    """Test cases for the one-option-per-group branch and bound"""
+
+    def test_beats_greedy_choice(self):
+        """Test the best total is found when the greedy first pick blocks two others"""
+        groups = {
+            "T1": [(10.0, frozenset({"mon"}), "T1-mon"), (9.0, frozenset({"tue"}), "T1-tue")],
+            "T2": [(8.0, frozenset({"mon"}), "T2-mon")],
+        }
+        plan, value = solve_exclusive_choice(groups)
+        assert plan == {"T1": "T1-tue", "T2": "T2-mon"}
+        assert value == 17.0
+
+    def test_group_may_receive_nothing(self):
+        """Test a group is left out when every option conflicts or has no value"""
+        groups = {
+            "T1": [(5.0, frozenset({"slot"}), "a")],
+            "T2": [(3.0, frozenset({"slot"}), "b"), (-1.0, frozenset(), "c")],
+        }
+        plan, value = solve_exclusive_choice(groups)
+        assert plan == {"T1": "a"}
+        assert value == 5.0
+
+    def test_shared_resource_capacity(self):
+        """Test a resource with capacity 2 takes two groups and a used-up one takes none"""
+        groups = {
+            "T1": [(5.0, frozenset({"AT"}), "a")],
+            "T2": [(4.0, frozenset({"AT"}), "b")],
+            "T3": [(3.0, frozenset({"AT", "closed"}), "c")],
+        }
+        plan, value = solve_exclusive_choice(groups, capacity={"AT": 2, "closed": 0})
+        assert plan == {"T1": "a", "T2": "b"}
+        assert value == 9.0
+
+
+class TestAuctionAssignment:
+    """Test cases for the forward auction"""
+
+    def test_beats_first_come_placement(self):
+        """Test the higher-ranked troop yields its first choice when the other troop has no alternative"""
+        values = {"A": {"mon-1": 100, "tue-1": 100}, "B": {"mon-1": 95}}
+        assert auction_assignment(values) == {"A": "tue-1", "B": "mon-1"}
+
+    def test_capacity_and_scarcity(self):
+        """Test a two-troop object takes the two most valuable bidders"""
+        values = {"A": {"at": 90}, "B": {"at": 100}, "C": {"at": 95}}
+        plan = auction_assignment(values, capacity={"at": 2})
+        assert plan == {"B": "at", "C": "at"}
+
+    def test_worthless_options_stay_unassigned(self):
+        """Test options with no positive value are never taken"""
+        assert auction_assignment({"A": {"x": 0, "y": -5}, "B": {}}) == {}
@@ -0,0 +1,35 @@
+"""
+Unit tests for the preference upper bound
+"""
+from core.models import Troop
+from core.scheduler.bounds import count_satisfied, preference_upper_bound
+
+TRIPS = ["History Center", "Tamarac Wildlife Refuge", "Itasca State Park", "Archery", "Climbing Tower"]
+
+
+def _troops(count, preferences):
+    return [Troop(name=f"T{i}", campsite=f"Site {i}", preferences=list(preferences)) for i in range(count)]
+
+
+class TestPreferenceUpperBound:
+    """Test cases for preference_upper_bound"""
+
+    def test_exclusive_day_restriction(self):
+        """Test History Center only fits the three Tuesday slots, one troop each"""
+        bound = preference_upper_bound(_troops(4, TRIPS), top=1)
+        assert (bound.achievable, bound.requested) == (3, 4)
+        assert bound.troop_achievable == {"T0": 1, "T1": 1, "T2": 1, "T3": 1}
+        assert bound.summary() == "Top 1: 3 of 4 achievable"
+
+    def test_one_three_hour_trip_per_troop(self):
+        """Test a second 3-hour trip in the Top 5 is never achievable"""
+        bound = preference_upper_bound(_troops(4, TRIPS), top=5)
+        assert bound.troop_achievable["T0"] == 4
+        assert bound.achievable == 15
+
+    def test_schedule_never_beats_bound(self, scheduled_week):
+        """Test a real schedule's satisfied count stays within the bound"""
+        for top in (5, 10):
+            bound = scheduled_week._preference_bound(top)
+            satisfied = count_satisfied(scheduled_week.schedule, scheduled_week.troops, top)
+            assert satisfied <= bound.achievable <= bound.requested
@@ -0,0 +1,126 @@
+"""
+Unit tests for anytime scheduling budgets (Deadline / PhaseWatchdog)
+"""
+import io
+import contextlib
+
+import pytest
+
+from core.scheduler.budget import Deadline, PhaseWatchdog, BudgetReport
+from core.io_handler import load_troops_from_json
+from core.models import Day
+from core.constrained_scheduler import ConstrainedScheduler
+
+
+class FakeClock:
+    """Manually advanced clock for deterministic budget tests"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestDeadline:
+    """Test cases for Deadline"""
+    
+    def test_unbounded_deadline_never_expires(self):
+        """Test a deadline without seconds has infinite budget"""
+        deadline = Deadline.coerce(None)
+        assert not deadline.bounded
+        assert not deadline.expired()
+        assert deadline.has_budget_for(0.9)
+    
+    def test_deadline_expires(self):
+        """Test remaining time counts down and expires"""
+        clock = FakeClock()
+        deadline = Deadline(2.0, clock=clock)
+        clock.now = 1.5
+        assert deadline.remaining() == pytest.approx(0.5)
+        assert deadline.has_budget_for(0.2)
+        assert not deadline.has_budget_for(0.3)
+        clock.now = 2.5
+        assert deadline.expired()
+        assert deadline.remaining() == 0.0
+    
+    def test_coerce_keeps_existing_deadline(self):
+        """Test coerce passes Deadline instances through"""
+        deadline = Deadline(5.0)
+        assert Deadline.coerce(deadline) is deadline
+        assert Deadline.coerce(3).seconds == 3.0
+
+
+class TestPhaseWatchdog:
+    """Test cases for PhaseWatchdog"""
+    
+    def test_unbounded_watchdog_always_ticks(self):
+        """Test an unbounded watchdog never stops a loop"""
+        watchdog = PhaseWatchdog.unbounded()
+        assert all(watchdog.tick() for _ in range(1000))
+        assert watchdog.iterations == 1000
+        assert not watchdog.tripped
+    
+    def test_iteration_cap(self):
+        """Test the watchdog stops after max_iterations"""
+        watchdog = PhaseWatchdog("D.2", max_iterations=3)
+        ticks = [watchdog.tick() for _ in range(5)]
+        assert ticks == [True, True, True, False, False]
+        assert watchdog.tripped
+    
+    def test_time_cap_and_deadline(self):
+        """Test the watchdog trips on its own cap or the run deadline"""
+        clock = FakeClock()
+        watchdog = PhaseWatchdog("D.2", max_seconds=1.0, clock=clock)
+        assert watchdog.tick()
+        clock.now = 1.0
+        assert not watchdog.tick()
+        
+        deadline = Deadline(0.5, clock=clock)
+        watchdog = PhaseWatchdog("D.3", deadline=deadline, clock=clock)
+        assert watchdog.budget_seconds() == pytest.approx(0.5)
+        clock.now = 1.6
+        assert not watchdog.tick()
+    
+    def test_report_records_phases(self):
+        """Test the budget report lists skipped and truncated phases"""
+        report = BudgetReport(Deadline(1.0))
+        watchdog = PhaseWatchdog("D.2", max_iterations=0)
+        watchdog.tick()
+        report.record("D.2", "truncated", True, watchdog)
+        report.record("D.3", "skipped", True)
+        data = report.to_dict()
+        assert data['skipped'] == ["D.3"]
+        assert data['truncated'] == ["D.2"]
+        assert data['phases'][0]['budget'] is None
+
+
+class TestAnytimeScheduleAll:
+    """Test schedule_all(deadline=...) keeps the schedule valid"""
+    
+    def test_zero_deadline_still_gap_free(self, troops_file):
+        """Test an exhausted deadline skips optional phases but leaves no gaps"""
+        troops = load_troops_from_json(troops_file)
+        scheduler = ConstrainedScheduler(troops)
+        with contextlib.redirect_stdout(io.StringIO()):
+            schedule = scheduler.schedule_all(deadline=0)
+        
+        report = scheduler.get_budget_report()
+        assert "D.2" in report['skipped']
+        assert "A.0" not in report['skipped']
+        for troop in troops:
+            for slot in scheduler.time_slots:
+                assert not schedule.is_troop_free(slot, troop)
+    
+    def test_zero_deadline_keeps_mandatory_activities(self, troops_file):
+        """Test an exhausted deadline still gives every troop Super Troop and a Friday Reflection"""
+        troops = load_troops_from_json(troops_file)
+        scheduler = ConstrainedScheduler(troops)
+        with contextlib.redirect_stdout(io.StringIO()):
+            schedule = scheduler.schedule_all(deadline=0)
+        
+        for troop in troops:
+            entries = [e for e in schedule.entries if e.troop == troop]
+            assert any(e.activity.name == "Super Troop" for e in entries), troop.name
+            assert any(e.activity.name == "Reflection" and e.time_slot.day == Day.FRIDAY
+                       for e in entries), troop.name
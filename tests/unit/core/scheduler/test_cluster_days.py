@@ -0,0 +1,40 @@
+"""
+Unit tests for the area cluster-day planner
+"""
+from core.scheduler.cluster_days import pack_items, plan_area_days
+
+CAPACITY = {"mon": 3, "tue": 3, "wed": 3, "thu": 2, "fri": 3}
+
+
+class TestPackItems:
+    """Test cases for packing requests into a fixed set of days"""
+
+    def test_owner_never_repeats_on_a_day(self):
+        """Test one troop's two requests land on different days"""
+        placement = pack_items([("T1", 1), ("T1", 1)], {"mon": 3, "tue": 3})
+        assert sorted(placement) == ["mon", "tue"]
+
+    def test_capacity_and_allowed_days(self):
+        """Test items that cannot fit return None and allowed days are honoured"""
+        assert pack_items([("T1", 2), ("T2", 2)], {"mon": 3}) is None
+        assert pack_items([("T1", 1)], {"mon": 3, "tue": 3}, allowed=[{"tue"}]) == ["tue"]
+
+
+class TestPlanAreaDays:
+    """Test cases for choosing the fewest open days per area"""
+
+    def test_fewest_days(self):
+        """Test three single-slot requests share one day"""
+        assert plan_area_days([("T1", 1), ("T2", 1), ("T3", 1)], CAPACITY) == ["mon"]
+
+    def test_preferred_days_win_ties(self):
+        """Test a commissioner day is chosen over an earlier day of equal size"""
+        items = [("T1", 1), ("T2", 1), ("T1", 1)]
+        assert plan_area_days(items, CAPACITY, preferred_days=["wed"]) == ["mon", "wed"]
+
+    def test_large_items_and_unplaceable_requests(self):
+        """Test a two-slot request opens a second day and requests with no day are dropped"""
+        items = [("T1", 2), ("T2", 2), ("T3", 1)]
+        assert plan_area_days(items, {"mon": 3, "thu": 2}) == ["mon", "thu"]
+        assert plan_area_days([("T1", 1)], CAPACITY, allowed=[set()]) == []
+        assert plan_area_days([], CAPACITY) == []
@@ -0,0 +1,59 @@
+"""
+Unit tests for commissioner-group decomposition
+"""
+import io
+import contextlib
+
+from core.io_handler import load_troops_from_json
+from core.models import Schedule, generate_time_slots
+from core.scheduler.decomposition import (
+    allocate_capacity, commissioner_groups, decomposition_resources, schedule_decomposed
+)
+from core.scheduler.multi_camp import ResourceLedger, SharedResource
+
+WEEK = "tc_week1"
+
+
+class TestAllocateCapacity:
+    """Test cases for allocate_capacity"""
+
+    def test_every_unit_goes_to_one_group(self, troops_file):
+        """Test each slot of a one-troop area is given to exactly one group, more to the keener group"""
+        troops = load_troops_from_json(troops_file)
+        groups = {"keen": [t for t in troops if "Archery" in t.preferences],
+                  "other": [t for t in troops if "Archery" not in t.preferences]}
+        archery = SharedResource("Archery", frozenset({"Archery"}), 1)
+        overrides = allocate_capacity(groups, [archery])
+        slots = generate_time_slots()
+        refused = {name: {slot for slot in slots for o in overrides[name] if o.covers("Archery", slot)}
+                   for name in groups}
+        assert refused["keen"].isdisjoint(refused["other"])
+        assert refused["keen"] | refused["other"] == set(slots)
+        assert len(refused["keen"]) < len(refused["other"])
+
+    def test_shared_resources(self):
+        """Test Delta is shared by all groups, Reflection never, Aqua Trampoline by two troops"""
+        resources = {r.name: r for r in decomposition_resources()}
+        assert resources["Delta"].capacity == 1
+        assert resources["Aqua Trampoline"].capacity == 2
+        assert not any("Reflection" in r.activities for r in resources.values() if r.unit == "troops")
+        assert resources["Shower House"].capacity == 1
+        assert not any("Itasca State Park" in r.activities for r in resources.values())
+
+
+class TestScheduleDecomposed:
+    """Test cases for schedule_decomposed"""
+
+    def test_groups_merge_within_capacity(self, troops_file):
+        """Test the merged week keeps every shared capacity and leaves no troop a gap"""
+        troops = load_troops_from_json(troops_file)
+        with contextlib.redirect_stdout(io.StringIO()):
+            schedule, report = schedule_decomposed(troops)
+        assert report['groups'] == {name: len(group) for name, group in commissioner_groups(troops).items()}
+        assert set(report['seconds']) == set(report['groups'])
+        assert report['conflicts'] == 0
+        by_group = {name: [e for e in schedule.entries if e.troop in group]
+                    for name, group in commissioner_groups(troops).items()}
+        ledger = ResourceLedger(decomposition_resources())
+        assert ledger.conflicts({name: Schedule(entries=entries) for name, entries in by_group.items()}) == []
+        assert not any(schedule.is_troop_free(slot, troop) for troop in troops for slot in generate_time_slots())
@@ -0,0 +1,80 @@
+"""
+Unit tests for mid-week disruption repair
+"""
+import io
+import contextlib
+
+import pytest
+
+from core.io_handler import load_troops_from_json
+from core.models import Day, TimeSlot
+from core.activities import get_activity_by_name
+from core.constrained_scheduler import ConstrainedScheduler
+from core.scheduler.disruption import activity_group, capacity_override
+
+WEEK = "tc_week5"
+
+
+def _cells(schedule, slots):
+    return sorted((e.troop.name, e.activity.name, e.time_slot.day.name, e.time_slot.slot_number)
+                  for e in schedule.entries if e.time_slot in slots)
+
+
+@pytest.fixture(scope="module")
+def repaired(scheduled_week):
+    previous = scheduled_week.schedule
+    scheduler = ConstrainedScheduler(scheduled_week.troops)
+    with contextlib.redirect_stdout(io.StringIO()):
+        scheduler.repair_disruption(previous, TimeSlot(Day.WEDNESDAY, 1),
+                                    [capacity_override("Beach", [Day.WEDNESDAY])])
+    return previous, scheduler
+
+
+class TestCapacityOverride:
+    """Test cases for capacity_override"""
+
+    def test_groups_and_days_expand(self):
+        """Test group names expand to activities and a day to all of its slots"""
+        override = capacity_override(["Canoe", "Tower"], [Day.THURSDAY, TimeSlot(Day.FRIDAY, 3)], capacity=1)
+        assert {"Troop Canoe", "Climbing Tower"} <= override.activities
+        assert override.slots == {("THURSDAY", 1), ("THURSDAY", 2), ("FRIDAY", 3)}
+        assert override.covers("Climbing Tower", TimeSlot(Day.THURSDAY, 2))
+        assert not override.covers("Climbing Tower", TimeSlot(Day.FRIDAY, 1))
+        assert activity_group("Archery") == {"Archery"}
+
+    def test_unknown_unit(self):
+        """Test an unknown capacity unit is rejected"""
+        with pytest.raises(ValueError):
+            capacity_override("Beach", [Day.MONDAY], unit="boats")
+
+
+class TestRepairDisruption:
+    """Test cases for ConstrainedScheduler.repair_disruption"""
+
+    def test_past_is_frozen(self, repaired):
+        """Test the slots before the start are untouched"""
+        previous, scheduler = repaired
+        assert len(scheduler.frozen_slots) == 6
+        assert _cells(scheduler.schedule, scheduler.frozen_slots) == _cells(previous, scheduler.frozen_slots)
+
+    def test_closure_is_respected_without_gaps(self, repaired):
+        """Test the closed beach is empty on Wednesday and every troop stays gap-free"""
+        _, scheduler = repaired
+        beach = activity_group("Beach")
+        assert scheduler.disruption_report['released'] > 0
+        assert scheduler.disruption_report['over_capacity'] == 0
+        assert not [e for e in scheduler.schedule.entries
+                    if e.time_slot.day == Day.WEDNESDAY and e.activity.name in beach]
+        assert not any(scheduler.schedule.is_troop_free(slot, troop)
+                       for troop in scheduler.troops for slot in scheduler.time_slots)
+
+    def test_frozen_slots_refuse_placements(self, troops_file):
+        """Test _can_schedule refuses a frozen slot that would otherwise be free"""
+        troop = load_troops_from_json(troops_file)[0]
+        scheduler = ConstrainedScheduler([troop])
+        gaga_ball = get_activity_by_name("Gaga Ball")
+        monday_1, friday_1 = TimeSlot(Day.MONDAY, 1), TimeSlot(Day.FRIDAY, 1)
+        assert scheduler._can_schedule(troop, gaga_ball, monday_1, Day.MONDAY)
+        scheduler.frozen_slots = frozenset([monday_1])
+        assert not scheduler._can_schedule(troop, gaga_ball, monday_1, Day.MONDAY)
+        assert scheduler._can_schedule(troop, gaga_ball, friday_1, Day.FRIDAY)
@@ -0,0 +1,34 @@
+"""
+Unit tests for the min-cost flow fill of the remaining cells (C.6)
+"""
+import io
+import contextlib
+from collections import Counter
+
+from core.io_handler import load_troops_from_json
+from core.constrained_scheduler import ConstrainedScheduler
+
+# Leaves empty cells after C.5
+WEEK = "tc_week7"
+
+
+class TestFillAllRemaining:
+    """Test cases for _fill_all_remaining"""
+
+    def test_flow_fills_every_empty_cell(self, troops_file):
+        """Test C.6 fills the cells left after C.5 without giving a troop an activity twice"""
+        scheduler = ConstrainedScheduler(load_troops_from_json(troops_file))
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduler.schedule_all(stop_after="C.5")
+        empty = [(troop, slot) for troop in scheduler.troops for slot in scheduler.time_slots
+                 if scheduler.schedule.is_troop_free(slot, troop)]
+        assert empty
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduler._fill_all_remaining()
+
+        assert not any(scheduler.schedule.is_troop_free(slot, troop) for troop, slot in empty)
+        filled = {(e.troop.name, e.activity.name) for e in scheduler.schedule.entries
+                  if (e.troop, e.time_slot) in empty}
+        held = Counter((e.troop.name, e.activity.name) for e in scheduler.schedule.entries)
+        assert all(held[key] == 1 for key in filled)
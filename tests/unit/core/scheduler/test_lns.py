@@ -0,0 +1,91 @@
+"""
+Unit tests for the large neighbourhood search
+"""
+import io
+import contextlib
+
+import pytest
+
+from core.io_handler import load_troops_from_json
+from core.constrained_scheduler import ConstrainedScheduler
+from core.models import Day
+from core.scheduler.disruption import capacity_override
+from core.scheduler.lns import (
+    LargeNeighbourhoodSearch, Neighbourhood, build_neighbourhoods, rebuild_scheduler, worker_settings
+)
+from core.scheduler.tuning import TuningProfile
+from utils.evaluate_week_success import evaluate_schedule
+
+
+def _entry_keys(schedule):
+    return sorted((e.troop.name, e.activity.name, e.time_slot.day.name, e.time_slot.slot_number)
+                  for e in schedule.entries)
+
+
+def _constant_score(schedule, troops):
+    return {'final_score': 0, 'constraint_violations': 0}
+
+
+def _run(troops_file, lns):
+    scheduler = ConstrainedScheduler(load_troops_from_json(troops_file))
+    with contextlib.redirect_stdout(io.StringIO()):
+        scheduler.schedule_all(lns=lns)
+    return scheduler
+
+
+class TestNeighbourhoods:
+    """Test cases for neighbourhood construction and repair"""
+
+    def test_days_commissioners_and_areas(self, troops_file):
+        """Test every day, commissioner group and staffed area is a neighbourhood"""
+        scheduler = ConstrainedScheduler(load_troops_from_json(troops_file))
+        neighbourhoods = build_neighbourhoods(scheduler)
+        assert neighbourhoods[0] == Neighbourhood('day', 'MONDAY')
+        assert sum(1 for n in neighbourhoods if n.kind == 'day') == 5
+        assert Neighbourhood('area', 'Tower') in neighbourhoods
+        commissioners = [n.key for n in neighbourhoods if n.kind == 'commissioner']
+        assert commissioners == sorted(set(scheduler.troop_commissioner.values()))
+
+    def test_repair_refills_freed_cells(self, troops_file):
+        """Test a day repair leaves no troop with a free slot"""
+        scheduler = _run(troops_file, None)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert scheduler._lns_repair('day', 'WEDNESDAY') > 0
+        for troop in scheduler.troops:
+            assert not any(scheduler.schedule.is_troop_free(s, troop) for s in scheduler.time_slots)
+        with pytest.raises(ValueError):
+            scheduler._lns_repair('week', 'ALL')
+
+    def test_worker_copy_keeps_instance_settings(self, troops_file):
+        """Test a worker's rebuilt scheduler gets the profile, overrides and campsite order"""
+        troops = load_troops_from_json(troops_file)
+        scheduler = ConstrainedScheduler(troops)
+        profile = TuningProfile.default()
+        profile.constants["STAFF_LIMIT"] = 14
+        profile.phase_order = [p for p in profile.phase_order if p != "D.8"]
+        scheduler.load_profile(profile)
+        scheduler.capacity_overrides = [capacity_override(["Archery"], [Day.MONDAY])]
+        scheduler.CAMPSITE_ORDER = list(reversed(scheduler.CAMPSITE_ORDER))
+
+        worker = rebuild_scheduler(troops, False, worker_settings(scheduler))
+        assert worker.STAFF_LIMIT == 14 and "D.8" not in worker.pipeline.ids()
+        assert worker.capacity_overrides == scheduler.capacity_overrides
+        assert worker.CAMPSITE_ORDER == scheduler.CAMPSITE_ORDER
+
+
+class TestLargeNeighbourhoodSearch:
+    """Test cases for the accept/reject loop"""
+
+    def test_no_improvement_keeps_schedule(self, troops_file, scheduled_week):
+        """Test repairs that do not raise the score are all rolled back"""
+        scheduler = _run(troops_file, LargeNeighbourhoodSearch(_constant_score))
+        assert scheduler.lns_report['accepted'] == []
+        assert _entry_keys(scheduler.schedule) == _entry_keys(scheduled_week.schedule)
+
+    def test_parallel_matches_serial(self, troops_file):
+        """Test worker processes reach the same schedule as the in-process search"""
+        serial = _run(troops_file, LargeNeighbourhoodSearch(evaluate_schedule, sweeps=1))
+        parallel = _run(troops_file, LargeNeighbourhoodSearch(evaluate_schedule, sweeps=1, jobs=2))
+        assert serial.lns_report['final_score'] >= serial.lns_report['start_score']
+        assert parallel.lns_report == serial.lns_report
+        assert _entry_keys(parallel.schedule) == _entry_keys(serial.schedule)
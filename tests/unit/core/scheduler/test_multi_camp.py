@@ -0,0 +1,79 @@
+"""
+Unit tests for joint multi-camp scheduling
+"""
+import pytest
+
+from core.activities import get_activity_by_name
+from core.io_handler import load_troops_from_json
+from core.models import Day, Schedule, ScheduleEntry, TimeSlot, generate_time_slots
+from core.scheduler.multi_camp import Camp, ResourceLedger, schedule_camps, shared_resource
+
+WEEK = "tc_week1"
+
+
+def _sailing(troop, slot):
+    return ScheduleEntry(slot, get_activity_by_name("Sailing"), troop)
+
+
+class TestResourceLedger:
+    """Test cases for ResourceLedger"""
+
+    def test_over_capacity_slot_goes_to_best_rank(self, troops_file):
+        """Test a shared slot is kept by the camp that wants it most; the other gets 0 there"""
+        troops = load_troops_from_json(troops_file)
+        ranked = sorted(troops, key=lambda t: t.get_priority("Sailing"))
+        first, second = ranked[0], ranked[-1]
+        slot = TimeSlot(Day.TUESDAY, 1)
+        schedules = {"a": Schedule(entries=[_sailing(second, slot)]),
+                     "b": Schedule(entries=[_sailing(first, slot)])}
+        ledger = ResourceLedger([shared_resource("Sailing", "Sailing", 1)])
+
+        assert ledger.conflicts(schedules) == [(ledger.resources[0], slot)]
+        admitted = {("Sailing", slot): ledger.admit(schedules, ledger.resources[0], slot)}
+        assert admitted[("Sailing", slot)] == {"a": 0, "b": 1}
+        overrides = ledger.overrides_for("a", schedules, admitted)
+        assert len(overrides) == 1 and overrides[0].capacity == 0
+        assert overrides[0].covers("Sailing", slot)
+        # Nothing the other camp keeps limits b
+        assert ledger.overrides_for("b", schedules, admitted) == []
+
+    def test_camp_over_capacity_on_its_own(self, troops_file):
+        """Test a camp that alone overbooks a slot is capped at what it keeps"""
+        troops = load_troops_from_json(troops_file)
+        slot = TimeSlot(Day.TUESDAY, 1)
+        schedules = {"a": Schedule(entries=[_sailing(troop, slot) for troop in troops[:2]]),
+                     "b": Schedule()}
+        ledger = ResourceLedger([shared_resource("Sailing", "Sailing", 1)])
+
+        admitted = {("Sailing", slot): ledger.admit(schedules, ledger.resources[0], slot)}
+        overrides = ledger.overrides_for("a", schedules, admitted)
+        assert len(overrides) == 1 and overrides[0].capacity == 1
+        assert overrides[0].covers("Sailing", slot)
+
+    def test_unknown_unit(self):
+        """Test an unknown capacity unit is rejected"""
+        with pytest.raises(ValueError):
+            shared_resource("Boats", "Canoe", 4, unit="boats")
+
+
+class TestScheduleCamps:
+    """Test cases for schedule_camps"""
+
+    def test_camps_share_resources_without_gaps(self, troops_dir):
+        """Test two weeks scheduled together end within every shared capacity and gap-free"""
+        camps = [Camp(week, load_troops_from_json(troops_dir / f"{week}_troops.json"))
+                 for week in ("tc_week2", "tc_week8")]
+        resources = [shared_resource("Beach", "Beach", 2)]
+        schedules, report = schedule_camps(camps, resources)
+        assert report['initial_conflicts'] > 0 and report['conflicts'] == 0
+        assert ResourceLedger(resources).conflicts(schedules) == []
+        for camp in camps:
+            schedule = schedules[camp.name]
+            assert not any(schedule.is_troop_free(slot, troop)
+                           for troop in camp.troops for slot in generate_time_slots())
+
+    def test_duplicate_camp_names(self):
+        """Test camps must have distinct names"""
+        camp = Camp("week", [])
+        with pytest.raises(ValueError):
+            schedule_camps([camp, camp])
@@ -0,0 +1,76 @@
+"""
+Unit tests for the nogood store behind _can_schedule
+"""
+import pickle
+
+from core.models import Schedule, ScheduleEntry, Troop, TimeSlot, Day
+from core.activities import get_activity_by_name
+from core.constrained_scheduler import ConstrainedScheduler
+from core.scheduler.disruption import capacity_override
+
+
+def _troops():
+    return [Troop(name=name, campsite=f"Site {name}", preferences=["Archery", "Tie Dye"])
+            for name in ("Massasoit", "Tecumseh")]
+
+
+class TestScopeHash:
+    """Test cases for Schedule.scope_hash"""
+
+    def test_scope_ignores_other_troops_on_other_days(self):
+        """Test only the troop's own entries and the day's entries change its scope"""
+        massasoit, tecumseh = _troops()
+        schedule = Schedule()
+        before = schedule.scope_hash("Massasoit", (Day.MONDAY,))
+        schedule.entries.append(ScheduleEntry(TimeSlot(Day.TUESDAY, 1), get_activity_by_name("Tie Dye"), tecumseh))
+        assert schedule.scope_hash("Massasoit", (Day.MONDAY,)) == before
+        schedule.entries.append(ScheduleEntry(TimeSlot(Day.MONDAY, 2), get_activity_by_name("Archery"), tecumseh))
+        assert schedule.scope_hash("Massasoit", (Day.MONDAY,)) != before
+
+    def test_scope_survives_pickle(self):
+        """Test the partial hashes are restored with the schedule"""
+        massasoit, _ = _troops()
+        schedule = Schedule(entries=[ScheduleEntry(TimeSlot(Day.MONDAY, 1), get_activity_by_name("Archery"), massasoit)])
+        restored = pickle.loads(pickle.dumps(schedule))
+        assert restored.scope_hash("Massasoit", (Day.MONDAY,)) == schedule.scope_hash("Massasoit", (Day.MONDAY,))
+
+
+class TestNogoodCache:
+    """Test cases for the nogood cache in _can_schedule"""
+
+    def test_failure_is_reused_until_scope_changes(self):
+        """Test a repeated failing check hits the cache and a change on its day clears it"""
+        massasoit, tecumseh = _troops()
+        scheduler = ConstrainedScheduler([massasoit, tecumseh])
+        archery = get_activity_by_name("Archery")
+        monday_1 = TimeSlot(Day.MONDAY, 1)
+        scheduler.schedule.add_entry(monday_1, archery, tecumseh)
+
+        assert not scheduler._can_schedule(massasoit, archery, monday_1, Day.MONDAY)
+        assert not scheduler._can_schedule(massasoit, archery, monday_1, Day.MONDAY)
+        assert scheduler.nogoods.hits == 1
+
+        # Another troop's entry on another day leaves the nogood valid
+        scheduler.schedule.add_entry(TimeSlot(Day.WEDNESDAY, 1), get_activity_by_name("Tie Dye"), tecumseh)
+        assert not scheduler._can_schedule(massasoit, archery, monday_1, Day.MONDAY)
+        assert scheduler.nogoods.hits == 2
+
+        # Freeing the range re-runs the full check
+        scheduler.schedule.entries = [e for e in scheduler.schedule.entries if e.activity.name != "Archery"]
+        assert scheduler._can_schedule(massasoit, archery, monday_1, Day.MONDAY)
+        assert scheduler.nogoods.hits == 2
+
+    def test_failure_under_override_is_dropped_with_the_override(self):
+        """Test a placement rejected under a capacity override succeeds once it is lifted"""
+        massasoit, tecumseh = _troops()
+        scheduler = ConstrainedScheduler([massasoit, tecumseh])
+        archery = get_activity_by_name("Archery")
+        monday_1 = TimeSlot(Day.MONDAY, 1)
+
+        scheduler.capacity_overrides = [capacity_override("Archery", [Day.MONDAY])]
+        assert not scheduler._can_schedule(massasoit, archery, monday_1, Day.MONDAY)
+        assert not scheduler._can_schedule(massasoit, archery, monday_1, Day.MONDAY)
+        assert scheduler.nogoods.hits == 1
+
+        scheduler.capacity_overrides = []
+        assert scheduler._can_schedule(massasoit, archery, monday_1, Day.MONDAY)
@@ -0,0 +1,94 @@
+"""
+Unit tests for the checkpointable phase pipeline
+"""
+import io
+import contextlib
+
+import pytest
+
+from core.scheduler.pipeline import (
+    Phase, PhasePipeline, CheckpointStore, build_default_pipeline,
+    capture_checkpoint, restore_checkpoint,
+)
+from core.io_handler import load_troops_from_json
+from core.constrained_scheduler import ConstrainedScheduler
+
+
+def _entry_keys(schedule):
+    return [(e.troop.name, e.activity.name, e.time_slot.day.name, e.time_slot.slot_number)
+            for e in schedule.entries]
+
+
+class TestPhasePipeline:
+    """Test cases for the phase registry"""
+
+    def test_register_before_and_after(self):
+        """Test phases can be inserted relative to registered ones"""
+        pipeline = PhasePipeline([Phase("A", "_a"), Phase("C", "_c")])
+        pipeline.register(Phase("B", "_b"), before="C")
+        pipeline.register(Phase("D", "_d"), after="C")
+        assert pipeline.ids() == ["A", "B", "C", "D"]
+        assert pipeline.previous("B") == "A"
+        assert pipeline.previous("A") is None
+
+    def test_duplicate_and_unknown_ids(self):
+        """Test duplicate registration and unknown lookups raise"""
+        pipeline = PhasePipeline([Phase("A", "_a")])
+        with pytest.raises(ValueError):
+            pipeline.register(Phase("A", "_other"))
+        with pytest.raises(KeyError):
+            pipeline.index("Z")
+
+    def test_default_pipeline_order(self):
+        """Test the default pipeline starts with Reflection and ends with sanitization"""
+        ids = build_default_pipeline().ids()
+        assert ids[0] == "A.0"
+        assert ids[-1] == "F.2"
+        assert ids.index("C.6") < ids.index("D.2") < ids.index("D.11")
+        assert len(ids) == len(set(ids))
+
+
+class TestCheckpoints:
+    """Test checkpoint capture, restore and resume"""
+
+    def test_store_round_trips_through_directory(self, tmp_path):
+        """Test a checkpoint written to disk can be loaded by a new store"""
+        CheckpointStore(tmp_path).save("A.0", {'phase': "A.0", 'entries': []})
+        store = CheckpointStore(tmp_path)
+        assert "A.0" in store
+        assert store.load("A.0")['phase'] == "A.0"
+        with pytest.raises(KeyError):
+            store.load("B.1")
+
+    def test_resume_matches_full_run(self, troops_file):
+        """Test resuming at D.2 from a checkpoint reproduces the uninterrupted run"""
+        store = CheckpointStore()
+        with contextlib.redirect_stdout(io.StringIO()):
+            full = ConstrainedScheduler(load_troops_from_json(troops_file))
+            full_keys = _entry_keys(full.schedule_all(checkpoints=store))
+
+            resumed = ConstrainedScheduler(load_troops_from_json(troops_file))
+            resumed_keys = _entry_keys(resumed.schedule_all(checkpoints=store, resume_from="D.2"))
+
+        assert resumed_keys == full_keys
+        assert resumed.troop_has_super_troop == full.troop_has_super_troop
+
+    def test_restore_rebuilds_state(self, troops_file):
+        """Test restore_checkpoint brings back entries and run-state counters"""
+        troops = load_troops_from_json(troops_file)
+        scheduler = ConstrainedScheduler(troops)
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduler.schedule_all(stop_after="B.7")
+        checkpoint = capture_checkpoint(scheduler, "B.7")
+
+        fresh = ConstrainedScheduler(load_troops_from_json(troops_file))
+        restore_checkpoint(fresh, checkpoint)
+        assert _entry_keys(fresh.schedule) == _entry_keys(scheduler.schedule)
+        assert fresh.staff_load_by_slot.keys() == scheduler.staff_load_by_slot.keys()
+        assert set(fresh.commissioner_busy_map) == set(scheduler.commissioner_busy_map)
+
+    def test_resume_without_checkpoints_raises(self, troops_file):
+        """Test resuming past the first phase needs a checkpoint store"""
+        scheduler = ConstrainedScheduler(load_troops_from_json(troops_file))
+        with pytest.raises(ValueError):
+            scheduler.schedule_all(resume_from="D.2")
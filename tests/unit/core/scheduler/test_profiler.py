@@ -0,0 +1,88 @@
+"""
+Unit tests for the per-phase profiler
+"""
+import io
+import contextlib
+
+import pytest
+
+from core.scheduler.profiler import PhaseProfiler, aggregate_phase_records, format_phase_table
+from core.io_handler import load_troops_from_json
+from core.constrained_scheduler import ConstrainedScheduler
+
+
+def _record(phase, elapsed=0.1, added=0, removed=0, score_delta=None, violation_delta=None):
+    return {
+        'phase': phase, 'status': 'ran', 'depth': 0, 'elapsed': elapsed,
+        'can_schedule_calls': 1, 'entries_added': added, 'entries_removed': removed,
+        'violation_delta': violation_delta, 'score_delta': score_delta,
+    }
+
+
+class TestAggregatePhaseRecords:
+    """Test cases for merging per-week phase records"""
+
+    def test_sums_per_phase_in_first_seen_order(self):
+        """Test rows are merged by phase name and totals are summed"""
+        runs = [
+            [_record("A.0", added=3, score_delta=10), _record("D.2", score_delta=0)],
+            [_record("A.0", added=2, score_delta=5), _record("D.2", removed=1, score_delta=-2)],
+        ]
+        rows = aggregate_phase_records(runs)
+        assert [r['phase'] for r in rows] == ["A.0", "D.2"]
+        assert rows[0]['entries_added'] == 5
+        assert rows[0]['score_delta'] == 15
+        assert rows[0]['unproductive_runs'] == 0
+        assert rows[1]['runs'] == 2
+        assert rows[1]['unproductive_runs'] == 2
+
+    def test_unscored_records_use_entry_churn(self):
+        """Test a phase without score data counts as unproductive only when it changed nothing"""
+        rows = aggregate_phase_records([[_record("B.2"), _record("C.4", added=1)]])
+        assert rows[0]['unproductive_runs'] == 1
+        assert rows[1]['unproductive_runs'] == 0
+        assert rows[0]['score_delta'] is None
+
+    def test_format_table(self):
+        """Test the text table has a header, separator and one line per row"""
+        table = format_phase_table([_record("A.0", score_delta=4, violation_delta=-1)])
+        lines = table.splitlines()
+        assert len(lines) == 3
+        assert lines[2].startswith("A.0")
+        assert "+4" in lines[2] and "-1" in lines[2]
+
+
+class TestProfiledScheduleAll:
+    """Test schedule_all(profiler=...) instruments every phase"""
+
+    def test_profiler_records_phases(self, troops_file):
+        """Test each executed phase is recorded and the counter is removed afterwards"""
+        troops = load_troops_from_json(troops_file)
+        scheduler = ConstrainedScheduler(troops)
+        scores = iter(range(1000))
+        profiler = PhaseProfiler(
+            evaluate_fn=lambda schedule, troops: {'final_score': next(scores), 'constraint_violations': 0})
+        with contextlib.redirect_stdout(io.StringIO()):
+            schedule = scheduler.schedule_all(profiler=profiler)
+
+        phases = [r['phase'] for r in profiler.records]
+        assert phases[0] == "A.0"
+        assert "D.2" in phases and "F.2" in phases
+        assert profiler.can_schedule_calls > 0
+        assert sum(r['can_schedule_calls'] for r in profiler.records if r['depth'] == 0) \
+            <= profiler.can_schedule_calls
+
+        top_level = [r for r in profiler.records if r['depth'] == 0]
+        added = sum(r['entries_added'] - r['entries_removed'] for r in top_level)
+        assert added == len(schedule.entries)
+        assert all(r['score_delta'] >= 1 and r['violation_delta'] == 0 for r in top_level)
+        assert '_can_schedule' not in vars(scheduler)
+
+    def test_profiler_detached_when_run_fails(self, troops_file):
+        """Test the counting wrapper is removed even when schedule_all raises"""
+        troops = load_troops_from_json(troops_file)
+        scheduler = ConstrainedScheduler(troops)
+        with pytest.raises(ValueError):
+            scheduler.schedule_all(profiler=PhaseProfiler(), resume_from="D.2")
+        assert '_can_schedule' not in vars(scheduler)
+        assert scheduler._profiler is None
@@ -0,0 +1,68 @@
+"""
+Unit tests for Friday Reflection placement and the Reflection slot assignment (D.1 / D.5)
+"""
+import io
+import contextlib
+from collections import Counter
+
+import pytest
+
+from core.io_handler import load_troops_from_json
+from core.constrained_scheduler import ConstrainedScheduler
+from core.models import Day
+
+# Two commissioners with 4 and 5 troops, so Friday slots are shared
+WEEK = "tc_week4"
+
+
+@pytest.fixture
+def polished(troops_file):
+    # Tests edit the schedule, so each gets its own run (not the shared scheduled_week)
+    scheduler = ConstrainedScheduler(load_troops_from_json(troops_file))
+    with contextlib.redirect_stdout(io.StringIO()):
+        scheduler.schedule_all(stop_after="D.4")
+    return scheduler
+
+
+def _reflections(scheduler):
+    return [e for e in scheduler.schedule.entries
+            if e.activity.name == "Reflection" and e.time_slot.day == Day.FRIDAY]
+
+
+def _crowding(scheduler):
+    """Troops beyond the first of one commissioner in the same Friday Reflection slot."""
+    per_slot = Counter((scheduler.troop_commissioner.get(e.troop.name), e.time_slot)
+                       for e in _reflections(scheduler))
+    return sum(count - 1 for count in per_slot.values())
+
+
+class TestFridayReflection:
+    """Test cases for _schedule_friday_reflection"""
+
+    def test_every_troop_gets_reflection(self, troops_file):
+        """Test troops sharing a proximity zone all get a Reflection in it (Reflection is concurrent)"""
+        troops = load_troops_from_json(troops_file)
+        scheduler = ConstrainedScheduler(troops)
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduler._schedule_friday_reflection()
+        assert sorted(e.troop.name for e in _reflections(scheduler)) == sorted(t.name for t in troops)
+
+
+class TestReflectionAssignment:
+    """Test cases for _optimize_flexible_reflections"""
+
+    def test_spreads_commissioner_troops_by_trading(self, polished):
+        """Test D.5 lowers crowding on a full schedule by trading with the troop's own entries"""
+        assert not any(polished.schedule.is_troop_free(slot, troop)
+                       for troop in polished.troops for slot in polished.time_slots if slot.day == Day.FRIDAY)
+        entries_before = len(polished.schedule.entries)
+        crowding_before = _crowding(polished)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            polished._optimize_flexible_reflections()
+
+        assert _crowding(polished) < crowding_before
+        assert len(polished.schedule.entries) == entries_before
+        assert sorted(e.troop.name for e in _reflections(polished)) == sorted(t.name for t in polished.troops)
+        occupied = Counter((e.troop.name, e.time_slot) for e in polished.schedule.entries)
+        assert max(occupied.values()) == 1
@@ -0,0 +1,81 @@
+"""
+Unit tests for incremental re-scheduling
+"""
+import io
+import contextlib
+
+import pytest
+
+from core.io_handler import load_troops_from_json
+from core.constrained_scheduler import ConstrainedScheduler
+from core.scheduler.pipeline import REPAIR_PHASES, build_finish_pipeline, build_repair_pipeline
+
+
+def _cells(schedule, troop_name):
+    return sorted((e.activity.name, e.time_slot.day.name, e.time_slot.slot_number)
+                  for e in schedule.entries if e.troop.name == troop_name)
+
+
+@pytest.fixture(scope="module")
+def previous(scheduled_week):
+    return scheduled_week.schedule
+
+
+def _reschedule(previous, troops, **kwargs):
+    scheduler = ConstrainedScheduler(troops)
+    with contextlib.redirect_stdout(io.StringIO()):
+        schedule = scheduler.reschedule(previous, **kwargs)
+    return scheduler, schedule
+
+
+class TestRepairPipeline:
+    """Test cases for build_repair_pipeline"""
+
+    def test_keeps_default_order(self):
+        """Test the repair phases run in schedule_all's order and skip Reflection and polish"""
+        ids = build_repair_pipeline().ids()
+        assert set(ids) == set(REPAIR_PHASES)
+        assert ids.index("A.1") < ids.index("B.1") < ids.index("C.6")
+        assert "A.0" not in ids and "D.2" not in ids
+
+    def test_finish_phases_are_the_required_tail(self):
+        """Test the finish pipeline holds every required phase from D.11 on"""
+        ids = build_finish_pipeline().ids()
+        assert ids == ["D.11", "D.11b", "D.11.gap", "F.1", "F.2"]
+
+
+class TestReschedule:
+    """Test cases for ConstrainedScheduler.reschedule"""
+
+    def test_unchanged_week_is_kept(self, previous, troops_file):
+        """Test nothing is released when no troop changed"""
+        troops = load_troops_from_json(troops_file)
+        scheduler, schedule = _reschedule(previous, troops)
+        assert scheduler.reschedule_report['released'] == []
+        assert {"D.11", "F.1", "F.2"} <= {p['phase'] for p in scheduler.budget_report.phases}
+        for troop in troops:
+            assert _cells(schedule, troop.name) == _cells(previous, troop.name)
+
+    def test_changed_troop_is_replaced_alone(self, previous, troops_file):
+        """Test only the troop with new preferences moves and it stays gap-free"""
+        troops = load_troops_from_json(troops_file)
+        changed = troops[0]
+        changed.preferences = changed.preferences[5:10] + changed.preferences[:5] + changed.preferences[10:]
+        scheduler, schedule = _reschedule(previous, troops)
+
+        assert scheduler.reschedule_report['released'] == [changed.name]
+        assert scheduler.reschedule_report['moved'] == 0
+        for troop in troops[1:]:
+            assert _cells(schedule, troop.name) == _cells(previous, troop.name)
+        assert not any(schedule.is_troop_free(slot, changed) for slot in scheduler.time_slots)
+        assert ("Reflection", "FRIDAY") in {cell[:2] for cell in _cells(schedule, changed.name)}
+
+    def test_new_troop_and_dropped_troop(self, previous, troops_file):
+        """Test a dropped troop's entries go and an explicitly released troop is re-placed"""
+        troops = load_troops_from_json(troops_file)
+        dropped = troops.pop()
+        scheduler, schedule = _reschedule(previous, troops, changed=[troops[0].name])
+        assert not _cells(schedule, dropped.name)
+        assert scheduler.reschedule_report['released'] == [troops[0].name]
+        assert not any(schedule.is_troop_free(slot, troop)
+                       for troop in troops for slot in scheduler.time_slots)
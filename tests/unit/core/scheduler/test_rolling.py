@@ -0,0 +1,71 @@
+"""
+Unit tests for the rolling-horizon pipeline (one exact day plan at a time)
+"""
+import io
+import contextlib
+
+import pytest
+
+from core.io_handler import load_troops_from_json
+from core.constrained_scheduler import ConstrainedScheduler
+from core.models import Day
+from core.scheduler.pipeline import ROLLING_FINISH_PHASES, build_default_pipeline, build_rolling_pipeline
+from utils.evaluate_week_success import evaluate_schedule
+
+WEEK = "tc_week5"
+
+
+@pytest.fixture(scope="module")
+def troops(troops_file):
+    return load_troops_from_json(troops_file)
+
+
+class TestBuildRollingPipeline:
+    """Test cases for build_rolling_pipeline"""
+
+    def test_days_in_order_between_setup_and_finish(self):
+        """Test the fixed reservations come first, then Monday to Friday, then the finish phases"""
+        ids = build_rolling_pipeline().ids()
+        assert ids[:2] == ["A.0", "A.0b"]
+        assert ids[2:8] == ["R.monday", "R.tuesday", "R.wednesday", "R.thursday", "R.friday", "R.gap"]
+        default = build_default_pipeline().ids()
+        assert ids[8:] == [phase_id for phase_id in default if phase_id in ROLLING_FINISH_PHASES]
+
+
+class TestSolveDayExactly:
+    """Test cases for ConstrainedScheduler._solve_day_exactly"""
+
+    def test_day_caps_and_look_ahead(self, troops):
+        """Test Monday keeps the per-day caps and only reserves Top 5 requests that miss Monday"""
+        scheduler = ConstrainedScheduler(troops)
+        monday = [s for s in scheduler.time_slots if s.day == Day.MONDAY]
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduler._solve_day_exactly(Day.MONDAY, monday)
+        for troop in troops:
+            ranks = {troop.get_priority(e.activity.name) for e in scheduler.schedule.get_troop_schedule(troop)
+                     if e.time_slot.day == Day.MONDAY}
+            assert len([r for r in ranks if r < 5]) <= 1
+            assert len([r for r in ranks if 5 <= r < 10]) <= 1
+
+        reserved = [e for e in scheduler.schedule.entries if e.time_slot.day == Day.TUESDAY]
+        assert reserved
+        for entry in reserved:
+            assert entry.troop.get_priority(entry.activity.name) < 5
+            scheduler._release_activity(entry.troop, entry.activity.name, Day.TUESDAY)
+            fits_monday = {activity.name for _, activity, _ in
+                           scheduler._day_requests(entry.troop, Day.MONDAY, monday, range(5))}
+            assert entry.activity.name not in fits_monday
+
+
+class TestRollingSchedule:
+    """Test cases for schedule_all with the rolling-horizon pipeline"""
+
+    def test_full_week_is_valid(self, troops):
+        """Test the rolling week has no gaps and no exclusive double-bookings"""
+        scheduler = ConstrainedScheduler(troops)
+        scheduler.pipeline = build_rolling_pipeline()
+        with contextlib.redirect_stdout(io.StringIO()):
+            schedule = scheduler.schedule_all()
+        metrics = evaluate_schedule(schedule, troops)
+        assert metrics['unnecessary_gaps'] == 0 and metrics['cluster_gaps'] == 0
+        assert metrics['exclusive_double_book'] == 0
@@ -0,0 +1,65 @@
+"""
+Unit tests for the content-addressed schedule cache
+"""
+import io
+import json
+import contextlib
+
+from core.activities import get_all_activities
+from core.io_handler import schedule_from_data, schedule_to_data
+from core.scheduler.schedule_cache import ScheduleCache, input_key, read_schedule_data
+
+def _cells(schedule):
+    return sorted((e.troop.name, e.activity.name, e.time_slot.day.name, e.time_slot.slot_number)
+                  for e in schedule.entries)
+
+
+class TestInputKey:
+    """Test cases for input_key"""
+
+    def test_same_inputs_same_key(self, tmp_path, troops_file):
+        """Test a byte-identical copy of the troops file gets the same key"""
+        copy = tmp_path / troops_file.name
+        copy.write_bytes(troops_file.read_bytes())
+        assert input_key(copy) == input_key(troops_file)
+
+    def test_changed_inputs_change_key(self, tmp_path, troops_file):
+        """Test any edit to the troops file or the mode gives a new key"""
+        edited = tmp_path / troops_file.name
+        edited.write_bytes(troops_file.read_bytes().replace(b'"scouts": 1', b'"scouts": 2', 1))
+        assert input_key(edited) != input_key(troops_file)
+        assert input_key(troops_file, voyageur_mode=True) != input_key(troops_file, voyageur_mode=False)
+
+
+class TestScheduleCache:
+    """Test cases for ScheduleCache"""
+
+    def test_round_trip(self, tmp_path, troops_file, scheduled_week):
+        """Test a stored schedule loads back entry for entry under its key only"""
+        troops, schedule = scheduled_week.troops, scheduled_week.schedule
+        cache = ScheduleCache(tmp_path)
+        key = input_key(troops_file)
+        assert cache.get(key) is None
+
+        cache.put(key, schedule_to_data(schedule, troops))
+        data = cache.get(key)
+        assert key in cache and data['input_key'] == key
+        assert _cells(schedule_from_data(data, troops, get_all_activities())) == _cells(schedule)
+        # A file made for other inputs is never served
+        assert read_schedule_data(cache.path(key), "0" * 64) is None
+
+    def test_unreadable_entry_is_a_miss(self, tmp_path):
+        """Test a truncated cache file counts as missing"""
+        cache = ScheduleCache(tmp_path)
+        cache.path("abc").write_text('{"troops": [')
+        assert cache.get("abc") is None
+
+    def test_legacy_week_file_without_key(self, tmp_path):
+        """Test a week file recording no key is read only as a legacy file, a wrong key never"""
+        path = tmp_path / "week_schedule.json"
+        path.write_text(json.dumps({'troops': [], 'entries': []}))
+        assert read_schedule_data(path, "0" * 64) is None
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert read_schedule_data(path, "0" * 64, legacy=True) is not None
+        path.write_text(json.dumps({'troops': [], 'entries': [], 'input_key': "1" * 64}))
+        assert read_schedule_data(path, "0" * 64, legacy=True) is None
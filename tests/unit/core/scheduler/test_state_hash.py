@@ -0,0 +1,50 @@
+"""
+Unit tests for the Zobrist schedule state hash
+"""
+import pickle
+
+from core.models import Schedule, ScheduleEntry, Troop, TimeSlot, Day
+from core.activities import get_activity_by_name
+from core.constrained_scheduler import ConstrainedScheduler
+
+
+def _entries():
+    troop = Troop(name="Massasoit", campsite="Site A", preferences=["Archery"])
+    return [ScheduleEntry(TimeSlot(Day.MONDAY, n), get_activity_by_name(name), troop)
+            for n, name in ((1, "Archery"), (2, "Tie Dye"), (3, "Troop Swim"))]
+
+
+class TestStateHash:
+    """Test cases for Schedule.state_hash"""
+
+    def test_incremental_hash_tracks_contents(self):
+        """Test adds and removes keep the hash equal to a rebuild, in any order"""
+        a, b, c = _entries()
+        schedule = Schedule()
+        empty = schedule.state_hash()
+        schedule.entries.append(a)
+        schedule.entries.append(b)
+        schedule.entries += [c]
+        assert schedule.state_hash() == Schedule(entries=[c, b, a]).state_hash()
+
+        schedule.entries.remove(b)
+        assert schedule.state_hash() == Schedule(entries=[a, c]).state_hash()
+        schedule.entries = []
+        assert schedule.state_hash() == empty
+
+    def test_hash_survives_pickle(self):
+        """Test a schedule sent to a worker process keeps its hash"""
+        schedule = Schedule(entries=_entries())
+        assert pickle.loads(pickle.dumps(schedule)).state_hash() == schedule.state_hash()
+
+    def test_state_hash_after_predicts_move(self):
+        """Test the predicted hash of a move matches the hash once it is made"""
+        a, b, _ = _entries()
+        scheduler = ConstrainedScheduler([a.troop])
+        scheduler.schedule.entries = [a, b]
+        predicted = scheduler._state_hash_after(
+            [(a.troop, "Archery", a.time_slot), (a.troop, "Tie Dye", b.time_slot)],
+            [(a.troop, "Archery", b.time_slot), (a.troop, "Tie Dye", a.time_slot)])
+        scheduler.schedule.entries = [ScheduleEntry(b.time_slot, a.activity, a.troop),
+                                      ScheduleEntry(a.time_slot, b.activity, a.troop)]
+        assert scheduler.schedule.state_hash() == predicted
@@ -0,0 +1,76 @@
+"""
+Unit tests for synthetic camp weeks and the section-by-section scaling mode
+"""
+import io
+import contextlib
+import random
+
+import pytest
+
+from core.activities import get_all_activities
+from core.io_handler import load_troops_from_json
+from core.models import Troop
+from core.scheduler.scaling import schedule_sections, split_sections
+from core.scheduler.synthetic import CampTopology, PreferenceModel, generate_week, load_topology, write_week
+
+
+@pytest.fixture(scope="module")
+def model():
+    return PreferenceModel.from_weeks()
+
+
+class TestCampTopology:
+    """Test cases for CampTopology"""
+
+    def test_sections_follow_the_real_camp(self):
+        """Test 30 troops need three 14-campsite sections with renamed copies"""
+        topology = CampTopology.for_troops(30)
+        assert len(topology.sections) == 3
+        assert [len(names) for names in topology.sections[0].values()] == [5, 5, 4]
+        assert topology.campsite_order(1)[0] == topology.campsite_order(0)[0] + " 2"
+        assert topology.commissioner_of("Pontiac 3") == "Commissioner C3"
+        assert topology.base_commissioner("Commissioner C3") == "Commissioner C"
+        assert CampTopology.from_data(topology.to_data()) == topology
+
+    def test_bad_section_size(self):
+        """Test a section cannot be larger than the real camp"""
+        with pytest.raises(ValueError):
+            CampTopology.for_troops(20, section_size=15)
+
+
+class TestGenerateWeek:
+    """Test cases for generate_week and PreferenceModel"""
+
+    def test_week_is_reproducible_and_loadable(self, model, tmp_path):
+        """Test a seed gives the same week, which loads as troops with its topology"""
+        data = generate_week(25, model=model, seed=3)
+        assert data == generate_week(25, model=model, seed=3)
+        path = write_week(data, tmp_path / "synthetic_25_troops.json")
+        troops = load_troops_from_json(path)
+        known = {a.name for a in get_all_activities()}
+        assert len({t.name for t in troops}) == 25
+        assert all(set(t.preferences) <= known and len(set(t.preferences)) == len(t.preferences)
+                   for t in troops)
+        assert load_topology(path) == CampTopology.for_troops(25)
+
+    def test_first_choices_follow_stored_weeks(self, model):
+        """Test Top 5 draws only use activities some stored troop ranked in its Top 5"""
+        rng = random.Random(0)
+        for _ in range(50):
+            assert set(model.sample_preferences(rng, 20)[:5]) <= set(model.bands[0])
+
+
+class TestScheduleSections:
+    """Test cases for schedule_sections"""
+
+    def test_each_section_scheduled_separately(self, model):
+        """Test two small sections are scheduled apart and merged onto the given troops"""
+        topology = CampTopology.for_troops(6, section_size=3, commissioners_per_section=3)
+        data = generate_week(6, topology, model, seed=1)
+        troops = [Troop(**t) for t in data["troops"]]
+        assert [len(group) for group in split_sections(troops, topology)] == [3, 3]
+        with contextlib.redirect_stdout(io.StringIO()):
+            schedule, report = schedule_sections(troops, topology)
+        assert [s['troops'] for s in report['sections']] == [3, 3]
+        assert {e.troop.name for e in schedule.entries} == {t.name for t in troops}
+        assert all(any(e.troop is t for t in troops) for e in schedule.entries)
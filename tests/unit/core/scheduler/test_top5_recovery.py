@@ -0,0 +1,58 @@
+"""
+Unit tests for the ejection-chain Top 5 recovery
+"""
+import io
+import contextlib
+from collections import Counter
+
+import pytest
+
+from core.io_handler import load_troops_from_json
+from core.constrained_scheduler import ConstrainedScheduler
+from core.activities import get_activity_by_name
+
+@pytest.fixture
+def scheduled(troops_file):
+    # Tests edit the schedule, so each gets its own run (not the shared scheduled_week)
+    scheduler = ConstrainedScheduler(load_troops_from_json(troops_file))
+    with contextlib.redirect_stdout(io.StringIO()):
+        scheduler.schedule_all()
+    return scheduler
+
+
+def _evict(scheduler, troop, activity_name):
+    """Replace troop's entry for activity_name with an unrequested fill, leaving no free slot."""
+    entry = next(e for e in scheduler.schedule.entries
+                 if e.troop == troop and e.activity.name == activity_name)
+    scheduler.schedule.entries.remove(entry)
+    assert scheduler.schedule.add_entry(entry.time_slot, get_activity_by_name("Shower House"), troop)
+    return entry
+
+
+class TestEjectionChain:
+    """Test cases for _place_by_ejection_chain"""
+
+    def test_recovers_by_displacing(self, scheduled):
+        """Test a Top 5 with no free slot is placed by ejecting a lower-ranked entry"""
+        troop = next(t for t in scheduled.troops if t.name == "Massasoit")
+        _evict(scheduled, troop, "Archery")
+        entries_before = len(scheduled.schedule.entries)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert scheduled._place_by_ejection_chain(troop, get_activity_by_name("Archery"), 2)
+
+        assert any(e.troop == troop and e.activity.name == "Archery" for e in scheduled.schedule.entries)
+        occupied = Counter((e.troop.name, e.time_slot) for e in scheduled.schedule.entries)
+        assert max(occupied.values()) == 1
+        assert len(scheduled.schedule.entries) == entries_before
+
+    def test_failed_search_leaves_schedule_unchanged(self, scheduled):
+        """Test a chain that cannot be built is rolled back completely"""
+        troop = next(t for t in scheduled.troops if t.name == "Massasoit")
+        _evict(scheduled, troop, "Archery")
+        scheduled.TOP5_CHAIN_DEPTH = 0
+        before = list(scheduled.schedule.entries)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert not scheduled._place_by_ejection_chain(troop, get_activity_by_name("Archery"), 2)
+        assert scheduled.schedule.entries == before
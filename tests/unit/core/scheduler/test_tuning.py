@@ -0,0 +1,82 @@
+"""
+Unit tests for tuning profiles and the offline autotuner
+"""
+import random
+
+import pytest
+
+from core.constrained_scheduler import ConstrainedScheduler
+from core.scheduler.tuning import TUNABLE_CONSTANTS, TuningProfile, evaluate_profiles, measure_profiles, neighbour
+from utils.evaluate_week_success import evaluate_schedule
+
+
+
+class TestTuningProfile:
+    """Test cases for TuningProfile"""
+
+    def test_round_trips_through_file(self, tmp_path):
+        """Test a saved profile loads back with the same choices"""
+        profile = TuningProfile.default()
+        profile.constants["SWAP_MAX_ITERATIONS"] = 2
+        path = profile.save(tmp_path / "fast.json")
+        loaded = TuningProfile.load(path)
+        assert loaded.key() == profile.key()
+        with pytest.raises(FileNotFoundError):
+            TuningProfile.load(tmp_path / "missing.json")
+
+    def test_apply_sets_one_instance(self):
+        """Test applying a profile changes the scheduler instance but not the class"""
+        profile = TuningProfile.default()
+        profile.constants["STAFF_LIMIT"] = 14
+        profile.phase_order = [p for p in profile.phase_order if p != "D.8"]
+        profile.area_clustering_priority = ["Tower"]
+        scheduler = ConstrainedScheduler([])
+        scheduler.load_profile(profile)
+        assert scheduler.STAFF_LIMIT == 14 and ConstrainedScheduler.STAFF_LIMIT == 16
+        assert "D.8" not in scheduler.pipeline.ids()
+        assert scheduler.area_clustering_priority == ["Tower"]
+
+    def test_rejects_invalid_choices(self):
+        """Test a dropped required phase or an unknown constant is refused"""
+        profile = TuningProfile.default()
+        profile.phase_order = [p for p in profile.phase_order if p != "F.1"]
+        with pytest.raises(ValueError):
+            profile.apply(ConstrainedScheduler([]))
+        profile = TuningProfile(constants={"MAX_CANOE_CAPACITY": 30})
+        with pytest.raises(ValueError):
+            profile.apply(ConstrainedScheduler([]))
+
+
+class TestAutotune:
+    """Test cases for the autotune neighbourhood and evaluation"""
+
+    def test_neighbours_change_one_choice_within_bounds(self):
+        """Test every neighbour differs from its profile and keeps constants in range"""
+        profile = TuningProfile.default()
+        rng = random.Random(3)
+        for _ in range(40):
+            candidate = neighbour(profile, rng)
+            assert candidate.key() != profile.key()
+            for name, value in candidate.constants.items():
+                low, high = TUNABLE_CONSTANTS[name]
+                assert low <= value <= high
+            candidate.apply(ConstrainedScheduler([]))
+
+    def test_default_profile_matches_plain_run(self, troops_file, scheduled_week):
+        """Test the default profile scores a week exactly as an untuned run does"""
+        result = evaluate_profiles([TuningProfile.default()], [troops_file], evaluate_schedule)[0]
+        metrics = evaluate_schedule(scheduled_week.schedule, scheduled_week.troops)
+        assert result.scores == {"tc_week2": metrics['final_score']}
+        assert result.cpu_seconds["tc_week2"] > 0 and not result.invalid
+
+    def test_measure_keeps_scores_and_fastest_run(self, troops_file, monkeypatch):
+        """Test repeated timing keeps the scores and each week's lowest CPU time"""
+        times = iter([0.0, 3.0, 10.0, 11.0])
+        monkeypatch.setattr("core.scheduler.tuning.time.process_time", lambda: next(times))
+        single = evaluate_profiles([TuningProfile.default()], [troops_file], evaluate_schedule)[0]
+        times = iter([0.0, 3.0, 10.0, 11.0])
+        result = measure_profiles([TuningProfile.default()], [troops_file], evaluate_schedule, repeats=2)[0]
+        assert result.scores == single.scores
+        assert result.cpu_seconds == {"tc_week2": 1.0}
+        with pytest.raises(ValueError):
+            measure_profiles([TuningProfile.default()], [troops_file], evaluate_schedule, repeats=0)
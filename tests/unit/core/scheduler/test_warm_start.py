@@ -0,0 +1,64 @@
+"""
+Unit tests for warm-starting schedule_all from a saved schedule
+"""
+import io
+import contextlib
+
+import pytest
+
+from core.io_handler import save_schedule_to_json
+from core.constrained_scheduler import ConstrainedScheduler
+from core.scheduler.pipeline import build_default_pipeline, build_warm_pipeline
+
+WEEK = "tc_week5"
+
+
+@pytest.fixture(scope="module")
+def previous(scheduled_week):
+    return scheduled_week.troops, scheduled_week.schedule
+
+
+class TestBuildWarmPipeline:
+    """Test cases for build_warm_pipeline"""
+
+    def test_skips_fixed_and_week_wide_phases(self):
+        """Test the warm pipeline re-plans and polishes but never rebuilds the week"""
+        ids = build_warm_pipeline().ids()
+        assert "A.0" not in ids and "A.2b" not in ids
+        assert {"A.1", "B.7", "D.1"} <= set(ids)
+        default = build_default_pipeline().ids()
+        assert ids == [phase_id for phase_id in default if phase_id in ids]
+
+
+class TestWarmStart:
+    """Test cases for ConstrainedScheduler.schedule_all(initial=...)"""
+
+    def test_own_output_is_kept(self, previous, tmp_path):
+        """Test a saved schedule keeps nearly all entries and the result has no gaps"""
+        troops, schedule = previous
+        path = tmp_path / "week_schedule.json"
+        save_schedule_to_json(schedule, troops, path)
+        scheduler = ConstrainedScheduler(troops)
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduler.schedule_all(initial=path)
+        report = scheduler.warm_start_report
+        assert report['kept'] + report['released'] == len(schedule.entries)
+        assert report['released'] <= len(schedule.entries) // 10
+        assert not any(scheduler.schedule.is_troop_free(slot, troop)
+                       for troop in scheduler.troops for slot in scheduler.time_slots)
+
+    def test_removed_troop_is_dropped(self, previous):
+        """Test entries of a troop no longer in the week are not carried over"""
+        troops, schedule = previous
+        scheduler = ConstrainedScheduler(troops[1:])
+        with contextlib.redirect_stdout(io.StringIO()):
+            scheduler.schedule_all(initial=schedule)
+        assert not [e for e in scheduler.schedule.entries if e.troop.name == troops[0].name]
+        assert scheduler.warm_start_report['released'] >= sum(
+            e.troop.name == troops[0].name for e in schedule.entries)
+
+    def test_not_with_resume_from(self, previous):
+        """Test a warm start cannot be combined with a checkpoint resume"""
+        troops, schedule = previous
+        with pytest.raises(ValueError):
+            ConstrainedScheduler(troops).schedule_all(initial=schedule, resume_from="B.1")
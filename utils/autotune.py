@@ -0,0 +1,84 @@
+"""
+Tune the scheduler's phase order, fill priority, staff limits, swap passes and
+area clustering priority offline, for the best mean score per CPU-second over
+the stored weeks (core/scheduler/tuning.py).
+
+The winning profile is written to config/profiles/<name>.json; load it with
+ConstrainedScheduler.load_profile(name) or generate_schedule.py --profile name.
+
+Usage:
+    python utils/autotune.py --name fast --jobs 4
+    python utils/autotune.py --name fast --rounds 8 --candidates 8 --max-score-loss 0.01
+    python utils/autotune.py --name wk4 --weeks tc_week4 tc_week5 --seconds 600
+
+The start and winning profiles are then re-run --repeats times, interleaved,
+and the saved metrics hold each week's lowest CPU time over those runs.
+"""
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.scheduler.tuning import TuningProfile, autotune, measure_profiles
+from core.scheduler_logging import set_log_level
+from utils.evaluate_week_success import evaluate_schedule
+
+TROOPS_DIR = Path(__file__).parent.parent / "data" / "troops"
+
+
+def week_files(names=None):
+    """Troop files of the named weeks (default: every stored week)."""
+    if not names:
+        return sorted(TROOPS_DIR.glob("*_troops.json"))
+    return [Path(n) if Path(n).exists() else TROOPS_DIR / f"{n}_troops.json" for n in names]
+
+
+def main():
+    """Command-line entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Autotune scheduler parameters for score per CPU-second")
+    parser.add_argument("--name", default="tuned", help="Profile name to save (config/profiles/<name>.json)")
+    parser.add_argument("--weeks", nargs="*", help="Week ids or troop files (default: all stored weeks)")
+    parser.add_argument("--base", help="Profile to start from (default: the engine's own settings)")
+    parser.add_argument("--rounds", type=int, default=5, help="Search rounds (default 5)")
+    parser.add_argument("--candidates", type=int, default=6, help="Neighbours evaluated per round (default 6)")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes (default 1)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default 0)")
+    parser.add_argument("--max-score-loss", type=float, default=0.02,
+                        help="Largest accepted drop in mean score, as a fraction of the start (default 0.02)")
+    parser.add_argument("--min-gain", type=float, default=0.01,
+                        help="Smallest relative gain in score per CPU-second that counts (default 0.01)")
+    parser.add_argument("--seconds", type=float, help="Stop starting new rounds after this many seconds")
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="Timing runs of the start and winning profiles for the saved metrics (default 5)")
+    args = parser.parse_args()
+
+    set_log_level(logging.WARNING)
+    weeks = week_files(args.weeks)
+    base = TuningProfile.load(args.base) if args.base else None
+    print(f"Tuning on {len(weeks)} week(s), {args.rounds} rounds of {args.candidates} profiles")
+    start = time.perf_counter()
+    best, history = autotune(weeks, evaluate_schedule, base=base, rounds=args.rounds, candidates=args.candidates,
+                             jobs=args.jobs, seed=args.seed, max_score_loss=args.max_score_loss,
+                             min_gain=args.min_gain, deadline=args.seconds)
+
+    print(f"Timing the start and winning profiles ({args.repeats} repeats)")
+    start_profile = base or TuningProfile.default()
+    measured_start, measured = measure_profiles([start_profile, best.profile], weeks, evaluate_schedule,
+                                                repeats=args.repeats, jobs=args.jobs)
+    best.profile.name = Path(args.name).stem
+    best.profile.metrics = dict(measured.summary(), start=measured_start.summary(), weeks=[w.stem for w in weeks],
+                                profiles_evaluated=len(history), seed=args.seed, repeats=args.repeats,
+                                cpu_seconds="per-week minimum over the repeats")
+    path = best.profile.save(args.name)
+    print(f"Tuned in {time.perf_counter() - start:.1f}s; saved {path}")
+    print(json.dumps(dict(measured.summary(), start=measured_start.summary()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
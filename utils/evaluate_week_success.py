@@ -22,8 +22,10 @@ import json
 
 from core.constrained_scheduler import ConstrainedScheduler
 from core.activities import get_all_activities
-from core.io_handler import load_troops_from_json, load_schedule_from_json
+from core.io_handler import load_troops_from_json, schedule_from_data, schedule_to_data
 from core.models import Day, TimeSlot, EXCLUSIVE_AREAS, generate_time_slots
+from core.scheduler.bounds import count_satisfied, preference_upper_bound
+from core.scheduler.schedule_cache import ScheduleCache, input_key, read_schedule_data
 
 # --- Configuration for Scoring (0-1000 perfect, can go negative) ---
 DEFAULT_WEIGHTS = {
@@ -89,26 +91,55 @@ def evaluate_week(week_file, weights=None):
     troops = load_troops_from_json(week_file)
     all_activities = get_all_activities()
     
-    # Try to load existing schedule from disk
+    # The week's working schedule or the cached one, if made for these inputs
     week_basename = os.path.splitext(os.path.basename(week_file))[0]
     # Update path to look in data/schedules/ relative to root
     schedule_file = os.path.join("data", "schedules", f"{week_basename}_schedule.json")
+    key = input_key(week_file)
+    cache = ScheduleCache()
+    data = read_schedule_data(schedule_file, key, legacy=True) or cache.get(key)
     
-    if os.path.exists(schedule_file):
-        print(f"Loading existing schedule from {schedule_file}...")
-        try:
-            schedule = load_schedule_from_json(schedule_file, troops, all_activities)
-            # Re-link schedule to valid objects if needed, but the loader handles mapping.
-        except Exception as e:
-            print(f"Error loading schedule: {e}")
-            print("Falling back to fresh scheduling...")
-            scheduler = ConstrainedScheduler(troops, all_activities)
-            schedule = scheduler.schedule_all()
+    if data is not None:
+        print(f"Loading schedule for {week_basename} (inputs {key[:12]})...")
+        schedule = schedule_from_data(data, troops, all_activities)
     else:
-        print(f"No existing schedule found at {schedule_file}. Running fresh scheduler...")
-        scheduler = ConstrainedScheduler(troops, all_activities)
+        print(f"No schedule for the current inputs of {week_basename}. Running fresh scheduler...")
+        voyageur_mode = "voyageur" in week_basename.lower()
+        scheduler = ConstrainedScheduler(troops, all_activities, voyageur_mode=voyageur_mode)
         schedule = scheduler.schedule_all()
+        cache.put(key, schedule_to_data(schedule, troops))
     
+    metrics = evaluate_schedule(schedule, troops, weights)
+    add_achievable_metrics(metrics, schedule, troops)
+    return metrics
+
+
+def add_achievable_metrics(metrics, schedule, troops):
+    """Add Top 5/10 "X of Y achievable" counts from the week's preference upper bound.
+    
+    Kept out of evaluate_schedule (the bound costs a max-flow solve per tier) and
+    out of final_score; reports use it to separate structurally impossible misses.
+    """
+    for top in (5, 10):
+        bound = preference_upper_bound(troops, top)
+        metrics[f"top{top}_satisfied"] = count_satisfied(schedule, troops, top)
+        metrics[f"top{top}_achievable"] = bound.achievable
+        metrics[f"top{top}_requested"] = bound.requested
+    return metrics
+
+
+def achievable_lines(metrics):
+    """Report lines for add_achievable_metrics' counts ([] when they were not computed)."""
+    return [f"{f'Top {top} Achieved:':<25}{metrics[f'top{top}_satisfied']} of {metrics[f'top{top}_achievable']} "
+            f"achievable ({metrics[f'top{top}_requested']} requested)"
+            for top in (5, 10) if f"top{top}_achievable" in metrics]
+
+
+def evaluate_schedule(schedule, troops, weights=None):
+    """Score an in-memory schedule (same metrics and final_score as evaluate_week)."""
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+
     metrics = {}
     
     # 1. Excess Days for Clustered Activities
@@ -702,6 +733,8 @@ def print_metrics(week_name, metrics):
         print(f"Beach Slot 2 Uses:       {metrics['beach_slot_2_uses']} (penalized)")
     print(f"Top 5 Missed (Total):    {metrics['missing_top5']}")
     print(f"Top 5 Success:           {metrics.get('top5_pct', 0):.1f}%")
+    for line in achievable_lines(metrics):
+        print(line)
     print(f"Cluster Gaps (1-3-2):    {metrics.get('cluster_gaps', 0)}")
     print(f"Top 10 Success:          {metrics.get('top10_pct', 0):.1f}%")
     print(f"Top 15 Success:          {metrics.get('top15_pct', 0):.1f}%")
@@ -753,6 +786,7 @@ if __name__ == "__main__":
             output_lines.append(f"Beach Slot 2 Uses:       {m['beach_slot_2_uses']} (penalized)")
         output_lines.append(f"Top 5 Missed (Total):    {m['missing_top5']}")
         output_lines.append(f"Top 5 Success:           {m.get('top5_pct', 0):.1f}%")
+        output_lines.extend(achievable_lines(m))
         output_lines.append(f"Cluster Gaps (1-3-2):    {m.get('cluster_gaps', 0)}")
         output_lines.append(f"Top 10 Success:          {m.get('top10_pct', 0):.1f}%")
         output_lines.append(f"Top 15 Success:          {m.get('top15_pct', 0):.1f}%")
@@ -1,9 +1,23 @@
 """
 Generate and cache schedules for summer camp weeks.
 This script generates schedules from troop JSON files and saves them as JSON for fast loading.
+
+Usage:
+    python utils/generate_schedule.py                    # all weeks, one at a time
+    python utils/generate_schedule.py --jobs 4           # all weeks in 4 worker processes
+    python utils/generate_schedule.py data/troops/tc_week4_troops.json
+    python utils/generate_schedule.py --force            # ignore the schedule cache
+    python utils/generate_schedule.py --warm             # re-plan from the saved week files
+    python utils/generate_schedule.py --profile fast     # tuning profile from config/profiles
 """
+import contextlib
+import io
 import json
+import os
 import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 # Add project root to path
@@ -13,9 +27,13 @@ from core.models import generate_time_slots, Day
 from core.activities import get_all_activities
 from core.io_handler import load_troops_from_json
 from core.constrained_scheduler import ConstrainedScheduler
+from core.scheduler import config_loader
+from core.scheduler.schedule_cache import ScheduleCache, input_key
+from core.scheduler.tuning import TuningProfile
 
 SCRIPT_DIR = Path(__file__).parent.resolve()
 SCHEDULES_DIR = Path(__file__).parent.parent / "data/schedules"
+SCHEDULE_CACHE = ScheduleCache(SCHEDULES_DIR / "cache")
 
 def serialize_schedule(schedule):
     """Convert Schedule object to JSON-serializable format."""
@@ -37,8 +55,17 @@ def serialize_schedule(schedule):
             continue
     return entries_data
 
-def generate_and_save_schedule(troops_file):
-    """Generate schedule for a troop file and save as JSON."""
+def generate_and_save_schedule(troops_file, activities=None, force=False, warm=False, profile=None):
+    """Generate schedule for a troop file and save as JSON.
+    
+    activities: a prebuilt activity catalog to share across weeks (built here otherwise).
+    A week whose inputs (troops file, configs, scheduler version) already have a
+    schedule in the content-addressed cache is not rescheduled unless force is set.
+    warm starts from the week's saved schedule file (if any), keeping its still-valid entries.
+    A warm result depends on that file as well as on the inputs, so like an incremental
+    repair it only goes to the week file, never to the content-addressed cache.
+    profile names a tuning profile (config/profiles) to schedule with; it is part of the cache key.
+    """
     troops_path = Path(troops_file)
     if not troops_path.exists():
         print(f"Error: {troops_file} not found")
@@ -47,16 +74,31 @@ def generate_and_save_schedule(troops_file):
     # Extract week identifier from filename (e.g., "tc_week5", "voyageur_week1")
     week_id = troops_path.stem  # removes .json extension
     
+    SCHEDULES_DIR.mkdir(exist_ok=True)
+    output_file = SCHEDULES_DIR / f"{week_id}_schedule.json"
+    key = input_key(troops_path, profile=TuningProfile.path_for(profile) if profile else None)
+    cached = None if force or warm else SCHEDULE_CACHE.get(key)
+    if cached is not None:
+        with open(output_file, 'w') as f:
+            json.dump(dict(cached, week_id=week_id), f, indent=2)
+        print(f"{week_id}: inputs unchanged ({key[:12]}), using cached schedule")
+        return True
+    
     print(f"Generating schedule for {week_id}...")
     
     # Load troops and generate schedule
     troops = load_troops_from_json(troops_path)
-    activities = get_all_activities()
+    if activities is None:
+        activities = get_all_activities()
     import inspect
     print(f"DEBUG: Scheduler loaded from {inspect.getfile(ConstrainedScheduler)}")
     # print(inspect.getsource(ConstrainedScheduler._optimize_friday_reflections))
-    scheduler = ConstrainedScheduler(troops, activities)
-    schedule = scheduler.schedule_all()
+    voyageur_mode = "voyageur" in week_id.lower()
+    scheduler = ConstrainedScheduler(troops, activities, voyageur_mode=voyageur_mode)
+    if profile:
+        scheduler.load_profile(profile)
+    initial = output_file if warm and output_file.exists() else None
+    schedule = scheduler.schedule_all(initial=initial)
     
     # Calculate unscheduled activities
     unscheduled_data = {}
@@ -113,50 +155,148 @@ def generate_and_save_schedule(troops_file):
             'name': t.name,
             'scouts': t.scouts,
             'adults': t.adults,
+            'campsite': t.campsite,
             'commissioner': t.commissioner,
-            'preferences': t.preferences
+            'preferences': t.preferences,
+            'day_requests': t.day_requests
         } for t in troops],
         'entries': serialize_schedule(schedule),
-        'unscheduled': unscheduled_data
+        'unscheduled': unscheduled_data,
+        'input_key': key
     }
     
     # Save to JSON
-    SCHEDULES_DIR.mkdir(exist_ok=True)
-    output_file = SCHEDULES_DIR / f"{week_id}_schedule.json"
-    
     with open(output_file, 'w') as f:
         json.dump(schedule_data, f, indent=2)
+    if initial is None:
+        SCHEDULE_CACHE.put(key, schedule_data)
     
     print(f"Saved schedule to {output_file}")
     return True
 
-def generate_all():
-    """Generate schedules for all troop files."""
+# Activity catalog shared by every week a worker process schedules (set by _init_worker)
+_worker_activities = None
+
+
+def _init_worker(activities, config):
+    """Process-pool initializer: reuse the parent's catalog and configuration."""
+    global _worker_activities
+    _worker_activities = activities
+    config_loader.preload_skull(config)
+
+
+def _generate_week(troops_file, activities=None, capture=True, force=False, warm=False, profile=None):
+    """Schedule one week; never raises.
+    
+    capture keeps the week's output in the result instead of printing it
+    (parallel weeks would interleave). Returns {'week_id', 'ok', 'seconds',
+    'error', 'log'}.
+    """
+    if activities is None:
+        activities = _worker_activities
+    log = io.StringIO()
+    start = time.perf_counter()
+    error = None
+    try:
+        with contextlib.redirect_stdout(log) if capture else contextlib.nullcontext():
+            ok = generate_and_save_schedule(troops_file, activities, force=force, warm=warm, profile=profile)
+    except Exception:
+        ok, error = False, traceback.format_exc()
+    return {
+        'week_id': Path(troops_file).stem,
+        'ok': ok,
+        'seconds': time.perf_counter() - start,
+        'error': error,
+        'log': log.getvalue(),
+    }
+
+
+def generate_all(jobs=1, force=False, warm=False, profile=None):
+    """Generate schedules for all troop files.
+    
+    jobs > 1 schedules the weeks in that many worker processes (0 = one per
+    CPU). The activity catalog and SKULL.json configuration are built once
+    and handed to every worker. Each week's progress, timing and failure is
+    reported as it finishes, and a week that raises does not stop the others.
+    Weeks whose inputs are unchanged come from the schedule cache unless force
+    or warm; warm re-plans every week from its saved schedule file and keeps the
+    result out of the cache. profile names a
+    tuning profile every week is scheduled with.
+    """
     # Look in data/troops/ directory
     troops_dir = SCRIPT_DIR.parent / "data" / "troops"
     troop_files = sorted(troops_dir.glob("*troops.json"))
     
     if not troop_files:
         print(f"No troop files found in {troops_dir} (*troops.json)")
-        return
+        return []
     
-    print(f"Found {len(troop_files)} troop file(s)")
+    jobs = min(jobs or os.cpu_count() or 1, len(troop_files))
+    print(f"Found {len(troop_files)} troop file(s)" + (f", {jobs} worker processes" if jobs > 1 else ""))
     print("=" * 60)
     
-    success_count = 0
-    for troop_file in troop_files:
-        if generate_and_save_schedule(troop_file):
-            success_count += 1
-        print()
+    activities = get_all_activities()
+    start = time.perf_counter()
+    results = []
+    
+    def report(result):
+        results.append(result)
+        status = "OK" if result['ok'] else "FAILED"
+        print(f"[{len(results)}/{len(troop_files)}] {result['week_id']}: {status} ({result['seconds']:.1f}s)")
+        if result['error']:
+            print(result['error'])
+    
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(activities, config_loader.get_skull())) as pool:
+            futures = {pool.submit(_generate_week, troop_file, None, True, force, warm, profile): troop_file
+                       for troop_file in troop_files}
+            for future in as_completed(futures):
+                try:
+                    report(future.result())
+                except Exception:
+                    # The worker process itself died (the week's own errors are caught inside)
+                    report({'week_id': futures[future].stem, 'ok': False, 'seconds': 0.0,
+                            'error': traceback.format_exc(), 'log': ''})
+    else:
+        for troop_file in troop_files:
+            report(_generate_week(troop_file, activities, capture=False, force=force, warm=warm, profile=profile))
+            print()
     
+    elapsed = time.perf_counter() - start
+    failed = sorted(r['week_id'] for r in results if not r['ok'])
     print("=" * 60)
-    print(f"Generated {success_count}/{len(troop_files)} schedules successfully")
+    print(f"Generated {len(results) - len(failed)}/{len(troop_files)} schedules successfully "
+          f"in {elapsed:.1f}s (sum of weeks {sum(r['seconds'] for r in results):.1f}s, "
+          f"slowest {max(r['seconds'] for r in results):.1f}s)")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+    return results
 
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
+
+def main():
+    """Command-line entry point."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Generate and cache schedules for summer camp weeks")
+    parser.add_argument("troops_file", nargs="?", help="Troop JSON file (default: all in data/troops)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes for all weeks (0 = one per CPU; default 1)")
+    parser.add_argument("--force", action="store_true",
+                        help="Reschedule even when the inputs match a cached schedule")
+    parser.add_argument("--warm", action="store_true",
+                        help="Start from the saved week schedule, re-planning only entries that no longer fit "
+                             "(bypasses the schedule cache)")
+    parser.add_argument("--profile", help="Tuning profile name or JSON file (see utils/autotune.py)")
+    args = parser.parse_args()
+    
+    if args.troops_file:
         # Generate specific file
-        troop_file = sys.argv[1]
-        generate_and_save_schedule(troop_file)
+        generate_and_save_schedule(args.troops_file, force=args.force, warm=args.warm, profile=args.profile)
     else:
         # Generate all
-        generate_all()
+        generate_all(jobs=args.jobs, force=args.force, warm=args.warm, profile=args.profile)
+
+
+if __name__ == "__main__":
+    main()
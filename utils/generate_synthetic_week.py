@@ -0,0 +1,78 @@
+"""
+Generate synthetic large-camp weeks and time the section-by-section scaling mode.
+
+Troop sizes, list lengths and preferences are sampled from the stored weeks in
+data/troops (core/scheduler/synthetic.py). Generated files go to data/synthetic
+so they never mix with the real weeks.
+
+Usage:
+    python utils/generate_synthetic_week.py                       # 25/50/100/200 troops
+    python utils/generate_synthetic_week.py 60 --seed 3 --section-size 12
+    python utils/generate_synthetic_week.py --capacity Beach=2 --capacity Staff=12:staff
+    python utils/generate_synthetic_week.py 25 50 100 --benchmark  # schedule and time each week
+"""
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.io_handler import load_troops_from_json
+from core.scheduler.scaling import schedule_sections
+from core.scheduler.synthetic import CampTopology, PreferenceModel, generate_week, load_topology, write_week
+
+SYNTHETIC_DIR = Path(__file__).parent.parent / "data" / "synthetic"
+
+
+def parse_capacity(text):
+    """'Beach=2' or 'Staff=12:staff' -> capacity_override arguments."""
+    name, _, value = text.partition("=")
+    capacity, _, unit = value.partition(":")
+    return {"activities": name, "capacity": int(capacity), "unit": unit or "troops"}
+
+
+def benchmark(path):
+    """Schedule a generated week section by section; returns the scaling report."""
+    troops = load_troops_from_json(path)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        schedule, report = schedule_sections(troops, load_topology(path))
+    elapsed = time.perf_counter() - start
+    print(f"  {len(troops)} troops, {len(report['sections'])} sections, {len(schedule.entries)} entries "
+          f"in {elapsed:.1f}s ({elapsed / len(troops):.2f}s per troop)")
+    return report
+
+
+def main():
+    """Command-line entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate synthetic large-camp troop files")
+    parser.add_argument("sizes", nargs="*", type=int, default=[25, 50, 100, 200],
+                        help="Troop counts to generate (default: 25 50 100 200)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default 0)")
+    parser.add_argument("--out", default=str(SYNTHETIC_DIR), help="Output directory (default data/synthetic)")
+    parser.add_argument("--section-size", type=int, default=None,
+                        help="Campsites per section (default: the real camp's 14)")
+    parser.add_argument("--commissioners", type=int, default=3, help="Commissioners per section (default 3)")
+    parser.add_argument("--capacity", action="append", default=[], type=parse_capacity,
+                        help="Per-section capacity, e.g. Beach=2 or Staff=12:staff (repeatable)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Schedule each generated week in scaling mode and report the time")
+    args = parser.parse_args()
+
+    model = PreferenceModel.from_weeks()
+    for size in args.sizes:
+        topology = CampTopology.for_troops(size, args.section_size, args.commissioners, args.capacity)
+        path = write_week(generate_week(size, topology, model, seed=args.seed),
+                          Path(args.out) / f"synthetic_{size}_troops.json")
+        print(f"Wrote {path} ({size} troops, {len(topology.sections)} sections)")
+        if args.benchmark:
+            benchmark(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Per-Phase Impact Report for schedule_all
+
+Runs the scheduler on every stored week with a PhaseProfiler attached and
+reports, per phase: wall time, _can_schedule calls, entries added/removed,
+constraint-violation delta and evaluate_week score delta. Phases that cost
+time without improving quality in most weeks are listed as gating candidates.
+
+Usage:
+    python utils/profile_phases.py                       # all weeks in data/troops
+    python utils/profile_phases.py data/troops/tc_week4_troops.json
+    python utils/profile_phases.py --json reports/phase_profile.json --per-week
+"""
+
+import contextlib
+import io
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.activities import get_all_activities
+from core.io_handler import load_troops_from_json
+from core.constrained_scheduler import ConstrainedScheduler
+from core.scheduler.profiler import PhaseProfiler, aggregate_phase_records, format_phase_table
+from core.scheduler_logging import set_log_level
+from utils.evaluate_week_success import evaluate_schedule
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+TROOPS_DIR = PROJECT_ROOT / "data" / "troops"
+
+
+def profile_week(troops_file, score=True):
+    """Schedule one week under the profiler and return its report dict."""
+    troops_path = Path(troops_file)
+    troops = load_troops_from_json(troops_path)
+    scheduler = ConstrainedScheduler(troops, get_all_activities(),
+                                     voyageur_mode='voyageur' in troops_path.stem)
+    profiler = PhaseProfiler(evaluate_fn=evaluate_schedule if score else None)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        schedule = scheduler.schedule_all(profiler=profiler)
+
+    report = profiler.to_dict()
+    report['week'] = troops_path.stem
+    report['entries'] = len(schedule.entries)
+    if score:
+        report['final_score'] = evaluate_schedule(schedule, troops)['final_score']
+    return report
+
+
+def gating_candidates(rows, min_share=0.5):
+    """Top-level phases that were unproductive in at least min_share of their runs, slowest first."""
+    candidates = [r for r in rows
+                  if r['depth'] == 0 and r['runs'] and r['unproductive_runs'] / r['runs'] >= min_share]
+    return sorted(candidates, key=lambda r: r['elapsed'], reverse=True)
+
+
+def main():
+    """Main entry point for the phase profiler."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Per-phase profiler and impact report for schedule_all")
+    parser.add_argument("weeks", nargs="*", help="Troop JSON files (default: all in data/troops)")
+    parser.add_argument("--json", dest="json_path", help="Write the full report to this JSON file")
+    parser.add_argument("--per-week", action="store_true", help="Also print the table for each week")
+    parser.add_argument("--no-score", action="store_true",
+                        help="Skip violation/score deltas (faster; time, calls and churn only)")
+    args = parser.parse_args()
+
+    set_log_level(logging.WARNING)
+    week_files = [Path(w) for w in args.weeks] or sorted(TROOPS_DIR.glob("*troops.json"))
+    if not week_files:
+        print(f"No troop files found in {TROOPS_DIR} (*troops.json)")
+        return 1
+
+    week_reports = []
+    for week_file in week_files:
+        report = profile_week(week_file, score=not args.no_score)
+        week_reports.append(report)
+        summary = f"{report['week']}: {report['total_elapsed']:.2f}s in phases, " \
+                  f"{report['total_can_schedule_calls']} _can_schedule calls"
+        if 'final_score' in report:
+            summary += f", score {report['final_score']}"
+        print(summary)
+        if args.per_week:
+            print(format_phase_table(report['phases']))
+            print()
+
+    rows = aggregate_phase_records([r['phases'] for r in week_reports])
+    candidates = gating_candidates(rows)
+
+    print()
+    print("=" * 70)
+    print(f"PHASE IMPACT ACROSS {len(week_reports)} WEEK(S)")
+    print("=" * 70)
+    print(format_phase_table(rows))
+    print()
+    if candidates:
+        print("Cost time without improving quality in most weeks (gating candidates):")
+        for row in candidates:
+            print(f"  {row['phase']:<10} {row['elapsed']:.3f}s  unproductive in "
+                  f"{row['unproductive_runs']}/{row['runs']} week(s)")
+
+    if args.json_path:
+        output = {
+            'weeks': week_reports,
+            'phases': rows,
+            'gating_candidates': [r['phase'] for r in candidates],
+        }
+        json_path = Path(args.json_path)
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(json_path, 'w') as f:
+            json.dump(output, f, indent=2)
+        print(f"\nSaved report to {json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
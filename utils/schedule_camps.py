@@ -0,0 +1,67 @@
+"""
+Schedule several camp weeks together against shared waterfront and staff capacity.
+
+Each troop file is one camp (Voyageur rules when "voyageur" is in its name).
+The camps are planned in parallel and then coordinated on the shared
+resources only (core/scheduler/multi_camp.py).
+
+Usage:
+    python utils/schedule_camps.py data/troops/tc_week1_troops.json data/troops/voyageur_week1_troops.json
+    python utils/schedule_camps.py tc_week3 voyageur_week3 --jobs 2 --out /tmp/joint
+"""
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.io_handler import load_troops_from_json, save_schedule_to_json
+from core.scheduler.multi_camp import Camp, schedule_camps
+from core.scheduler_logging import set_log_level
+from utils.evaluate_week_success import evaluate_schedule
+
+TROOPS_DIR = Path(__file__).parent.parent / "data" / "troops"
+
+
+def load_camp(name_or_path):
+    """A troop file path, or a week id such as tc_week3 (looked up in data/troops)."""
+    path = Path(name_or_path)
+    if not path.exists():
+        path = TROOPS_DIR / f"{name_or_path}_troops.json"
+    week_id = path.stem.replace("_troops", "")
+    return Camp(week_id, load_troops_from_json(path), "voyageur" in week_id.lower())
+
+
+def main():
+    """Command-line entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Schedule camp weeks together with shared resources")
+    parser.add_argument("camps", nargs="+", help="Troop files or week ids, one per camp")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for the independent runs")
+    parser.add_argument("--rounds", type=int, default=5, help="Maximum coordination rounds (default 5)")
+    parser.add_argument("--out", help="Directory to save each camp's schedule JSON in")
+    args = parser.parse_args()
+
+    set_log_level(logging.WARNING)
+    camps = [load_camp(c) for c in args.camps]
+    if args.out:
+        Path(args.out).mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    schedules, report = schedule_camps(camps, jobs=args.jobs, max_rounds=args.rounds)
+    print(f"Scheduled {len(camps)} camps in {time.perf_counter() - start:.1f}s: "
+          f"{report['initial_conflicts']} shared-resource conflicts before coordination, "
+          f"{report['conflicts']} after {len(report['rounds'])} round(s)")
+    for index, round_report in enumerate(report['rounds'], 1):
+        print(f"  Round {index}: {round_report['conflicts']} conflicts, repaired {', '.join(round_report['repaired'])}")
+    for camp in camps:
+        metrics = evaluate_schedule(schedules[camp.name], camp.troops)
+        print(f"  {camp.name}: score {metrics['final_score']}, {metrics['constraint_violations']} violations")
+        if args.out:
+            save_schedule_to_json(schedules[camp.name], camp.troops, Path(args.out) / f"{camp.name}_joint_schedule.json")
+
+
+if __name__ == "__main__":
+    main()
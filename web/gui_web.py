@@ -13,8 +13,9 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from core.models import Day, TimeSlot, generate_time_slots, ScheduleEntry, Troop, Schedule
 from core.activities import get_all_activities
-from core.io_handler import load_troops_from_json, save_schedule_to_json
+from core.io_handler import load_troops_from_json, save_schedule_to_json, schedule_to_data
 from core.constrained_scheduler import ConstrainedScheduler
+from core.scheduler.schedule_cache import ScheduleCache, input_key, read_schedule_data
 
 app = Flask(__name__)
 app.config['TEMPLATES_AUTO_RELOAD'] = True
@@ -35,6 +36,8 @@ def add_header(response):
 print("Loading schedules...")
 
 SCHEDULES_DIR = SCRIPT_DIR.parent / "data/schedules"
+# Full schedule_all results keyed by their inputs (regenerated/repaired plans live in the week files)
+SCHEDULE_CACHE = ScheduleCache(SCHEDULES_DIR / "cache")
 WEEK_DATA = {}
 activities = get_all_activities()
 time_slots = generate_time_slots()
@@ -108,15 +111,8 @@ def load_schedule_from_json(schedule_file):
     
     return troops, schedule, unscheduled
 
-def generate_schedule(troops_file):
-    """Generate schedule from troops file (fallback)."""
-    print(f"  Generating schedule from {troops_file.name}...")
-    troops = load_troops_from_json(troops_file)
-    voyageur_mode = "voyageur" in troops_file.name.lower()
-    scheduler = ConstrainedScheduler(troops, activities, voyageur_mode=voyageur_mode)
-    schedule = scheduler.schedule_all()
-    
-    # Calculate unscheduled activities
+def compute_unscheduled(troops, schedule):
+    """Missing Top 5 / Top 10 requests per troop, with HC/DG and 3-hour exemptions."""
     unscheduled_data = {}
     # HC/DG exemption: if all 3 Tuesday slots are HC or DG, troops who missed HC/DG get exempt
     tuesday_hc_dg_slots = set()
@@ -125,7 +121,7 @@ def generate_schedule(troops_file):
             tuesday_hc_dg_slots.add(e.time_slot.slot_number)
     hc_dg_tuesday_full = tuesday_hc_dg_slots >= {1, 2, 3}
 
-    for troop in scheduler.troops:
+    for troop in troops:
         troop_schedule = schedule.get_troop_schedule(troop)
         scheduled_activity_names = {e.activity.name for e in troop_schedule}
         
@@ -157,7 +153,33 @@ def generate_schedule(troops_file):
                 'top5': missing_top5,
                 'top10': missing_top10
             }
-            
+    return unscheduled_data
+
+
+def generate_schedule(troops_file, deadline=None, previous=None):
+    """Generate schedule from troops file (fallback).
+    
+    deadline: optional wall-clock budget in seconds - optional improvement
+    phases are skipped once it is spent (see ConstrainedScheduler.schedule_all).
+    previous: optional cached Schedule to repair instead - only troops whose
+    data changed are re-scheduled (see ConstrainedScheduler.reschedule), then
+    polished by a large neighbourhood search over those troops while the
+    deadline allows.
+    """
+    print(f"  Generating schedule from {troops_file.name}...")
+    troops = load_troops_from_json(troops_file)
+    voyageur_mode = "voyageur" in troops_file.name.lower()
+    scheduler = ConstrainedScheduler(troops, activities, voyageur_mode=voyageur_mode)
+    if previous is not None:
+        from core.scheduler.lns import LargeNeighbourhoodSearch
+        from utils.evaluate_week_success import evaluate_schedule
+        schedule = scheduler.reschedule(previous, deadline=deadline,
+                                        lns=LargeNeighbourhoodSearch(evaluate_schedule, sweeps=REPAIR_LNS_SWEEPS))
+    else:
+        schedule = scheduler.schedule_all(deadline=deadline)
+    
+    unscheduled_data = compute_unscheduled(scheduler.troops, schedule)
+    
     # vital: return scheduler.troops because they might have been split
     return scheduler.troops, schedule, unscheduled_data
 
@@ -188,61 +210,58 @@ for troops_file in troop_files:
 
 # In-memory cache for loaded weeks (populated on-demand)
 WEEK_DATA = {}
+# Regenerate button response-time guarantee (seconds); override per request with ?deadline=
+REGENERATE_DEADLINE_SECONDS = 20.0
+# LNS sweeps over the released troops after an incremental repair (bounded by the deadline)
+REPAIR_LNS_SWEEPS = 3
 # Performance optimization: Pre-warm cache for commonly used weeks
 PREWARM_WEEKS = ['tc_week1_troops', 'tc_week2_troops', 'tc_week3_troops']
 
 def get_week_data(week_id):
-    """Lazy load a week's data on demand, with cache invalidation."""
+    """Lazy load a week's data on demand.
+    
+    Schedules are looked up by a hash of their inputs (troops file, configs and
+    scheduler version - core/scheduler/schedule_cache.py): the week's working
+    file if it was made for the current inputs, else the content-addressed
+    cache, else a fresh schedule that is then cached. A loaded week is reused
+    while its inputs are unchanged.
+    """
     if week_id not in WEEK_METADATA:
         return None
     
     meta = WEEK_METADATA[week_id]
     troops_file = meta['file']
     schedule_file = SCHEDULES_DIR / f"{week_id}_schedule.json"
+    key = input_key(troops_file)
     
-    # Check if cache needs invalidation (schedule file was modified)
-    if week_id in WEEK_DATA:
-        cached_mtime = WEEK_DATA[week_id].get('_mtime', 0)
-        if schedule_file.exists():
-            current_mtime = schedule_file.stat().st_mtime
-            if current_mtime > cached_mtime:
-                print(f"  Cache invalidated for {week_id} (file updated)")
-                del WEEK_DATA[week_id]
+    # Inputs changed since the week was loaded: drop it
+    if week_id in WEEK_DATA and WEEK_DATA[week_id].get('_key') != key:
+        print(f"  Cache invalidated for {week_id} (inputs changed)")
+        del WEEK_DATA[week_id]
     
     if week_id in WEEK_DATA:
         return WEEK_DATA[week_id]
     
     print(f"Loading {week_id} on demand...")
     
-    # Try cache first with better error handling
-    schedule_mtime = 0
     unscheduled_data = {}
-    
-    if schedule_file.exists():
+    loaded = False
+    for cached_file in (schedule_file, SCHEDULE_CACHE.path(key)):
+        if read_schedule_data(cached_file, key, legacy=cached_file == schedule_file) is None:
+            continue
         try:
-            troops, schedule, unscheduled_data = load_schedule_from_json(schedule_file)
-            schedule_mtime = schedule_file.stat().st_mtime
-            print(f"  Loaded from cache")
+            troops, schedule, unscheduled_data = load_schedule_from_json(cached_file)
+            print(f"  Loaded from cache ({cached_file.name})")
+            loaded = True
+            break
         except Exception as e:
-            print(f"  Cache failed: {e}, regenerating...")
-            try:
-                troops, schedule, unscheduled_data = generate_schedule(troops_file)
-            except Exception as e2:
-                print(f"  Schedule generation failed: {e2}")
-                # Return empty data rather than crashing
-                return {
-                    'troops': [],
-                    'schedule': Schedule(),
-                    'unscheduled': {},
-                    'week_number': meta['week_number'],
-                    'file': troops_file.name,
-                    '_mtime': 0,
-                    'error': str(e2)
-                }
-    else:
+            print(f"  Cache failed: {e}")
+    
+    if not loaded:
         try:
             print(f"  Generating fresh schedule...")
             troops, schedule, unscheduled_data = generate_schedule(troops_file)
+            SCHEDULE_CACHE.put(key, schedule_to_data(schedule, troops, unscheduled_data))
         except Exception as e:
             print(f"  Schedule generation failed: {e}")
             # Return empty data rather than crashing
@@ -252,7 +271,7 @@ def get_week_data(week_id):
                 'unscheduled': {},
                 'week_number': meta['week_number'],
                 'file': troops_file.name,
-                '_mtime': 0,
+                '_key': None,
                 'error': str(e)
             }
     
@@ -262,7 +281,7 @@ def get_week_data(week_id):
         'unscheduled': unscheduled_data,
         'week_number': meta['week_number'],
         'file': troops_file.name,
-        '_mtime': schedule_mtime  # Track file modification time
+        '_key': key  # Inputs the schedule was made for
     }
     meta['loaded'] = True
     
@@ -344,7 +363,11 @@ def get_evaluation(week_id):
 
 @app.route('/api/regenerate/<week_id>', methods=['POST'])
 def regenerate_week(week_id):
-    """Force regenerate a week's schedule (deletes cache and recreates)."""
+    """Force regenerate a week's schedule (deletes cache and recreates).
+    
+    ?incremental=1 repairs the cached schedule instead: troops whose roster or
+    preferences changed are re-scheduled and every other troop keeps its entries.
+    """
     if week_id not in WEEK_METADATA:
         return jsonify({'error': 'Week not found'}), 404
     
@@ -352,6 +375,14 @@ def regenerate_week(week_id):
     troops_file = meta['file']
     schedule_file = SCHEDULES_DIR / f"{week_id}_schedule.json"
     
+    # Keep the cached schedule to repair (a cache that no longer loads means a full run)
+    previous = None
+    if request.args.get('incremental', default=0, type=int) and schedule_file.exists():
+        try:
+            _, previous, _ = load_schedule_from_json(schedule_file)
+        except (ValueError, RuntimeError) as e:
+            print(f"Cached schedule unusable for incremental repair ({e}); regenerating fully")
+    
     # Delete cached schedule if exists
     if schedule_file.exists():
         import os
@@ -363,12 +394,15 @@ def regenerate_week(week_id):
         del WEEK_DATA[week_id]
     meta['loaded'] = False
     
-    # Regenerate schedule
-    print(f"Regenerating schedule for {week_id}...")
-    troops, schedule, unscheduled_data = generate_schedule(troops_file)
+    # Regenerate schedule within the response-time budget
+    deadline = request.args.get('deadline', default=REGENERATE_DEADLINE_SECONDS, type=float)
+    mode = "incremental, " if previous is not None else ""
+    print(f"Regenerating schedule for {week_id} ({mode}deadline {deadline:.1f}s)...")
+    troops, schedule, unscheduled_data = generate_schedule(troops_file, deadline=deadline, previous=previous)
     
-    # Save to cache using io_handler
-    save_schedule_to_json(schedule, troops, str(schedule_file), unscheduled_data)
+    # Save as the week's working schedule, tagged with the inputs it was made for
+    key = input_key(troops_file)
+    save_schedule_to_json(schedule, troops, str(schedule_file), unscheduled_data, input_key=key)
     
     # Update memory cache
     WEEK_DATA[week_id] = {
@@ -376,11 +410,58 @@ def regenerate_week(week_id):
         'schedule': schedule,
         'unscheduled': unscheduled_data,
         'week_number': meta['week_number'],
-        'file': troops_file.name
+        'file': troops_file.name,
+        '_key': key
     }
     meta['loaded'] = True
     
-    return jsonify({'success': True, 'week': week_id, 'entries': len(schedule.entries)})
+    return jsonify({'success': True, 'week': week_id, 'entries': len(schedule.entries),
+                    'incremental': previous is not None})
+
+
+@app.route('/api/disrupt/<week_id>', methods=['POST'])
+def disrupt_week(week_id):
+    """Re-plan a week from a slot after a closure, keeping the slots that already ran.
+    
+    JSON body:
+        {"start": {"day": "WEDNESDAY", "slot": 1},
+         "closures": [{"names": ["Beach"], "days": ["WEDNESDAY"], "slots": [["THURSDAY", 1]],
+                       "capacity": 0, "unit": "troops"}]}
+    names are activities, EXCLUSIVE_AREAS areas or Beach/Canoe/Staff; capacity 0
+    closes them (see core/scheduler/disruption.py).
+    """
+    from core.scheduler.disruption import capacity_override
+    
+    data = get_week_data(week_id)
+    if data is None:
+        return jsonify({'error': 'Week not found'}), 404
+    
+    body = request.get_json(silent=True) or {}
+    try:
+        start = TimeSlot(Day[body['start']['day'].upper()], int(body['start']['slot']))
+        overrides = []
+        for closure in body.get('closures', []):
+            window = [Day[day.upper()] for day in closure.get('days', [])]
+            window += [TimeSlot(Day[day.upper()], int(number)) for day, number in closure.get('slots', [])]
+            overrides.append(capacity_override(closure['names'], window, int(closure.get('capacity', 0)),
+                                               closure.get('unit', 'troops')))
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid disruption request: {e}'}), 400
+    
+    meta = WEEK_METADATA[week_id]
+    troops = data['troops']
+    voyageur_mode = "voyageur" in meta['file'].name.lower()
+    scheduler = ConstrainedScheduler(troops, activities, voyageur_mode=voyageur_mode)
+    deadline = request.args.get('deadline', default=REGENERATE_DEADLINE_SECONDS, type=float)
+    print(f"Repairing {week_id} from {start} ({len(overrides)} closure(s), deadline {deadline:.1f}s)...")
+    schedule = scheduler.repair_disruption(data['schedule'], start, overrides, deadline=deadline)
+    unscheduled_data = compute_unscheduled(troops, schedule)
+    
+    schedule_file = SCHEDULES_DIR / f"{week_id}_schedule.json"
+    save_schedule_to_json(schedule, troops, str(schedule_file), unscheduled_data, input_key=data['_key'])
+    data.update({'schedule': schedule, 'unscheduled': unscheduled_data})
+    
+    return jsonify({'success': True, 'week': week_id, **scheduler.disruption_report})
 
 
 # def save_schedule_to_json(week_id, troops, schedule):